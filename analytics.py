@@ -0,0 +1,246 @@
+"""
+GPA and grade-distribution analytics over the Student Management System's enrollments.
+
+The analytics work on a `ColumnarEnrollments` table rather than on `Enrollment` objects: every
+statistic is computed for all students or all courses at once with batched column operations.
+NumPy is used when it is installed and a pure-Python implementation of the same operations is
+used otherwise, so the project keeps working without any external dependency.
+
+Example
+-------
+analytics = GradeAnalytics.from_system(sms)
+print(analytics.student_gpa())
+print(analytics.course_statistics())
+"""
+
+from statistics import median
+
+from columnar import ColumnarEnrollments
+
+try:
+    import numpy as np
+except ImportError: # numpy is optional, the pure-Python implementation is used without it
+    np = None
+
+
+class GradeScale:
+    """
+    A class used to map letter grades to grade points.
+
+    Attributes
+    ----------
+    points : dict[str, float]
+        The grade points of each letter grade. Grades missing from the scale (e.g. "P" or
+        "Incomplete") are ignored by the analytics.
+    """
+
+    DEFAULT_POINTS = {
+        "A+": 4.0, "A": 4.0, "A-": 3.7,
+        "B+": 3.3, "B": 3.0, "B-": 2.7,
+        "C+": 2.3, "C": 2.0, "C-": 1.7,
+        "D+": 1.3, "D": 1.0, "D-": 0.7,
+        "F": 0.0,
+    }
+
+    def __init__(self, points: dict[str, float] = None) -> None:
+        self.points = dict(self.DEFAULT_POINTS if points is None else points)
+
+    def get(self, grade: str):
+        """
+        Retrieve the grade points of a letter grade.
+
+        Parameters
+        ----------
+        grade : str
+            The letter grade, or None for an enrollment without a grade.
+
+        Returns
+        -------
+        float or None
+            The grade points, or None if the grade is not on the scale.
+        """
+        return self.points.get(grade)
+
+
+class GradeAnalytics:
+    """
+    A class used to compute GPAs, course statistics and grade distributions over a set of enrollments.
+
+    Attributes
+    ----------
+    table : ColumnarEnrollments
+        The enrollments to analyse.
+    scale : GradeScale
+        The letter-to-point scale used for GPAs and course statistics.
+    majors : dict[int, str]
+        The major of each student, used by the per-major aggregates.
+    use_numpy : bool
+        Whether the NumPy implementation is used.
+
+    Methods
+    -------
+    from_system(sms: StudentManagementSystem, scale: GradeScale = None, use_numpy: bool = None) -> GradeAnalytics
+        Builds the analytics over every enrollment in a system.
+    student_gpa() -> dict[int, float]
+        The GPA of every student with at least one graded enrollment.
+    course_statistics() -> dict[str, dict[str, float]]
+        The grade-point count, mean and median of every course with at least one graded enrollment.
+    grade_distribution() -> dict[str, dict[str, int]]
+        The number of each letter grade awarded in every course.
+    major_statistics() -> dict[str, dict[str, float]]
+        The number of graded students and the mean GPA of every major.
+    """
+
+    def __init__(self, table: ColumnarEnrollments, scale: GradeScale = None, majors: dict[int, str] = None,
+                 use_numpy: bool = None) -> None:
+        if use_numpy and np is None:
+            raise ImportError("NumPy is not installed, use use_numpy=False for the pure-Python implementation.")
+        self.table = table
+        self.scale = scale if scale is not None else GradeScale()
+        self.majors = majors if majors is not None else {}
+        self.use_numpy = np is not None if use_numpy is None else use_numpy
+
+    @classmethod
+    def from_system(cls, sms, scale: GradeScale = None, use_numpy: bool = None) -> "GradeAnalytics":
+        """
+        Build the analytics over every enrollment in a Student Management System.
+
+        Parameters
+        ----------
+        sms : StudentManagementSystem
+            The system to analyse.
+        scale : GradeScale, optional
+            The letter-to-point scale (default is the standard 4.0 scale).
+        use_numpy : bool, optional
+            Whether to use NumPy (default is to use it when it is installed).
+
+        Returns
+        -------
+        GradeAnalytics
+            The analytics over the system's current enrollments.
+        """
+        table = ColumnarEnrollments.from_enrollments(sms.iter_enrollments())
+        majors = {student.id_number: student.major for student in sms.iter_students()}
+        return cls(table, scale, majors, use_numpy)
+
+    def _grade_points(self) -> list:
+        # the grade points of each grade code, None for codes that are off the scale
+        return [self.scale.get(grade) for grade in self.table.grades]
+
+    def _graded_columns(self, index_column) -> tuple:
+        # numpy views of an index column and of the grade points, restricted to the graded enrollments
+        code_points = np.array([np.nan if point is None else point for point in self._grade_points()])
+        enrollment_points = code_points[np.frombuffer(self.table.grade_code, dtype=np.uint8)]
+        graded = ~np.isnan(enrollment_points)
+        return np.frombuffer(index_column, dtype=np.int32)[graded], enrollment_points[graded]
+
+    def _student_totals(self) -> tuple[list, list]:
+        # per student index: the sum of grade points and the number of graded enrollments
+        table = self.table
+        size = len(table.student_ids)
+        if self.use_numpy:
+            students, enrollment_points = self._graded_columns(table.student_index)
+            totals = np.bincount(students, weights=enrollment_points, minlength=size)
+            counts = np.bincount(students, minlength=size)
+            return totals.tolist(), counts.tolist()
+        points = self._grade_points()
+        totals = [0.0] * size
+        counts = [0] * size
+        for student, code in zip(table.student_index, table.grade_code):
+            point = points[code]
+            if point is not None:
+                totals[student] += point
+                counts[student] += 1
+        return totals, counts
+
+    def student_gpa(self) -> dict[int, float]:
+        """
+        Compute the GPA of every student with at least one graded enrollment.
+
+        Returns
+        -------
+        dict[int, float]
+            The GPA of each student keyed by student id.
+        """
+        totals, counts = self._student_totals()
+        return {student_id: total / count
+                for student_id, total, count in zip(self.table.student_ids, totals, counts) if count}
+
+    def course_statistics(self) -> dict[str, dict[str, float]]:
+        """
+        Compute the number of graded enrollments and the mean and median grade points of every course.
+
+        Returns
+        -------
+        dict[str, dict[str, float]]
+            A `{"count": ..., "mean": ..., "median": ...}` dictionary for each course keyed by course id.
+        """
+        table = self.table
+        statistics = {}
+        if self.use_numpy:
+            courses, enrollment_points = self._graded_columns(table.course_index)
+            # sort by course then points so each course's grades form one sorted run
+            order = np.lexsort((enrollment_points, courses))
+            courses, enrollment_points = courses[order], enrollment_points[order]
+            present, starts, counts = np.unique(courses, return_index=True, return_counts=True)
+            means = np.bincount(courses, weights=enrollment_points)[present] / counts
+            medians = (enrollment_points[starts + (counts - 1) // 2] + enrollment_points[starts + counts // 2]) / 2
+            for course, count, mean, middle in zip(present.tolist(), counts.tolist(), means.tolist(), medians.tolist()):
+                statistics[table.course_ids[course]] = {"count": count, "mean": mean, "median": middle}
+            return statistics
+        points = self._grade_points()
+        course_points = {}
+        for course, code in zip(table.course_index, table.grade_code):
+            point = points[code]
+            if point is not None:
+                course_points.setdefault(course, []).append(point)
+        for course, run in sorted(course_points.items()):
+            statistics[table.course_ids[course]] = {"count": len(run), "mean": sum(run) / len(run), "median": median(run)}
+        return statistics
+
+    def grade_distribution(self) -> dict[str, dict[str, int]]:
+        """
+        Count the letter grades awarded in every course, including grades that are not on the scale.
+
+        Returns
+        -------
+        dict[str, dict[str, int]]
+            The number of times each grade was awarded, keyed by course id then grade.
+            Enrollments without a grade are not counted.
+        """
+        table = self.table
+        grade_count = len(table.grades)
+        if self.use_numpy:
+            cells = (np.frombuffer(table.course_index, dtype=np.int32).astype(np.int64) * grade_count
+                     + np.frombuffer(table.grade_code, dtype=np.uint8))
+            counts = np.bincount(cells, minlength=len(table.course_ids) * grade_count).reshape(-1, grade_count)
+            course_rows, codes = np.nonzero(counts[:, 1:])
+            totals = counts[course_rows, codes + 1].tolist()
+            cells = zip(course_rows.tolist(), (codes + 1).tolist(), totals)
+        else:
+            tally = {}
+            for course, code in zip(table.course_index, table.grade_code):
+                if code:
+                    tally[(course, code)] = tally.get((course, code), 0) + 1
+            cells = ((course, code, total) for (course, code), total in sorted(tally.items()))
+        distribution = {}
+        for course, code, total in cells:
+            distribution.setdefault(table.course_ids[course], {})[table.grades[code]] = total
+        return distribution
+
+    def major_statistics(self) -> dict[str, dict[str, float]]:
+        """
+        Compute the number of graded students and the mean student GPA of every major.
+
+        Returns
+        -------
+        dict[str, dict[str, float]]
+            A `{"students": ..., "mean_gpa": ...}` dictionary for each major keyed by major.
+            Students whose major is unknown are grouped under None.
+        """
+        totals = {}
+        for student_id, gpa in self.student_gpa().items():
+            major = self.majors.get(student_id)
+            count, total = totals.get(major, (0, 0.0))
+            totals[major] = (count + 1, total + gpa)
+        return {major: {"students": count, "mean_gpa": total / count} for major, (count, total) in totals.items()}
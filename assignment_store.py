@@ -0,0 +1,139 @@
+class AssignmentStore:
+    """
+    A class used to store which instructors teach which courses in the Student Management System.
+
+    Assignments are `(instructor_id, course_id)` pairs indexed in both directions, so the courses
+    of an instructor and the instructors of a course are each one dictionary lookup. The
+    dictionaries preserve insertion order, so assignments are listed in the order they were made.
+
+    Attributes
+    ----------
+    by_instructor_id : dict[int, dict[str, None]]
+        The IDs of the courses each instructor teaches, keyed by instructor id.
+    by_course_id : dict[str, dict[int, None]]
+        The IDs of the instructors teaching each course, keyed by course id.
+
+    Methods
+    -------
+    add(instructor_id: int, course_id: str) -> bool
+        Assigns an instructor to a course.
+    remove(instructor_id: int, course_id: str) -> bool
+        Unassigns an instructor from a course.
+    courses_of(instructor_id: int) -> list[str]
+        The IDs of the courses an instructor teaches.
+    instructors_of(course_id: str) -> list[int]
+        The IDs of the instructors teaching a course.
+    remove_instructor(instructor_id: int) -> list[str]
+        Removes every assignment of an instructor.
+    remove_course(course_id: str) -> list[int]
+        Removes every assignment to a course.
+    rekey_instructor(old_id: int, new_id: int) -> None
+        Moves an instructor's assignments to a new instructor id.
+    rekey_course(old_id: str, new_id: str) -> None
+        Moves a course's assignments to a new course id.
+    """
+
+    def __init__(self) -> None:
+        self.by_instructor_id = {}
+        self.by_course_id = {}
+
+    def __len__(self) -> int:
+        return sum(len(course_ids) for course_ids in self.by_instructor_id.values())
+
+    def __iter__(self):
+        # (instructor_id, course_id) pairs
+        return ((instructor_id, course_id)
+                for instructor_id, course_ids in self.by_instructor_id.items() for course_id in course_ids)
+
+    def __contains__(self, key: tuple[int, str]) -> bool:
+        instructor_id, course_id = key
+        return course_id in self.by_instructor_id.get(instructor_id, ())
+
+    def add(self, instructor_id: int, course_id: str) -> bool:
+        """
+        Assigns an instructor to a course.
+
+        Parameters
+        ----------
+        instructor_id : int
+            The ID of the instructor.
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        bool
+            True if the assignment was added, False if the instructor already teaches the course.
+        """
+        if (instructor_id, course_id) in self:
+            return False
+        self.by_instructor_id.setdefault(instructor_id, {})[course_id] = None
+        self.by_course_id.setdefault(course_id, {})[instructor_id] = None
+        return True
+
+    def remove(self, instructor_id: int, course_id: str) -> bool:
+        """
+        Unassigns an instructor from a course.
+
+        Parameters
+        ----------
+        instructor_id : int
+            The ID of the instructor.
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        bool
+            True if the assignment was removed, False if the instructor didn't teach the course.
+        """
+        if (instructor_id, course_id) not in self:
+            return False
+        self._discard(self.by_instructor_id, instructor_id, course_id)
+        self._discard(self.by_course_id, course_id, instructor_id)
+        return True
+
+    def courses_of(self, instructor_id: int) -> list[str]:
+        return list(self.by_instructor_id.get(instructor_id, ()))
+
+    def instructors_of(self, course_id: str) -> list[int]:
+        return list(self.by_course_id.get(course_id, ()))
+
+    def remove_instructor(self, instructor_id: int) -> list[str]:
+        course_ids = list(self.by_instructor_id.pop(instructor_id, ()))
+        for course_id in course_ids:
+            self._discard(self.by_course_id, course_id, instructor_id)
+        return course_ids
+
+    def remove_course(self, course_id: str) -> list[int]:
+        instructor_ids = list(self.by_course_id.pop(course_id, ()))
+        for instructor_id in instructor_ids:
+            self._discard(self.by_instructor_id, instructor_id, course_id)
+        return instructor_ids
+
+    def rekey_instructor(self, old_id: int, new_id: int) -> None:
+        course_ids = self.by_instructor_id.pop(old_id, None)
+        if course_ids is not None:
+            self.by_instructor_id[new_id] = course_ids
+            for course_id in course_ids:
+                instructor_ids = self.by_course_id[course_id]
+                del instructor_ids[old_id]
+                instructor_ids[new_id] = None
+
+    def rekey_course(self, old_id: str, new_id: str) -> None:
+        instructor_ids = self.by_course_id.pop(old_id, None)
+        if instructor_ids is not None:
+            self.by_course_id[new_id] = instructor_ids
+            for instructor_id in instructor_ids:
+                course_ids = self.by_instructor_id[instructor_id]
+                del course_ids[old_id]
+                course_ids[new_id] = None
+
+    @staticmethod
+    def _discard(index: dict, key, member) -> None:
+        # drop member from index[key], and drop the key once nothing is left under it
+        members = index.get(key)
+        if members is not None:
+            members.pop(member, None)
+            if not members:
+                del index[key]
@@ -0,0 +1,164 @@
+"""
+An asyncio front end for the Student Management System.
+
+`AsyncStudentManagementSystem` wraps a `StudentManagementSystem` for async web tiers. Mutations
+are queued and applied by a single writer task, which drains the queue in batches and applies
+each batch inside one storage transaction, so a burst of registrations costs one commit
+instead of one per request. Reads do not queue behind writes: they run as soon as they are
+awaited and see every mutation whose coroutine has already returned.
+
+Example
+-------
+async with AsyncStudentManagementSystem(sms) as async_sms:
+    await async_sms.enroll_student(1, "CS101")
+    students = await async_sms.get_students_in_course("CS101")
+"""
+
+import asyncio
+
+
+class AsyncStudentManagementSystem:
+    """
+    A class to serve Student Management System operations to coroutines.
+
+    Attributes
+    ----------
+    sms : StudentManagementSystem
+        The wrapped system. It must not be mutated directly while the writer task is running.
+    max_batch : int
+        The most queued mutations applied in one storage transaction.
+    batches : int
+        The number of batches the writer task has applied.
+
+    Methods
+    -------
+    start() -> None
+        Starts the writer task.
+    close() -> None
+        Applies the queued mutations and stops the writer task.
+    enroll_student(student_id: int, course_id: str) -> None
+        Enrolls a student in a course through the writer task.
+    unenroll_student(student_id: int, course_id: str) -> None
+        Unenrolls a student from a course through the writer task.
+    assign_grade(student_id: int, course_id: str, grade: str) -> None
+        Assigns a grade through the writer task.
+    get_students_in_course(course_id: str) -> list[Student]
+        Retrieves the students enrolled in a course.
+    get_courses_of_student(student_id: int) -> list[Course]
+        Retrieves the courses a student is enrolled in.
+    """
+
+    def __init__(self, sms, max_batch: int = 512) -> None:
+        self.sms = sms
+        self.max_batch = max_batch
+        self.batches = 0
+        self._queue = None
+        self._writer = None
+        self._closing = False
+
+    async def __aenter__(self) -> "AsyncStudentManagementSystem":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """
+        Start the writer task on the running event loop.
+        """
+        if self._writer is not None:
+            raise RuntimeError("The writer task is already running.")
+        self._queue = asyncio.Queue()
+        self._closing = False
+        self._writer = asyncio.create_task(self._write_batches())
+
+    async def close(self) -> None:
+        """
+        Apply every queued mutation, then stop the writer task.
+        """
+        if self._writer is None:
+            return
+        self._closing = True
+        await self._queue.put(None) # the writer stops when it reaches this marker
+        await self._writer
+        self._writer = None
+
+    async def _submit(self, method: str, *args):
+        # queue a mutation for the writer task and wait for its result
+        if self._writer is None or self._closing:
+            raise RuntimeError("The writer task is not running, use start() or 'async with'.")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((method, args, future))
+        return await future
+
+    async def _write_batches(self) -> None:
+        queue = self._queue
+        stopping = False
+        while not stopping:
+            batch = [await queue.get()]
+            while batch[-1] is not None and len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            if batch[-1] is None:
+                stopping = True
+                batch.pop()
+            results = []
+            try:
+                # one transaction per batch; a failing mutation only fails its own caller
+                with self.sms.storage.transaction():
+                    for method, args, future in batch:
+                        try:
+                            results.append((future, getattr(self.sms, method)(*args), None))
+                        except Exception as error:
+                            results.append((future, None, error))
+            except Exception as error: # the commit itself failed, so none of the batch was applied
+                results = [(future, None, error) for _, _, future in batch]
+            # callers only hear back once their batch is committed
+            for future, result, error in results:
+                if future.cancelled():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+            self.batches += 1
+
+    async def enroll_student(self, student_id: int, course_id: str) -> None:
+        """
+        Enroll a student in a course through the writer task.
+
+        Raises the same errors as `StudentManagementSystem.enroll_student`.
+        """
+        return await self._submit("enroll_student", student_id, course_id)
+
+    async def unenroll_student(self, student_id: int, course_id: str) -> None:
+        """
+        Unenroll a student from a course through the writer task.
+
+        Raises the same errors as `StudentManagementSystem.unenroll_student`.
+        """
+        return await self._submit("unenroll_student", student_id, course_id)
+
+    async def assign_grade(self, student_id: int, course_id: str, grade: str) -> None:
+        """
+        Assign a grade to a student for a course through the writer task.
+
+        Raises the same errors as `StudentManagementSystem.assign_grade`.
+        """
+        return await self._submit("assign_grade", student_id, course_id, grade)
+
+    async def get_students_in_course(self, course_id: str):
+        """
+        Retrieve the students enrolled in a course without waiting for queued writes.
+
+        Raises the same errors as `StudentManagementSystem.get_students_in_course`.
+        """
+        return self.sms.get_students_in_course(course_id)
+
+    async def get_courses_of_student(self, student_id: int):
+        """
+        Retrieve the courses a student is enrolled in without waiting for queued writes.
+
+        Raises the same errors as `StudentManagementSystem.get_courses_of_student`.
+        """
+        return self.sms.get_courses_of_student(student_id)
@@ -0,0 +1,77 @@
+"""
+Measures `GradeAnalytics` over a columnar table of synthetic enrollments, with the pure-Python
+implementation and, when NumPy is installed, the NumPy one, checking that both give the same results.
+
+The table is filled directly rather than through a system, so millions of enrollments load in seconds.
+About one enrollment in ten has no grade and one in fifty a grade off the scale ("P").
+
+Run from the project root:
+    python -m benchmarks.analytics --enrollments 1000000
+"""
+import argparse
+import math
+import random
+import time
+
+from analytics import GradeAnalytics, np
+from columnar import ColumnarEnrollments
+
+GRADES = ("A", "A-", "B+", "B", "B-", "C+", "C", "D", "F")
+METHODS = ("student_gpa", "course_statistics", "grade_distribution", "major_statistics")
+
+
+def build(num_enrollments: int, num_students: int, num_courses: int, seed: int) -> tuple[ColumnarEnrollments, dict]:
+    """
+    Return a table of `num_enrollments` enrollments dealt round-robin over the students, and the students' majors.
+    """
+    generator = random.Random(seed)
+    table = ColumnarEnrollments()
+    for k in range(num_enrollments):
+        student_id = k % num_students
+        draw = generator.random()
+        grade = None if draw < 0.1 else "P" if draw < 0.12 else generator.choice(GRADES)
+        table.append(student_id, f"C{(student_id * 7 + k // num_students) % num_courses}", grade)
+    return table, {student_id: f"Major {student_id % 40}" for student_id in range(num_students)}
+
+
+def same(first, second) -> bool:
+    """
+    Compare two analytics results, allowing for floating-point rounding in the sums.
+    """
+    if isinstance(first, dict):
+        return first.keys() == second.keys() and all(same(first[key], second[key]) for key in first)
+    if isinstance(first, float) or isinstance(second, float):
+        return math.isclose(first, second, rel_tol=1e-9, abs_tol=1e-12)
+    return first == second
+
+
+def run(num_enrollments: int, num_students: int, num_courses: int, seed: int) -> None:
+    start = time.perf_counter()
+    table, majors = build(num_enrollments, num_students, num_courses, seed)
+    print(f"{len(table):,} enrollments, {num_students:,} students, {num_courses:,} courses, "
+          f"built in {time.perf_counter() - start:.2f}s")
+    implementations = [False] + ([True] if np is not None else [])
+    if np is None:
+        print("NumPy is not installed, only the pure-Python implementation is measured")
+    print(f"{'':<22}" + "".join(f"{'numpy' if use_numpy else 'pure Python':>14}" for use_numpy in implementations))
+    for method in METHODS:
+        timings, results = [], []
+        for use_numpy in implementations:
+            analytics = GradeAnalytics(table, majors=majors, use_numpy=use_numpy)
+            start = time.perf_counter()
+            results.append(getattr(analytics, method)())
+            timings.append(time.perf_counter() - start)
+        if len(results) == 2 and not same(*results):
+            raise AssertionError(f"{method} differs between NumPy and pure Python")
+        print(f"{method:<22}" + "".join(f"{elapsed:13.3f}s" for elapsed in timings)
+              + (f"   {timings[0] / timings[1]:5.1f}x, same results" if len(timings) == 2 else ""))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--enrollments", type=int, default=1_000_000)
+    parser.add_argument("--students", type=int, default=200_000)
+    parser.add_argument("--courses", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.enrollments, args.students, args.courses, args.seed)
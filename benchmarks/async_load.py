@@ -0,0 +1,68 @@
+"""
+Drives `AsyncStudentManagementSystem` with thousands of concurrent coroutines and reports latency.
+
+Every coroutine plays one student registering: it enrolls in a few courses, reads its schedule
+and a course roster, and receives a grade. The p50 and p99 latency of each operation are
+reported along with the number of writer batches.
+
+Run from the project root:
+    python -m benchmarks.async_load --clients 5000
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from student_management_system import StudentManagementSystem
+from async_sms import AsyncStudentManagementSystem
+from person import Student
+from course import Course
+from storage import SQLiteStorage
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def client(async_sms: AsyncStudentManagementSystem, student_id: int, course_ids: list[str],
+                 latencies: dict[str, list[float]]) -> None:
+    async def timed(name: str, operation):
+        start = time.perf_counter()
+        await operation
+        latencies.setdefault(name, []).append(time.perf_counter() - start)
+
+    for course_id in course_ids:
+        await timed("enroll_student", async_sms.enroll_student(student_id, course_id))
+    await timed("get_courses_of_student", async_sms.get_courses_of_student(student_id))
+    await timed("get_students_in_course", async_sms.get_students_in_course(course_ids[0]))
+    await timed("assign_grade", async_sms.assign_grade(student_id, course_ids[0], "A"))
+
+
+async def run(num_clients: int, num_courses: int, per_client: int, max_batch: int, sqlite: bool) -> None:
+    sms = StudentManagementSystem(SQLiteStorage() if sqlite else None)
+    sms.bulk_load(students=(Student(f"Student {i}", i, "Undeclared") for i in range(num_clients)),
+                  courses=(Course(f"Course {i}", f"C{i}") for i in range(num_courses)))
+    generator = random.Random(0)
+    latencies = {}
+    start = time.perf_counter()
+    async with AsyncStudentManagementSystem(sms, max_batch=max_batch) as async_sms:
+        await asyncio.gather(*(client(async_sms, i, [f"C{c}" for c in generator.sample(range(num_courses), per_client)], latencies)
+                               for i in range(num_clients)))
+    elapsed = time.perf_counter() - start
+    operations = sum(len(samples) for samples in latencies.values())
+    print(f"{num_clients:,} clients, {operations:,} operations in {elapsed:.2f}s "
+          f"({operations / elapsed:,.0f} ops/s, {async_sms.batches:,} writer batches)")
+    for name, samples in latencies.items():
+        print(f"  {name:24s} p50 {percentile(samples, 0.5) * 1000:8.2f} ms   p99 {percentile(samples, 0.99) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=5_000)
+    parser.add_argument("--courses", type=int, default=200)
+    parser.add_argument("--per-client", type=int, default=4)
+    parser.add_argument("--max-batch", type=int, default=512)
+    parser.add_argument("--sqlite", action="store_true", help="back the system with an in-memory SQLite database")
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.courses, args.per_client, args.max_batch, args.sqlite))
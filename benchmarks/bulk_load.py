@@ -0,0 +1,51 @@
+"""
+Measures the throughput of `StudentManagementSystem.bulk_load`.
+
+Run from the project root:
+    python -m benchmarks.bulk_load --enrollments 1000000
+"""
+import argparse
+import time
+
+from student_management_system import StudentManagementSystem
+from person import Student
+from course import Course
+
+
+def records(num_students: int, num_courses: int, num_enrollments: int):
+    """
+    Return generators of a synthetic term's students, courses and exactly `num_enrollments` graded enrollments.
+
+    Enrollments are dealt round-robin over the students, so no student takes more than
+    ceil(num_enrollments / num_students) courses; that must not exceed `num_courses`.
+    """
+    if -(-num_enrollments // num_students) > num_courses:
+        raise ValueError(f"{num_enrollments:,} enrollments need more than {num_courses:,} courses for {num_students:,} students.")
+    students = (Student(f"Student {i}", i, "Undeclared") for i in range(num_students))
+    courses = (Course(f"Course {i}", f"C{i}") for i in range(num_courses))
+    enrollments = ((k % num_students, f"C{(k % num_students * 7 + k // num_students) % num_courses}", "A")
+                   for k in range(num_enrollments))
+    return students, courses, enrollments
+
+
+def run(num_students: int, num_courses: int, num_enrollments: int) -> float:
+    """
+    Bulk load a synthetic term and return the enrollment throughput in records per second.
+    """
+    students, courses, enrollments = records(num_students, num_courses, num_enrollments)
+    sms = StudentManagementSystem()
+    start = time.perf_counter()
+    report = sms.bulk_load(students=students, courses=courses, enrollments=enrollments)
+    elapsed = time.perf_counter() - start
+    print(f"{report} in {elapsed:.2f}s")
+    return report.enrollments_added / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=200_000)
+    parser.add_argument("--courses", type=int, default=5_000)
+    parser.add_argument("--enrollments", type=int, default=1_000_000)
+    args = parser.parse_args()
+    throughput = run(args.students, args.courses, args.enrollments)
+    print(f"{throughput:,.0f} enrollments/s")
@@ -0,0 +1,170 @@
+"""
+Deterministic synthetic university data for benchmarks and load tests.
+
+`generate` builds a term of students, instructors, courses, enrollments and instructor
+assignments from a seed, so the same arguments always give the same dataset. Course popularity
+follows a Zipf distribution (a few courses are taken by many students, most by few), grades are
+drawn from a weighted distribution that leaves some enrollments ungraded, and a share of the
+courses is filled exactly to capacity so waitlists can be exercised.
+
+Run from the project root to print a summary of a dataset, or write it as CSV files that
+`data_io.import_system` reads:
+    python -m benchmarks.datagen --enrollments 1000000 --output term/
+"""
+import argparse
+import random
+from bisect import bisect_left
+from itertools import accumulate
+
+from student_management_system import StudentManagementSystem
+from person import Student, Instructor
+from course import Course
+from data_io import export_system
+
+MAJORS = ("Computer Science", "Mathematics", "Physics", "Chemistry", "Biology", "Economics", "History",
+          "Philosophy", "Literature", "Psychology", "Sociology", "Political Science", "Music", "Art", "Linguistics")
+FIRST_NAMES = ("Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn",
+               "Charlie", "Dana", "Emery", "Finley", "Harper", "Kai", "Logan", "Noa", "Parker", "Rowan")
+LAST_NAMES = ("Smith", "Garcia", "Chen", "Okafor", "Müller", "Silva", "Kowalski", "Nguyen", "Haddad", "Ivanova",
+              "Tanaka", "Dubois", "Rossi", "Kim", "Singh", "Andersen", "Novak", "Costa", "Ali", "Murphy")
+# the weight of each grade, None standing for an enrollment not graded yet
+GRADE_WEIGHTS = {"A": 22, "A-": 10, "B+": 10, "B": 16, "B-": 8, "C+": 7, "C": 9, "D": 5, "F": 4, None: 9}
+
+
+class Dataset:
+    """
+    A class used to hold a generated term.
+
+    Attributes
+    ----------
+    students : list[Student]
+        The students, with ids 1 to n.
+    instructors : list[Instructor]
+        The instructors, with ids 1 to n.
+    courses : list[Course]
+        The courses, "C00000" being the most popular.
+    enrollments : list[tuple[int, str, str | None]]
+        The `(student_id, course_id, grade)` records.
+    assignments : list[tuple[int, str]]
+        The `(instructor_id, course_id)` records, one instructor per course.
+    popularity : list[float]
+        The cumulative Zipf weights of the courses, for drawing further popular courses with `draw_course`.
+
+    Methods
+    -------
+    load(sms) -> BulkLoadReport
+        Loads the dataset into a system with `bulk_load`.
+    draw_course(generator: random.Random) -> str
+        Draws a course id with the dataset's popularity.
+    """
+
+    def __init__(self, students, instructors, courses, enrollments, assignments, popularity) -> None:
+        self.students = students
+        self.instructors = instructors
+        self.courses = courses
+        self.enrollments = enrollments
+        self.assignments = assignments
+        self.popularity = popularity
+
+    def __repr__(self) -> str:
+        return (f"Dataset({len(self.students):,} students, {len(self.instructors):,} instructors, "
+                f"{len(self.courses):,} courses, {len(self.enrollments):,} enrollments)")
+
+    def load(self, sms):
+        """
+        Load the dataset into a system, typically an empty one, with one `bulk_load` call.
+
+        The system gets its own copies of the students, instructors and courses, so one dataset can be
+        loaded into several systems.
+        """
+        return sms.bulk_load(students=(Student(s.name, s.id_number, s.major) for s in self.students),
+                             instructors=(Instructor(i.name, i.id_number, i.department) for i in self.instructors),
+                             courses=(Course(c.course_name, c.course_id, c.capacity) for c in self.courses),
+                             enrollments=self.enrollments, assignments=self.assignments)
+
+    def draw_course(self, generator: random.Random) -> str:
+        return self.courses[bisect_left(self.popularity, generator.random() * self.popularity[-1])].course_id
+
+
+def generate(num_enrollments: int, per_student: int = 5, num_courses: int = None, num_instructors: int = None,
+             zipf: float = 1.1, grade_weights: dict = None, full_share: float = 0.1, seed: int = 0) -> Dataset:
+    """
+    Generate a term with a given number of enrollments.
+
+    Parameters
+    ----------
+    num_enrollments : int
+        The number of enrollments; the number of students is this divided by `per_student`.
+    per_student : int
+        The number of courses each student takes (default is 5).
+    num_courses : int, optional
+        The number of courses (default is one per 50 enrollments, at least `per_student`).
+    num_instructors : int, optional
+        The number of instructors (default is one per three courses, at least one).
+    zipf : float
+        The Zipf exponent of course popularity: the course of rank k is drawn with weight 1 / k ** zipf (default is 1.1).
+    grade_weights : dict[str | None, float], optional
+        The weight of each grade, None for ungraded enrollments (default is `GRADE_WEIGHTS`).
+    full_share : float
+        The share of the courses whose capacity equals their enrollment (default is 0.1); the others
+        have room for a fifth more students, and at least five.
+    seed : int
+        The seed of the random generator (default is 0).
+
+    Returns
+    -------
+    Dataset
+        The generated term.
+    """
+    generator = random.Random(seed)
+    num_students = max(num_enrollments // per_student, 1)
+    num_courses = num_courses or max(num_enrollments // 50, per_student)
+    num_instructors = num_instructors or max(num_courses // 3, 1)
+    grade_weights = GRADE_WEIGHTS if grade_weights is None else grade_weights
+    grades, weights = list(grade_weights), list(accumulate(grade_weights.values()))
+    popularity = list(accumulate(1 / rank ** zipf for rank in range(1, num_courses + 1)))
+    total = popularity[-1]
+
+    def name() -> str:
+        return f"{generator.choice(FIRST_NAMES)} {generator.choice(LAST_NAMES)}"
+
+    # ids start at 1, as an id of 0 can't be given to an existing student by `update_student_details`
+    students = [Student(name(), student_id, generator.choice(MAJORS)) for student_id in range(1, num_students + 1)]
+    instructors = [Instructor(name(), instructor_id, generator.choice(MAJORS)) for instructor_id in range(1, num_instructors + 1)]
+    course_ids = [f"C{position:05d}" for position in range(num_courses)]
+
+    enrollments = []
+    roster_sizes = [0] * num_courses
+    for student_id in range(1, num_students + 1):
+        if len(enrollments) >= num_enrollments:
+            break
+        chosen = set()
+        while len(chosen) < min(per_student, num_courses, num_enrollments - len(enrollments)):
+            chosen.add(bisect_left(popularity, generator.random() * total))
+        for position in sorted(chosen):
+            roster_sizes[position] += 1
+            enrollments.append((student_id, course_ids[position], generator.choices(grades, cum_weights=weights)[0]))
+
+    courses = []
+    for position, course_id in enumerate(course_ids):
+        size = roster_sizes[position]
+        capacity = size if generator.random() < full_share else size + max(size // 5, 5)
+        courses.append(Course(f"Course {position}", course_id, capacity))
+    assignments = [(generator.randint(1, num_instructors), course_id) for course_id in course_ids]
+    return Dataset(students, instructors, courses, enrollments, assignments, popularity)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--enrollments", type=int, default=100_000)
+    parser.add_argument("--per-student", type=int, default=5)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="a directory to write the dataset to as CSV files")
+    args = parser.parse_args()
+    dataset = generate(args.enrollments, args.per_student, zipf=args.zipf, seed=args.seed)
+    print(dataset)
+    if args.output:
+        sms = StudentManagementSystem()
+        dataset.load(sms)
+        print(export_system(sms, args.output))
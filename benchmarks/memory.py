@@ -0,0 +1,94 @@
+"""
+Measures the memory held per enrollment by the in-memory store and by the columnar table.
+
+The store is measured twice: once with `__dict__`-backed entities, the layout before the
+classes declared `__slots__` (subclasses that don't declare `__slots__` get a `__dict__` back),
+and once with the slotted classes, so the difference is what `__slots__` saves.
+
+Run from the project root:
+    python -m benchmarks.memory --enrollments 1000000
+"""
+import argparse
+import tracemalloc
+from contextlib import contextmanager
+
+import student_management_system
+from student_management_system import StudentManagementSystem
+from person import Student
+from course import Course, Enrollment
+from columnar import ColumnarEnrollments
+
+
+def unslotted(cls: type) -> type:
+    """
+    Return a subclass of `cls` whose instances carry a `__dict__`, as they did before `__slots__`.
+    """
+    return type(cls.__name__, (cls,), {})
+
+
+@contextmanager
+def dict_backed_enrollments():
+    # bulk_load creates Enrollment objects through the name in student_management_system
+    original = student_management_system.Enrollment
+    student_management_system.Enrollment = unslotted(Enrollment)
+    try:
+        yield
+    finally:
+        student_management_system.Enrollment = original
+
+
+def measure(build) -> tuple[int, object]:
+    """
+    Return the bytes still allocated after `build()` runs, along with what it built.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def load(num_students: int, num_courses: int, num_enrollments: int, student_class: type, course_class: type):
+    """
+    Load the students and courses, then return the bytes per student, per course and per enrollment, and the system.
+    """
+    sms = StudentManagementSystem()
+    student_bytes, _ = measure(lambda: sms.bulk_load(students=(student_class(f"Student {i}", i, "Undeclared")
+                                                               for i in range(num_students))))
+    course_bytes, _ = measure(lambda: sms.bulk_load(courses=(course_class(f"Course {i}", f"C{i}") for i in range(num_courses))))
+    grades = ("A", "B", "C", "D", "F", None)
+    # dealt round-robin over the students, so exactly num_enrollments are loaded
+    enrollments = ((k % num_students, f"C{(k % num_students * 7 + k // num_students) % num_courses}", grades[k % len(grades)])
+                   for k in range(num_enrollments))
+    store_bytes, report = measure(lambda: sms.bulk_load(enrollments=enrollments))
+    count = report.enrollments_added
+    return student_bytes / num_students, course_bytes / num_courses, store_bytes / count, sms
+
+
+def run(num_students: int, num_courses: int, num_enrollments: int) -> None:
+    """
+    Print the bytes per enrollment of the object store with and without `__slots__`, and of the columnar table.
+    """
+    with dict_backed_enrollments():
+        before = load(num_students, num_courses, num_enrollments, unslotted(Student), unslotted(Course))[:3]
+    *after, sms = load(num_students, num_courses, num_enrollments, Student, Course)
+    count = len(sms.enrollments)
+    print(f"{count:,} enrollments, {num_students:,} students, {num_courses:,} courses")
+    print(f"{'bytes per':<32}{'student':>10}{'course':>10}{'enrollment':>12}")
+    print(f"{'objects with __dict__':<32}{before[0]:10.1f}{before[1]:10.1f}{before[2]:12.1f}")
+    print(f"{'objects with __slots__':<32}{after[0]:10.1f}{after[1]:10.1f}{after[2]:12.1f}")
+    print(f"{'saved by __slots__':<32}{before[0] - after[0]:10.1f}{before[1] - after[1]:10.1f}{before[2] - after[2]:12.1f}"
+          f" ({1 - after[2] / before[2]:.0%} per enrollment)")
+
+    table_bytes, table = measure(lambda: ColumnarEnrollments.from_enrollments(sms.iter_enrollments()))
+    print(f"{'ColumnarEnrollments':<32}{'':>20}{table_bytes / count:12.1f} ({table.nbytes() / count:.1f} in the arrays)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--courses", type=int, default=2_000)
+    parser.add_argument("--enrollments", type=int, default=500_000)
+    args = parser.parse_args()
+    run(args.students, args.courses, args.enrollments)
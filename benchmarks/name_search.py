@@ -0,0 +1,87 @@
+"""
+Measures name lookups: prefix and typo-tolerant searches through `NameSearch` versus a linear scan
+of `get_all_students()` comparing names, plus the cost of keeping the index in sync with renames.
+
+Names are drawn from syllables: 2,000 first names of two or three syllables and 50,000 last names
+of three or four, so names repeat as they do in a real population, and the typo queries misspell a random person's name with one swap or substitution.
+
+Run from the project root:
+    python -m benchmarks.name_search --people 1000000
+"""
+import argparse
+import random
+import time
+
+from student_management_system import StudentManagementSystem
+from person import Student
+from name_search import NameSearch, words
+
+SYLLABLES = ("al", "an", "ar", "be", "bo", "ca", "da", "de", "el", "en", "fa", "ga", "ha", "is", "ja", "ka",
+             "ko", "la", "li", "ma", "mi", "na", "ni", "no", "ol", "pa", "ra", "ri", "ro", "sa", "se", "ta",
+             "to", "va", "vi", "wa", "ya", "yo", "za", "zu")
+
+
+def names(count: int, syllables: tuple, generator: random.Random) -> list[str]:
+    return list({"".join(generator.choices(SYLLABLES, k=generator.choice(syllables))).capitalize() for _ in range(count)})
+
+
+def misspell(name: str, generator: random.Random) -> str:
+    letters = list(name.lower())
+    position = generator.randrange(len(letters) - 1)
+    if generator.random() < 0.5:
+        letters[position], letters[position + 1] = letters[position + 1], letters[position]
+    else:
+        letters[position] = generator.choice("aeioulnrst")
+    return "".join(letters)
+
+
+def timed(label: str, queries: list, lookup) -> None:
+    start = time.perf_counter()
+    for query in queries:
+        lookup(query)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<32} {elapsed / len(queries) * 1e6:10.1f} us per query")
+
+
+def run(num_people: int, num_queries: int, seed: int) -> None:
+    generator = random.Random(seed)
+    first_names, last_names = names(2_000, (2, 3), generator), names(50_000, (3, 4), generator)
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=(Student(f"{generator.choice(first_names)} {generator.choice(last_names)}", i, "Undeclared")
+                            for i in range(1, num_people + 1)))
+    start = time.perf_counter()
+    index = NameSearch(sms)
+    print(f"{num_people:,} people, indexed in {time.perf_counter() - start:.2f}s")
+
+    people = [sms.students[generator.randrange(1, num_people + 1)] for _ in range(num_queries)]
+    prefixes = [f"{student.name.split()[0][:2]} {student.name.split()[1][:3]}" for student in people]
+    typos = [f"{misspell(student.name.split()[0], generator)} {misspell(student.name.split()[1], generator)}"
+             for student in people]
+    timed("prefix('abcd')", [query.split()[1] + "a" for query in prefixes], index.prefix)
+    timed("prefix('ab cde')", prefixes, index.prefix)
+    timed("search(exact name)", [student.name for student in people], index.search)
+    timed("search(one misspelled word)", [query.split()[1] for query in typos], index.search)
+    timed("search(two misspelled words)", typos, index.search)
+    found = sum(any(result.person is student for result in index.search(query)) for student, query in zip(people, typos))
+    print(f"  misspelled person in the top 10  {found / num_queries:10.1%}")
+
+    def scan(query):
+        query_words = words(query)
+        return [student for student in sms.get_all_students()
+                if all(any(word.startswith(prefix) for word in words(student.name)) for prefix in query_words)]
+
+    timed("linear scan (prefix)", prefixes[:3], scan)
+
+    start = time.perf_counter()
+    for student in people:
+        sms.update_student_details(student.id_number, new_name=f"{generator.choice(first_names)} {generator.choice(last_names)}")
+    print(f"  update_student_details (rename) {(time.perf_counter() - start) / num_queries * 1e6:10.1f} us each, index included")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--people", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.people, args.queries, args.seed)
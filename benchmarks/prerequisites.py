@@ -0,0 +1,88 @@
+"""
+Measures prerequisite eligibility checks: every student checked against every course of a
+layered catalog, first with a cold `EligibilityCache`, then warm, then after regrading a share
+of the students, and finally recomputed without the cache for comparison.
+
+Each course requires up to two courses of the layer below it, some with a minimum grade, so a
+course in the top layer transitively requires a large part of the catalog.
+
+Run from the project root:
+    python -m benchmarks.prerequisites --students 2000 --courses 200 --layers 8
+"""
+import argparse
+import random
+import time
+
+from student_management_system import StudentManagementSystem
+from person import Student
+from course import Course
+from prerequisites import EligibilityCache, PrerequisiteGraph
+
+GRADES = ("A", "B", "C", "D", "F")
+
+
+def catalog(num_courses: int, layers: int, seed: int) -> list[Course]:
+    generator = random.Random(seed)
+    per_layer = max(num_courses // layers, 1)
+    courses = []
+    for i in range(num_courses):
+        layer = i // per_layer
+        below = range(max(layer - 1, 0) * per_layer, layer * per_layer)
+        prerequisites = {f"C{j}": generator.choice((None, "C", "B"))
+                         for j in generator.sample(below, min(len(below), 2))}
+        courses.append(Course(f"Course {i}", f"C{i}", prerequisites=prerequisites))
+    return courses
+
+
+def check_all(sms, missing) -> tuple[float, int]:
+    start = time.perf_counter()
+    eligible = sum(1 for student_id in sms.students for course_id in sms.courses if not missing(student_id, course_id))
+    return time.perf_counter() - start, eligible
+
+
+def run(num_students: int, num_courses: int, layers: int, per_student: int, seed: int) -> None:
+    generator = random.Random(seed)
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=(Student(f"Student {i}", i, "Undeclared") for i in range(num_students)),
+                  courses=catalog(num_courses, layers, seed),
+                  enrollments=((student_id, f"C{course}", generator.choice(GRADES)) for student_id in range(num_students)
+                               for course in generator.sample(range(num_courses), per_student)))
+    checks = num_students * num_courses
+    print(f"{checks:,} eligibility checks per pass, {len(sms.enrollments):,} graded enrollments")
+
+    elapsed, eligible = check_all(sms, sms.eligibility.missing)
+    print(f"  cold cache   {elapsed:8.3f}s ({eligible:,} eligible)")
+    elapsed, eligible = check_all(sms, sms.eligibility.missing)
+    print(f"  warm cache   {elapsed:8.3f}s")
+
+    regraded = generator.sample(list(sms.enrollments), len(sms.enrollments) // 100)
+    start = time.perf_counter()
+    for enrollment in regraded:
+        sms.assign_grade(enrollment.student.id_number, enrollment.course.course_id, generator.choice(GRADES))
+    elapsed, eligible = check_all(sms, sms.eligibility.missing)
+    print(f"  after {len(regraded):,} regrades {time.perf_counter() - start:8.3f}s")
+
+    # a fresh graph and cache per check, i.e. the closure and grades recomputed every time
+    def uncached(student_id: int, course_id: str) -> tuple:
+        graph = PrerequisiteGraph()
+        graph.requires = sms.prerequisites.requires
+        return EligibilityCache(graph, sms.enrollments.for_student).missing(student_id, course_id)
+
+    sample = max(num_students // 20, 1)
+    start = time.perf_counter()
+    for student_id in range(sample):
+        for course_id in sms.courses:
+            uncached(student_id, course_id)
+    elapsed = (time.perf_counter() - start) * num_students / sample
+    print(f"  uncached     {elapsed:8.3f}s (extrapolated from {sample:,} students)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=2_000)
+    parser.add_argument("--courses", type=int, default=200)
+    parser.add_argument("--layers", type=int, default=8)
+    parser.add_argument("--per-student", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.students, args.courses, args.layers, args.per_student, args.seed)
@@ -0,0 +1,77 @@
+"""
+Measures write-ahead logging overhead, snapshot time and crash recovery time.
+
+A system with the given number of enrollments is loaded through a `WriteAheadLog`, snapshotted
+while writers keep enrolling, then extended by a log tail of single enrollments. The log is then
+abandoned without closing it, as in a crash after its last flush, and the system is recovered
+from the snapshot plus the tail.
+
+Run from the project root:
+    python -m benchmarks.recovery --enrollments 1000000
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from wal import WriteAheadLog
+from person import Student
+from course import Course
+
+
+def run(num_enrollments: int, per_student: int, num_courses: int, tail: int) -> None:
+    directory = tempfile.mkdtemp(prefix="sms-wal-")
+    try:
+        num_students = num_enrollments // per_student
+        log = WriteAheadLog(directory)
+        sms = log.recover()
+        start = time.perf_counter()
+        sms.bulk_load(students=(Student(f"Student {i}", i, "Undeclared") for i in range(num_students)),
+                      courses=(Course(f"Course {i}", f"C{i}") for i in range(num_courses)),
+                      enrollments=((i, f"C{(i * 7 + k) % num_courses}") for i in range(num_students) for k in range(per_student)))
+        log.flush()
+        elapsed = time.perf_counter() - start
+        print(f"Logged bulk load of {len(sms.enrollments):,} enrollments in {elapsed:.2f}s, log records: {log.lsn:,}")
+
+        start = time.perf_counter()
+        log.checkpoint()
+        # writers keep going while the snapshot is written
+        written = 0
+        while log._snapshotter is not None:
+            sms.assign_grade(written % num_students, f"C{(written % num_students) * 7 % num_courses}", "B")
+            written += 1
+        elapsed = time.perf_counter() - start
+        print(f"Snapshot written in {elapsed:.2f}s while {written:,} grades were assigned alongside it")
+
+        start = time.perf_counter()
+        for i in range(tail):
+            sms.enroll_student(i % num_students, f"C{(i % num_students * 7 + per_student) % num_courses}")
+        log.flush()
+        elapsed = time.perf_counter() - start
+        print(f"Logged a tail of {tail:,} enrollments in {elapsed:.2f}s ({tail / elapsed:,.0f} ops/s including the final fsync)")
+        sizes = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"On disk: {sizes / 2**20:.1f} MiB in {len(os.listdir(directory))} files")
+
+        # crash: the log is dropped without close(), everything flushed so far is on disk
+        sms.remove_observer(log)
+        start = time.perf_counter()
+        recovered_log = WriteAheadLog(directory)
+        recovered = recovered_log.recover()
+        elapsed = time.perf_counter() - start
+        print(f"Recovered {len(recovered.enrollments):,} enrollments in {elapsed:.2f}s "
+              f"(snapshot LSN {recovered_log.snapshot_lsn:,}, {recovered_log.replayed:,} records replayed)")
+        assert len(recovered.enrollments) == len(sms.enrollments)
+        recovered_log.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--enrollments", type=int, default=1_000_000)
+    parser.add_argument("--per-student", type=int, default=5)
+    parser.add_argument("--courses", type=int, default=2_000)
+    parser.add_argument("--tail", type=int, default=50_000)
+    args = parser.parse_args()
+    run(args.enrollments, args.per_student, args.courses, args.tail)
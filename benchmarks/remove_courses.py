@@ -0,0 +1,55 @@
+"""
+Measures the cascading delete of courses with `remove_course` and `remove_courses`.
+
+Run from the project root:
+    python -m benchmarks.remove_courses --courses 10000 --enrollments 1000000
+"""
+import argparse
+import time
+
+from student_management_system import StudentManagementSystem
+from person import Student
+from course import Course
+
+
+def build(num_students: int, num_courses: int, num_enrollments: int) -> StudentManagementSystem:
+    """
+    Build a system with evenly spread enrollments.
+    """
+    per_student = max(1, num_enrollments // num_students)
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=(Student(f"Student {i}", i, "Undeclared") for i in range(num_students)),
+                  courses=(Course(f"Course {i}", f"C{i}") for i in range(num_courses)),
+                  enrollments=((i, f"C{(i * 7 + j) % num_courses}") for i in range(num_students) for j in range(per_student)))
+    return sms
+
+
+def run(num_students: int, num_courses: int, num_enrollments: int, fraction: float) -> None:
+    """
+    Retire a fraction of the catalog one course at a time, then the same amount in one batch.
+    """
+    retired = int(num_courses * fraction)
+
+    sms = build(num_students, num_courses, num_enrollments)
+    before = len(sms.enrollments)
+    start = time.perf_counter()
+    for i in range(retired):
+        sms.remove_course(f"C{i}")
+    elapsed = time.perf_counter() - start
+    print(f"remove_course  x{retired:,}: {elapsed:.3f}s, {before - len(sms.enrollments):,} enrollments cascaded")
+
+    sms = build(num_students, num_courses, num_enrollments)
+    start = time.perf_counter()
+    sms.remove_courses(f"C{i}" for i in range(retired))
+    elapsed = time.perf_counter() - start
+    print(f"remove_courses x{retired:,}: {elapsed:.3f}s, {before - len(sms.enrollments):,} enrollments cascaded")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=200_000)
+    parser.add_argument("--courses", type=int, default=10_000)
+    parser.add_argument("--enrollments", type=int, default=1_000_000)
+    parser.add_argument("--fraction", type=float, default=0.1, help="share of the catalog to retire")
+    args = parser.parse_args()
+    run(args.students, args.courses, args.enrollments, args.fraction)
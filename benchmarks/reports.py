@@ -0,0 +1,80 @@
+"""
+Measures transcript and roster generation: a single-threaded loop over the live system's objects,
+then `write_reports` over a mapped snapshot with 1, 2, 4, ... worker processes up to the number
+of cores, reporting each run's speedup over one process.
+
+Run from the project root:
+    python -m benchmarks.reports --students 100000 --per-student 5
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from student_management_system import StudentManagementSystem
+from mapped_snapshot import write_mapped_snapshot
+from person import Student
+from course import Course
+from reports import KINDS, format_roster, format_transcript, write_reports
+
+
+def serial_reports(sms, kind: str, path: str) -> int:
+    # the straightforward way: walk the system's objects in one process
+    with open(path, "w", encoding="utf-8") as file:
+        if kind == "transcripts":
+            for student in sorted(sms.get_all_students(), key=lambda student: student.id_number):
+                schedule = [(enrollment.course, enrollment.grade) for enrollment in sms.enrollments.for_student(student.id_number)]
+                file.write(format_transcript(student, schedule))
+            return len(sms.students)
+        for course in sorted(sms.get_all_courses(), key=lambda course: course.course_id):
+            file.write(format_roster(course, [(enrollment.student, enrollment.grade)
+                                              for enrollment in sms.enrollments.for_course(course.course_id)]))
+        return len(sms.courses)
+
+
+def run(num_students: int, num_courses: int, per_student: int, max_processes: int, seed: int) -> None:
+    generator = random.Random(seed)
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=(Student(f"Student {i}", i, f"Major {i % 40}") for i in range(num_students)),
+                  courses=(Course(f"Course {i}", f"C{i:05d}") for i in range(num_courses)),
+                  enrollments=((i, f"C{course:05d}", generator.choice("ABCDF")) for i in range(num_students)
+                               for course in generator.sample(range(num_courses), per_student)))
+    directory = tempfile.mkdtemp(prefix="sms-reports-")
+    try:
+        snapshot_path = os.path.join(directory, "registry.smap")
+        start = time.perf_counter()
+        write_mapped_snapshot(sms, snapshot_path)
+        print(f"{len(sms.enrollments):,} enrollments; mapped snapshot written in {time.perf_counter() - start:.2f}s")
+        output = os.path.join(directory, "reports.txt")
+        process_counts = [1]
+        while process_counts[-1] * 2 <= max_processes:
+            process_counts.append(process_counts[-1] * 2)
+        if process_counts[-1] != max_processes:
+            process_counts.append(max_processes)
+        for kind in KINDS:
+            start = time.perf_counter()
+            written = serial_reports(sms, kind, output)
+            print(f"{kind} ({written:,} reports)")
+            print(f"  live objects, 1 process  {time.perf_counter() - start:8.3f}s")
+            baseline = None
+            for processes in process_counts:
+                start = time.perf_counter()
+                write_reports(snapshot_path, kind, output, processes=processes)
+                elapsed = time.perf_counter() - start
+                baseline = baseline or elapsed
+                print(f"  snapshot, {processes:>3} processes {elapsed:8.3f}s  speedup {baseline / elapsed:5.2f}x")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--courses", type=int, default=2_000)
+    parser.add_argument("--per-student", type=int, default=5)
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.students, args.courses, args.per_student, args.max_processes, args.seed)
@@ -0,0 +1,85 @@
+"""
+Compares startup from a memory-mapped snapshot with rebuilding every object from a full snapshot.
+
+Both files are written from the same system. "Rebuild" reads the write-ahead log's snapshot
+format and reconstructs a `StudentManagementSystem` with `bulk_load`; "Mapped" opens a
+`MappedStudentManagementSystem` over the mapped snapshot. Each is then asked the same random
+roster and schedule queries, and the time to the first answer and to the last is reported.
+
+Run from the project root:
+    python -m benchmarks.startup --enrollments 1000000
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from student_management_system import StudentManagementSystem
+from mapped_snapshot import write_mapped_snapshot, MappedStudentManagementSystem
+from wal import read_snapshot, write_snapshot
+from person import Student
+from course import Course
+
+
+def run(num_enrollments: int, per_student: int, num_courses: int, queries: int) -> None:
+    directory = tempfile.mkdtemp(prefix="sms-startup-")
+    try:
+        num_students = num_enrollments // per_student
+        sms = StudentManagementSystem()
+        sms.bulk_load(students=(Student(f"Student {i}", i, f"Major {i % 40}") for i in range(num_students)),
+                      courses=(Course(f"Course {i}", f"C{i:05d}") for i in range(num_courses)),
+                      enrollments=((i, f"C{(i * 7 + k) % num_courses:05d}", "ABCDF"[(i + k) % 5])
+                                   for i in range(num_students) for k in range(per_student)))
+        full_path = os.path.join(directory, "full.bin")
+        mapped_path = os.path.join(directory, "registry.smap")
+        write_snapshot(full_path, 0,
+                       ((s.id_number, s.name, s.major) for s in sms.iter_students()), (),
+                       ((c.course_id, c.course_name, c.capacity) for c in sms.iter_courses()),
+                       ((e.student.id_number, e.course.course_id, e.grade) for e in sms.iter_enrollments()), ())
+        start = time.perf_counter()
+        write_mapped_snapshot(sms, mapped_path)
+        print(f"{len(sms.enrollments):,} enrollments; mapped snapshot written in {time.perf_counter() - start:.2f}s")
+        print(f"  full snapshot   {os.path.getsize(full_path) / 2**20:8.1f} MiB")
+        print(f"  mapped snapshot {os.path.getsize(mapped_path) / 2**20:8.1f} MiB")
+        del sms
+
+        generator = random.Random(0)
+        workload = [(generator.randrange(num_students), f"C{generator.randrange(num_courses):05d}") for _ in range(queries)]
+
+        def answer(system) -> None:
+            for student_id, course_id in workload:
+                system.get_courses_of_student(student_id)
+                system.get_students_in_course(course_id)
+
+        start = time.perf_counter()
+        students, _, courses, enrollments, _, _ = read_snapshot(full_path)[1]
+        rebuilt = StudentManagementSystem()
+        rebuilt.bulk_load(students=(Student(name, id_number, major) for id_number, name, major in students),
+                          courses=(Course(name, course_id, capacity) for course_id, name, capacity in courses),
+                          enrollments=enrollments)
+        rebuilt.get_courses_of_student(workload[0][0])
+        first = time.perf_counter() - start
+        answer(rebuilt)
+        print(f"Rebuild: first answer after {first:8.3f}s, {queries:,} query pairs done after {time.perf_counter() - start:8.3f}s")
+        del rebuilt
+
+        start = time.perf_counter()
+        with MappedStudentManagementSystem(mapped_path) as view:
+            view.get_courses_of_student(workload[0][0])
+            first = time.perf_counter() - start
+            answer(view)
+            print(f"Mapped:  first answer after {first:8.3f}s, {queries:,} query pairs done after {time.perf_counter() - start:8.3f}s")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--enrollments", type=int, default=1_000_000)
+    parser.add_argument("--per-student", type=int, default=5)
+    parser.add_argument("--courses", type=int, default=2_000)
+    parser.add_argument("--queries", type=int, default=1_000)
+    args = parser.parse_args()
+    run(args.enrollments, args.per_student, args.courses, args.queries)
@@ -0,0 +1,436 @@
+"""
+Times every public method of `StudentManagementSystem` across dataset size tiers, records the
+results as JSON and flags regressions against a stored baseline.
+
+Each tier is a term generated by `benchmarks.datagen` with the given number of enrollments and
+loaded into a fresh system. Every case then prepares its own arguments (scratch students and
+courses for the mutating methods, Zipf-drawn courses and random students for the reads), times
+a batch of calls, and undoes its changes untimed, so the cases don't disturb each other. A case's
+result is the best time per call over `--repeat` runs.
+
+The growth column estimates how each method's cost scales with the size of the system: the
+exponent k of cost ~ n ** k between the smallest and the largest tier (0 for constant time,
+1 for linear). With `--baseline`, every time more than `--tolerance` slower than the baseline's
+(and slower by more than a microsecond) is reported, and the script exits with status 1.
+
+Run from the project root:
+    python -m benchmarks.suite --tiers 1000 10000 100000 1000000 --output results.json
+    python -m benchmarks.suite --tiers 1000 10000 --baseline results.json
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+from collections import deque
+
+from student_management_system import StudentManagementSystem
+from events import SystemObserver
+from person import Student, Instructor
+from course import Course
+from benchmarks.datagen import MAJORS, generate
+
+_SCRATCH_ID = 10 ** 12 # ids of the students and instructors cases add, well clear of the dataset's
+
+# case name -> (function(sms, dataset, generator, calls) -> (elapsed seconds, calls made), number of calls per run)
+CASES = {}
+
+
+def case(name: str, calls: int = 200):
+    def register(function):
+        CASES[name] = (function, calls)
+        return function
+    return register
+
+
+def _timed(function, arguments) -> tuple[float, int]:
+    # the arguments are prepared before the clock starts; returns the elapsed time and the number of calls
+    arguments = list(arguments)
+    start = time.perf_counter()
+    for args in arguments:
+        function(*args)
+    return time.perf_counter() - start, len(arguments)
+
+
+def _scratch_students(sms, dataset, generator, count: int, per_student: int = 5) -> list[int]:
+    # add students enrolled in popular courses with free seats, untimed
+    ids = list(range(_SCRATCH_ID, _SCRATCH_ID + count))
+    sms.bulk_load(students=(Student("Scratch", student_id, MAJORS[0]) for student_id in ids),
+                  enrollments=((student_id, dataset.draw_course(generator)) for student_id in ids for _ in range(per_student)))
+    return ids
+
+
+def _scratch_course(sms, course_id: str = "SCRATCH", capacity: int = None, students=()) -> str:
+    sms.bulk_load(courses=[Course("Scratch", course_id, capacity)], enrollments=((student_id, course_id) for student_id in students))
+    return course_id
+
+
+def _random_students(sms, dataset, generator, count: int) -> list[int]:
+    return generator.sample(range(1, len(dataset.students) + 1), min(count, len(dataset.students)))
+
+
+# students
+
+@case("add_student")
+def _add_student(sms, dataset, generator, calls):
+    ids = range(_SCRATCH_ID, _SCRATCH_ID + calls)
+    elapsed = _timed(sms.add_student, ((Student("Scratch", student_id, MAJORS[0]),) for student_id in ids))
+    sms.remove_students(ids)
+    return elapsed
+
+
+@case("remove_student")
+def _remove_student(sms, dataset, generator, calls):
+    ids = _scratch_students(sms, dataset, generator, calls)
+    return _timed(sms.remove_student, ((student_id,) for student_id in ids))
+
+
+@case("remove_students", calls=10)
+def _remove_students(sms, dataset, generator, calls):
+    ids = _scratch_students(sms, dataset, generator, calls * 20)
+    return _timed(sms.remove_students, ((ids[start:start + 20],) for start in range(0, len(ids), 20)))
+
+
+@case("update_student_details")
+def _update_student_details(sms, dataset, generator, calls):
+    # renaming a student's id rewrites their enrollments, the costliest update
+    ids = _random_students(sms, dataset, generator, calls)
+    elapsed = _timed(sms.update_student_details, ((student_id, None, None, _SCRATCH_ID + student_id) for student_id in ids))
+    for student_id in ids:
+        sms.update_student_details(_SCRATCH_ID + student_id, new_id_number=student_id)
+    return elapsed
+
+
+# instructors
+
+@case("add_instructor")
+def _add_instructor(sms, dataset, generator, calls):
+    ids = range(_SCRATCH_ID, _SCRATCH_ID + calls)
+    elapsed = _timed(sms.add_instructor, ((Instructor("Scratch", instructor_id, MAJORS[0]),) for instructor_id in ids))
+    for instructor_id in ids:
+        sms.remove_instructor(instructor_id)
+    return elapsed
+
+
+@case("remove_instructor")
+def _remove_instructor(sms, dataset, generator, calls):
+    ids = range(_SCRATCH_ID, _SCRATCH_ID + calls)
+    sms.bulk_load(instructors=(Instructor("Scratch", instructor_id, MAJORS[0]) for instructor_id in ids),
+                  assignments=((instructor_id, dataset.draw_course(generator)) for instructor_id in ids))
+    return _timed(sms.remove_instructor, ((instructor_id,) for instructor_id in ids))
+
+
+@case("update_instructor_details")
+def _update_instructor_details(sms, dataset, generator, calls):
+    ids = generator.sample(range(1, len(dataset.instructors) + 1), min(calls, len(dataset.instructors)))
+    elapsed = _timed(sms.update_instructor_details, ((instructor_id, None, None, _SCRATCH_ID + instructor_id) for instructor_id in ids))
+    for instructor_id in ids:
+        sms.update_instructor_details(_SCRATCH_ID + instructor_id, new_id_number=instructor_id)
+    return elapsed
+
+
+# courses
+
+@case("add_course")
+def _add_course(sms, dataset, generator, calls):
+    ids = [f"SCRATCH{position}" for position in range(calls)]
+    elapsed = _timed(sms.add_course, ((Course("Scratch", course_id),) for course_id in ids))
+    sms.remove_courses(ids)
+    return elapsed
+
+
+@case("remove_course")
+def _remove_course(sms, dataset, generator, calls):
+    ids = [_scratch_course(sms, f"SCRATCH{position}", students=_random_students(sms, dataset, generator, 20))
+           for position in range(calls)]
+    return _timed(sms.remove_course, ((course_id,) for course_id in ids))
+
+
+@case("remove_courses", calls=10)
+def _remove_courses(sms, dataset, generator, calls):
+    ids = [_scratch_course(sms, f"SCRATCH{position}", students=_random_students(sms, dataset, generator, 20))
+           for position in range(calls * 5)]
+    return _timed(sms.remove_courses, ((ids[start:start + 5],) for start in range(0, len(ids), 5)))
+
+
+@case("update_course_details")
+def _update_course_details(sms, dataset, generator, calls):
+    # renaming a course's id rewrites its roster, and popular courses are drawn more often
+    ids = list(dict.fromkeys(dataset.draw_course(generator) for _ in range(calls)))
+    elapsed = _timed(sms.update_course_details, ((course_id, None, f"SCRATCH-{course_id}") for course_id in ids))
+    for course_id in ids:
+        sms.update_course_details(f"SCRATCH-{course_id}", new_course_id=course_id)
+    return elapsed
+
+
+# enrollments
+
+@case("enroll_student")
+def _enroll_student(sms, dataset, generator, calls):
+    course_id = _scratch_course(sms)
+    elapsed = _timed(sms.enroll_student, ((student_id, course_id) for student_id in _random_students(sms, dataset, generator, calls)))
+    sms.remove_course(course_id)
+    return elapsed
+
+
+@case("unenroll_student")
+def _unenroll_student(sms, dataset, generator, calls):
+    students = _random_students(sms, dataset, generator, calls)
+    course_id = _scratch_course(sms, students=students)
+    elapsed = _timed(sms.unenroll_student, ((student_id, course_id) for student_id in students))
+    sms.remove_course(course_id)
+    return elapsed
+
+
+@case("assign_grade")
+def _assign_grade(sms, dataset, generator, calls):
+    records = generator.sample(dataset.enrollments, min(calls, len(dataset.enrollments)))
+    return _timed(sms.assign_grade, ((student_id, course_id, generator.choice("ABCDF")) for student_id, course_id, _ in records))
+
+
+@case("join_waitlist")
+def _join_waitlist(sms, dataset, generator, calls):
+    course_id = _scratch_course(sms, capacity=0)
+    elapsed = _timed(sms.join_waitlist, ((student_id, course_id) for student_id in _random_students(sms, dataset, generator, calls)))
+    sms.remove_course(course_id)
+    return elapsed
+
+
+@case("leave_waitlist")
+def _leave_waitlist(sms, dataset, generator, calls):
+    course_id = _scratch_course(sms, capacity=0)
+    students = _random_students(sms, dataset, generator, calls)
+    for student_id in students:
+        sms.join_waitlist(student_id, course_id)
+    elapsed = _timed(sms.leave_waitlist, ((student_id, course_id) for student_id in students))
+    sms.remove_course(course_id)
+    return elapsed
+
+
+@case("get_waitlist")
+def _get_waitlist(sms, dataset, generator, calls):
+    course_id = _scratch_course(sms, capacity=0)
+    for student_id in _random_students(sms, dataset, generator, 50):
+        sms.join_waitlist(student_id, course_id)
+    elapsed = _timed(sms.get_waitlist, ((course_id,) for _ in range(calls)))
+    sms.remove_course(course_id)
+    return elapsed
+
+
+@case("bulk_load", calls=3)
+def _bulk_load(sms, dataset, generator, calls):
+    elapsed = 0.0
+    for _ in range(calls):
+        ids = range(_SCRATCH_ID, _SCRATCH_ID + 1000)
+        students = [Student("Scratch", student_id, MAJORS[0]) for student_id in ids]
+        enrollments = [(student_id, dataset.draw_course(generator)) for student_id in ids for _ in range(5)]
+        start = time.perf_counter()
+        sms.bulk_load(students=students, enrollments=enrollments)
+        elapsed += time.perf_counter() - start
+        sms.remove_students(ids)
+    return elapsed, calls
+
+
+# instructor assignments
+
+@case("assign_instructor")
+def _assign_instructor(sms, dataset, generator, calls):
+    pairs = {(generator.randint(1, len(dataset.instructors)), dataset.draw_course(generator)) for _ in range(calls)}
+    pairs = [pair for pair in pairs if pair not in sms.assignments]
+    elapsed = _timed(sms.assign_instructor, pairs)
+    for instructor_id, course_id in pairs:
+        sms.unassign_instructor(instructor_id, course_id)
+    return elapsed
+
+
+@case("unassign_instructor")
+def _unassign_instructor(sms, dataset, generator, calls):
+    pairs = generator.sample(dataset.assignments, min(calls, len(dataset.assignments)))
+    elapsed = _timed(sms.unassign_instructor, pairs)
+    for instructor_id, course_id in pairs:
+        sms.assign_instructor(instructor_id, course_id)
+    return elapsed
+
+
+# reads
+
+@case("get_students_in_course")
+def _get_students_in_course(sms, dataset, generator, calls):
+    return _timed(sms.get_students_in_course, ((dataset.draw_course(generator),) for _ in range(calls)))
+
+
+@case("get_courses_of_student")
+def _get_courses_of_student(sms, dataset, generator, calls):
+    return _timed(sms.get_courses_of_student, ((student_id,) for student_id in _random_students(sms, dataset, generator, calls)))
+
+
+@case("get_missing_prerequisites")
+def _get_missing_prerequisites(sms, dataset, generator, calls):
+    return _timed(sms.get_missing_prerequisites, ((student_id, dataset.draw_course(generator))
+                                                  for student_id in _random_students(sms, dataset, generator, calls)))
+
+
+@case("is_eligible")
+def _is_eligible(sms, dataset, generator, calls):
+    return _timed(sms.is_eligible, ((student_id, dataset.draw_course(generator))
+                                    for student_id in _random_students(sms, dataset, generator, calls)))
+
+
+@case("get_courses_of_instructor")
+def _get_courses_of_instructor(sms, dataset, generator, calls):
+    return _timed(sms.get_courses_of_instructor, ((generator.randint(1, len(dataset.instructors)),) for _ in range(calls)))
+
+
+@case("get_instructors_of_course")
+def _get_instructors_of_course(sms, dataset, generator, calls):
+    return _timed(sms.get_instructors_of_course, ((dataset.draw_course(generator),) for _ in range(calls)))
+
+
+@case("get_students_of_instructor")
+def _get_students_of_instructor(sms, dataset, generator, calls):
+    return _timed(sms.get_students_of_instructor, ((generator.randint(1, len(dataset.instructors)),) for _ in range(calls)))
+
+
+@case("add_observer")
+def _add_observer(sms, dataset, generator, calls):
+    observers = [SystemObserver() for _ in range(calls)]
+    elapsed = _timed(sms.add_observer, ((observer,) for observer in observers))
+    for observer in observers:
+        sms.remove_observer(observer)
+    return elapsed
+
+
+@case("remove_observer")
+def _remove_observer(sms, dataset, generator, calls):
+    observers = [SystemObserver() for _ in range(calls)]
+    for observer in observers:
+        sms.add_observer(observer)
+    return _timed(sms.remove_observer, ((observer,) for observer in reversed(observers)))
+
+
+# whole-system listings, linear in the size of the system
+
+for _name in ("get_all_students", "get_all_instructors", "get_all_courses", "get_all_enrollments"):
+    case(_name, calls=3)(lambda sms, dataset, generator, calls, name=_name: _timed(getattr(sms, name), [()] * calls))
+
+for _name in ("iter_students", "iter_instructors", "iter_courses", "iter_enrollments", "iter_assignments"):
+    case(_name, calls=3)(lambda sms, dataset, generator, calls, name=_name:
+                         _timed(lambda: deque(getattr(sms, name)(), maxlen=0), [()] * calls))
+
+
+def run(tiers, repeat: int = 3, seed: int = 0, only=None) -> dict:
+    """
+    Time every case on every tier.
+
+    Parameters
+    ----------
+    tiers : Iterable[int]
+        The number of enrollments of each tier's dataset.
+    repeat : int
+        The number of runs of each case; the best is kept (default is 3).
+    seed : int
+        The seed of the datasets and of the cases' arguments (default is 0).
+    only : Iterable[str], optional
+        The names of the cases to run (default is every case).
+
+    Returns
+    -------
+    dict
+        The results: `meta` describing the run, and `results` mapping each tier (as a string)
+        to the seconds per call of each case.
+    """
+    results = {}
+    names = list(only) if only else list(CASES)
+    for tier in tiers:
+        dataset = generate(tier, seed=seed)
+        sms = StudentManagementSystem()
+        start = time.perf_counter()
+        dataset.load(sms)
+        print(f"{dataset} loaded in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+        generator = random.Random(seed)
+        timings = results[str(tier)] = {}
+        for name in names:
+            function, calls = CASES[name]
+            timings[name] = min(elapsed / max(made, 1) for elapsed, made in
+                                (function(sms, dataset, generator, calls) for _ in range(repeat)))
+    return {
+        "meta": {"python": platform.python_version(), "implementation": platform.python_implementation(),
+                 "machine": platform.machine(), "seed": seed, "repeat": repeat,
+                 "date": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+
+
+def growth(timings: dict, tiers: list, name: str):
+    # the exponent k of cost ~ n ** k between the smallest and the largest tier
+    first, last = tiers[0], tiers[-1]
+    if first == last or not timings[first].get(name) or not timings[last].get(name):
+        return None
+    return math.log(timings[last][name] / timings[first][name]) / math.log(int(last) / int(first))
+
+
+def regressions(results: dict, baseline: dict, tolerance: float = 0.5, floor: float = 1e-6) -> list[tuple]:
+    """
+    Compare results with a baseline.
+
+    Parameters
+    ----------
+    results, baseline : dict
+        Results returned by `run`, or loaded from its JSON output.
+    tolerance : float
+        How much slower than the baseline a case may be before it is flagged, as a fraction (default is 0.5).
+    floor : float
+        The smallest slowdown in seconds per call that is flagged, so timer noise on very fast calls is ignored
+        (default is one microsecond).
+
+    Returns
+    -------
+    list[tuple[str, str, float, float]]
+        A `(tier, case, baseline_seconds, seconds)` tuple per regression, for tiers and cases present in both.
+    """
+    flagged = []
+    for tier, timings in results["results"].items():
+        for name, seconds in timings.items():
+            before = baseline["results"].get(tier, {}).get(name)
+            if before is not None and seconds > before * (1 + tolerance) and seconds - before > floor:
+                flagged.append((tier, name, before, seconds))
+    return flagged
+
+
+def report(results: dict) -> None:
+    timings = results["results"]
+    tiers = list(timings)
+    print(f"{'us per call':<28}" + "".join(f"{int(tier):>12,}" for tier in tiers) + f"{'growth':>9}")
+    for name in next(iter(timings.values()), {}):
+        exponent = growth(timings, tiers, name)
+        print(f"{name:<28}" + "".join(f"{timings[tier][name] * 1e6:>12.2f}" for tier in tiers)
+              + (f"{exponent:>9.2f}" if exponent is not None else ""))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tiers", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000],
+                        help="the number of enrollments of each tier")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), help="the cases to run (default is every case)")
+    parser.add_argument("--output", help="a file to write the results to as JSON")
+    parser.add_argument("--baseline", help="a JSON file written by --output to compare the results with")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    args = parser.parse_args()
+
+    results = run(args.tiers, args.repeat, args.seed, args.cases)
+    report(results)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            flagged = regressions(results, json.load(file), args.tolerance)
+        for tier, name, before, seconds in flagged:
+            print(f"REGRESSION {name} at {int(tier):,} enrollments: {before * 1e6:.2f} -> {seconds * 1e6:.2f} us per call "
+                  f"({seconds / before:.2f}x)")
+        if flagged:
+            sys.exit(1)
@@ -0,0 +1,86 @@
+"""
+Measures timetable clash checking: enrollments checked against each student's interval index,
+and a whole term validated by `find_conflicts` in one sweep versus comparing every pair of courses.
+
+Courses get two or three one-hour weekly meetings at random times, so a share of the planned
+enrollments clash.
+
+Run from the project root:
+    python -m benchmarks.timetable --students 20000 --courses 2000 --per-student 5
+"""
+import argparse
+import random
+import time
+
+from student_management_system import StudentManagementSystem
+from person import Student
+from course import Course, MeetingSlot
+from timetable import ScheduleConflictError, find_conflicts
+
+
+def catalog(num_courses: int, seed: int) -> list[Course]:
+    generator = random.Random(seed)
+    courses = []
+    for i in range(num_courses):
+        meetings = []
+        for day in generator.sample(range(5), generator.choice((2, 3))):
+            start = generator.randrange(8, 20) * 60
+            meetings.append(MeetingSlot(day, start, start + 60))
+        courses.append(Course(f"Course {i}", f"C{i}", meetings=meetings))
+    return courses
+
+
+def pairwise_conflicts(courses, enrollments) -> int:
+    # the naive check: every pair of each student's courses, every pair of their meetings
+    meetings = {course.course_id: course.meetings for course in courses}
+    schedules = {}
+    for student_id, course_id in enrollments:
+        schedules.setdefault(student_id, []).append(course_id)
+    found = 0
+    for course_ids in schedules.values():
+        for position, course_id in enumerate(course_ids):
+            for other_id in course_ids[position + 1:]:
+                if any(meeting.overlaps(other) for meeting in meetings[course_id] for other in meetings[other_id]):
+                    found += 1
+    return found
+
+
+def run(num_students: int, num_courses: int, per_student: int, seed: int) -> None:
+    courses = catalog(num_courses, seed)
+    generator = random.Random(seed + 1)
+    enrollments = [(student_id, f"C{course}") for student_id in range(num_students)
+                   for course in generator.sample(range(num_courses), per_student)]
+
+    start = time.perf_counter()
+    conflicts = find_conflicts(courses, enrollments)
+    sweep = time.perf_counter() - start
+    start = time.perf_counter()
+    pairs = pairwise_conflicts(courses, enrollments)
+    pairwise = time.perf_counter() - start
+    student_conflicts = sum(1 for kind, *_ in conflicts if kind == "student")
+    print(f"{len(enrollments):,} planned enrollments, {student_conflicts:,} clashing course pairs")
+    print(f"  find_conflicts sweep {sweep:8.3f}s")
+    print(f"  pairwise comparison  {pairwise:8.3f}s ({pairs:,} clashing pairs)")
+
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=(Student(f"Student {i}", i, "Undeclared") for i in range(num_students)), courses=courses)
+    rejected = 0
+    start = time.perf_counter()
+    for student_id, course_id in enrollments:
+        try:
+            sms.enroll_student(student_id, course_id)
+        except ScheduleConflictError:
+            rejected += 1
+    elapsed = time.perf_counter() - start
+    print(f"enroll_student x{len(enrollments):,}: {elapsed:.3f}s ({elapsed / len(enrollments) * 1e6:.1f} us each), "
+          f"{rejected:,} rejected as clashes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=20_000)
+    parser.add_argument("--courses", type=int, default=2_000)
+    parser.add_argument("--per-student", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.students, args.courses, args.per_student, args.seed)
@@ -0,0 +1,131 @@
+"""
+A compact, column-oriented copy of the Student Management System's enrollments.
+
+`ColumnarEnrollments` stores each enrollment as a `(student index, course index, grade code)`
+triple spread over three typed `array`s, so an enrollment costs a few bytes instead of a Python
+object and its dictionary entries. Student and course ids are mapped to dense indexes and
+grades are interned to small integer codes, with code 0 meaning "no grade".
+
+The table is an optional, read-mostly representation: build it from a system when memory
+matters more than mutability, e.g. for analytics over millions of enrollments.
+
+Example
+-------
+table = ColumnarEnrollments.from_enrollments(sms.iter_enrollments())
+for student_id, course_id, grade in table:
+    print(student_id, course_id, grade)
+"""
+
+from array import array
+
+
+class ColumnarEnrollments:
+    """
+    A class used to store enrollments as typed arrays of student indexes, course indexes and grade codes.
+
+    Attributes
+    ----------
+    student_index : array
+        The index into `student_ids` of each enrollment's student.
+    course_index : array
+        The index into `course_ids` of each enrollment's course.
+    grade_code : array
+        The index into `grades` of each enrollment's grade; 0 means no grade has been assigned.
+    student_ids : list[int]
+        The distinct student ids, in the order they were first seen.
+    course_ids : list[str]
+        The distinct course ids, in the order they were first seen.
+    grades : list[str | None]
+        The distinct grades; `grades[0]` is None.
+
+    Methods
+    -------
+    from_enrollments(enrollments: Iterable[Enrollment]) -> ColumnarEnrollments
+        Builds a table from `Enrollment` objects.
+    append(student_id: int, course_id: str, grade: str = None) -> None
+        Appends an enrollment to the table.
+    nbytes() -> int
+        The number of bytes held by the table's arrays.
+    """
+
+    def __init__(self) -> None:
+        self.student_index = array("i")
+        self.course_index = array("i")
+        self.grade_code = array("B")
+        self.student_ids = []
+        self.course_ids = []
+        self.grades = [None]
+        self._student_positions = {}
+        self._course_positions = {}
+        self._grade_codes = {None: 0}
+
+    def __len__(self) -> int:
+        return len(self.student_index)
+
+    def __iter__(self):
+        student_ids, course_ids, grades = self.student_ids, self.course_ids, self.grades
+        for student, course, grade in zip(self.student_index, self.course_index, self.grade_code):
+            yield student_ids[student], course_ids[course], grades[grade]
+
+    @classmethod
+    def from_enrollments(cls, enrollments) -> "ColumnarEnrollments":
+        """
+        Build a table from `Enrollment` objects, e.g. `sms.iter_enrollments()`.
+
+        Parameters
+        ----------
+        enrollments : Iterable[Enrollment]
+            The enrollments to store.
+
+        Returns
+        -------
+        ColumnarEnrollments
+            A table holding one row per enrollment, in iteration order.
+        """
+        table = cls()
+        append = table.append
+        for enrollment in enrollments:
+            append(enrollment.student.id_number, enrollment.course.course_id, enrollment.grade)
+        return table
+
+    def append(self, student_id: int, course_id: str, grade: str = None) -> None:
+        """
+        Append an enrollment to the table, interning its ids and grade.
+
+        Parameters
+        ----------
+        student_id : int
+            The ID of the enrolled student.
+        course_id : str
+            The ID of the course.
+        grade : str, optional
+            The grade assigned to the student (default is None).
+        """
+        self.student_index.append(self._intern(self._student_positions, self.student_ids, student_id))
+        self.course_index.append(self._intern(self._course_positions, self.course_ids, course_id))
+        code = self._grade_codes.get(grade)
+        if code is None:
+            if len(self.grades) > 255:
+                raise ValueError(f"Cannot intern grade {grade!r}: a table holds at most 255 distinct grades.")
+            code = self._intern(self._grade_codes, self.grades, grade)
+        self.grade_code.append(code)
+
+    def nbytes(self) -> int:
+        """
+        The number of bytes held by the table's three arrays.
+
+        Returns
+        -------
+        int
+            The combined size of the student index, course index and grade code arrays.
+        """
+        return sum(column.itemsize * len(column) for column in (self.student_index, self.course_index, self.grade_code))
+
+    @staticmethod
+    def _intern(positions: dict, values: list, value) -> int:
+        # return the dense index of value, adding it to values the first time it is seen
+        position = positions.get(value)
+        if position is None:
+            position = positions[value] = len(values)
+            values.append(value)
+        return position
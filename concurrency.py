@@ -0,0 +1,261 @@
+"""
+Thread-safe access to the Student Management System.
+
+`ConcurrentStudentManagementSystem` is a drop-in `StudentManagementSystem` for processes that
+share one system between many threads. Student and course keys hash onto a fixed set of
+lock stripes, so each check-then-act sequence on one student or one course is serialized
+while registrations for different students in different courses don't wait on each other.
+Operations that restructure the system (removing or renaming entities, batch loads, and
+reads that walk every entity) hold every stripe at once.
+
+The stripes buy correctness, not throughput: the operations are pure Python, so under the
+GIL only one thread runs them at a time and more threads don't add operations per second
+(`benchmarks.concurrency` measured 110,976 ops/s with 1 thread and 104,089 with 4). Use it
+when threads must share the system, e.g. request handlers, not to speed up a batch; for
+that, `bulk_load` and `allocate_seats` are much faster.
+
+Example
+-------
+sms = ConcurrentStudentManagementSystem()
+with ThreadPoolExecutor() as pool:
+    pool.map(lambda request: sms.enroll_student(*request), requests)
+"""
+
+from contextlib import contextmanager
+from threading import RLock
+
+from student_management_system import StudentManagementSystem
+from storage import InMemoryStorage
+
+
+class StripedLock:
+    """
+    A class used to map keys onto a fixed number of re-entrant locks.
+
+    Keys that hash to different stripes can be locked independently. Locks are always
+    acquired in stripe order, so holders of several stripes cannot deadlock each other.
+
+    Attributes
+    ----------
+    stripes : list[RLock]
+        The locks keys are mapped onto.
+
+    Methods
+    -------
+    hold(*keys) -> ContextManager
+        Holds the stripes of the given keys for the duration of a block.
+    hold_all() -> ContextManager
+        Holds every stripe for the duration of a block.
+    """
+
+    def __init__(self, stripes: int = 64) -> None:
+        if stripes < 1:
+            raise ValueError("A StripedLock needs at least one stripe.")
+        self.stripes = [RLock() for _ in range(stripes)]
+
+    @contextmanager
+    def _holding(self, indexes):
+        acquired = []
+        try:
+            for index in indexes:
+                self.stripes[index].acquire()
+                acquired.append(index)
+            yield
+        finally:
+            for index in reversed(acquired):
+                self.stripes[index].release()
+
+    def hold(self, *keys):
+        """
+        Hold the stripes the given keys map to, in stripe order, for the duration of a block.
+
+        Parameters
+        ----------
+        *keys : Hashable
+            The keys to lock.
+        """
+        return self._holding(sorted({hash(key) % len(self.stripes) for key in keys}))
+
+    def hold_all(self):
+        """
+        Hold every stripe for the duration of a block, excluding all other lock holders.
+        """
+        return self._holding(range(len(self.stripes)))
+
+
+class ConcurrentStudentManagementSystem(StudentManagementSystem):
+    """
+    A class to share a Student Management System safely between threads.
+
+    Enrollment and assignment operations lock the stripes of their two entities, adding an entity
+    and single-student or single-course reads lock that entity's stripe, and every other
+    operation locks all stripes. The SQLite storage engine runs statements on a single connection, so systems backed
+    by it always use a single stripe, which serializes every operation.
+
+    The lazy `iter_*` methods are not guarded, since the locks cannot be held across the caller's
+    iteration; use the `get_all_*` methods for consistent listings while other threads write.
+
+    Attributes
+    ----------
+    locks : StripedLock
+        The locks guarding the system's students and courses.
+    """
+
+    def __init__(self, storage=None, stripes: int = 64) -> None:
+        """
+        Parameters
+        ----------
+        storage : InMemoryStorage | SQLiteStorage, optional
+            The storage engine holding the system's data (default is a new `InMemoryStorage`).
+        stripes : int
+            The number of lock stripes students and courses are spread over (default is 64).
+        """
+        super().__init__(storage)
+        if not isinstance(self.storage, InMemoryStorage):
+            stripes = 1
+        self.locks = StripedLock(stripes)
+
+    @staticmethod
+    def _student_key(student_id: int) -> tuple[str, int]:
+        return ("student", student_id)
+
+    @staticmethod
+    def _instructor_key(id_number: int) -> tuple[str, int]:
+        return ("instructor", id_number)
+
+    @staticmethod
+    def _course_key(course_id: str) -> tuple[str, str]:
+        return ("course", course_id)
+
+    # enrollment operations only touch one student and one course
+
+    def enroll_student(self, student_id: int, course_id: str):
+        with self.locks.hold(self._student_key(student_id), self._course_key(course_id)):
+            return super().enroll_student(student_id, course_id)
+
+    def unenroll_student(self, student_id: int, course_id: str):
+        with self.locks.hold(self._student_key(student_id), self._course_key(course_id)):
+            if not self.waitlists.waiting(course_id):
+                return super().unenroll_student(student_id, course_id)
+        # the freed seat promotes another student, whose stripe isn't held, so exclude everything else
+        with self.locks.hold_all():
+            return super().unenroll_student(student_id, course_id)
+
+    def assign_grade(self, student_id: int, course_id: str, grade: str):
+        with self.locks.hold(self._student_key(student_id), self._course_key(course_id)):
+            return super().assign_grade(student_id, course_id, grade)
+
+    def join_waitlist(self, student_id: int, course_id: str, priority=0) -> None:
+        with self.locks.hold(self._student_key(student_id), self._course_key(course_id)):
+            return super().join_waitlist(student_id, course_id, priority)
+
+    def leave_waitlist(self, student_id: int, course_id: str) -> None:
+        with self.locks.hold(self._student_key(student_id), self._course_key(course_id)):
+            return super().leave_waitlist(student_id, course_id)
+
+    def assign_instructor(self, instructor_id: int, course_id: str) -> None:
+        with self.locks.hold(self._instructor_key(instructor_id), self._course_key(course_id)):
+            return super().assign_instructor(instructor_id, course_id)
+
+    def unassign_instructor(self, instructor_id: int, course_id: str) -> None:
+        with self.locks.hold(self._instructor_key(instructor_id), self._course_key(course_id)):
+            return super().unassign_instructor(instructor_id, course_id)
+
+    def get_courses_of_instructor(self, instructor_id: int):
+        with self.locks.hold(self._instructor_key(instructor_id)):
+            return super().get_courses_of_instructor(instructor_id)
+
+    def get_instructors_of_course(self, course_id: str):
+        with self.locks.hold(self._course_key(course_id)):
+            return super().get_instructors_of_course(course_id)
+
+    def get_waitlist(self, course_id: str):
+        with self.locks.hold(self._course_key(course_id)):
+            return super().get_waitlist(course_id)
+
+    def get_students_in_course(self, course_id: str):
+        with self.locks.hold(self._course_key(course_id)):
+            return super().get_students_in_course(course_id)
+
+    def get_courses_of_student(self, student_id: int):
+        with self.locks.hold(self._student_key(student_id)):
+            return super().get_courses_of_student(student_id)
+
+    def get_missing_prerequisites(self, student_id: int, course_id: str):
+        # a student's memoized answers only change under their own stripe, the prerequisites under every stripe
+        with self.locks.hold(self._student_key(student_id), self._course_key(course_id)):
+            return super().get_missing_prerequisites(student_id, course_id)
+
+    # adding an entity only races with operations on the same id and with listings, which hold every stripe
+
+    def add_student(self, student):
+        with self.locks.hold(self._student_key(student.id_number)):
+            return super().add_student(student)
+
+    def add_instructor(self, instructor):
+        with self.locks.hold(self._instructor_key(instructor.id_number)):
+            return super().add_instructor(instructor)
+
+    def add_course(self, course):
+        # a course meeting in rooms books them, and rooms are shared by every course, as are the prerequisites
+        with (self.locks.hold_all() if course.meetings or course.prerequisites else self.locks.hold(self._course_key(course.course_id))):
+            return super().add_course(course)
+
+    # operations that remove or rename entities, or walk all of them, exclude everything else
+
+    def remove_student(self, id_number: int):
+        with self.locks.hold_all():
+            return super().remove_student(id_number)
+
+    def remove_students(self, id_numbers) -> None:
+        with self.locks.hold_all():
+            return super().remove_students(id_numbers)
+
+    def update_student_details(self, *args, **kwargs) -> None:
+        with self.locks.hold_all():
+            return super().update_student_details(*args, **kwargs)
+
+    def remove_instructor(self, id_number: int):
+        with self.locks.hold_all():
+            return super().remove_instructor(id_number)
+
+    def update_instructor_details(self, *args, **kwargs) -> None:
+        with self.locks.hold_all():
+            return super().update_instructor_details(*args, **kwargs)
+
+    def remove_course(self, course_id: str):
+        with self.locks.hold_all():
+            return super().remove_course(course_id)
+
+    def remove_courses(self, course_ids) -> None:
+        with self.locks.hold_all():
+            return super().remove_courses(course_ids)
+
+    def update_course_details(self, *args, **kwargs) -> None:
+        with self.locks.hold_all():
+            return super().update_course_details(*args, **kwargs)
+
+    def bulk_load(self, *args, **kwargs):
+        with self.locks.hold_all():
+            return super().bulk_load(*args, **kwargs)
+
+    def get_all_students(self):
+        with self.locks.hold_all():
+            return super().get_all_students()
+
+    def get_all_instructors(self):
+        with self.locks.hold_all():
+            return super().get_all_instructors()
+
+    def get_all_courses(self):
+        with self.locks.hold_all():
+            return super().get_all_courses()
+
+    def get_all_enrollments(self):
+        with self.locks.hold_all():
+            return super().get_all_enrollments()
+
+    def get_students_of_instructor(self, instructor_id: int):
+        # the instructor's rosters span courses whose stripes aren't known up front
+        with self.locks.hold_all():
+            return super().get_students_of_instructor(instructor_id)
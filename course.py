@@ -1,5 +1,153 @@
 from person import Student
 
+DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+class MeetingSlot:
+    """
+    A class used to represent a weekly meeting of a course in the Student Management System.
+
+    A slot covers the minutes from `start` up to, but not including, `end`, so back-to-back
+    meetings don't overlap. Its text form is "Mon 09:00-10:30 R101", the room being optional.
+
+    Attributes
+    ----------
+    day : int
+        The day of the week, 0 for Monday to 6 for Sunday.
+    start : int
+        The start time in minutes after midnight.
+    end : int
+        The end time in minutes after midnight.
+    room : str, optional
+        The room the meeting takes place in (default is None, meaning no room is booked).
+
+    Methods
+    -------
+    overlaps(other: MeetingSlot) -> bool
+        Checks whether two meetings take place at the same time.
+    parse(text: str) -> MeetingSlot
+        Builds a slot from its text form.
+    """
+    __slots__ = ("day", "start", "end", "room")
+
+    def __init__(self, day: int, start: int, end: int, room: str = None) -> None:
+        if not 0 <= day < len(DAYS):
+            raise ValueError(f"Invalid day {day!r}, expected 0 (Monday) to 6 (Sunday).")
+        if not 0 <= start < end <= 24 * 60:
+            raise ValueError(f"Invalid meeting time {start}-{end}, expected minutes within one day with start < end.")
+        self.day = day
+        self.start = start
+        self.end = end
+        self.room = room
+
+    def __str__(self) -> str:
+        text = f"{DAYS[self.day]} {self.start // 60:02d}:{self.start % 60:02d}-{self.end // 60:02d}:{self.end % 60:02d}"
+        return f"{text} {self.room}" if self.room is not None else text
+
+    def __repr__(self) -> str:
+        return f"MeetingSlot.parse({str(self)!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MeetingSlot):
+            return NotImplemented
+        return (self.day, self.start, self.end, self.room) == (other.day, other.start, other.end, other.room)
+
+    def __hash__(self) -> int:
+        return hash((self.day, self.start, self.end, self.room))
+
+    @property
+    def week_start(self) -> int:
+        # minutes since Monday 00:00, so slots on different days sort and compare on one axis
+        return self.day * 24 * 60 + self.start
+
+    @property
+    def week_end(self) -> int:
+        return self.day * 24 * 60 + self.end
+
+    def overlaps(self, other: "MeetingSlot") -> bool:
+        """
+        Checks whether two meetings take place at the same time, whatever their rooms.
+
+        Parameters
+        ----------
+        other : MeetingSlot
+            The other meeting.
+
+        Returns
+        -------
+        bool
+            True if the meetings are on the same day and their times overlap, False otherwise.
+        """
+        return self.day == other.day and self.start < other.end and other.start < self.end
+
+    @classmethod
+    def parse(cls, text: str) -> "MeetingSlot":
+        """
+        Builds a slot from its text form, e.g. "Mon 09:00-10:30 R101" or "Tue 14:00-15:00".
+
+        Parameters
+        ----------
+        text : str
+            The day, the time range and an optional room, separated by whitespace.
+
+        Returns
+        -------
+        MeetingSlot
+            The parsed slot.
+
+        Raises
+        ------
+        ValueError
+            If the text is not a valid meeting.
+        """
+        try:
+            day, times, *room = text.split(maxsplit=2)
+            start, end = (int(hours) * 60 + int(minutes)
+                          for hours, minutes in (time.split(":") for time in times.split("-")))
+            return cls(DAYS.index(day.capitalize()), start, end, room[0] if room else None)
+        except ValueError:
+            raise ValueError(f"Invalid meeting {text!r}, expected e.g. 'Mon 09:00-10:30 R101'.") from None
+
+
+def format_meetings(meetings) -> str:
+    """
+    Joins meetings into one string, e.g. "Mon 09:00-10:30 R101; Wed 09:00-10:30 R101".
+
+    This is how meetings are stored in a single field by the storage engines, the log and the data files.
+    """
+    return "; ".join(str(meeting) for meeting in meetings)
+
+
+def parse_meetings(text: str) -> tuple[MeetingSlot, ...]:
+    """
+    Splits a string written by `format_meetings` back into meetings; empty or missing text gives none.
+    """
+    if not text:
+        return ()
+    return tuple(MeetingSlot.parse(part) for part in text.split(";") if part.strip())
+
+
+def format_prerequisites(prerequisites: dict) -> str:
+    """
+    Joins prerequisites into one string, e.g. "CS101>=C; MATH100" for CS101 with C or better and MATH100 passed.
+
+    This is how prerequisites are stored in a single field by the storage engines, the log and the data files.
+    """
+    return "; ".join(course_id if grade is None else f"{course_id}>={grade}" for course_id, grade in prerequisites.items())
+
+
+def parse_prerequisites(text: str) -> dict:
+    """
+    Splits a string written by `format_prerequisites` back into prerequisites; empty or missing text gives none.
+    """
+    prerequisites = {}
+    for part in (text or "").split(";"):
+        if part.strip():
+            course_id, _, grade = part.partition(">=")
+            prerequisites[course_id.strip()] = grade.strip() or None
+    return prerequisites
+
+
 class Course:
     """
     A class used to represent a course in the Student Management System.
@@ -10,19 +158,52 @@ class Course:
         The name of the course.
     course_id : str
         The ID of the course.
+    capacity : int, optional
+        The maximum number of students that can enroll in the course (default is None, meaning unlimited).
     enrolled_students : list[Student]
-        A list to keep track of students enrolled in the course.
+        A list of the students enrolled in the course, in the order they enrolled.
+    roster : dict[int, Student]
+        The students enrolled in the course keyed by student id, in the order they enrolled.
+    meetings : tuple[MeetingSlot, ...]
+        The weekly meetings of the course (default is none, meaning the course never clashes).
+    prerequisites : dict[str, str | None]
+        The minimum grade required in each prerequisite course keyed by its course id, None meaning
+        any passing grade (default is none).
     """
+    __slots__ = ("course_name", "course_id", "capacity", "roster", "meetings", "prerequisites")
 
-    def __init__(self, course_name: str, course_id: str) -> None:
+    def __init__(self, course_name: str, course_id: str, capacity: int = None, meetings=(), prerequisites=None) -> None:
         self.course_name = course_name
         self.course_id = course_id
-        self.enrolled_students = []
+        self.capacity = capacity
+        self.meetings = tuple(meetings or ())
+        self.prerequisites = dict(prerequisites or {})
+        self.roster = {} # dicts preserve insertion order and give O(1) membership, add and remove
 
     def __str__(self) -> str:
         students = ', '.join(student.name for student in self.enrolled_students)  # List student names for clarity
         return f"Course Name: {self.course_name}, Course ID: {self.course_id}, Enrolled Students: [{students}]"
 
+    @property
+    def enrolled_students(self) -> list[Student]:
+        return list(self.roster.values())
+
+    def is_enrolled(self, student: Student) -> bool:
+        """
+        Checks whether a student is enrolled in the course.
+
+        Parameters
+        ----------
+        student : Student
+            The Student object to look up.
+
+        Returns
+        -------
+        bool
+            True if the student is enrolled in the course, False otherwise.
+        """
+        return self.roster.get(student.id_number) is student
+
     def enroll_student(self, student: Student) -> None:
         """
         Enrolls a student in the course if they are not already enrolled.
@@ -32,8 +213,8 @@ class Course:
         student : Student
             The Student object to be enrolled in the course.
         """
-        if student not in self.enrolled_students:
-            self.enrolled_students.append(student)
+        if student.id_number not in self.roster:
+            self.roster[student.id_number] = student
 
     def unenroll_student(self, student: Student) -> None:
         """
@@ -44,8 +225,22 @@ class Course:
         student : Student
             The Student object to be unenrolled from the course.
         """
-        if student in self.enrolled_students:
-            self.enrolled_students.remove(student)
+        if self.is_enrolled(student):
+            del self.roster[student.id_number]
+
+    def rekey_student(self, old_id: int, new_id: int) -> None:
+        """
+        Moves an enrolled student from an old student id to a new one, keeping their place in the roster.
+
+        Parameters
+        ----------
+        old_id : int
+            The student's previous ID.
+        new_id : int
+            The student's new ID.
+        """
+        if old_id in self.roster:
+            self.roster = {(new_id if student_id == old_id else student_id): student for student_id, student in self.roster.items()}
 
 
 class Enrollment:
@@ -66,6 +261,7 @@ class Enrollment:
     set_grade(grade: str)
         Assigns a grade to the student for this enrollment.
     """
+    __slots__ = ("student", "course", "grade")
 
     def __init__(self, student: Student, course: Course, grade: str = None) -> None:
         self.student = student
@@ -0,0 +1,397 @@
+"""
+Streaming CSV and JSON Lines readers and writers for the Student Management System.
+
+Readers take an open text file and yield one record at a time; writers take an open text
+file and any iterable of records and write them one at a time. Neither side ever holds more
+than one record in memory, so readers can be fed straight into `StudentManagementSystem.bulk_load`
+and the system's `iter_*` methods can be fed straight into the writers.
+
+Enrollments are read and written as `(student_id, course_id, grade)` tuples and instructor
+assignments as `(instructor_id, course_id)` tuples, the record formats accepted by `bulk_load`.
+A row that can't be read (a missing field, a bad number or a line that isn't JSON) is yielded
+as a `MalformedRecord` in place of its record, so `bulk_load` reports it among the rejected
+records and still loads the rest of the file.
+
+Example
+-------
+with open("students.csv", newline="") as file:
+    report = sms.bulk_load(students=read_students(file, "csv"))
+
+with open("enrollments.jsonl", "w") as file:
+    write_enrollments(file, sms.iter_enrollments(), "jsonl")
+"""
+
+import csv
+import json
+import os
+
+from person import Student, Instructor
+from course import Course, format_meetings, format_prerequisites, parse_meetings, parse_prerequisites
+
+FORMATS = ("csv", "jsonl")
+
+STUDENT_FIELDS = ("id_number", "name", "major")
+INSTRUCTOR_FIELDS = ("id_number", "name", "department")
+COURSE_FIELDS = ("course_id", "course_name", "capacity", "meetings", "prerequisites")
+ENROLLMENT_FIELDS = ("student_id", "course_id", "grade")
+ASSIGNMENT_FIELDS = ("instructor_id", "course_id")
+
+
+class MalformedRecord:
+    """
+    A class used to stand in for a row of a file that couldn't be read as a record.
+
+    It is neither an entity nor a tuple, so `bulk_load` rejects it as malformed and its
+    representation, which names the problem and the row, ends up in the report's errors.
+
+    Attributes
+    ----------
+    row : dict | str
+        The row as it was read, or the line if it isn't valid JSON.
+    reason : str
+        Why the row couldn't be read.
+    """
+
+    __slots__ = ("row", "reason")
+
+    def __init__(self, row, reason: str) -> None:
+        self.row = row
+        self.reason = reason
+
+    def __repr__(self) -> str:
+        return f"<{self.reason}: {self.row!r}>"
+
+
+def _read_rows(file, fmt: str):
+    # yield each record of the file as a dict of field name to value
+    if fmt == "csv":
+        yield from csv.DictReader(file)
+    elif fmt == "jsonl":
+        for line in file:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError as error:
+                    yield MalformedRecord(line.rstrip("\n"), f"invalid JSON ({error})")
+    else:
+        raise ValueError(f"Unsupported format {fmt!r}, expected one of {FORMATS}.")
+
+
+def _parse_rows(rows, parse):
+    # parse each row into a record, a row that can't be parsed is passed on as a MalformedRecord
+    for row in rows:
+        try:
+            yield parse(row)
+        except KeyError as error:
+            yield row if isinstance(row, MalformedRecord) else MalformedRecord(row, f"missing field {error}")
+        except (TypeError, ValueError) as error:
+            yield row if isinstance(row, MalformedRecord) else MalformedRecord(row, str(error))
+
+
+def _write_rows(file, fields: tuple[str, ...], rows, fmt: str) -> int:
+    # write each row (a tuple ordered like fields) to the file and return the number written
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(file)
+        writer.writerow(fields)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    elif fmt == "jsonl":
+        for row in rows:
+            file.write(json.dumps(dict(zip(fields, row))) + "\n")
+            count += 1
+    else:
+        raise ValueError(f"Unsupported format {fmt!r}, expected one of {FORMATS}.")
+    return count
+
+
+def _grade(value):
+    # csv has no null, so an empty cell is a missing grade
+    return value if value not in ("", None) else None
+
+
+def _capacity(value):
+    # an empty or missing capacity means the course is unlimited
+    return int(value) if value not in ("", None) else None
+
+
+def read_students(file, fmt: str = "csv"):
+    """
+    Lazily read Student objects from a CSV or JSON Lines file.
+
+    Parameters
+    ----------
+    file : TextIO
+        An open text file with `id_number`, `name` and `major` fields.
+    fmt : str
+        The file format, either "csv" or "jsonl".
+
+    Yields
+    ------
+    Student
+        One Student object per record, or a MalformedRecord for a row that can't be read.
+    """
+    return _parse_rows(_read_rows(file, fmt),
+                       lambda row: Student(name=row["name"], id_number=int(row["id_number"]), major=row["major"]))
+
+
+def read_instructors(file, fmt: str = "csv"):
+    """
+    Lazily read Instructor objects from a CSV or JSON Lines file.
+
+    Parameters
+    ----------
+    file : TextIO
+        An open text file with `id_number`, `name` and `department` fields.
+    fmt : str
+        The file format, either "csv" or "jsonl".
+
+    Yields
+    ------
+    Instructor
+        One Instructor object per record, or a MalformedRecord for a row that can't be read.
+    """
+    return _parse_rows(_read_rows(file, fmt),
+                       lambda row: Instructor(name=row["name"], id_number=int(row["id_number"]), department=row["department"]))
+
+
+def read_courses(file, fmt: str = "csv"):
+    """
+    Lazily read Course objects from a CSV or JSON Lines file.
+
+    Parameters
+    ----------
+    file : TextIO
+        An open text file with `course_id`, `course_name` and optional `capacity`, `meetings` and `prerequisites`
+        fields, meetings in the `format_meetings` form, e.g. "Mon 09:00-10:30 R101; Wed 09:00-10:30 R101", and
+        prerequisites in the `format_prerequisites` form, e.g. "CS101>=C; MATH100".
+    fmt : str
+        The file format, either "csv" or "jsonl".
+
+    Yields
+    ------
+    Course
+        One Course object per record, or a MalformedRecord for a row that can't be read.
+    """
+    return _parse_rows(_read_rows(file, fmt),
+                       lambda row: Course(course_name=row["course_name"], course_id=str(row["course_id"]),
+                                          capacity=_capacity(row.get("capacity")), meetings=parse_meetings(row.get("meetings")),
+                                          prerequisites=parse_prerequisites(row.get("prerequisites"))))
+
+
+def read_enrollments(file, fmt: str = "csv"):
+    """
+    Lazily read enrollment records from a CSV or JSON Lines file.
+
+    Parameters
+    ----------
+    file : TextIO
+        An open text file with `student_id`, `course_id` and optional `grade` fields.
+    fmt : str
+        The file format, either "csv" or "jsonl".
+
+    Yields
+    ------
+    tuple[int, str, str | None]
+        One `(student_id, course_id, grade)` tuple per record, or a MalformedRecord for a row that can't be read.
+    """
+    return _parse_rows(_read_rows(file, fmt), lambda row: (int(row["student_id"]), str(row["course_id"]), _grade(row.get("grade"))))
+
+
+def read_assignments(file, fmt: str = "csv"):
+    """
+    Lazily read instructor assignment records from a CSV or JSON Lines file.
+
+    Parameters
+    ----------
+    file : TextIO
+        An open text file with `instructor_id` and `course_id` fields.
+    fmt : str
+        The file format, either "csv" or "jsonl".
+
+    Yields
+    ------
+    tuple[int, str]
+        One `(instructor_id, course_id)` tuple per record, or a MalformedRecord for a row that can't be read.
+    """
+    return _parse_rows(_read_rows(file, fmt), lambda row: (int(row["instructor_id"]), str(row["course_id"])))
+
+
+def write_students(file, students, fmt: str = "csv") -> int:
+    """
+    Write Student objects to a CSV or JSON Lines file one record at a time.
+
+    Parameters
+    ----------
+    file : TextIO
+        An open text file to write to.
+    students : Iterable[Student]
+        The students to write, e.g. `sms.iter_students()`.
+    fmt : str
+        The file format, either "csv" or "jsonl".
+
+    Returns
+    -------
+    int
+        The number of records written.
+    """
+    rows = ((student.id_number, student.name, student.major) for student in students)
+    return _write_rows(file, STUDENT_FIELDS, rows, fmt)
+
+
+def write_instructors(file, instructors, fmt: str = "csv") -> int:
+    """
+    Write Instructor objects to a CSV or JSON Lines file one record at a time.
+
+    Parameters
+    ----------
+    file : TextIO
+        An open text file to write to.
+    instructors : Iterable[Instructor]
+        The instructors to write, e.g. `sms.iter_instructors()`.
+    fmt : str
+        The file format, either "csv" or "jsonl".
+
+    Returns
+    -------
+    int
+        The number of records written.
+    """
+    rows = ((instructor.id_number, instructor.name, instructor.department) for instructor in instructors)
+    return _write_rows(file, INSTRUCTOR_FIELDS, rows, fmt)
+
+
+def write_courses(file, courses, fmt: str = "csv") -> int:
+    """
+    Write Course objects to a CSV or JSON Lines file one record at a time.
+
+    Parameters
+    ----------
+    file : TextIO
+        An open text file to write to.
+    courses : Iterable[Course]
+        The courses to write, e.g. `sms.iter_courses()`.
+    fmt : str
+        The file format, either "csv" or "jsonl".
+
+    Returns
+    -------
+    int
+        The number of records written.
+    """
+    rows = ((course.course_id, course.course_name, course.capacity, format_meetings(course.meetings),
+             format_prerequisites(course.prerequisites)) for course in courses)
+    return _write_rows(file, COURSE_FIELDS, rows, fmt)
+
+
+def write_enrollments(file, enrollments, fmt: str = "csv") -> int:
+    """
+    Write enrollments to a CSV or JSON Lines file one record at a time.
+
+    Parameters
+    ----------
+    file : TextIO
+        An open text file to write to.
+    enrollments : Iterable[Enrollment]
+        The enrollments to write, e.g. `sms.iter_enrollments()`.
+    fmt : str
+        The file format, either "csv" or "jsonl".
+
+    Returns
+    -------
+    int
+        The number of records written.
+    """
+    rows = ((enrollment.student.id_number, enrollment.course.course_id, enrollment.grade) for enrollment in enrollments)
+    return _write_rows(file, ENROLLMENT_FIELDS, rows, fmt)
+
+
+def write_assignments(file, assignments, fmt: str = "csv") -> int:
+    """
+    Write instructor assignments to a CSV or JSON Lines file one record at a time.
+
+    Parameters
+    ----------
+    file : TextIO
+        An open text file to write to.
+    assignments : Iterable[tuple[int, str]]
+        The `(instructor_id, course_id)` pairs to write, e.g. `sms.iter_assignments()`.
+    fmt : str
+        The file format, either "csv" or "jsonl".
+
+    Returns
+    -------
+    int
+        The number of records written.
+    """
+    return _write_rows(file, ASSIGNMENT_FIELDS, assignments, fmt)
+
+
+def export_system(sms, directory: str, fmt: str = "csv") -> dict[str, int]:
+    """
+    Stream every entity of a Student Management System into one file per entity type.
+
+    Parameters
+    ----------
+    sms : StudentManagementSystem
+        The system to export.
+    directory : str
+        The directory to write `students`, `instructors`, `courses`, `enrollments` and `assignments` files into.
+    fmt : str
+        The file format, either "csv" or "jsonl".
+
+    Returns
+    -------
+    dict[str, int]
+        The number of records written per entity type.
+    """
+    os.makedirs(directory, exist_ok=True)
+    counts = {}
+    for name, writer, records in (("students", write_students, sms.iter_students()),
+                                  ("instructors", write_instructors, sms.iter_instructors()),
+                                  ("courses", write_courses, sms.iter_courses()),
+                                  ("enrollments", write_enrollments, sms.iter_enrollments()),
+                                  ("assignments", write_assignments, sms.iter_assignments())):
+        with open(os.path.join(directory, f"{name}.{fmt}"), "w", newline="", encoding="utf-8") as file:
+            counts[name] = writer(file, records, fmt)
+    return counts
+
+
+def import_system(sms, directory: str, fmt: str = "csv", check_rules: bool = False):
+    """
+    Stream the files written by `export_system` into a Student Management System with `bulk_load`.
+
+    Missing files are skipped, so a directory may hold only some of the entity types. By default the
+    enrollments are restored as exported, so a roster above a since-lowered capacity, or an enrollment
+    whose prerequisite grade was since changed, survives the round trip.
+
+    Parameters
+    ----------
+    sms : StudentManagementSystem
+        The system to load the records into.
+    directory : str
+        The directory holding the `students`, `instructors`, `courses`, `enrollments` and `assignments` files.
+    fmt : str
+        The file format, either "csv" or "jsonl".
+    check_rules : bool, optional
+        Whether enrollments are checked against prerequisites, course capacity and timetable clashes,
+        default False. Pass True to load files that weren't written by `export_system`.
+
+    Returns
+    -------
+    BulkLoadReport
+        The report returned by `bulk_load`.
+    """
+    readers = {"students": read_students, "instructors": read_instructors,
+               "courses": read_courses, "enrollments": read_enrollments, "assignments": read_assignments}
+    files = {}
+    try:
+        for name in readers:
+            path = os.path.join(directory, f"{name}.{fmt}")
+            if os.path.exists(path):
+                files[name] = open(path, newline="", encoding="utf-8")
+        return sms.bulk_load(**{name: readers[name](file, fmt) for name, file in files.items()}, check_rules=check_rules)
+    finally:
+        for file in files.values():
+            file.close()
@@ -0,0 +1,318 @@
+from course import Enrollment
+
+class EnrollmentStore:
+    """
+    A class used to store the enrollments of the Student Management System.
+
+    Enrollments are kept in a dictionary keyed by the `(student_id, course_id)` pair, with
+    secondary per-student and per-course indexes so that lookups never have to walk every
+    enrollment in the system. All the dictionaries preserve insertion order, so iterating
+    the store yields enrollments in the order they were made.
+
+    Attributes
+    ----------
+    by_pair : dict[tuple[int, str], Enrollment]
+        The primary index, mapping a `(student_id, course_id)` pair to its enrollment.
+    by_student_id : dict[int, dict[str, Enrollment]]
+        The secondary index, mapping a student id to that student's enrollments keyed by course id.
+    by_course_id : dict[str, dict[int, Enrollment]]
+        The secondary index, mapping a course id to that course's enrollments keyed by student id.
+
+    Methods
+    -------
+    add(enrollment: Enrollment) -> bool
+        Adds an enrollment to the store if the pair is not already enrolled.
+    insert(key: tuple[int, str], enrollment: Enrollment) -> None
+        Inserts an enrollment without checking for an existing one.
+    get(student_id: int, course_id: str) -> Enrollment | None
+        Retrieves the enrollment of a student in a course.
+    remove(student_id: int, course_id: str) -> Enrollment | None
+        Removes the enrollment of a student in a course.
+    set_grade(student_id: int, course_id: str, grade: str) -> bool
+        Assigns a grade to the enrollment of a student in a course.
+    for_student(student_id: int) -> list[Enrollment]
+        Retrieves the enrollments of a student.
+    for_course(course_id: str) -> list[Enrollment]
+        Retrieves the enrollments of a course.
+    count_for_course(course_id: str) -> int
+        Counts the enrollments of a course.
+    remove_student(student_id: int) -> list[Enrollment]
+        Removes every enrollment of a student.
+    remove_course(course_id: str) -> list[Enrollment]
+        Removes every enrollment of a course.
+    rekey_student(old_id: int, new_id: int) -> None
+        Moves a student's enrollments to a new student id.
+    rekey_course(old_id: str, new_id: str) -> None
+        Moves a course's enrollments to a new course id.
+    """
+
+    def __init__(self) -> None:
+        self.by_pair = {}
+        self.by_student_id = {}
+        self.by_course_id = {}
+
+    def __len__(self) -> int:
+        return len(self.by_pair)
+
+    def __iter__(self):
+        return iter(self.by_pair.values())
+
+    def __contains__(self, key: tuple[int, str]) -> bool:
+        return key in self.by_pair
+
+    def add(self, enrollment: Enrollment) -> bool:
+        """
+        Adds an enrollment to the store if the student is not already enrolled in the course.
+
+        Parameters
+        ----------
+        enrollment : Enrollment
+            The Enrollment object to be added to the store.
+
+        Returns
+        -------
+        bool
+            True if the enrollment was added, False if the pair was already enrolled.
+        """
+        key = (enrollment.student.id_number, enrollment.course.course_id)
+        if key in self.by_pair:
+            return False
+        self.insert(key, enrollment)
+        return True
+
+    def insert(self, key: tuple[int, str], enrollment: Enrollment) -> None:
+        """
+        Inserts an enrollment under a `(student_id, course_id)` pair the caller knows is not yet enrolled.
+
+        This skips the duplicate check done by `add` and is meant for batch loads that have
+        already validated their records.
+
+        Parameters
+        ----------
+        key : tuple[int, str]
+            The `(student_id, course_id)` pair of the enrollment.
+        enrollment : Enrollment
+            The Enrollment object to be inserted into the store.
+        """
+        student_id, course_id = key
+        self.by_pair[key] = enrollment
+        student_index = self.by_student_id.get(student_id)
+        if student_index is None:
+            student_index = self.by_student_id[student_id] = {}
+        student_index[course_id] = enrollment
+        course_index = self.by_course_id.get(course_id)
+        if course_index is None:
+            course_index = self.by_course_id[course_id] = {}
+        course_index[student_id] = enrollment
+
+    def get(self, student_id: int, course_id: str):
+        """
+        Retrieve the enrollment of a student in a course.
+
+        Parameters
+        ----------
+        student_id : int
+            The ID of the enrolled student.
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        Enrollment or None
+            The matching enrollment, or None if the student is not enrolled in the course.
+        """
+        return self.by_pair.get((student_id, course_id))
+
+    def remove(self, student_id: int, course_id: str):
+        """
+        Removes the enrollment of a student in a course, if there is one.
+
+        Parameters
+        ----------
+        student_id : int
+            The ID of the enrolled student.
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        Enrollment or None
+            The removed enrollment, or None if the student was not enrolled in the course.
+        """
+        enrollment = self.by_pair.pop((student_id, course_id), None)
+        if enrollment is None:
+            return None
+        self._discard(self.by_student_id, student_id, course_id)
+        self._discard(self.by_course_id, course_id, student_id)
+        return enrollment
+
+    def set_grade(self, student_id: int, course_id: str, grade: str) -> bool:
+        """
+        Assigns a grade to the enrollment of a student in a course.
+
+        Parameters
+        ----------
+        student_id : int
+            The ID of the enrolled student.
+        course_id : str
+            The ID of the course.
+        grade : str
+            The grade to assign.
+
+        Returns
+        -------
+        bool
+            True if the grade was assigned, False if the student is not enrolled in the course.
+        """
+        enrollment = self.by_pair.get((student_id, course_id))
+        if enrollment is None:
+            return False
+        enrollment.set_grade(grade)
+        return True
+
+    def for_student(self, student_id: int) -> list[Enrollment]:
+        """
+        Retrieve the enrollments of a student, in the order they were made.
+
+        Parameters
+        ----------
+        student_id : int
+            The ID of the student.
+
+        Returns
+        -------
+        list[Enrollment]
+            The enrollments of the student; empty if the student has none.
+        """
+        return list(self.by_student_id.get(student_id, {}).values())
+
+    def for_course(self, course_id: str) -> list[Enrollment]:
+        """
+        Retrieve the enrollments of a course, in the order they were made.
+
+        Parameters
+        ----------
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        list[Enrollment]
+            The enrollments of the course; empty if the course has none.
+        """
+        return list(self.by_course_id.get(course_id, {}).values())
+
+    def count_for_course(self, course_id: str) -> int:
+        """
+        Count the enrollments of a course in O(1).
+
+        Parameters
+        ----------
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        int
+            The number of students enrolled in the course.
+        """
+        return len(self.by_course_id.get(course_id, ()))
+
+    def remove_student(self, student_id: int) -> list[Enrollment]:
+        """
+        Removes every enrollment of a student in O(k), where k is the student's enrollment count.
+
+        Parameters
+        ----------
+        student_id : int
+            The ID of the student.
+
+        Returns
+        -------
+        list[Enrollment]
+            The removed enrollments.
+        """
+        removed = list(self.by_student_id.pop(student_id, {}).values())
+        for enrollment in removed:
+            course_id = enrollment.course.course_id
+            del self.by_pair[(student_id, course_id)]
+            self._discard(self.by_course_id, course_id, student_id)
+        return removed
+
+    def remove_course(self, course_id: str) -> list[Enrollment]:
+        """
+        Removes every enrollment of a course in O(k), where k is the course's enrollment count.
+
+        Parameters
+        ----------
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        list[Enrollment]
+            The removed enrollments.
+        """
+        removed = list(self.by_course_id.pop(course_id, {}).values())
+        for enrollment in removed:
+            student_id = enrollment.student.id_number
+            del self.by_pair[(student_id, course_id)]
+            self._discard(self.by_student_id, student_id, course_id)
+        return removed
+
+    def rekey_student(self, old_id: int, new_id: int) -> None:
+        """
+        Moves a student's enrollments from an old student id to a new one.
+
+        Parameters
+        ----------
+        old_id : int
+            The student's previous ID.
+        new_id : int
+            The student's new ID.
+        """
+        enrollments = self.by_student_id.pop(old_id, None)
+        if not enrollments:
+            return
+        self.by_student_id[new_id] = enrollments
+        for course_id, enrollment in enrollments.items():
+            self.by_pair[(new_id, course_id)] = self.by_pair.pop((old_id, course_id))
+            # rebuild the course's index so the roster keeps its enrollment order
+            course_index = self.by_course_id[course_id]
+            self.by_course_id[course_id] = {
+                (new_id if student_id == old_id else student_id): course_enrollment
+                for student_id, course_enrollment in course_index.items()
+            }
+
+    def rekey_course(self, old_id: str, new_id: str) -> None:
+        """
+        Moves a course's enrollments from an old course id to a new one.
+
+        Parameters
+        ----------
+        old_id : str
+            The course's previous ID.
+        new_id : str
+            The course's new ID.
+        """
+        enrollments = self.by_course_id.pop(old_id, None)
+        if not enrollments:
+            return
+        self.by_course_id[new_id] = enrollments
+        for student_id, enrollment in enrollments.items():
+            self.by_pair[(student_id, new_id)] = self.by_pair.pop((student_id, old_id))
+            student_index = self.by_student_id[student_id]
+            self.by_student_id[student_id] = {
+                (new_id if course_id == old_id else course_id): student_enrollment
+                for course_id, student_enrollment in student_index.items()
+            }
+
+    @staticmethod
+    def _discard(index: dict, outer_key, inner_key) -> None:
+        # drop an entry from a nested index and the bucket itself once it is empty
+        bucket = index.get(outer_key)
+        if bucket is None:
+            return
+        bucket.pop(inner_key, None)
+        if not bucket:
+            del index[outer_key]
@@ -0,0 +1,97 @@
+"""
+Change notifications for the Student Management System.
+
+Every mutation applied by `StudentManagementSystem` is announced to the observers registered
+with `add_observer`, after the change has been made. Layers that must follow the system's state
+(the write-ahead log, secondary indexes, aggregates, ...) subclass `SystemObserver` and
+override the hooks they need; every hook does nothing by default.
+
+Removing a student, an instructor or a course announces the cascaded unenrollments and
+instructor unassignments first, then the removal.
+Seats handed to waitlisted students are announced as ordinary enrollments.
+
+Example
+-------
+class Counter(SystemObserver):
+    def __init__(self):
+        self.enrollments = 0
+
+    def enrolled(self, enrollment):
+        self.enrollments += 1
+
+sms.add_observer(Counter())
+"""
+
+
+class SystemObserver:
+    """
+    A base class for objects notified of the changes made to a Student Management System.
+
+    The `previous` argument of the `*_updated` hooks maps each changed attribute name to its
+    value before the update, so an observer can tell a rename from a change of ID.
+
+    Methods
+    -------
+    student_added(student) / student_updated(student, previous) / student_removed(student) -> None
+        Called when a student is added, updated or removed.
+    instructor_added(instructor) / instructor_updated(instructor, previous) / instructor_removed(instructor) -> None
+        Called when an instructor is added, updated or removed.
+    course_added(course) / course_updated(course, previous) / course_removed(course) -> None
+        Called when a course is added, updated or removed.
+    enrolled(enrollment) / unenrolled(enrollment) -> None
+        Called when an enrollment is created or removed.
+    grade_assigned(enrollment, previous_grade) -> None
+        Called when an enrollment's grade is set.
+    instructor_assigned(instructor, course) / instructor_unassigned(instructor, course) -> None
+        Called when an instructor starts or stops teaching a course.
+    waitlist_joined(student_id, course_id, priority) / waitlist_left(student_id, course_id) -> None
+        Called when a student joins or leaves a course's waitlist on request.
+    """
+
+    def student_added(self, student) -> None:
+        pass
+
+    def student_updated(self, student, previous: dict) -> None:
+        pass
+
+    def student_removed(self, student) -> None:
+        pass
+
+    def instructor_added(self, instructor) -> None:
+        pass
+
+    def instructor_updated(self, instructor, previous: dict) -> None:
+        pass
+
+    def instructor_removed(self, instructor) -> None:
+        pass
+
+    def course_added(self, course) -> None:
+        pass
+
+    def course_updated(self, course, previous: dict) -> None:
+        pass
+
+    def course_removed(self, course) -> None:
+        pass
+
+    def enrolled(self, enrollment) -> None:
+        pass
+
+    def unenrolled(self, enrollment) -> None:
+        pass
+
+    def grade_assigned(self, enrollment, previous_grade) -> None:
+        pass
+
+    def instructor_assigned(self, instructor, course) -> None:
+        pass
+
+    def instructor_unassigned(self, instructor, course) -> None:
+        pass
+
+    def waitlist_joined(self, student_id: int, course_id: str, priority) -> None:
+        pass
+
+    def waitlist_left(self, student_id: int, course_id: str) -> None:
+        pass
@@ -0,0 +1,444 @@
+"""
+Grade history and audit trail for the Student Management System.
+
+`ChangeJournal` follows a system as an observer (see `events.SystemObserver`) and appends a
+`Change` to an in-memory journal for every student, instructor, course and enrollment that is
+added, updated or removed, with the old and new value of each field. Nothing in the journal is
+ever modified, so grades and details that the system overwrites stay on record.
+
+The journal is indexed three ways, each as a time-ordered timeline searched by bisection:
+- by entity, so the history of one student, course or enrollment is found without a scan;
+- by course, for the grade changes made in it ("every grade change in CS101 this term");
+- by position, for the journal as a whole.
+
+`state_as_of(timestamp)` reconstructs every entity's fields at a point in time. Every
+`checkpoint_interval` changes the journal keeps the whole state, a persistent map (see
+`persistent.PersistentMap`) that shares all unchanged entries with the previous checkpoint, so a
+reconstruction replays at most `checkpoint_interval` changes on top of the nearest checkpoint.
+
+Entities are keyed by their ID: ("student", id_number), ("instructor", id_number),
+("course", course_id) and ("enrollment", (student_id, course_id)). When an ID changes, the entity's
+timelines move to the new key, so its history follows it. Courses' meetings and prerequisites
+are not journaled.
+
+Example
+-------
+journal = ChangeJournal(sms)
+sms.assign_grade(1, "CS101", "B")
+sms.assign_grade(1, "CS101", "A")
+print(journal.grade_changes("CS101", start=term_start, end=term_end))
+print(journal.entity_as_of("enrollment", (1, "CS101"), term_start))
+"""
+
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+from events import SystemObserver
+from persistent import PersistentMap
+
+# the journaled fields of each entity kind
+_FIELDS = {
+    "student": ("id_number", "name", "major"),
+    "instructor": ("id_number", "name", "department"),
+    "course": ("course_id", "course_name", "capacity"),
+    "enrollment": ("student_id", "course_id", "grade"),
+}
+
+
+class Change:
+    """
+    A class used to represent one journaled change to an entity of the Student Management System.
+
+    Attributes
+    ----------
+    sequence : int
+        The change's position in the journal.
+    timestamp : float
+        When the change was journaled, in the clock's unit (seconds since the epoch by default).
+    kind : str
+        "student", "instructor", "course" or "enrollment".
+    key : Any
+        The entity's key after the change.
+    action : str
+        "added", "updated" or "removed".
+    fields : dict[str, tuple]
+        Each changed field mapped to its `(old, new)` values; for an addition or a removal, every field,
+        the missing side being None.
+    renamed_from : Any
+        The entity's key before the change if its ID changed, otherwise None.
+    """
+
+    __slots__ = ("sequence", "timestamp", "kind", "key", "action", "fields", "renamed_from")
+
+    def __init__(self, sequence: int, timestamp: float, kind: str, key, action: str, fields: dict, renamed_from=None) -> None:
+        self.sequence = sequence
+        self.timestamp = timestamp
+        self.kind = kind
+        self.key = key
+        self.action = action
+        self.fields = fields
+        self.renamed_from = renamed_from
+
+    def __repr__(self) -> str:
+        renamed = f", renamed_from={self.renamed_from!r}" if self.renamed_from is not None else ""
+        return (f"Change({self.sequence}, {self.timestamp!r}, {self.kind!r}, {self.key!r}, {self.action!r}, "
+                f"{self.fields!r}{renamed})")
+
+
+class _Timeline:
+    # the journal positions of a series of changes, with their timestamps, both in journal order
+    __slots__ = ("timestamps", "positions")
+
+    def __init__(self) -> None:
+        self.timestamps = []
+        self.positions = []
+
+    def append(self, timestamp: float, position: int) -> None:
+        self.timestamps.append(timestamp)
+        self.positions.append(position)
+
+    def extend(self, other: "_Timeline") -> None:
+        # `other` holds older changes only when a key is reused after a rename, so merge by position
+        merged = sorted(zip(self.positions + other.positions, self.timestamps + other.timestamps))
+        self.positions = [position for position, _ in merged]
+        self.timestamps = [timestamp for _, timestamp in merged]
+
+    def between(self, start, end) -> list:
+        # the positions of the changes with start <= timestamp <= end, None meaning unbounded
+        first = 0 if start is None else bisect_left(self.timestamps, start)
+        last = len(self.timestamps) if end is None else bisect_right(self.timestamps, end)
+        return self.positions[first:last]
+
+
+def _apply(state: PersistentMap, change: Change) -> PersistentMap:
+    # the entity state map with one change applied
+    entity = (change.kind, change.key)
+    if change.renamed_from is not None:
+        old_entity = (change.kind, change.renamed_from)
+        values = state.get(old_entity, {})
+        state = state.delete(old_entity) if old_entity in state else state
+    else:
+        values = state.get(entity, {})
+    if change.action == "removed":
+        return state.delete(entity) if entity in state else state
+    values = dict(values)
+    for field, (_, new) in change.fields.items():
+        values[field] = new
+    return state.set(entity, values)
+
+
+class ChangeJournal(SystemObserver):
+    """
+    A class used to keep an append-only, time-indexed journal of the changes made to a Student Management System.
+
+    The system's contents when the journal is attached form its first checkpoint; earlier times
+    can't be reconstructed. Timestamps never go backwards, even if the clock does. Updates and reads
+    hold a lock, so the journal can observe a `ConcurrentStudentManagementSystem` used from several threads.
+
+    Attributes
+    ----------
+    sms : StudentManagementSystem
+        The observed system.
+    started : float
+        The time the journal was attached.
+    checkpoint_interval : int
+        The number of changes between two checkpoints of the whole state.
+
+    Methods
+    -------
+    changes(start=None, end=None) -> list[Change]
+        Every change journaled in a time range.
+    history(kind: str, key, start=None, end=None) -> list[Change]
+        The changes made to one entity.
+    grade_changes(course_id: str, start=None, end=None) -> list[Change]
+        The grade changes made in a course.
+    state_as_of(timestamp) -> PersistentMap
+        Every entity's fields at a point in time.
+    entity_as_of(kind: str, key, timestamp) -> dict | None
+        One entity's fields at a point in time.
+    detach() -> None
+        Stops following the system's changes.
+    """
+
+    def __init__(self, sms, clock=time.time, checkpoint_interval: int = 1024) -> None:
+        """
+        Parameters
+        ----------
+        sms : StudentManagementSystem
+            The system to follow. Its current contents are recorded, then every change to them is journaled.
+        clock : Callable[[], float], optional
+            Returns the current time (default is `time.time`).
+        checkpoint_interval : int, optional
+            The number of changes between two checkpoints (default is 1024). Smaller intervals make
+            reconstructions faster and keep more versions of the state alive.
+
+        Raises
+        ------
+        ValueError
+            If the checkpoint interval is not positive.
+        """
+        if checkpoint_interval < 1:
+            raise ValueError(f"Invalid checkpoint interval {checkpoint_interval}, expected at least 1.")
+        self.sms = sms
+        self.clock = clock
+        self.checkpoint_interval = checkpoint_interval
+        self._lock = threading.RLock()
+        self._changes = []
+        self._timeline = _Timeline()   # every change
+        self._entities = {}            # (kind, key) -> _Timeline
+        self._grades = {}              # course id -> _Timeline of grade changes
+        with self._lock:
+            self.started = self.clock()
+            entries = []
+            for student in sms.iter_students():
+                entries.append((("student", student.id_number), self._values("student", student)))
+            for instructor in sms.iter_instructors():
+                entries.append((("instructor", instructor.id_number), self._values("instructor", instructor)))
+            for course in sms.iter_courses():
+                entries.append((("course", course.course_id), self._values("course", course)))
+            for enrollment in sms.iter_enrollments():
+                values = self._values("enrollment", enrollment)
+                entries.append((("enrollment", (values["student_id"], values["course_id"])), values))
+            self._state = PersistentMap(entries)
+            self._checkpoints = [0]                 # journal positions of the checkpoints
+            self._checkpoint_states = [self._state]  # the state before the change at each position
+        sms.add_observer(self)
+
+    def detach(self) -> None:
+        """
+        Stop following the system's changes; the journal can still be queried.
+        """
+        self.sms.remove_observer(self)
+
+    def __len__(self) -> int:
+        return len(self._changes)
+
+    @staticmethod
+    def _values(kind: str, entity) -> dict:
+        if kind == "enrollment":
+            return {"student_id": entity.student.id_number, "course_id": entity.course.course_id, "grade": entity.grade}
+        return {field: getattr(entity, field) for field in _FIELDS[kind]}
+
+    # reads
+
+    def changes(self, start=None, end=None) -> list:
+        """
+        Return the changes journaled in a time range, oldest first.
+
+        Parameters
+        ----------
+        start, end : float, optional
+            The first and last times included (default is unbounded).
+
+        Returns
+        -------
+        list[Change]
+            The changes with start <= timestamp <= end.
+        """
+        with self._lock:
+            positions = self._timeline.between(start, end)
+            return self._changes[positions[0]:positions[-1] + 1] if positions else []
+
+    def history(self, kind: str, key, start=None, end=None) -> list:
+        """
+        Return the changes made to one entity in a time range, oldest first, including those made under its former IDs.
+
+        Parameters
+        ----------
+        kind : str
+            "student", "instructor", "course" or "enrollment".
+        key : Any
+            The entity's current ID; `(student_id, course_id)` for an enrollment.
+        start, end : float, optional
+            The first and last times included (default is unbounded).
+
+        Returns
+        -------
+        list[Change]
+            The entity's changes, empty if it has none.
+
+        Raises
+        ------
+        ValueError
+            If the kind of entity is unknown.
+        """
+        if kind not in _FIELDS:
+            raise ValueError(f"Unknown kind of entity {kind!r}, expected one of {', '.join(_FIELDS)}.")
+        with self._lock:
+            timeline = self._entities.get((kind, key))
+            return [self._changes[position] for position in timeline.between(start, end)] if timeline else []
+
+    def grade_changes(self, course_id: str, start=None, end=None) -> list:
+        """
+        Return the grade changes made in a course in a time range, oldest first.
+
+        Enrollments that start with a grade count as a grade change; ungraded enrollments and
+        unenrollments don't.
+
+        Parameters
+        ----------
+        course_id : str
+            The course's current ID.
+        start, end : float, optional
+            The first and last times included (default is unbounded).
+
+        Returns
+        -------
+        list[Change]
+            The enrollment changes whose fields include "grade".
+        """
+        with self._lock:
+            timeline = self._grades.get(course_id)
+            return [self._changes[position] for position in timeline.between(start, end)] if timeline else []
+
+    def state_as_of(self, timestamp) -> PersistentMap:
+        """
+        Reconstruct every entity's fields at a point in time, from the nearest checkpoint plus the changes after it.
+
+        Parameters
+        ----------
+        timestamp : float
+            The time; changes journaled at exactly that time are included.
+
+        Returns
+        -------
+        PersistentMap
+            The fields of each entity that existed then, keyed by `(kind, key)`.
+
+        Raises
+        ------
+        ValueError
+            If the time is before the journal was attached.
+        """
+        with self._lock:
+            if timestamp < self.started:
+                raise ValueError(f"Can't reconstruct the state at {timestamp}, the journal started at {self.started}.")
+            position = bisect_right(self._timeline.timestamps, timestamp)
+            checkpoint = bisect_right(self._checkpoints, position) - 1
+            state = self._checkpoint_states[checkpoint]
+            for change in self._changes[self._checkpoints[checkpoint]:position]:
+                state = _apply(state, change)
+            return state
+
+    def entity_as_of(self, kind: str, key, timestamp):
+        """
+        Reconstruct one entity's fields at a point in time.
+
+        Parameters
+        ----------
+        kind : str
+            "student", "instructor", "course" or "enrollment".
+        key : Any
+            The entity's ID at that time.
+        timestamp : float
+            The time.
+
+        Returns
+        -------
+        dict or None
+            The entity's fields, or None if it didn't exist then.
+
+        Raises
+        ------
+        ValueError
+            If the time is before the journal was attached.
+        """
+        return self.state_as_of(timestamp).get((kind, key))
+
+    # updates
+
+    def _journal(self, kind: str, key, action: str, fields: dict, renamed_from=None) -> None:
+        with self._lock:
+            position = len(self._changes)
+            timestamp = self.clock()
+            if self._timeline.timestamps and timestamp < self._timeline.timestamps[-1]:
+                timestamp = self._timeline.timestamps[-1]
+            change = Change(position, timestamp, kind, key, action, fields, renamed_from)
+            self._changes.append(change)
+            self._timeline.append(timestamp, position)
+            entity = (kind, key)
+            if renamed_from is not None:
+                self._move(self._entities, (kind, renamed_from), entity)
+            self._entities.setdefault(entity, _Timeline()).append(timestamp, position)
+            if kind == "enrollment" and "grade" in fields and (action == "updated" or fields["grade"][1] is not None):
+                self._grades.setdefault(key[1], _Timeline()).append(timestamp, position)
+            self._state = _apply(self._state, change)
+            if (position + 1) % self.checkpoint_interval == 0:
+                self._checkpoints.append(position + 1)
+                self._checkpoint_states.append(self._state)
+
+    @staticmethod
+    def _move(timelines: dict, old_key, new_key) -> None:
+        timeline = timelines.pop(old_key, None)
+        if timeline is not None:
+            if new_key in timelines:
+                timeline.extend(timelines[new_key])
+            timelines[new_key] = timeline
+
+    def _added(self, kind: str, key, values: dict) -> None:
+        self._journal(kind, key, "added", {field: (None, value) for field, value in values.items()})
+
+    def _removed(self, kind: str, key, values: dict) -> None:
+        self._journal(kind, key, "removed", {field: (value, None) for field, value in values.items()})
+
+    def _updated(self, kind: str, entity, previous: dict, id_field: str) -> None:
+        key = getattr(entity, id_field)
+        # fields set to the value they already had are left out, and an update that changed nothing isn't journaled
+        fields = {field: (old, getattr(entity, field)) for field, old in previous.items()
+                  if field in _FIELDS[kind] and old != getattr(entity, field)}
+        old_key = previous.get(id_field, key)
+        if fields:
+            self._journal(kind, key, "updated", fields, old_key if old_key != key else None)
+
+    def student_added(self, student) -> None:
+        self._added("student", student.id_number, self._values("student", student))
+
+    def student_updated(self, student, previous: dict) -> None:
+        with self._lock:
+            self._updated("student", student, previous, "id_number")
+            if "id_number" in previous:
+                old_id = previous["id_number"]
+                for course in self.sms.get_courses_of_student(student.id_number):
+                    self._journal("enrollment", (student.id_number, course.course_id), "updated",
+                                  {"student_id": (old_id, student.id_number)}, (old_id, course.course_id))
+
+    def student_removed(self, student) -> None:
+        self._removed("student", student.id_number, self._values("student", student))
+
+    def instructor_added(self, instructor) -> None:
+        self._added("instructor", instructor.id_number, self._values("instructor", instructor))
+
+    def instructor_updated(self, instructor, previous: dict) -> None:
+        self._updated("instructor", instructor, previous, "id_number")
+
+    def instructor_removed(self, instructor) -> None:
+        self._removed("instructor", instructor.id_number, self._values("instructor", instructor))
+
+    def course_added(self, course) -> None:
+        self._added("course", course.course_id, self._values("course", course))
+
+    def course_updated(self, course, previous: dict) -> None:
+        with self._lock:
+            self._updated("course", course, previous, "course_id")
+            if "course_id" in previous:
+                old_id = previous["course_id"]
+                self._move(self._grades, old_id, course.course_id)
+                for student in self.sms.get_students_in_course(course.course_id):
+                    self._journal("enrollment", (student.id_number, course.course_id), "updated",
+                                  {"course_id": (old_id, course.course_id)}, (student.id_number, old_id))
+
+    def course_removed(self, course) -> None:
+        self._removed("course", course.course_id, self._values("course", course))
+
+    def enrolled(self, enrollment) -> None:
+        values = self._values("enrollment", enrollment)
+        self._added("enrollment", (values["student_id"], values["course_id"]), values)
+
+    def unenrolled(self, enrollment) -> None:
+        values = self._values("enrollment", enrollment)
+        self._removed("enrollment", (values["student_id"], values["course_id"]), values)
+
+    def grade_assigned(self, enrollment, previous_grade) -> None:
+        self._journal("enrollment", (enrollment.student.id_number, enrollment.course.course_id), "updated",
+                      {"grade": (previous_grade, enrollment.grade)})
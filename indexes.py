@@ -0,0 +1,470 @@
+"""
+Secondary indexes and a query API for the Student Management System.
+
+`SecondaryIndexes` indexes a system's students by major, instructors by department, courses by
+course name, and all three by the prefix of every word of their name, so "smi" finds "John Smith".
+It builds the indexes once from the system's current
+contents, then keeps them up to date as an observer (see `events.SystemObserver`), so renames,
+ID changes and removals made through the system are reflected immediately.
+
+Lookups return a `Query`: an immutable set of matching entities that can be narrowed with
+`where`, combined with `&`, `|` and `-`, and read a page at a time in ID order.
+
+Example
+-------
+indexes = SecondaryIndexes(sms)
+maths = indexes.find_students(major="Mathematics")
+page = (maths & indexes.find_students(name_prefix="jo")).where(lambda s: s.id_number > 100).page(1, size=20)
+"""
+
+import threading
+
+from events import SystemObserver
+
+
+class AttributeIndex:
+    """
+    A class used to index entities by the value of one attribute.
+
+    Attributes
+    ----------
+    by_value : dict[Any, dict[Any, Any]]
+        The entities with each attribute value, keyed by their id.
+
+    Methods
+    -------
+    add(value, key, entity) / remove(value, key) -> None
+        Indexes an entity under a value, or drops it.
+    get(value) -> dict
+        The entities with a value, keyed by their id.
+    """
+
+    def __init__(self) -> None:
+        self.by_value = {}
+
+    def add(self, value, key, entity) -> None:
+        entities = self.by_value.get(value)
+        if entities is None:
+            entities = self.by_value[value] = {}
+        entities[key] = entity
+
+    def remove(self, value, key) -> None:
+        entities = self.by_value.get(value)
+        if entities is not None:
+            entities.pop(key, None)
+            if not entities:
+                del self.by_value[value]
+
+    def get(self, value) -> dict:
+        return self.by_value.get(value, {})
+
+
+class PrefixIndex:
+    """
+    A class used to find entities with a name word starting with a prefix, ignoring case.
+
+    Each word of a name is indexed under its first one to `depth` case-folded characters, so adding
+    and removing a name costs `depth` dictionary updates per word. Prefixes longer than `depth` are
+    looked up by the bucket of their first word's first `depth` characters, whose names the caller
+    checks in full with `matches`.
+
+    Attributes
+    ----------
+    depth : int
+        The longest prefix with its own bucket.
+    buckets : dict[str, dict[Any, Any]]
+        The entities whose case-folded name starts with each short prefix, keyed by their id.
+
+    Methods
+    -------
+    add(name, key, entity) / remove(name, key) -> None
+        Indexes an entity under its name, or drops it.
+    candidates(prefix: str) -> dict
+        The entities with a name word that may start with a prefix, keyed by their id.
+    matches(name: str, prefix: str) -> bool
+        Checks whether a name, from the start of one of its words, starts with a prefix.
+    """
+
+    def __init__(self, depth: int = 3) -> None:
+        self.depth = depth
+        self.buckets = {}
+
+    def _prefixes(self, name: str):
+        # a set, as words sharing their first letters share buckets
+        return {word[:length] for word in name.casefold().split() for length in range(1, min(len(word), self.depth) + 1)}
+
+    def add(self, name: str, key, entity) -> None:
+        for prefix in self._prefixes(name):
+            entities = self.buckets.get(prefix)
+            if entities is None:
+                entities = self.buckets[prefix] = {}
+            entities[key] = entity
+
+    def remove(self, name: str, key) -> None:
+        for prefix in self._prefixes(name):
+            entities = self.buckets.get(prefix)
+            if entities is not None:
+                entities.pop(key, None)
+                if not entities:
+                    del self.buckets[prefix]
+
+    def candidates(self, prefix: str) -> dict:
+        """
+        The entities with a name word that may start with a prefix: exactly those with one that does if
+        the prefix is a single word of at most `depth` characters, otherwise those with a word sharing
+        the first `depth` characters of the prefix's first word.
+
+        Parameters
+        ----------
+        prefix : str
+            A non-empty prefix, matched ignoring case.
+
+        Returns
+        -------
+        dict
+            The candidate entities keyed by their id. The index's own bucket is returned, so it must not be modified.
+        """
+        first_word = prefix.casefold().split()[:1]
+        return self.buckets.get(first_word[0][:self.depth], {}) if first_word else {}
+
+    @staticmethod
+    def matches(name: str, prefix: str) -> bool:
+        """
+        Check whether a name, read from the start of one of its words, starts with a prefix, ignoring case.
+
+        "smi", "john sm" and "smith" all match "John Smith"; "ohn" doesn't.
+        """
+        folded, prefix = name.casefold(), prefix.casefold().lstrip()
+        return any(folded.startswith(prefix, start) for start in range(len(folded))
+                   if not folded[start].isspace() and (start == 0 or folded[start - 1].isspace()))
+
+
+class Query:
+    """
+    A class used to represent the result of a lookup: a set of entities of one kind.
+
+    A query holds its own copy of the matching entities, so it is not affected by later changes
+    to the system. Results are ordered by entity ID.
+
+    Attributes
+    ----------
+    kind : str
+        The kind of entity matched: "student", "instructor" or "course".
+
+    Methods
+    -------
+    where(predicate) -> Query
+        The entities for which a predicate is true.
+    q1 & q2, q1 | q2, q1 - q2 -> Query
+        The entities matched by both queries, either query, or the first but not the second.
+    page(number: int, size: int = 20) -> list
+        One page of the results, numbered from 1.
+    first() -> Any | None
+        The result with the lowest ID.
+    count() -> int
+        The number of results.
+    all() -> list
+        Every result.
+    """
+
+    def __init__(self, kind: str, entities: dict) -> None:
+        self.kind = kind
+        self._entities = entities
+        self._ordered = None
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __iter__(self):
+        return iter(self.all())
+
+    def __contains__(self, key) -> bool:
+        return key in self._entities
+
+    def _check_kind(self, other: "Query") -> None:
+        if not isinstance(other, Query) or other.kind != self.kind:
+            raise ValueError(f"Cannot combine a {self.kind} query with {other!r}.")
+
+    def __and__(self, other: "Query") -> "Query":
+        self._check_kind(other)
+        small, large = sorted((self._entities, other._entities), key=len)
+        return Query(self.kind, {key: entity for key, entity in small.items() if key in large})
+
+    def __or__(self, other: "Query") -> "Query":
+        self._check_kind(other)
+        return Query(self.kind, {**self._entities, **other._entities})
+
+    def __sub__(self, other: "Query") -> "Query":
+        self._check_kind(other)
+        return Query(self.kind, {key: entity for key, entity in self._entities.items() if key not in other._entities})
+
+    def where(self, predicate) -> "Query":
+        """
+        Narrow the query to the entities for which a predicate is true.
+
+        Parameters
+        ----------
+        predicate : Callable[[Any], bool]
+            Called with each entity.
+
+        Returns
+        -------
+        Query
+            The matching entities.
+        """
+        return Query(self.kind, {key: entity for key, entity in self._entities.items() if predicate(entity)})
+
+    def all(self) -> list:
+        """
+        Every result, in ID order.
+
+        Returns
+        -------
+        list
+            The matching entities.
+        """
+        if self._ordered is None:
+            self._ordered = [self._entities[key] for key in sorted(self._entities)]
+        return list(self._ordered)
+
+    def page(self, number: int, size: int = 20) -> list:
+        """
+        One page of the results in ID order.
+
+        Parameters
+        ----------
+        number : int
+            The page number, starting at 1.
+        size : int
+            The number of results per page (default is 20).
+
+        Returns
+        -------
+        list
+            The entities on the page, empty past the last page.
+
+        Raises
+        ------
+        ValueError
+            If the page number or size is less than 1.
+        """
+        if number < 1 or size < 1:
+            raise ValueError("Page numbers and sizes start at 1.")
+        if self._ordered is None:
+            self.all()
+        return self._ordered[(number - 1) * size:number * size]
+
+    def first(self):
+        """
+        The result with the lowest ID, or None if there are no results.
+        """
+        if not self._entities:
+            return None
+        return self._entities[min(self._entities)]
+
+    def count(self) -> int:
+        """
+        The number of results.
+        """
+        return len(self._entities)
+
+
+class SecondaryIndexes(SystemObserver):
+    """
+    A class used to keep secondary indexes over a Student Management System and query them.
+
+    Index updates and lookups hold a lock, so the indexes can observe a
+    `ConcurrentStudentManagementSystem` used from several threads.
+
+    Attributes
+    ----------
+    sms : StudentManagementSystem
+        The indexed system.
+    majors : AttributeIndex
+        The students keyed by major.
+    departments : AttributeIndex
+        The instructors keyed by department.
+    course_names : AttributeIndex
+        The courses keyed by course name.
+    student_names / instructor_names / course_name_prefixes : PrefixIndex
+        The students, instructors and courses keyed by the prefixes of their name words.
+
+    Methods
+    -------
+    find_students(major: str = None, name_prefix: str = None) -> Query
+        The students with a major and/or a name prefix.
+    find_instructors(department: str = None, name_prefix: str = None) -> Query
+        The instructors in a department and/or with a name prefix.
+    find_courses(course_name: str = None, name_prefix: str = None) -> Query
+        The courses with a name and/or a name prefix.
+    detach() -> None
+        Stops following the system's changes.
+    """
+
+    def __init__(self, sms) -> None:
+        """
+        Parameters
+        ----------
+        sms : StudentManagementSystem
+            The system to index. Its current contents are indexed, then the indexes follow its changes.
+        """
+        self.sms = sms
+        self.majors = AttributeIndex()
+        self.departments = AttributeIndex()
+        self.course_names = AttributeIndex()
+        self.student_names = PrefixIndex()
+        self.instructor_names = PrefixIndex()
+        self.course_name_prefixes = PrefixIndex()
+        self._lock = threading.RLock() # re-entrant, so an update can re-add under the lock it holds
+        for student in sms.iter_students():
+            self.student_added(student)
+        for instructor in sms.iter_instructors():
+            self.instructor_added(instructor)
+        for course in sms.iter_courses():
+            self.course_added(course)
+        sms.add_observer(self)
+
+    def detach(self) -> None:
+        """
+        Stop following the system's changes; the indexes keep their current contents.
+        """
+        self.sms.remove_observer(self)
+
+    # lookups
+
+    def _find(self, kind: str, criteria: list, repository) -> Query:
+        # each criterion is (candidates, predicate): the smallest candidate set is read and checked
+        # against every predicate, so a selective index narrows the work of an unselective one
+        with self._lock:
+            if not criteria:
+                return Query(kind, dict(repository.items()))
+            candidates = min((candidates for candidates, _ in criteria), key=len)
+            predicates = [predicate for _, predicate in criteria]
+            return Query(kind, {key: entity for key, entity in candidates.items()
+                                if all(predicate(entity) for predicate in predicates)})
+
+    @staticmethod
+    def _prefix_criterion(index: PrefixIndex, prefix: str, attribute: str) -> tuple:
+        return index.candidates(prefix), lambda entity: index.matches(getattr(entity, attribute), prefix)
+
+    def find_students(self, major: str = None, name_prefix: str = None) -> Query:
+        """
+        Find the students with a major and/or with a name word starting with a prefix.
+
+        Parameters
+        ----------
+        major : str, optional
+            The exact major to match.
+        name_prefix : str, optional
+            The start of a word of the name, and of the words after it, to match ignoring case.
+
+        Returns
+        -------
+        Query
+            The matching students; every student if no criteria are given.
+        """
+        criteria = []
+        if major is not None:
+            criteria.append((self.majors.get(major), lambda student: student.major == major))
+        if name_prefix:
+            criteria.append(self._prefix_criterion(self.student_names, name_prefix, "name"))
+        return self._find("student", criteria, self.sms.students)
+
+    def find_instructors(self, department: str = None, name_prefix: str = None) -> Query:
+        """
+        Find the instructors in a department and/or with a name word starting with a prefix.
+
+        Parameters
+        ----------
+        department : str, optional
+            The exact department to match.
+        name_prefix : str, optional
+            The start of a word of the name, and of the words after it, to match ignoring case.
+
+        Returns
+        -------
+        Query
+            The matching instructors; every instructor if no criteria are given.
+        """
+        criteria = []
+        if department is not None:
+            criteria.append((self.departments.get(department), lambda instructor: instructor.department == department))
+        if name_prefix:
+            criteria.append(self._prefix_criterion(self.instructor_names, name_prefix, "name"))
+        return self._find("instructor", criteria, self.sms.instructors)
+
+    def find_courses(self, course_name: str = None, name_prefix: str = None) -> Query:
+        """
+        Find the courses with a name and/or with a name word starting with a prefix.
+
+        Parameters
+        ----------
+        course_name : str, optional
+            The exact course name to match.
+        name_prefix : str, optional
+            The start of a word of the course name, and of the words after it, to match ignoring case.
+
+        Returns
+        -------
+        Query
+            The matching courses; every course if no criteria are given.
+        """
+        criteria = []
+        if course_name is not None:
+            criteria.append((self.course_names.get(course_name), lambda course: course.course_name == course_name))
+        if name_prefix:
+            criteria.append(self._prefix_criterion(self.course_name_prefixes, name_prefix, "course_name"))
+        return self._find("course", criteria, self.sms.courses)
+
+    # hooks, an update drops the entity under its previous values and indexes it under the new ones
+
+    def student_added(self, student) -> None:
+        with self._lock:
+            self.majors.add(student.major, student.id_number, student)
+            self.student_names.add(student.name, student.id_number, student)
+
+    def student_updated(self, student, previous: dict) -> None:
+        with self._lock:
+            old_id = previous.get("id_number", student.id_number)
+            self.majors.remove(previous.get("major", student.major), old_id)
+            self.student_names.remove(previous.get("name", student.name), old_id)
+            self.student_added(student)
+
+    def student_removed(self, student) -> None:
+        with self._lock:
+            self.majors.remove(student.major, student.id_number)
+            self.student_names.remove(student.name, student.id_number)
+
+    def instructor_added(self, instructor) -> None:
+        with self._lock:
+            self.departments.add(instructor.department, instructor.id_number, instructor)
+            self.instructor_names.add(instructor.name, instructor.id_number, instructor)
+
+    def instructor_updated(self, instructor, previous: dict) -> None:
+        with self._lock:
+            old_id = previous.get("id_number", instructor.id_number)
+            self.departments.remove(previous.get("department", instructor.department), old_id)
+            self.instructor_names.remove(previous.get("name", instructor.name), old_id)
+            self.instructor_added(instructor)
+
+    def instructor_removed(self, instructor) -> None:
+        with self._lock:
+            self.departments.remove(instructor.department, instructor.id_number)
+            self.instructor_names.remove(instructor.name, instructor.id_number)
+
+    def course_added(self, course) -> None:
+        with self._lock:
+            self.course_names.add(course.course_name, course.course_id, course)
+            self.course_name_prefixes.add(course.course_name, course.course_id, course)
+
+    def course_updated(self, course, previous: dict) -> None:
+        with self._lock:
+            old_id = previous.get("course_id", course.course_id)
+            self.course_names.remove(previous.get("course_name", course.course_name), old_id)
+            self.course_name_prefixes.remove(previous.get("course_name", course.course_name), old_id)
+            self.course_added(course)
+
+    def course_removed(self, course) -> None:
+        with self._lock:
+            self.course_names.remove(course.course_name, course.course_id)
+            self.course_name_prefixes.remove(course.course_name, course.course_id)
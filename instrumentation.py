@@ -0,0 +1,410 @@
+"""
+Opt-in instrumentation and profiling for the Student Management System.
+
+`Instrumentation` wraps the public methods of one system instance to count calls and errors and
+to record a latency histogram per method, plus a histogram of the size of the structure each
+call works over (the student's enrollments for `assign_grade`, the course's roster for
+`remove_course`, ...). The wrappers are instance attributes: a system that was never
+instrumented, or whose instrumentation was detached, runs its methods unchanged, so the cost
+when disabled is zero. The statistics can be exported as a dictionary with `snapshot()` or in
+the Prometheus text exposition format with `prometheus()`.
+
+`profile()` is a context manager that runs a block under cProfile and tracemalloc and fills in
+a `ProfileReport` with the hottest functions and the largest allocations.
+
+Example
+-------
+instrumentation = Instrumentation(sms)
+sms.enroll_student(1, "CS101")
+print(instrumentation.prometheus())
+
+with profile() as report:
+    sms.bulk_load(students=students, enrollments=enrollments)
+print(report)
+"""
+
+import cProfile
+import functools
+import inspect
+import pstats
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left
+
+# the methods instrumented by default; lazy iterators are left out, as a call only creates the iterator
+METHODS = (
+    "add_student", "remove_student", "remove_students", "update_student_details",
+    "add_instructor", "remove_instructor", "update_instructor_details",
+    "add_course", "remove_course", "remove_courses", "update_course_details",
+    "enroll_student", "unenroll_student", "assign_grade", "join_waitlist", "leave_waitlist", "get_waitlist",
+    "assign_instructor", "unassign_instructor", "bulk_load",
+    "get_students_in_course", "get_courses_of_student", "get_missing_prerequisites", "is_eligible",
+    "get_courses_of_instructor", "get_instructors_of_course", "get_students_of_instructor",
+    "get_all_students", "get_all_instructors", "get_all_courses", "get_all_enrollments",
+)
+
+# histogram bucket upper bounds: latencies from a microsecond to ten seconds, sizes from 1 to a million;
+# the latencies are parsed from decimal literals, as 2.5 * 10.0 ** -6 prints as 2.4999999999999998e-06
+LATENCY_BUCKETS = tuple(float(f"{scale}e{exponent}") for exponent in range(-6, 1) for scale in (1, 2.5, 5)) + (10.0,)
+SIZE_BUCKETS = tuple(scale * 10 ** exponent for exponent in range(0, 6) for scale in (1, 2, 5)) + (1_000_000,)
+
+
+def _schedule_size(sms, student_id, *_):
+    return len(sms.enrollments.for_student(student_id))
+
+
+def _roster_size(sms, course_id, *_):
+    return sms.enrollments.count_for_course(course_id)
+
+
+def _teaching_size(sms, instructor_id, *_):
+    return len(sms.assignments.courses_of(instructor_id))
+
+
+# how the size of the structure a call works over is measured, from the call's first arguments, by method
+SIZE_PROBES = {
+    "remove_student": _schedule_size,
+    "update_student_details": _schedule_size,
+    "get_courses_of_student": _schedule_size,
+    "assign_grade": _schedule_size,
+    "get_missing_prerequisites": _schedule_size,
+    "is_eligible": _schedule_size,
+    "enroll_student": lambda sms, student_id, course_id, *_: sms.enrollments.count_for_course(course_id),
+    "unenroll_student": lambda sms, student_id, course_id, *_: sms.enrollments.count_for_course(course_id),
+    "join_waitlist": lambda sms, student_id, course_id, *_: sms.waitlists.waiting(course_id),
+    "leave_waitlist": lambda sms, student_id, course_id, *_: sms.waitlists.waiting(course_id),
+    "get_waitlist": lambda sms, course_id: sms.waitlists.waiting(course_id),
+    "remove_course": _roster_size,
+    "update_course_details": _roster_size,
+    "get_students_in_course": _roster_size,
+    "get_instructors_of_course": lambda sms, course_id: len(sms.assignments.instructors_of(course_id)),
+    "remove_instructor": _teaching_size,
+    "update_instructor_details": _teaching_size,
+    "get_courses_of_instructor": _teaching_size,
+    "get_students_of_instructor": _teaching_size,
+    "remove_students": lambda sms, id_numbers: len(id_numbers),
+    "remove_courses": lambda sms, course_ids: len(course_ids),
+    "get_all_students": lambda sms: len(sms.students),
+    "get_all_instructors": lambda sms: len(sms.instructors),
+    "get_all_courses": lambda sms: len(sms.courses),
+    "get_all_enrollments": lambda sms: len(sms.enrollments),
+}
+
+
+class Histogram:
+    """
+    A class used to count observations into fixed buckets, as Prometheus histograms do.
+
+    Attributes
+    ----------
+    bounds : tuple[float, ...]
+        The upper bound of each bucket, in increasing order; larger observations only count towards `+Inf`.
+    counts : list[int]
+        The number of observations per bucket, the last one holding those above every bound.
+    total : float
+        The sum of the observations.
+    """
+
+    __slots__ = ("bounds", "counts", "total")
+
+    def __init__(self, bounds) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0
+
+    def observe(self, value) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """
+        Return the `(upper_bound, observations_up_to_it)` pairs, ending with `(inf, count)`.
+        """
+        pairs = []
+        running = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+
+class MethodStats:
+    """
+    A class used to hold the statistics of one instrumented method.
+
+    Attributes
+    ----------
+    calls : int
+        The number of calls, failed ones included.
+    errors : int
+        The number of calls that raised an exception.
+    latency : Histogram
+        The duration of the calls in seconds.
+    sizes : Histogram
+        The size of the structure each call worked over, for methods with a size probe.
+    """
+
+    __slots__ = ("calls", "errors", "latency", "sizes")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.sizes = Histogram(SIZE_BUCKETS)
+
+
+class Instrumentation:
+    """
+    A class used to record per-method call counts, latencies and scanned sizes of a Student Management System.
+
+    Calls a public method makes to another one are recorded for both. The statistics are updated
+    under a lock, so an instrumented `ConcurrentStudentManagementSystem` can be used from several threads.
+
+    Attributes
+    ----------
+    sms : StudentManagementSystem
+        The instrumented system.
+    stats : dict[str, MethodStats]
+        The statistics of each instrumented method.
+
+    Methods
+    -------
+    snapshot() -> dict
+        The statistics as plain dictionaries.
+    prometheus(prefix: str = "sms") -> str
+        The statistics in the Prometheus text exposition format.
+    reset() -> None
+        Clears the statistics.
+    detach() -> None
+        Restores the system's methods.
+    """
+
+    def __init__(self, sms, methods=METHODS, probe_sizes: bool = True) -> None:
+        """
+        Parameters
+        ----------
+        sms : StudentManagementSystem
+            The system to instrument.
+        methods : Iterable[str]
+            The names of the methods to instrument (default is `METHODS`).
+        probe_sizes : bool
+            Whether to measure the size of the structure each call works over (default is True). Probing
+            costs one store lookup per call, e.g. a query with `SQLiteStorage`.
+        """
+        self.sms = sms
+        self.stats = {}
+        self._lock = threading.Lock()
+        for name in methods:
+            self.stats[name] = MethodStats()
+            setattr(sms, name, self._wrap(name, getattr(sms, name), SIZE_PROBES.get(name) if probe_sizes else None))
+
+    def detach(self) -> None:
+        """
+        Restore the system's own methods; the statistics keep their current values.
+        """
+        for name in self.stats:
+            self.sms.__dict__.pop(name, None)
+
+    def _wrap(self, name: str, method, probe):
+        all_stats = self.stats
+        lock = self._lock
+        sms = self.sms
+        signature = inspect.signature(method) if probe is not None else None
+
+        @functools.wraps(method)
+        def instrumented(*args, **kwargs):
+            size = None
+            if probe is not None:
+                try:
+                    # keyword arguments are put back in parameter order, the usual positional call skips that
+                    size = probe(sms, *(signature.bind(*args, **kwargs).arguments.values() if kwargs else args))
+                except (KeyError, ValueError, TypeError):
+                    pass # e.g. a missing id, which the call itself reports
+            failed = True
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                elapsed = time.perf_counter() - start
+                with lock:
+                    stats = all_stats[name]
+                    stats.calls += 1
+                    stats.errors += failed
+                    stats.latency.observe(elapsed)
+                    if size is not None:
+                        stats.sizes.observe(size)
+        return instrumented
+
+    def reset(self) -> None:
+        """
+        Clear the statistics of every method.
+        """
+        with self._lock:
+            for name in self.stats:
+                self.stats[name] = MethodStats()
+
+    def snapshot(self) -> dict:
+        """
+        Return the statistics of every method that was called.
+
+        Returns
+        -------
+        dict[str, dict]
+            Per method: `calls`, `errors`, `seconds` (the total duration), `latency` and, for methods
+            with a size probe, `scanned` (the total size) and `sizes`, both histograms given as lists of
+            cumulative `(upper_bound, count)` pairs ending with infinity.
+        """
+        with self._lock:
+            result = {}
+            for name, stats in self.stats.items():
+                if not stats.calls:
+                    continue
+                entry = result[name] = {"calls": stats.calls, "errors": stats.errors, "seconds": stats.latency.total,
+                                        "latency": stats.latency.cumulative()}
+                if any(stats.sizes.counts):
+                    entry["scanned"] = stats.sizes.total
+                    entry["sizes"] = stats.sizes.cumulative()
+            return result
+
+    def prometheus(self, prefix: str = "sms") -> str:
+        """
+        Render the statistics in the Prometheus text exposition format.
+
+        Parameters
+        ----------
+        prefix : str
+            The prefix of the metric names (default is "sms").
+
+        Returns
+        -------
+        str
+            The `<prefix>_calls_total` and `<prefix>_errors_total` counters and the
+            `<prefix>_call_duration_seconds` and `<prefix>_scanned_items` histograms, labelled by method.
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        def histogram(name: str, key: str, total_key: str) -> None:
+            for method, entry in snapshot.items():
+                if key not in entry:
+                    continue
+                count = 0
+                for bound, count in entry[key]:
+                    le = "+Inf" if bound == float("inf") else repr(float(bound))
+                    lines.append(f'{prefix}_{name}_bucket{{method="{method}",le="{le}"}} {count}')
+                lines.append(f'{prefix}_{name}_sum{{method="{method}"}} {entry[total_key]}')
+                lines.append(f'{prefix}_{name}_count{{method="{method}"}} {count}')
+
+        metric("calls_total", "counter", "Calls of each Student Management System method.")
+        lines.extend(f'{prefix}_calls_total{{method="{method}"}} {entry["calls"]}' for method, entry in snapshot.items())
+        metric("errors_total", "counter", "Calls of each method that raised an exception.")
+        lines.extend(f'{prefix}_errors_total{{method="{method}"}} {entry["errors"]}' for method, entry in snapshot.items())
+        metric("call_duration_seconds", "histogram", "Duration of each method's calls.")
+        histogram("call_duration_seconds", "latency", "seconds")
+        metric("scanned_items", "histogram", "Size of the structure each call worked over.")
+        histogram("scanned_items", "sizes", "scanned")
+        return "\n".join(lines) + "\n"
+
+
+class ProfileReport:
+    """
+    A class used to hold the summary of a block run under `profile()`.
+
+    The attributes are filled in when the block exits.
+
+    Attributes
+    ----------
+    seconds : float
+        The wall-clock duration of the block.
+    functions : list[tuple[str, int, float, float]]
+        The `(function, calls, own_seconds, cumulative_seconds)` of the hottest functions, hottest first.
+    memory_peak : int | None
+        The peak size in bytes of the memory traced during the block, None if memory wasn't traced.
+    allocations : list[tuple[str, int, int]]
+        The `(file:line, bytes, blocks)` of the largest allocations still alive at the end of the block.
+    """
+
+    __slots__ = ("seconds", "functions", "memory_peak", "allocations")
+
+    def __init__(self) -> None:
+        self.seconds = 0.0
+        self.functions = []
+        self.memory_peak = None
+        self.allocations = []
+
+    def __str__(self) -> str:
+        lines = [f"{self.seconds:.3f}s"
+                 + (f", peak traced memory {self.memory_peak / 2 ** 20:.1f} MiB" if self.memory_peak is not None else "")]
+        lines.append(f"  {'calls':>10} {'own s':>9} {'cum s':>9}  function")
+        lines.extend(f"  {calls:>10} {own:>9.4f} {cumulative:>9.4f}  {function}"
+                     for function, calls, own, cumulative in self.functions)
+        if self.allocations:
+            lines.append(f"  {'KiB':>10} {'blocks':>9}  allocated at")
+            lines.extend(f"  {size / 1024:>10.1f} {blocks:>9}  {location}" for location, size, blocks in self.allocations)
+        return "\n".join(lines)
+
+
+class profile:
+    """
+    A context manager running a block under cProfile and, optionally, tracemalloc.
+
+    Tracing memory slows the block down considerably, so leave it off when only timings matter.
+
+    Parameters
+    ----------
+    sort : str
+        The `pstats` key the functions are ranked by (default is "cumulative").
+    limit : int
+        The number of functions and allocations reported (default is 15).
+    memory : bool
+        Whether to trace memory allocations with tracemalloc (default is True).
+
+    Example
+    -------
+    with profile(sort="tottime", memory=False) as report:
+        allocate_seats(sms, preferences)
+    print(report)
+    """
+
+    def __init__(self, sort: str = "cumulative", limit: int = 15, memory: bool = True) -> None:
+        self.sort = sort
+        self.limit = limit
+        self.memory = memory
+        self.report = ProfileReport()
+        self._profiler = cProfile.Profile()
+
+    def __enter__(self) -> ProfileReport:
+        # memory traced by someone else is left traced on exit
+        self._started_tracing = self.memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        if self.memory:
+            tracemalloc.reset_peak()
+            self._before = tracemalloc.take_snapshot()
+        self._start = time.perf_counter()
+        self._profiler.enable()
+        return self.report
+
+    def __exit__(self, *exc_info) -> None:
+        self._profiler.disable()
+        report = self.report
+        report.seconds = time.perf_counter() - self._start
+        if self.memory:
+            report.memory_peak = tracemalloc.get_traced_memory()[1]
+            grown = tracemalloc.take_snapshot().compare_to(self._before, "lineno")
+            if self._started_tracing:
+                tracemalloc.stop()
+            grown = sorted((stat for stat in grown if stat.size_diff > 0), key=lambda stat: stat.size_diff, reverse=True)
+            report.allocations = [(str(stat.traceback[0]), stat.size_diff, stat.count_diff) for stat in grown[:self.limit]]
+        stats = pstats.Stats(self._profiler)
+        stats.sort_stats(self.sort)
+        for function in stats.fcn_list[:self.limit]:
+            _, calls, own, cumulative, _ = stats.stats[function]
+            report.functions.append((pstats.func_std_string(function), calls, own, cumulative))
@@ -0,0 +1,535 @@
+"""
+A memory-mapped, read-only snapshot of the Student Management System.
+
+`write_mapped_snapshot` stores a system as fixed-width columns (typed arrays) in one file: a string
+table holding every name, major, department, course id, grade, meeting list and prerequisite list
+once, the students sorted by id, the instructors sorted by id, the courses sorted by course id, and
+four offset indexes that list each course's roster and instructors, each student's schedule and
+each instructor's courses as contiguous runs of positions.
+
+`MappedStudentManagementSystem` maps that file and answers the read methods of
+`StudentManagementSystem` straight from the mapping: opening it reads nothing but the header,
+a lookup is a binary search plus one slice of an index, and objects are only built for the
+records a query returns, then kept for later queries. The operating system pages the file in on demand and shares the pages
+between every process that maps it.
+
+File layout
+-----------
+header   : magic, byte order, then an (offset, length) pair per section
+sections : the columns listed in `_SECTIONS`, each an array of native-endian fixed-width
+           integers aligned to 8 bytes; strings are indexes into the string table and
+           `_NONE` (or -1 for capacities) stands for None; meetings and prerequisites are
+           stored in the text form of `format_meetings` and `format_prerequisites`
+
+Example
+-------
+write_mapped_snapshot(sms, "registry.smap")
+with MappedStudentManagementSystem("registry.smap") as view:
+    print(view.get_students_in_course("CS101"))
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+from course import Course, Enrollment, format_meetings, format_prerequisites, parse_meetings, parse_prerequisites
+from person import Student, Instructor
+
+_MAGIC = b"SMSMAP2\0"
+_NONE = 0xFFFFFFFF # string index standing for None
+
+# (name, typecode) of each column, in file order
+_SECTIONS = (
+    ("string_offsets", "Q"), ("string_data", "B"),
+    ("student_ids", "q"), ("student_names", "I"), ("student_majors", "I"),
+    ("schedule_offsets", "Q"), ("schedule_courses", "I"), ("schedule_grades", "I"),
+    ("instructor_ids", "q"), ("instructor_names", "I"), ("instructor_departments", "I"),
+    ("course_ids", "I"), ("course_names", "I"), ("course_capacities", "q"),
+    ("course_meetings", "I"), ("course_prerequisites", "I"),
+    ("roster_offsets", "Q"), ("roster_students", "I"), ("roster_grades", "I"),
+    ("teaching_offsets", "Q"), ("teaching_courses", "I"),
+    ("staffing_offsets", "Q"), ("staffing_instructors", "I"),
+)
+_HEADER = struct.Struct("<8s1s7x" + "QQ" * len(_SECTIONS))
+_BYTE_ORDER = b"L" if sys.byteorder == "little" else b"B"
+
+
+def write_mapped_snapshot(sms, path: str) -> None:
+    """
+    Write a system's students, instructors, courses, enrollments and instructor assignments to a mappable snapshot file.
+
+    Waitlists are not part of the snapshot.
+
+    Parameters
+    ----------
+    sms : StudentManagementSystem
+        The system to write.
+    path : str
+        The path of the snapshot file.
+
+    Raises
+    ------
+    ValueError
+        If an ID doesn't fit the format (student and instructor ids must be 64-bit integers).
+    """
+    strings = {}
+
+    def intern(value) -> int:
+        if value is None:
+            return _NONE
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    columns = {name: array(typecode) for name, typecode in _SECTIONS}
+    students = sorted(sms.iter_students(), key=lambda student: student.id_number)
+    courses = sorted(sms.iter_courses(), key=lambda course: course.course_id)
+    instructors = sorted(sms.iter_instructors(), key=lambda instructor: instructor.id_number)
+    try:
+        for student in students:
+            columns["student_ids"].append(student.id_number)
+            columns["student_names"].append(intern(student.name))
+            columns["student_majors"].append(intern(student.major))
+        for instructor in instructors:
+            columns["instructor_ids"].append(instructor.id_number)
+            columns["instructor_names"].append(intern(instructor.name))
+            columns["instructor_departments"].append(intern(instructor.department))
+    except (TypeError, OverflowError) as error:
+        raise ValueError(f"IDs must be 64-bit integers to be mapped: {error}") from None
+    for course in courses:
+        columns["course_ids"].append(intern(course.course_id))
+        columns["course_names"].append(intern(course.course_name))
+        columns["course_capacities"].append(-1 if course.capacity is None else course.capacity)
+        columns["course_meetings"].append(intern(format_meetings(course.meetings)))
+        columns["course_prerequisites"].append(intern(format_prerequisites(course.prerequisites)))
+
+    # both offset indexes list enrollments in the order the system made them
+    student_positions = {student.id_number: position for position, student in enumerate(students)}
+    course_positions = {course.course_id: position for position, course in enumerate(courses)}
+    schedules = [[] for _ in students]
+    rosters = [[] for _ in courses]
+    for enrollment in sms.iter_enrollments():
+        student_position = student_positions[enrollment.student.id_number]
+        course_position = course_positions[enrollment.course.course_id]
+        grade = intern(enrollment.grade)
+        schedules[student_position].append((course_position, grade))
+        rosters[course_position].append((student_position, grade))
+    for runs, offsets, targets, grades in ((schedules, "schedule_offsets", "schedule_courses", "schedule_grades"),
+                                           (rosters, "roster_offsets", "roster_students", "roster_grades")):
+        offsets, targets, grades = columns[offsets], columns[targets], columns[grades]
+        offsets.append(0)
+        for run in runs:
+            for target, grade in run:
+                targets.append(target)
+                grades.append(grade)
+            offsets.append(len(targets))
+
+    # and both assignment indexes list them in the order the instructors were assigned
+    instructor_positions = {instructor.id_number: position for position, instructor in enumerate(instructors)}
+    teaching = [[] for _ in instructors]
+    staffing = [[] for _ in courses]
+    for instructor_id, course_id in sms.iter_assignments():
+        teaching[instructor_positions[instructor_id]].append(course_positions[course_id])
+        staffing[course_positions[course_id]].append(instructor_positions[instructor_id])
+    for runs, offsets, targets in ((teaching, "teaching_offsets", "teaching_courses"),
+                                   (staffing, "staffing_offsets", "staffing_instructors")):
+        offsets, targets = columns[offsets], columns[targets]
+        offsets.append(0)
+        for run in runs:
+            targets.extend(run)
+            offsets.append(len(targets))
+
+    string_offsets, string_data = columns["string_offsets"], columns["string_data"]
+    string_offsets.append(0)
+    for value in strings: # dicts keep insertion order, so a string's position is its index
+        string_data.frombytes(str(value).encode("utf-8"))
+        string_offsets.append(len(string_data))
+
+    with open(path, "wb") as file:
+        file.write(b"\0" * _HEADER.size)
+        locations = []
+        for name, _ in _SECTIONS:
+            file.write(b"\0" * (-file.tell() % 8))
+            locations += [file.tell(), len(columns[name])]
+            columns[name].tofile(file)
+        file.seek(0)
+        file.write(_HEADER.pack(_MAGIC, _BYTE_ORDER, *locations))
+
+
+class MappedStudentManagementSystem:
+    """
+    A class used to answer Student Management System queries from a memory-mapped snapshot file.
+
+    The view is read-only and built by `write_mapped_snapshot`. `Student`, `Instructor` and `Course`
+    objects are built from the file the first time a query returns them and reused afterwards,
+    so memory grows with the records touched rather than with the file. The returned courses'
+    rosters are not filled in.
+
+    Attributes
+    ----------
+    path : str
+        The path of the mapped snapshot file.
+    num_students / num_instructors / num_courses / num_enrollments : int
+        The number of records of each type in the snapshot.
+
+    Methods
+    -------
+    get_students_in_course(course_id: str) -> list[Student]
+        Retrieves the students enrolled in a course.
+    get_courses_of_student(student_id: int) -> list[Course]
+        Retrieves the courses a student is enrolled in.
+    get_grade(student_id: int, course_id: str) -> str | None
+        Retrieves the grade of a student in a course.
+    get_courses_of_instructor(instructor_id: int) -> list[Course]
+        Retrieves the courses an instructor teaches.
+    get_instructors_of_course(course_id: str) -> list[Instructor]
+        Retrieves the instructors teaching a course.
+    get_all_students / get_all_instructors / get_all_courses / get_all_enrollments -> list
+        Retrieves every record of a type.
+    iter_students() / iter_instructors() / iter_courses() / iter_enrollments() / iter_assignments() -> Iterator
+        Lazily iterates over every record of a type.
+    iter_schedules(start: int = 0, stop: int = None) -> Iterator[tuple[Student, list[tuple[Course, str]]]]
+        Lazily iterates over a range of students with their courses and grades.
+    iter_rosters(start: int = 0, stop: int = None) -> Iterator[tuple[Course, list[tuple[Student, str]]]]
+        Lazily iterates over a range of courses with their students and grades.
+    close() -> None
+        Unmaps the file.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Parameters
+        ----------
+        path : str
+            The path of a file written by `write_mapped_snapshot`.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a mapped snapshot, or was written on a machine with another byte order.
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, byte_order, *locations = _HEADER.unpack_from(self._map)
+        except struct.error:
+            magic = byte_order = None
+        if magic != _MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a mapped snapshot file.")
+        if byte_order != _BYTE_ORDER:
+            self._map.close()
+            raise ValueError(f"{path} was written on a machine with a different byte order.")
+
+        # each column is a typed view straight onto the mapping, nothing is copied
+        self._buffer = memoryview(self._map)
+        for (name, typecode), offset, length in zip(_SECTIONS, locations[::2], locations[1::2]):
+            size = array(typecode).itemsize
+            setattr(self, f"_{name}", self._buffer[offset:offset + length * size].cast(typecode))
+        self.num_students = len(self._student_ids)
+        self.num_instructors = len(self._instructor_ids)
+        self.num_courses = len(self._course_ids)
+        self.num_enrollments = len(self._roster_students)
+        # the strings and objects built so far, by string index or record position
+        self._strings = {_NONE: None}
+        self._students = {}
+        self._instructors = {}
+        self._courses = {}
+
+    def __enter__(self) -> "MappedStudentManagementSystem":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Unmap the file. Objects already returned by queries stay valid.
+        """
+        if self._map.closed:
+            return
+        for name, _ in _SECTIONS:
+            getattr(self, f"_{name}").release()
+        self._buffer.release()
+        self._map.close()
+
+    # lookups in the mapped columns
+
+    def _string(self, index: int):
+        string = self._strings.get(index)
+        if string is None and index != _NONE:
+            offsets = self._string_offsets
+            string = self._strings[index] = str(self._string_data[offsets[index]:offsets[index + 1]], "utf-8")
+        return string
+
+    def _student_position(self, student_id: int):
+        position = bisect_left(self._student_ids, student_id)
+        if position < self.num_students and self._student_ids[position] == student_id:
+            return position
+        return None
+
+    def _instructor_position(self, instructor_id: int):
+        position = bisect_left(self._instructor_ids, instructor_id)
+        if position < self.num_instructors and self._instructor_ids[position] == instructor_id:
+            return position
+        return None
+
+    def _course_position(self, course_id: str):
+        course_ids = self._course_ids
+        position = bisect_left(range(self.num_courses), course_id, key=lambda position: self._string(course_ids[position]))
+        if position < self.num_courses and self._string(course_ids[position]) == course_id:
+            return position
+        return None
+
+    def _student(self, position: int) -> Student:
+        student = self._students.get(position)
+        if student is None:
+            student = self._students[position] = Student(self._string(self._student_names[position]), self._student_ids[position],
+                                                          self._string(self._student_majors[position]))
+        return student
+
+    def _instructor(self, position: int) -> Instructor:
+        instructor = self._instructors.get(position)
+        if instructor is None:
+            instructor = self._instructors[position] = Instructor(self._string(self._instructor_names[position]),
+                                                                  self._instructor_ids[position],
+                                                                  self._string(self._instructor_departments[position]))
+        return instructor
+
+    def _course(self, position: int) -> Course:
+        course = self._courses.get(position)
+        if course is None:
+            capacity = self._course_capacities[position]
+            course = self._courses[position] = Course(self._string(self._course_names[position]), self._string(self._course_ids[position]),
+                                                      None if capacity < 0 else capacity,
+                                                      parse_meetings(self._string(self._course_meetings[position])),
+                                                      parse_prerequisites(self._string(self._course_prerequisites[position])))
+        return course
+
+    # the read API of StudentManagementSystem
+
+    def get_students_in_course(self, course_id: str) -> list[Student]:
+        """
+        Retrieve the students enrolled in a course, in the order they enrolled.
+
+        Parameters
+        ----------
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        List[Student]
+            The enrolled students.
+
+        Raises
+        ------
+        KeyError
+            If the course ID is not in the snapshot.
+        """
+        position = self._course_position(course_id)
+        if position is None:
+            raise KeyError(f"The Course with ID {course_id} doesn't exist!")
+        start, end = self._roster_offsets[position], self._roster_offsets[position + 1]
+        return [self._student(student) for student in self._roster_students[start:end]]
+
+    def get_courses_of_student(self, student_id: int) -> list[Course]:
+        """
+        Retrieve the courses a student is enrolled in, in the order they enrolled.
+
+        Parameters
+        ----------
+        student_id : int
+            The ID of the student.
+
+        Returns
+        -------
+        List[Course]
+            The courses the student is enrolled in.
+
+        Raises
+        ------
+        ValueError
+            If the student ID is not in the snapshot.
+        """
+        position = self._student_position(student_id)
+        if position is None:
+            raise ValueError(f"The Student with ID {student_id} doesn't exist!")
+        start, end = self._schedule_offsets[position], self._schedule_offsets[position + 1]
+        return [self._course(course) for course in self._schedule_courses[start:end]]
+
+    def get_grade(self, student_id: int, course_id: str):
+        """
+        Retrieve the grade of a student in a course.
+
+        Parameters
+        ----------
+        student_id : int
+            The ID of the student.
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        str or None
+            The grade, or None if no grade has been assigned.
+
+        Raises
+        ------
+        ValueError
+            If the student is not enrolled in the course.
+        """
+        position = self._student_position(student_id)
+        course = self._course_position(course_id)
+        if position is not None and course is not None:
+            start, end = self._schedule_offsets[position], self._schedule_offsets[position + 1]
+            for index in range(start, end):
+                if self._schedule_courses[index] == course:
+                    return self._string(self._schedule_grades[index])
+        raise ValueError(f"No enrollment found for student ID {student_id} in course ID {course_id}.")
+
+    def get_courses_of_instructor(self, instructor_id: int) -> list[Course]:
+        """
+        Retrieve the courses an instructor teaches, in the order they were assigned.
+
+        Parameters
+        ----------
+        instructor_id : int
+            The ID of the instructor.
+
+        Returns
+        -------
+        List[Course]
+            The courses the instructor teaches.
+
+        Raises
+        ------
+        ValueError
+            If the instructor ID is not in the snapshot.
+        """
+        position = self._instructor_position(instructor_id)
+        if position is None:
+            raise ValueError(f"The Instructor with ID {instructor_id} doesn't exist!")
+        start, end = self._teaching_offsets[position], self._teaching_offsets[position + 1]
+        return [self._course(course) for course in self._teaching_courses[start:end]]
+
+    def get_instructors_of_course(self, course_id: str) -> list[Instructor]:
+        """
+        Retrieve the instructors teaching a course, in the order they were assigned.
+
+        Parameters
+        ----------
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        List[Instructor]
+            The instructors teaching the course.
+
+        Raises
+        ------
+        KeyError
+            If the course ID is not in the snapshot.
+        """
+        position = self._course_position(course_id)
+        if position is None:
+            raise KeyError(f"The Course with ID {course_id} doesn't exist!")
+        start, end = self._staffing_offsets[position], self._staffing_offsets[position + 1]
+        return [self._instructor(instructor) for instructor in self._staffing_instructors[start:end]]
+
+    def iter_students(self):
+        """
+        Lazily iterate over the students in the snapshot, in ID order.
+        """
+        return map(self._student, range(self.num_students))
+
+    def iter_instructors(self):
+        """
+        Lazily iterate over the instructors in the snapshot, in ID order.
+        """
+        return map(self._instructor, range(self.num_instructors))
+
+    def iter_courses(self):
+        """
+        Lazily iterate over the courses in the snapshot, in course ID order.
+        """
+        return map(self._course, range(self.num_courses))
+
+    def iter_enrollments(self):
+        """
+        Lazily iterate over the enrollments in the snapshot, course by course.
+        """
+        for position in range(self.num_courses):
+            course = self._course(position)
+            start, end = self._roster_offsets[position], self._roster_offsets[position + 1]
+            for student, grade in zip(self._roster_students[start:end], self._roster_grades[start:end]):
+                yield Enrollment(self._student(student), course, self._string(grade))
+
+    def iter_assignments(self):
+        """
+        Lazily iterate over the instructor assignments in the snapshot as `(instructor_id, course_id)` pairs, course by course.
+        """
+        for position in range(self.num_courses):
+            course_id = self._string(self._course_ids[position])
+            start, end = self._staffing_offsets[position], self._staffing_offsets[position + 1]
+            for instructor in self._staffing_instructors[start:end]:
+                yield self._instructor_ids[instructor], course_id
+
+    def iter_schedules(self, start: int = 0, stop: int = None):
+        """
+        Lazily iterate over a range of the students in ID order, each with the courses they are enrolled in.
+
+        Parameters
+        ----------
+        start, stop : int, optional
+            The positions of the first student and of the one after the last, in ID order
+            (default is every student). Contiguous ranges split the students between workers.
+
+        Yields
+        ------
+        tuple[Student, list[tuple[Course, str | None]]]
+            A student and their `(course, grade)` pairs, in the order they enrolled.
+        """
+        offsets, courses, grades = self._schedule_offsets, self._schedule_courses, self._schedule_grades
+        for position in range(*slice(start, stop).indices(self.num_students)):
+            first, last = offsets[position], offsets[position + 1]
+            yield self._student(position), [(self._course(course), self._string(grade))
+                                            for course, grade in zip(courses[first:last], grades[first:last])]
+
+    def iter_rosters(self, start: int = 0, stop: int = None):
+        """
+        Lazily iterate over a range of the courses in course ID order, each with the students enrolled in it.
+
+        Parameters
+        ----------
+        start, stop : int, optional
+            The positions of the first course and of the one after the last, in course ID order
+            (default is every course).
+
+        Yields
+        ------
+        tuple[Course, list[tuple[Student, str | None]]]
+            A course and its `(student, grade)` pairs, in the order they enrolled.
+        """
+        offsets, students, grades = self._roster_offsets, self._roster_students, self._roster_grades
+        for position in range(*slice(start, stop).indices(self.num_courses)):
+            first, last = offsets[position], offsets[position + 1]
+            yield self._course(position), [(self._student(student), self._string(grade))
+                                           for student, grade in zip(students[first:last], grades[first:last])]
+
+    def get_all_students(self) -> list[Student]:
+        return list(self.iter_students())
+
+    def get_all_instructors(self) -> list[Instructor]:
+        return list(self.iter_instructors())
+
+    def get_all_courses(self) -> list[Course]:
+        return list(self.iter_courses())
+
+    def get_all_enrollments(self) -> list[Enrollment]:
+        return list(self.iter_enrollments())
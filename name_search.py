@@ -0,0 +1,493 @@
+"""
+Prefix and typo-tolerant name search over the students and instructors of the Student Management System.
+
+`NameSearch` splits every person's name into words, folded to lower case without accents, and
+indexes the distinct words (the vocabulary) in three structures:
+- in a prefix trie, so `prefix("ja sm")` walks to the words starting with each query word;
+- under each of its one-letter deletions, which pairs words one or two edits apart (such as
+  "jhon" and "john") even when they share few trigrams, as short names often do;
+- in a trigram inverted index, which finds the words sharing the most three-letter fragments
+  with a query word that is nowhere near a vocabulary word, scored with the Dice coefficient.
+
+Each vocabulary word maps to the people whose name contains it. Names repeat a lot, so the
+vocabulary, and with it the trie and the trigram postings, stays far smaller than the number
+of people. The work per query is bounded: a query naming k people exactly is answered from
+their words' postings alone; otherwise each query word is matched against the words it is,
+starts, or is within two edits of, and only a word with none of those scans the trigram
+postings. Each query word keeps its 64 best-matching words. Candidate people are then drawn
+from the most selective query word, best-matching words first, and the search stops as soon
+as no remaining candidate can beat the k results already found.
+
+The index follows the system as an observer (see `events.SystemObserver`), so adding, renaming,
+re-identifying or removing a student or an instructor updates it immediately.
+
+Example
+-------
+names = NameSearch(sms)
+print(names.prefix("jo sm"))                   # John Smith, Joan Smithers, ...
+print(names.search("jhon smiht", k=5, kind="student"))
+"""
+
+import heapq
+import re
+import threading
+import unicodedata
+from collections import Counter
+from itertools import chain, islice
+
+from events import SystemObserver
+
+_KINDS = ("student", "instructor")
+_WORD = re.compile(r"\w+")
+_MIN_DELETION = 3 # shorter words have too few letters left for their deletions to be telling
+_CANDIDATES = 64 # the most vocabulary words a query word is matched with, best first
+
+
+def words(name: str) -> list:
+    """
+    Split a name into search words: lower case, without accents.
+
+    Parameters
+    ----------
+    name : str
+        A person's name, or a query.
+
+    Returns
+    -------
+    list[str]
+        The words, in order.
+    """
+    folded = unicodedata.normalize("NFKD", name.casefold())
+    return _WORD.findall("".join(character for character in folded if not unicodedata.combining(character)))
+
+
+def deletions(word: str) -> set:
+    """
+    Return the words obtained by deleting one letter of a word.
+    """
+    return {word[:position] + word[position + 1:] for position in range(len(word))}
+
+
+def _near_distance(first: str, second: str) -> int:
+    # the edit distance of two different words found through the deletion index: words whose lengths
+    # differ are one deletion apart, and words of equal length sharing a deletion are one substitution
+    # or one swap of adjacent letters apart, or else two edits
+    if len(first) != len(second):
+        return 1
+    differ = [position for position, (letter, other) in enumerate(zip(first, second)) if letter != other]
+    if len(differ) == 1:
+        return 1
+    if len(differ) == 2 and differ[1] == differ[0] + 1 and first[differ[0]] == second[differ[1]] and first[differ[1]] == second[differ[0]]:
+        return 1
+    return 2
+
+
+def trigrams(word: str) -> set:
+    """
+    Return the three-letter fragments of a word, padded so that its first and last letters weigh as much as the others.
+    """
+    padded = f"  {word} "
+    return {padded[position:position + 3] for position in range(len(padded) - 2)}
+
+
+class _TrieNode:
+    # a node of the prefix trie: the word ending here, if any, and the number of
+    # (person, word) pairs at or below it, which estimates how selective its prefix is
+    __slots__ = ("children", "word", "people")
+
+    def __init__(self) -> None:
+        self.children = {}
+        self.word = None
+        self.people = 0
+
+
+class SearchResult:
+    """
+    A class used to represent one person found by a name search.
+
+    Attributes
+    ----------
+    kind : str
+        "student" or "instructor".
+    person : Student | Instructor
+        The person found.
+    score : float
+        How well the name matches, from 0 to 1; 1 when every query word is in the name or is the start of a name word in a prefix search.
+    """
+
+    __slots__ = ("kind", "person", "score")
+
+    def __init__(self, kind: str, person, score: float) -> None:
+        self.kind = kind
+        self.person = person
+        self.score = score
+
+    def __repr__(self) -> str:
+        return f"SearchResult({self.kind!r}, {self.person.name!r}, id={self.person.id_number}, score={self.score:.2f})"
+
+
+class NameSearch(SystemObserver):
+    """
+    A class used to find students and instructors by partial or misspelled names.
+
+    People are keyed by `(kind, id_number)`. Updates and lookups hold a lock, so the index can
+    observe a `ConcurrentStudentManagementSystem` used from several threads.
+
+    Attributes
+    ----------
+    sms : StudentManagementSystem
+        The indexed system.
+
+    Methods
+    -------
+    prefix(text: str, k: int = 10, kind: str = None) -> list[SearchResult]
+        The people with a name word starting with each query word.
+    search(text: str, k: int = 10, kind: str = None, threshold: float = 0.5) -> list[SearchResult]
+        The people whose name words best match the query words, allowing typos.
+    detach() -> None
+        Stops following the system's changes.
+    """
+
+    def __init__(self, sms) -> None:
+        """
+        Parameters
+        ----------
+        sms : StudentManagementSystem
+            The system to index. Its current students and instructors are indexed, then the index follows its changes.
+        """
+        self.sms = sms
+        self._lock = threading.RLock()
+        self._people = {}     # (kind, id) -> person
+        self._words_of = {}   # (kind, id) -> the distinct words of their name
+        self._postings = {}   # word -> {(kind, id): None}, the people whose name contains it
+        self._trie = _TrieNode()
+        self._trigrams = {}   # trigram -> {word: None}
+        self._gram_counts = {}  # word -> number of distinct trigrams
+        self._deletions = {}  # one-letter deletion of a word of at least _MIN_DELETION letters -> {word: None}
+        with self._lock:
+            for student in sms.iter_students():
+                self._add("student", student)
+            for instructor in sms.iter_instructors():
+                self._add("instructor", instructor)
+        sms.add_observer(self)
+
+    def detach(self) -> None:
+        """
+        Stop following the system's changes; the index keeps its current contents.
+        """
+        self.sms.remove_observer(self)
+
+    def __len__(self) -> int:
+        return len(self._people)
+
+    # the vocabulary
+
+    def _count(self, word: str, delta: int) -> _TrieNode:
+        # add delta to the people along the word's trie path, creating nodes on the way and pruning
+        # the ones left empty; returns the word's node
+        node = self._trie
+        node.people += delta
+        path = []
+        for letter in word:
+            child = node.children.get(letter)
+            if child is None:
+                child = node.children[letter] = _TrieNode()
+            path.append((node, letter))
+            node = child
+            node.people += delta
+        for parent, letter in reversed(path):
+            if parent.children[letter].people:
+                break
+            del parent.children[letter]
+        return node
+
+    def _add_word(self, word: str) -> None:
+        grams = trigrams(word)
+        for gram in grams:
+            self._trigrams.setdefault(gram, {})[word] = None
+        self._gram_counts[word] = len(grams)
+        if len(word) >= _MIN_DELETION:
+            for deleted in deletions(word):
+                self._deletions.setdefault(deleted, {})[word] = None
+
+    def _remove_word(self, word: str) -> None:
+        for gram in trigrams(word):
+            words_with_gram = self._trigrams[gram]
+            del words_with_gram[word]
+            if not words_with_gram:
+                del self._trigrams[gram]
+        del self._gram_counts[word]
+        if len(word) >= _MIN_DELETION:
+            for deleted in deletions(word):
+                words_with_deletion = self._deletions[deleted]
+                del words_with_deletion[word]
+                if not words_with_deletion:
+                    del self._deletions[deleted]
+
+    def _add(self, kind: str, person) -> None:
+        key = (kind, person.id_number)
+        name_words = tuple(dict.fromkeys(words(person.name)))
+        self._people[key] = person
+        self._words_of[key] = name_words
+        for word in name_words:
+            people = self._postings.get(word)
+            if people is None:
+                people = self._postings[word] = {}
+                self._add_word(word)
+            people[key] = None
+            self._count(word, 1).word = word
+
+    def _remove(self, kind: str, id_number: int) -> None:
+        key = (kind, id_number)
+        del self._people[key]
+        name_words = self._words_of.pop(key)
+        for word in name_words:
+            people = self._postings[word]
+            del people[key]
+            node = self._count(word, -1)
+            if not people:
+                node.word = None
+                del self._postings[word]
+                self._remove_word(word)
+
+    # lookups
+
+    @staticmethod
+    def _check(k: int, kind: str) -> None:
+        if k < 1:
+            raise ValueError(f"Invalid number of results {k}, expected at least 1.")
+        if kind is not None and kind not in _KINDS:
+            raise ValueError(f"Unknown kind {kind!r}, expected 'student' or 'instructor'.")
+
+    def _node(self, prefix: str):
+        # the trie node of a prefix, or None if no word starts with it
+        node = self._trie
+        for letter in prefix:
+            node = node.children.get(letter)
+            if node is None:
+                return None
+        return node
+
+    @staticmethod
+    def _completions(node: _TrieNode):
+        # the vocabulary words at or below a node, shortest first, then alphabetically
+        level = [node]
+        while level:
+            yield from sorted(node.word for node in level if node.word is not None)
+            level = [child for node in level for _, child in sorted(node.children.items())]
+
+    def _rank(self, kind: str, matches: list, k: int) -> list:
+        # matches holds, per query word, {vocabulary word: similarity} in decreasing similarity order;
+        # a person must match every query word and scores the mean of their best matches
+        if not matches or not all(matches):
+            return []
+        driver = min(matches, key=lambda found: sum(len(self._postings[word]) for word in found))
+        others = [found for found in matches if found is not driver]
+        others_best = sum(next(iter(found.values())) for found in others)
+        count = len(matches)
+        words_of = self._words_of
+        best = []  # heap of (score, -sequence, key) with the k best so far
+        kept = set()  # the keys in the heap
+        sequence = 0
+        for word, similarity in driver.items():
+            if len(best) == k and (similarity + others_best) / count <= best[0][0]:
+                break # no remaining candidate can enter the top k
+            for key in self._postings[word]:
+                if kind is not None and key[0] != kind:
+                    continue
+                # a person met again under a later driver word scores no better than the first time,
+                # since the driver's words come in decreasing similarity
+                name_words = words_of[key]
+                score = similarity
+                for found in others:
+                    match = 0.0
+                    for name_word in name_words:
+                        other = found.get(name_word, 0.0)
+                        if other > match:
+                            match = other
+                    if not match:
+                        break
+                    score += match
+                else:
+                    sequence -= 1
+                    entry = (score / count, sequence, key)
+                    if key in kept:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif entry > best[0]:
+                        kept.discard(heapq.heapreplace(best, entry)[2])
+                    else:
+                        continue
+                    kept.add(key)
+        return [SearchResult(key[0], self._people[key], score) for score, _, key in sorted(best, reverse=True)]
+
+    def prefix(self, text: str, k: int = 10, kind: str = None) -> list:
+        """
+        Find the people with, for every word of the query, a name word starting with it.
+
+        Parameters
+        ----------
+        text : str
+            The query, e.g. "jo sm"; case and accents are ignored.
+        k : int, optional
+            The maximum number of results (default is 10).
+        kind : str, optional
+            "student" or "instructor" to search only one kind of person (default is both).
+
+        Returns
+        -------
+        list[SearchResult]
+            The matching people; those matching the most selective query word with a shorter name
+            word come first. Every score is 1.
+
+        Raises
+        ------
+        ValueError
+            If k is less than 1 or the kind is unknown.
+        """
+        self._check(k, kind)
+        with self._lock:
+            query = list(dict.fromkeys(words(text)))
+            nodes = [self._node(query_word) for query_word in query]
+            results = []
+            if not query or None in nodes:
+                return results
+            # the people are read from the query word with the fewest, and checked against the others
+            position = min(range(len(query)), key=lambda position: nodes[position].people)
+            others = query[:position] + query[position + 1:]
+            seen = set()
+            for word in self._completions(nodes[position]):
+                for key in self._postings[word]:
+                    if key in seen or (kind is not None and key[0] != kind):
+                        continue
+                    seen.add(key)
+                    name_words = self._words_of[key]
+                    for other in others:
+                        for name_word in name_words:
+                            if name_word.startswith(other):
+                                break
+                        else:
+                            break
+                    else:
+                        results.append(SearchResult(key[0], self._people[key], 1.0))
+                        if len(results) == k:
+                            return results
+            return results
+
+    def search(self, text: str, k: int = 10, kind: str = None, threshold: float = 0.5) -> list:
+        """
+        Find the people whose names best match a query that may be partial or misspelled.
+
+        Each query word is matched with itself, the vocabulary words it starts and those one or two
+        edits away; a query word with none of those is matched through the trigram index instead.
+        A name word scores one minus its edit distance to the query word over the longer word's
+        length, or the Dice coefficient of the two words' trigrams if that is higher; at least 0.9
+        if it starts with the query word, and 1 if it is the query word. Only the 64 best-scoring
+        name words of each query word are kept.
+
+        Parameters
+        ----------
+        text : str
+            The query, e.g. "jhon smiht"; case and accents are ignored.
+        k : int, optional
+            The maximum number of results (default is 10).
+        kind : str, optional
+            "student" or "instructor" to search only one kind of person (default is both).
+        threshold : float, optional
+            The lowest similarity for a name word to match a query word (default is 0.5).
+
+        Returns
+        -------
+        list[SearchResult]
+            The k best-matching people, best first. A person must match every query word, and scores
+            the mean similarity of their best-matching name words.
+
+        Raises
+        ------
+        ValueError
+            If k is less than 1 or the kind is unknown.
+        """
+        self._check(k, kind)
+        with self._lock:
+            query = list(dict.fromkeys(words(text)))
+            if query and all(query_word in self._postings for query_word in query):
+                # the fast path: nobody scores more than the people named by every query word exactly
+                results = self._rank(kind, [{query_word: 1.0} for query_word in query], k)
+                if len(results) == k:
+                    return results
+            return self._rank(kind, [self._matches(query_word, threshold) for query_word in query], k)
+
+    def _matches(self, query_word: str, threshold: float) -> dict:
+        # {vocabulary word: similarity} for one query word, at most _CANDIDATES in decreasing similarity order
+        near = {} # word -> edit distance, for the words the deletion index finds
+        for word in self._deletions.get(query_word, ()):
+            near[word] = 1
+        if len(query_word) >= _MIN_DELETION:
+            for deleted in deletions(query_word):
+                if deleted in self._postings:
+                    near[deleted] = 1
+                for word in self._deletions.get(deleted, ()):
+                    if word not in near and word != query_word:
+                        near[word] = _near_distance(query_word, word)
+        node = self._node(query_word)
+        candidates = chain((query_word,) if query_word in self._postings else (), near,
+                           islice(self._completions(node), _CANDIDATES + 1) if node is not None else ())
+
+        grams = trigrams(query_word)
+        found = {}
+        for word in candidates:
+            if word in found:
+                continue
+            if word == query_word:
+                similarity = 1.0
+            else:
+                similarity = 2 * len(grams & trigrams(word)) / (len(grams) + self._gram_counts[word])
+                distance = near.get(word)
+                if distance is not None:
+                    similarity = max(similarity, 1 - distance / max(len(word), len(query_word)))
+                if word.startswith(query_word):
+                    similarity = max(similarity, 0.9)
+            if similarity >= threshold:
+                found[word] = similarity
+        if not found:
+            # nothing near the query word, so fall back to the words sharing enough of its trigrams: a word
+            # sharing c trigrams has at least c of them, so its Dice coefficient is at most 2c / (len(grams) + c)
+            shared = Counter(chain.from_iterable(self._trigrams.get(gram, ()) for gram in grams))
+            least = threshold * len(grams) / (2 - threshold)
+            for word, common in shared.items():
+                if common >= least:
+                    similarity = 2 * common / (len(grams) + self._gram_counts[word])
+                    if similarity >= threshold:
+                        found[word] = similarity
+        return dict(sorted(found.items(), key=lambda item: (-item[1], item[0]))[:_CANDIDATES])
+
+    # hooks
+
+    def student_added(self, student) -> None:
+        with self._lock:
+            self._add("student", student)
+
+    def student_updated(self, student, previous: dict) -> None:
+        if "name" in previous or "id_number" in previous:
+            with self._lock:
+                self._remove("student", previous.get("id_number", student.id_number))
+                self._add("student", student)
+
+    def student_removed(self, student) -> None:
+        with self._lock:
+            self._remove("student", student.id_number)
+
+    def instructor_added(self, instructor) -> None:
+        with self._lock:
+            self._add("instructor", instructor)
+
+    def instructor_updated(self, instructor, previous: dict) -> None:
+        if "name" in previous or "id_number" in previous:
+            with self._lock:
+                self._remove("instructor", previous.get("id_number", instructor.id_number))
+                self._add("instructor", instructor)
+
+    def instructor_removed(self, instructor) -> None:
+        with self._lock:
+            self._remove("instructor", instructor.id_number)
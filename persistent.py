@@ -0,0 +1,251 @@
+"""
+A persistent (immutable, structurally shared) hash map for the Student Management System.
+
+`PersistentMap` is a hash array mapped trie (HAMT): a tree of nodes with up to 32 children,
+indexed by successive 5-bit chunks of the keys' hashes. `set` and `delete` never modify a map;
+they return a new map that shares every node except the O(log32 n) nodes on the path to the
+changed key, so keeping an old version costs nothing until it diverges, and an old version's
+nodes are freed as soon as no map refers to them anymore.
+
+Example
+-------
+empty = PersistentMap()
+first = empty.set("CS101", 30)
+second = first.set("CS101", 31).set("MATH100", 12)
+print(first["CS101"], second["CS101"], len(first), len(second))   # 30 31 1 2
+"""
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_MASK = (1 << 64) - 1
+_MISSING = object()
+
+
+class _Bitmap:
+    # an inner node: bit i of the bitmap is set when the node has a slot for hash chunk i; a slot is
+    # either an entry tuple (hash, key, value) or a child node, in chunk order
+    __slots__ = ("bitmap", "slots")
+
+    def __init__(self, bitmap: int, slots: tuple) -> None:
+        self.bitmap = bitmap
+        self.slots = slots
+
+
+class _Collision:
+    # the entries of several keys with the same full hash
+    __slots__ = ("hash", "entries")
+
+    def __init__(self, key_hash: int, entries: tuple) -> None:
+        self.hash = key_hash
+        self.entries = entries
+
+
+_EMPTY_NODE = _Bitmap(0, ())
+
+
+def _merge(entry, other, shift: int):
+    # a node holding two entries whose hashes agree below `shift`
+    if entry[0] == other[0]:
+        return _Collision(entry[0], (entry, other))
+    chunk, other_chunk = (entry[0] >> shift) & _MASK, (other[0] >> shift) & _MASK
+    if chunk == other_chunk:
+        return _Bitmap(1 << chunk, (_merge(entry, other, shift + _BITS),))
+    slots = (entry, other) if chunk < other_chunk else (other, entry)
+    return _Bitmap((1 << chunk) | (1 << other_chunk), slots)
+
+
+def _set(node, entry, shift: int):
+    # the node with the entry added or replaced, and whether a key was added
+    key_hash, key = entry[0], entry[1]
+    if type(node) is _Collision:
+        if key_hash == node.hash:
+            for position, (_, other_key, _) in enumerate(node.entries):
+                if other_key is key or other_key == key:
+                    return _Collision(key_hash, node.entries[:position] + (entry,) + node.entries[position + 1:]), False
+            return _Collision(key_hash, node.entries + (entry,)), True
+        # a different hash: push the collision down under a bitmap node
+        node = _Bitmap(1 << ((node.hash >> shift) & _MASK), (node,))
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    position = (node.bitmap & (bit - 1)).bit_count()
+    slots = node.slots
+    if not node.bitmap & bit:
+        return _Bitmap(node.bitmap | bit, slots[:position] + (entry,) + slots[position:]), True
+    slot = slots[position]
+    if type(slot) is tuple:
+        if slot[1] is key or slot[1] == key:
+            if slot[2] is entry[2]:
+                return node, False
+            replacement, added = entry, False
+        else:
+            replacement, added = _merge(slot, entry, shift + _BITS), True
+    else:
+        replacement, added = _set(slot, entry, shift + _BITS)
+        if replacement is slot:
+            return node, False
+    return _Bitmap(node.bitmap, slots[:position] + (replacement,) + slots[position + 1:]), added
+
+
+def _delete(node, key_hash: int, key, shift: int):
+    # the node without the key: _MISSING if the key isn't there, None if the node became empty,
+    # or an entry tuple if a single entry is left, for the parent to hold directly
+    if type(node) is _Collision:
+        if key_hash != node.hash:
+            return _MISSING
+        entries = tuple(entry for entry in node.entries if not (entry[1] is key or entry[1] == key))
+        if len(entries) == len(node.entries):
+            return _MISSING
+        return entries[0] if len(entries) == 1 else _Collision(key_hash, entries)
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    if not node.bitmap & bit:
+        return _MISSING
+    position = (node.bitmap & (bit - 1)).bit_count()
+    slots = node.slots
+    slot = slots[position]
+    if type(slot) is tuple:
+        if not (slot[1] is key or slot[1] == key):
+            return _MISSING
+        replacement = None
+    else:
+        replacement = _delete(slot, key_hash, key, shift + _BITS)
+        if replacement is _MISSING:
+            return _MISSING
+    if replacement is None:
+        bitmap = node.bitmap & ~bit
+        slots = slots[:position] + slots[position + 1:]
+        if not slots:
+            return None
+        if len(slots) == 1 and type(slots[0]) is tuple:
+            return slots[0]
+        return _Bitmap(bitmap, slots)
+    if len(slots) == 1 and type(replacement) is tuple:
+        return replacement
+    return _Bitmap(node.bitmap, slots[:position] + (replacement,) + slots[position + 1:])
+
+
+def _entries(node):
+    for slot in (node.entries if type(node) is _Collision else node.slots):
+        if type(slot) is tuple:
+            yield slot
+        else:
+            yield from _entries(slot)
+
+
+class PersistentMap:
+    """
+    A class used to represent an immutable mapping whose updates return new, structurally shared maps.
+
+    Keys must be hashable. Iteration follows the keys' hashes, not their insertion order.
+
+    Methods
+    -------
+    get(key, default=None) -> Any
+        The value of a key, or a default.
+    set(key, value) -> PersistentMap
+        A map with the key set to the value.
+    delete(key) -> PersistentMap
+        A map without the key.
+    keys() / values() / items() -> Iterator
+        Lazily iterates over the map.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, items=()) -> None:
+        """
+        Parameters
+        ----------
+        items : Mapping | Iterable[tuple], optional
+            The initial contents (default is an empty map).
+        """
+        self._root = _EMPTY_NODE
+        self._size = 0
+        for key, value in (items.items() if hasattr(items, "items") else items):
+            self._root, added = _set(self._root, (hash(key) & _HASH_MASK, key, value), 0)
+            self._size += added
+
+    @classmethod
+    def _make(cls, root, size: int) -> "PersistentMap":
+        persistent = cls.__new__(cls)
+        persistent._root = root
+        persistent._size = size
+        return persistent
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"PersistentMap({dict(self.items())!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PersistentMap):
+            return NotImplemented
+        return self._root is other._root or (self._size == other._size and
+                                             all(other.get(key, _MISSING) == value for key, value in self.items()))
+
+    __hash__ = None
+
+    def get(self, key, default=None):
+        """
+        Return the value of a key, or `default` if the map doesn't hold it.
+        """
+        key_hash = hash(key) & _HASH_MASK
+        node, shift = self._root, 0
+        while True:
+            if type(node) is _Collision:
+                for _, other_key, value in node.entries:
+                    if other_key is key or other_key == key:
+                        return value
+                return default
+            bit = 1 << ((key_hash >> shift) & _MASK)
+            if not node.bitmap & bit:
+                return default
+            slot = node.slots[(node.bitmap & (bit - 1)).bit_count()]
+            if type(slot) is tuple:
+                return slot[2] if slot[1] is key or slot[1] == key else default
+            node, shift = slot, shift + _BITS
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def set(self, key, value) -> "PersistentMap":
+        """
+        Return a map with the key set to the value, sharing every node off the key's path with this map.
+        """
+        root, added = _set(self._root, (hash(key) & _HASH_MASK, key, value), 0)
+        return self if root is self._root else self._make(root, self._size + added)
+
+    def delete(self, key) -> "PersistentMap":
+        """
+        Return a map without the key.
+
+        Raises
+        ------
+        KeyError
+            If the map doesn't hold the key.
+        """
+        root = _delete(self._root, hash(key) & _HASH_MASK, key, 0)
+        if root is _MISSING:
+            raise KeyError(key)
+        if root is None:
+            root = _EMPTY_NODE
+        elif type(root) is tuple:
+            root = _Bitmap(1 << (root[0] & _MASK), (root,))
+        return self._make(root, self._size - 1)
+
+    def __iter__(self):
+        return (entry[1] for entry in _entries(self._root))
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        return (entry[2] for entry in _entries(self._root))
+
+    def items(self):
+        return ((entry[1], entry[2]) for entry in _entries(self._root))
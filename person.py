@@ -10,6 +10,8 @@ class Person:
     id_number : int
         The ID number of the person.
     """
+    __slots__ = ("name", "id_number") # no per-instance __dict__, which dominates memory for large registries
+
     def __init__(self, name: str, id_number: int) -> None:
         self.name = name
         self.id_number = id_number
@@ -33,6 +35,8 @@ class Student(Person):
     major : str
         The major or field of study of the student.
     """
+    __slots__ = ("major",)
+
     def __init__(self, name: str, id_number: int, major: str) -> None:
         # Person.__init__(self, name, id_number) # doesn't follow MRO and the not the best approach
         super().__init__(name, id_number) # follows MRO and the best approach as it maintains class heirarchy
@@ -57,6 +61,8 @@ class Instructor(Person):
     department : str
         The department of the instructor.
     """
+    __slots__ = ("department",)
+
     def __init__(self, name: str, id_number: int, department: str) -> None:
         super().__init__(name, id_number)
         self.department = department
@@ -0,0 +1,395 @@
+"""
+Course prerequisites for the Student Management System.
+
+A course's `prerequisites` map the courses that must be passed first to the minimum grade
+required in each (see `course.Course`). `PrerequisiteGraph` keeps these requirements as a
+directed acyclic graph: requirements that would close a cycle are rejected, and the transitive
+closure of each course (every course below it, with the strictest grade required of it along
+any path) is memoized until a requirement below the course changes. A course requires its
+whole closure, so CS201 requiring CS102 requiring CS101 means CS101 must be passed too.
+
+`EligibilityCache` answers "which requirements of this course hasn't this student met?" from
+the grades of the student's enrollments, memoizing the answer per student and course. A new
+grade only drops the student's answers for the courses above the graded course, and a changed
+requirement only drops the answers for the courses above it, so repeated checks are a
+dictionary lookup.
+
+Example
+-------
+sms.add_course(Course("Intro to Programming", "CS101"))
+sms.add_course(Course("Data Structures", "CS102", prerequisites={"CS101": "C"}))
+sms.get_missing_prerequisites(1, "CS102")   # [("CS101", "C")] until student 1 passes CS101 with C or better
+"""
+
+from analytics import GradeScale
+
+
+class PrerequisiteCycleError(ValueError):
+    """
+    Raised when a course's prerequisites would make it a prerequisite of itself.
+    """
+
+
+class PrerequisiteError(ValueError):
+    """
+    Raised when a student is enrolled in a course whose prerequisites they haven't passed.
+    """
+
+
+class PrerequisiteGraph:
+    """
+    A class used to keep the prerequisites of every course as a directed acyclic graph.
+
+    Attributes
+    ----------
+    requires : dict[str, dict[str, str | None]]
+        The direct prerequisites of each course and the minimum grade required in them, keyed by course id.
+    required_by : dict[str, dict[str, None]]
+        The courses directly requiring each course, keyed by course id.
+    scale : GradeScale
+        The scale used to compare minimum grades.
+
+    Methods
+    -------
+    find_cycle(course_id: str, prerequisites: dict) -> list[str] | None
+        The cycle that giving a course these prerequisites would close.
+    validate(course_id: str, prerequisites: dict) -> None
+        Checks that a course can be given these prerequisites.
+    set(course_id: str, prerequisites: dict) -> set[str]
+        Replaces the prerequisites of a course.
+    closure(course_id: str) -> dict[str, str | None]
+        Every course below a course, with the strictest minimum grade required in it.
+    dependents(course_id: str) -> set[str]
+        Every course above a course, the course included.
+    remove_course(course_id: str) -> list[str]
+        Removes a course and every requirement on it.
+    rename(old_id: str, new_id: str) -> None
+        Moves a course's requirements to a new course id.
+    """
+
+    def __init__(self, scale: GradeScale = None) -> None:
+        self.requires = {}
+        self.required_by = {}
+        self.scale = scale if scale is not None else GradeScale()
+        self._closures = {}   # course id -> memoized closure
+        self._dependents = {} # course id -> memoized dependents, dropped whenever any requirement changes
+
+    def find_cycle(self, course_id: str, prerequisites):
+        """
+        Find the cycle that giving a course these prerequisites would close.
+
+        Parameters
+        ----------
+        course_id : str
+            The ID of the course.
+        prerequisites : Iterable[str]
+            The IDs of the course's new prerequisites.
+
+        Returns
+        -------
+        list[str] | None
+            The course IDs along the cycle, starting and ending with `course_id`, or None if there is no cycle.
+        """
+        # a cycle exists if the course is below one of its new prerequisites, found by a depth-first
+        # search below each of them that keeps the path it followed
+        visited = set()
+        for prerequisite in prerequisites:
+            if prerequisite == course_id:
+                return [course_id, course_id]
+            if prerequisite in visited:
+                continue
+            visited.add(prerequisite)
+            path = [course_id, prerequisite]
+            stack = [iter(self.requires.get(prerequisite, ()))]
+            while stack:
+                below = next(stack[-1], None)
+                if below is None:
+                    stack.pop()
+                    path.pop()
+                elif below == course_id:
+                    return path + [course_id]
+                elif below not in visited:
+                    visited.add(below)
+                    path.append(below)
+                    stack.append(iter(self.requires.get(below, ())))
+        return None
+
+    def validate(self, course_id: str, prerequisites: dict) -> None:
+        """
+        Check that a course can be given these prerequisites. They may name courses that don't exist yet.
+
+        Parameters
+        ----------
+        course_id : str
+            The ID of the course.
+        prerequisites : dict[str, str | None]
+            The minimum grade required in each prerequisite, keyed by course id.
+
+        Raises
+        ------
+        ValueError
+            If a minimum grade is not on the grade scale.
+        PrerequisiteCycleError
+            If the prerequisites would make the course a prerequisite of itself.
+        """
+        for prerequisite, grade in prerequisites.items():
+            if grade is not None and self.scale.get(grade) is None:
+                raise ValueError(f"The minimum grade {grade!r} required in course ID {prerequisite} is not on the grade scale.")
+        cycle = self.find_cycle(course_id, prerequisites)
+        if cycle is not None:
+            raise PrerequisiteCycleError(f"Prerequisites of course ID {course_id} would form the cycle {' -> '.join(cycle)}.")
+
+    def set(self, course_id: str, prerequisites: dict) -> set:
+        """
+        Replace the prerequisites of a course, after checking them with `validate`.
+
+        Parameters
+        ----------
+        course_id : str
+            The ID of the course.
+        prerequisites : dict[str, str | None]
+            The minimum grade required in each prerequisite, keyed by course id.
+
+        Returns
+        -------
+        set[str]
+            The courses whose closure changed: the course and every course above it.
+
+        Raises
+        ------
+        ValueError
+            If a minimum grade is not on the grade scale.
+        PrerequisiteCycleError
+            If the prerequisites would make the course a prerequisite of itself.
+        """
+        self.validate(course_id, prerequisites)
+        affected = self.dependents(course_id)
+        self._forget(affected)
+        for prerequisite in self.requires.pop(course_id, ()):
+            self._unlink(prerequisite, course_id)
+        if prerequisites:
+            self.requires[course_id] = dict(prerequisites)
+            for prerequisite in prerequisites:
+                self.required_by.setdefault(prerequisite, {})[course_id] = None
+        return affected
+
+    def closure(self, course_id: str) -> dict:
+        """
+        Return every course below a course, memoized until a requirement below it changes.
+
+        Parameters
+        ----------
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        dict[str, str | None]
+            The strictest minimum grade required in each course below, keyed by course id. The dictionary is
+            shared with the memo and must not be modified.
+        """
+        closure = self._closures.get(course_id)
+        if closure is None:
+            closure = {}
+            for prerequisite, grade in self.requires.get(course_id, {}).items():
+                self._require(closure, prerequisite, grade)
+                for below, below_grade in self.closure(prerequisite).items():
+                    self._require(closure, below, below_grade)
+            self._closures[course_id] = closure
+        return closure
+
+    def dependents(self, course_id: str) -> set:
+        """
+        Return every course above a course, the course included.
+
+        Parameters
+        ----------
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        set[str]
+            The course IDs, shared with the memo and not to be modified.
+        """
+        dependents = self._dependents.get(course_id)
+        if dependents is None:
+            dependents = {course_id}
+            pending = [course_id]
+            while pending:
+                for above in self.required_by.get(pending.pop(), ()):
+                    if above not in dependents:
+                        dependents.add(above)
+                        pending.append(above)
+            self._dependents[course_id] = dependents
+        return dependents
+
+    def remove_course(self, course_id: str) -> list:
+        """
+        Remove a course's own prerequisites and every requirement other courses have on it.
+
+        Parameters
+        ----------
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        list[str]
+            The IDs of the courses that required the removed course.
+        """
+        self._forget(self.dependents(course_id))
+        for prerequisite in self.requires.pop(course_id, ()):
+            self._unlink(prerequisite, course_id)
+        dependents = list(self.required_by.pop(course_id, ()))
+        for above in dependents:
+            requirements = self.requires[above]
+            del requirements[course_id]
+            if not requirements:
+                del self.requires[above]
+        return dependents
+
+    def rename(self, old_id: str, new_id: str) -> None:
+        self._forget(self.dependents(old_id))
+        prerequisites = self.requires.pop(old_id, None)
+        if prerequisites is not None:
+            self.requires[new_id] = prerequisites
+            for prerequisite in prerequisites:
+                above = self.required_by[prerequisite]
+                del above[old_id]
+                above[new_id] = None
+        dependents = self.required_by.pop(old_id, None)
+        if dependents is not None:
+            self.required_by[new_id] = dependents
+            for above in dependents:
+                self.requires[above] = {(new_id if key == old_id else key): grade for key, grade in self.requires[above].items()}
+
+    def _require(self, closure: dict, course_id: str, grade) -> None:
+        # keep the stricter of two minimum grades, None being the least strict
+        current = closure.get(course_id, False)
+        if current is False or current is None or (grade is not None and self.scale.get(grade) > self.scale.get(current)):
+            closure[course_id] = grade
+
+    def _forget(self, course_ids) -> None:
+        for course_id in course_ids:
+            self._closures.pop(course_id, None)
+        self._dependents.clear()
+
+    def _unlink(self, prerequisite: str, course_id: str) -> None:
+        above = self.required_by[prerequisite]
+        del above[course_id]
+        if not above:
+            del self.required_by[prerequisite]
+
+
+class EligibilityCache:
+    """
+    A class used to memoize which prerequisites each student is missing for each course.
+
+    A student's grades are read from their enrollments the first time they are checked and
+    kept up to date by `grade_changed`. Without a minimum grade, any grade but a failing one
+    (zero points on the scale, e.g. "F") passes; with one, the grade must be on the scale with
+    at least as many points.
+
+    Attributes
+    ----------
+    graph : PrerequisiteGraph
+        The prerequisites checked.
+    enrollments_of : Callable[[int], Iterable[Enrollment]]
+        Returns a student's enrollments, e.g. `sms.enrollments.for_student`.
+
+    Methods
+    -------
+    missing(student_id: int, course_id: str) -> tuple[tuple[str, str | None], ...]
+        The requirements of a course a student hasn't met.
+    grade_changed(student_id: int, course_id: str, grade: str) -> None
+        Records a student's new grade in a course.
+    requirements_changed(course_ids: Iterable[str]) -> None
+        Drops the answers for courses whose closure changed.
+    forget_student(student_id: int) / clear() -> None
+        Drops the memoized answers of a student, or of everyone.
+    """
+
+    def __init__(self, graph: PrerequisiteGraph, enrollments_of) -> None:
+        self.graph = graph
+        self.enrollments_of = enrollments_of
+        self._grades = {}     # student id -> {course id: grade}
+        self._missing = {}    # student id -> {course id: missing requirements}
+        self._checked = {}    # course id -> {student id: None}, the students with a memoized answer for the course
+
+    def missing(self, student_id: int, course_id: str) -> tuple:
+        """
+        Return the requirements of a course a student hasn't met, memoized until one of its inputs changes.
+
+        Parameters
+        ----------
+        student_id : int
+            The ID of the student.
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        tuple[tuple[str, str | None], ...]
+            The `(course_id, minimum_grade)` requirements not met, empty if the student is eligible.
+        """
+        answers = self._missing.get(student_id)
+        if answers is not None and course_id in answers:
+            return answers[course_id]
+        closure = self.graph.closure(course_id)
+        if not closure:
+            return ()
+        grades = self._grades.get(student_id)
+        if grades is None:
+            grades = self._grades[student_id] = {enrollment.course.course_id: enrollment.grade
+                                                 for enrollment in self.enrollments_of(student_id)
+                                                 if enrollment.grade is not None}
+        missing = tuple((required, minimum) for required, minimum in closure.items()
+                        if not self._passes(grades.get(required), minimum))
+        self._missing.setdefault(student_id, {})[course_id] = missing
+        self._checked.setdefault(course_id, {})[student_id] = None
+        return missing
+
+    def _passes(self, grade, minimum) -> bool:
+        if grade is None:
+            return False
+        points = self.graph.scale.get(grade)
+        if minimum is None:
+            return points is None or points > 0
+        return points is not None and points >= self.graph.scale.get(minimum)
+
+    def grade_changed(self, student_id: int, course_id: str, grade) -> None:
+        """
+        Record a student's new grade in a course, None if the grade or the enrollment was removed.
+
+        Only the student's answers for the courses above the graded course are dropped.
+        """
+        grades = self._grades.get(student_id)
+        if grades is not None:
+            if grade is None:
+                grades.pop(course_id, None)
+            else:
+                grades[course_id] = grade
+        answers = self._missing.get(student_id)
+        if answers:
+            for above in self.graph.dependents(course_id):
+                if answers.pop(above, None) is not None:
+                    del self._checked[above][student_id]
+
+    def requirements_changed(self, course_ids) -> None:
+        """
+        Drop every student's answers for courses whose closure changed, e.g. those returned by `PrerequisiteGraph.set`.
+        """
+        for course_id in course_ids:
+            for student_id in self._checked.pop(course_id, ()):
+                del self._missing[student_id][course_id]
+
+    def forget_student(self, student_id: int) -> None:
+        self._grades.pop(student_id, None)
+        for course_id in self._missing.pop(student_id, ()):
+            del self._checked[course_id][student_id]
+
+    def clear(self) -> None:
+        self._grades.clear()
+        self._missing.clear()
+        self._checked.clear()
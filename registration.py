@@ -0,0 +1,360 @@
+"""
+Course capacity, waitlists and seat allocation for the Student Management System.
+
+Courses with a `capacity` stop accepting enrollments once they are full. Students can then
+join the course's waitlist, a priority queue from which `StudentManagementSystem.unenroll_student`
+promotes the next student whenever a seat frees up. For registration rushes, `allocate_seats`
+takes a whole term's ranked preferences and assigns every seat in one pass.
+
+Example
+-------
+result = allocate_seats(sms, [(1, ["CS101", "MATH101"]), (2, ["CS101"])], max_courses=1)
+print(result.assigned, result.waitlisted)
+"""
+
+import heapq
+from itertools import count
+
+
+class CourseFullError(ValueError):
+    """
+    Raised when a student is enrolled in a course that has no free seat left.
+    """
+
+
+class Waitlist:
+    """
+    A class used to represent the waitlist of a course as a priority queue.
+
+    Students with a lower priority value are served first, and students with equal priority
+    are served in the order they joined. Removing a student only marks their heap entry as
+    stale, so joining, leaving and popping are all O(log n).
+
+    Attributes
+    ----------
+    entries : dict[int, list]
+        The live heap entry of each waitlisted student keyed by student id.
+
+    Methods
+    -------
+    push(student_id: int, priority=0) -> None
+        Adds a student to the waitlist, or moves them to a new priority.
+    remove(student_id: int) -> bool
+        Removes a student from the waitlist.
+    pop() -> int | None
+        Removes and returns the student at the head of the waitlist.
+    student_ids() -> list[int]
+        The waitlisted students in the order they will be served.
+    """
+
+    def __init__(self) -> None:
+        self.entries = {}
+        self._heap = []
+        self._order = count()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, student_id: int) -> bool:
+        return student_id in self.entries
+
+    def push(self, student_id: int, priority=0) -> None:
+        """
+        Add a student to the waitlist, or move an already waitlisted student to a new priority.
+
+        Parameters
+        ----------
+        student_id : int
+            The ID of the student to waitlist.
+        priority : Any, optional
+            The student's priority; lower values are served first (default is 0).
+        """
+        self.remove(student_id)
+        entry = [priority, next(self._order), student_id]
+        self.entries[student_id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def remove(self, student_id: int) -> bool:
+        """
+        Remove a student from the waitlist.
+
+        Parameters
+        ----------
+        student_id : int
+            The ID of the student to remove.
+
+        Returns
+        -------
+        bool
+            True if the student was on the waitlist, False otherwise.
+        """
+        entry = self.entries.pop(student_id, None)
+        if entry is None:
+            return False
+        entry[-1] = None # the entry stays in the heap and is skipped when it reaches the top
+        return True
+
+    def pop(self):
+        """
+        Remove and return the student at the head of the waitlist.
+
+        Returns
+        -------
+        int or None
+            The ID of the student served next, or None if the waitlist is empty.
+        """
+        while self._heap:
+            student_id = heapq.heappop(self._heap)[-1]
+            if student_id is not None:
+                del self.entries[student_id]
+                return student_id
+        return None
+
+    def student_ids(self) -> list[int]:
+        """
+        List the waitlisted students in the order they will be served.
+
+        Returns
+        -------
+        list[int]
+            The IDs of the waitlisted students.
+        """
+        return [entry[-1] for entry in sorted(self.entries.values())]
+
+    def rekey_student(self, old_id: int, new_id: int) -> None:
+        """
+        Moves a waitlisted student from an old student id to a new one, keeping their place.
+
+        Parameters
+        ----------
+        old_id : int
+            The student's previous ID.
+        new_id : int
+            The student's new ID.
+        """
+        entry = self.entries.pop(old_id, None)
+        if entry is not None:
+            entry[-1] = new_id
+            self.entries[new_id] = entry
+
+
+class WaitlistBook:
+    """
+    A class used to keep the waitlists of every course, with a reverse index from students to
+    the courses they are waitlisted for.
+
+    Attributes
+    ----------
+    by_course_id : dict[str, Waitlist]
+        The waitlist of each course that has one, keyed by course id.
+    by_student_id : dict[int, set[str]]
+        The IDs of the courses each student is waitlisted for, keyed by student id.
+
+    Methods
+    -------
+    join(student_id: int, course_id: str, priority=0) -> None
+        Adds a student to a course's waitlist.
+    leave(student_id: int, course_id: str) -> bool
+        Removes a student from a course's waitlist.
+    waiting(course_id: str) -> int
+        The number of students on a course's waitlist.
+    student_ids(course_id: str) -> list[int]
+        The students on a course's waitlist in the order they will be served.
+    pop(course_id: str) -> int | None
+        Removes and returns the student at the head of a course's waitlist.
+    remove_student(student_id: int) / remove_course(course_id: str) -> None
+        Drops a student from every waitlist, or drops a course's waitlist.
+    rekey_student(old_id: int, new_id: int) / rekey_course(old_id: str, new_id: str) -> None
+        Moves waitlist places to a new student or course id.
+    """
+
+    def __init__(self) -> None:
+        self.by_course_id = {}
+        self.by_student_id = {}
+
+    def join(self, student_id: int, course_id: str, priority=0) -> None:
+        waitlist = self.by_course_id.get(course_id)
+        if waitlist is None:
+            waitlist = self.by_course_id[course_id] = Waitlist()
+        waitlist.push(student_id, priority)
+        self.by_student_id.setdefault(student_id, set()).add(course_id)
+
+    def leave(self, student_id: int, course_id: str) -> bool:
+        waitlist = self.by_course_id.get(course_id)
+        if waitlist is None or not waitlist.remove(student_id):
+            return False
+        self._forget(student_id, course_id)
+        return True
+
+    def waiting(self, course_id: str) -> int:
+        return len(self.by_course_id.get(course_id, ()))
+
+    def student_ids(self, course_id: str) -> list[int]:
+        waitlist = self.by_course_id.get(course_id)
+        return waitlist.student_ids() if waitlist is not None else []
+
+    def pop(self, course_id: str):
+        waitlist = self.by_course_id.get(course_id)
+        student_id = waitlist.pop() if waitlist is not None else None
+        if student_id is not None:
+            self._forget(student_id, course_id)
+        return student_id
+
+    def remove_student(self, student_id: int) -> None:
+        for course_id in self.by_student_id.pop(student_id, ()):
+            waitlist = self.by_course_id[course_id]
+            waitlist.remove(student_id)
+            if not waitlist:
+                del self.by_course_id[course_id]
+
+    def remove_course(self, course_id: str) -> None:
+        waitlist = self.by_course_id.pop(course_id, None)
+        if waitlist is not None:
+            for student_id in list(waitlist.entries):
+                self._forget(student_id, course_id)
+
+    def rekey_student(self, old_id: int, new_id: int) -> None:
+        course_ids = self.by_student_id.pop(old_id, None)
+        if course_ids:
+            self.by_student_id[new_id] = course_ids
+            for course_id in course_ids:
+                self.by_course_id[course_id].rekey_student(old_id, new_id)
+
+    def rekey_course(self, old_id: str, new_id: str) -> None:
+        waitlist = self.by_course_id.pop(old_id, None)
+        if waitlist is not None:
+            self.by_course_id[new_id] = waitlist
+            for student_id in waitlist.entries:
+                course_ids = self.by_student_id[student_id]
+                course_ids.discard(old_id)
+                course_ids.add(new_id)
+
+    def _forget(self, student_id: int, course_id: str) -> None:
+        course_ids = self.by_student_id.get(student_id)
+        if course_ids is not None:
+            course_ids.discard(course_id)
+            if not course_ids:
+                del self.by_student_id[student_id]
+        waitlist = self.by_course_id.get(course_id)
+        if waitlist is not None and not waitlist:
+            del self.by_course_id[course_id]
+
+
+class AllocationResult:
+    """
+    A class used to report the outcome of an `allocate_seats` run.
+
+    Attributes
+    ----------
+    assigned : dict[int, list[str]]
+        The IDs of the courses each student was enrolled in, keyed by student id.
+    waitlisted : dict[int, list[str]]
+        The IDs of the full courses each student was waitlisted for, keyed by student id.
+    errors : list[tuple[int, str, str]]
+        The preferences that could not be honoured as `(student_id, course_id, message)` tuples.
+    """
+
+    def __init__(self) -> None:
+        self.assigned = {}
+        self.waitlisted = {}
+        self.errors = []
+
+    def __str__(self) -> str:
+        seats = sum(len(course_ids) for course_ids in self.assigned.values())
+        waits = sum(len(course_ids) for course_ids in self.waitlisted.values())
+        return f"Seats assigned: {seats}, Waitlist places: {waits}, Errors: {len(self.errors)}"
+
+
+def allocate_seats(sms, preferences, max_courses: int = None, waitlist: bool = True) -> AllocationResult:
+    """
+    Assign a whole term's seats from ranked student preferences in one pass.
+
+    Students are served in the order they appear in `preferences`, which is their priority
+    (e.g. by seniority or by a lottery). Each student receives their highest-ranked courses
+    that still have a free seat, whose prerequisites they have passed and that don't clash with their
+    timetable, up to `max_courses`; ineligible and clashing courses are reported in the errors and skipped. Full courses passed over on the way can be
+    waitlisted, with priority given by preference rank and then by the student's position.
+    Seat counts are tracked locally and the enrollments are written with one
+    `bulk_load` call, so the allocation costs O(total preferences).
+
+    Parameters
+    ----------
+    sms : StudentManagementSystem
+        The system to enroll the students in.
+    preferences : Iterable[tuple[int, Sequence[str]]]
+        `(student_id, ranked_course_ids)` pairs, highest-priority student first.
+    max_courses : int, optional
+        The most courses a student may be assigned, counting existing enrollments (default is no limit).
+    waitlist : bool
+        Whether to waitlist students for full courses they ranked (default is True).
+
+    Returns
+    -------
+    AllocationResult
+        The seats assigned, the waitlist places taken and the preferences that were rejected.
+    """
+    result = AllocationResult()
+    free_seats = {} # course id -> seats left, None for unlimited courses
+    courses = {} # course id -> Course, looked up once
+    enrollments = []
+    waitlist_places = []
+
+    for position, (student_id, ranked_course_ids) in enumerate(preferences):
+        if student_id not in sms.students:
+            result.errors.append((student_id, None, f"The Student with ID {student_id} doesn't exist!"))
+            continue
+        taken = len(sms.enrollments.for_student(student_id)) if max_courses is not None else 0
+        chosen = set()
+        meetings = [] # (meeting, course id) of the courses assigned to the student so far in this allocation
+        for rank, course_id in enumerate(ranked_course_ids):
+            if max_courses is not None and taken >= max_courses:
+                break
+            if course_id not in free_seats:
+                if course_id not in sms.courses:
+                    result.errors.append((student_id, course_id, f"The Course with ID {course_id} doesn't exist!"))
+                    continue
+                courses[course_id] = sms.courses[course_id]
+                capacity = courses[course_id].capacity
+                free_seats[course_id] = None if capacity is None else capacity - sms.enrollments.count_for_course(course_id)
+            if course_id in chosen or (student_id, course_id) in sms.enrollments:
+                continue
+            chosen.add(course_id)
+            course = courses[course_id]
+            missing = sms.eligibility.missing(student_id, course_id)
+            if missing:
+                result.errors.append((student_id, course_id, f"The Student with ID {student_id} hasn't passed the prerequisites "
+                                      f"of course ID {course_id}: {', '.join(required for required, _ in missing)}."))
+                continue
+            clash = course.meetings and (sms.timetable.student_conflict(student_id, course)
+                                         or next((other_id for meeting in course.meetings for other, other_id in meetings
+                                                  if meeting.overlaps(other)), None))
+            if clash:
+                result.errors.append((student_id, course_id, f"The Course with ID {course_id} clashes with course ID {clash}."))
+                continue
+            seats = free_seats[course_id]
+            if seats is None or seats > 0:
+                if seats is not None:
+                    free_seats[course_id] = seats - 1
+                meetings.extend((meeting, course_id) for meeting in course.meetings)
+                enrollments.append((student_id, course_id))
+                result.assigned.setdefault(student_id, []).append(course_id)
+                taken += 1
+            elif waitlist:
+                waitlist_places.append((student_id, course_id, rank))
+
+    report = sms.bulk_load(enrollments=enrollments)
+    for _, position, message in report.errors:
+        student_id, course_id = enrollments[position]
+        result.assigned[student_id].remove(course_id)
+        result.errors.append((student_id, course_id, message))
+
+    # the courses are only full once the enrollments are loaded, so the waitlists are joined last;
+    # students join in priority order, so ties on rank are served by position
+    for student_id, course_id, rank in waitlist_places:
+        try:
+            sms.join_waitlist(student_id, course_id, priority=rank)
+        except ValueError as error:
+            result.errors.append((student_id, course_id, str(error)))
+        else:
+            result.waitlisted.setdefault(student_id, []).append(course_id)
+    return result
@@ -0,0 +1,158 @@
+"""
+Multiprocess report generation for the Student Management System.
+
+`write_reports` renders a text transcript for every student or a roster for every course. The
+system is first written to a mapped snapshot (see `mapped_snapshot.py`), the students or courses
+are split into contiguous shards in ID order, and a pool of worker processes renders one shard
+each into its own file. Every worker maps the same snapshot read-only, so the data is shared
+through the operating system's page cache instead of being pickled to each process, and only the
+shard bounds and the number of reports written cross process boundaries. The shard files are then
+concatenated in order, so the output is identical whatever the number of processes.
+
+Example
+-------
+write_reports(sms, "transcripts", "transcripts.txt", processes=4)
+write_reports("registry.smap", "rosters", "rosters.txt")
+"""
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from analytics import GradeScale
+from mapped_snapshot import MappedStudentManagementSystem, write_mapped_snapshot
+
+KINDS = ("transcripts", "rosters")
+
+
+def format_transcript(student, schedule, scale: GradeScale = None) -> str:
+    """
+    Render a student's transcript as text.
+
+    Parameters
+    ----------
+    student : Student
+        The student.
+    schedule : Iterable[tuple[Course, str | None]]
+        The student's courses and grades.
+    scale : GradeScale, optional
+        The scale used to compute the GPA (default is `GradeScale()`).
+
+    Returns
+    -------
+    str
+        The transcript, ending with a blank line. The GPA averages the grades on the scale.
+    """
+    scale = scale if scale is not None else GradeScale()
+    lines = [f"Transcript: {student.name} (ID {student.id_number}), {student.major}"]
+    total = graded = 0
+    for course, grade in schedule:
+        lines.append(f"  {course.course_id:<10} {course.course_name:<40} {grade if grade is not None else '-'}")
+        points = scale.get(grade)
+        if points is not None:
+            total += points
+            graded += 1
+    lines.append(f"  GPA: {total / graded:.2f} over {graded} graded courses" if graded else "  GPA: n/a")
+    return "\n".join(lines) + "\n\n"
+
+
+def format_roster(course, roster) -> str:
+    """
+    Render a course's roster as text.
+
+    Parameters
+    ----------
+    course : Course
+        The course.
+    roster : Sequence[tuple[Student, str | None]]
+        The course's students and their grades.
+
+    Returns
+    -------
+    str
+        The roster, ending with a blank line.
+    """
+    capacity = f" of {course.capacity}" if course.capacity is not None else ""
+    lines = [f"Roster: {course.course_id} {course.course_name}, {len(roster)}{capacity} enrolled"]
+    for student, grade in roster:
+        lines.append(f"  {student.id_number:<10} {student.name:<30} {student.major or '':<25} {grade if grade is not None else '-'}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _write_shard(snapshot_path: str, kind: str, start: int, stop: int, shard_path: str, scale: GradeScale) -> int:
+    # render the reports of one shard into its own file; runs in a worker process
+    with MappedStudentManagementSystem(snapshot_path) as view, open(shard_path, "w", encoding="utf-8") as file:
+        written = 0
+        if kind == "transcripts":
+            for student, schedule in view.iter_schedules(start, stop):
+                file.write(format_transcript(student, schedule, scale))
+                written += 1
+        else:
+            for course, roster in view.iter_rosters(start, stop):
+                file.write(format_roster(course, roster))
+                written += 1
+        return written
+
+
+def write_reports(source, kind: str, path: str, processes: int = None, shards: int = None, scale: GradeScale = None) -> int:
+    """
+    Render a transcript for every student or a roster for every course into one text file, in parallel.
+
+    Parameters
+    ----------
+    source : StudentManagementSystem | str
+        The system to report on, or the path of a snapshot written by `write_mapped_snapshot`.
+        A system is written to a temporary mapped snapshot first.
+    kind : str
+        "transcripts" for one report per student in ID order, "rosters" for one per course in course ID order.
+    path : str
+        The path of the file to write.
+    processes : int, optional
+        The number of worker processes (default is `os.cpu_count()`). With 1, the shards are
+        rendered in the calling process.
+    shards : int, optional
+        The number of shards the records are split into (default is four per process, so a slow
+        shard doesn't leave the other processes idle).
+    scale : GradeScale, optional
+        The scale used to compute GPAs on transcripts (default is `GradeScale()`).
+
+    Returns
+    -------
+    int
+        The number of reports written.
+
+    Raises
+    ------
+    ValueError
+        If the kind is not one of `KINDS`.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown report kind {kind!r}, expected one of {', '.join(KINDS)}.")
+    processes = processes or os.cpu_count() or 1
+    shards = shards or processes * 4
+    directory = tempfile.mkdtemp(prefix="sms-reports-", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        if isinstance(source, str):
+            snapshot_path = source
+        else:
+            snapshot_path = os.path.join(directory, "snapshot.smap")
+            write_mapped_snapshot(source, snapshot_path)
+        with MappedStudentManagementSystem(snapshot_path) as view:
+            count = view.num_students if kind == "transcripts" else view.num_courses
+        shards = max(min(shards, count), 1)
+        bounds = [count * shard // shards for shard in range(shards + 1)]
+        jobs = [(snapshot_path, kind, start, stop, os.path.join(directory, f"shard-{shard:05d}.txt"), scale)
+                for shard, (start, stop) in enumerate(zip(bounds, bounds[1:]))]
+        if processes == 1:
+            written = sum(_write_shard(*job) for job in jobs)
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                written = sum(pool.map(_write_shard, *zip(*jobs)))
+        with open(path, "wb") as output:
+            for job in jobs:
+                with open(job[4], "rb") as shard:
+                    shutil.copyfileobj(shard, output)
+        return written
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
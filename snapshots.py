@@ -0,0 +1,438 @@
+"""
+Versioned, copy-on-write read snapshots of the Student Management System.
+
+`VersionedSnapshots` follows a system as an observer (see `events.SystemObserver`) and keeps its
+own copy of the students, instructors, courses, rosters and schedules in persistent maps (see
+`persistent.PersistentMap`). Every change replaces the affected entries with new maps that share
+all other nodes with the previous version, in O(log32 n), and bumps the version number.
+
+`snapshot()` hands out the current version in O(1): a `Snapshot` holding the roots of the maps,
+which later changes never touch. A long-running report reads a frozen, consistent view while
+writers keep going, instead of iterating over live rosters or copying every enrollment. The
+nodes of an old version are freed as soon as its last snapshot is released (or garbage
+collected) and no newer version shares them.
+
+Entities in a snapshot are copies made when the change was announced, so renaming a student
+after the snapshot was taken doesn't show through; the courses' rosters are not filled in.
+A cascaded removal is announced change by change, so a snapshot taken from another thread while
+it runs can hold a student with part of their enrollments removed.
+
+Example
+-------
+snapshots = VersionedSnapshots(sms)
+with snapshots.snapshot() as view:
+    sms.unenroll_student(1, "CS101")           # not visible in the view
+    print(view.version, view.get_students_in_course("CS101"))
+"""
+
+import threading
+import weakref
+
+from course import Course, Enrollment
+from events import SystemObserver
+from persistent import PersistentMap
+from person import Student, Instructor
+
+_EMPTY = PersistentMap()
+
+
+def _copy_student(student: Student) -> Student:
+    return Student(student.name, student.id_number, student.major)
+
+
+def _copy_instructor(instructor: Instructor) -> Instructor:
+    return Instructor(instructor.name, instructor.id_number, instructor.department)
+
+
+def _copy_course(course: Course) -> Course:
+    return Course(course.course_name, course.course_id, course.capacity, course.meetings, course.prerequisites)
+
+
+class Snapshot:
+    """
+    A class used to read one version of a Student Management System, unaffected by later changes.
+
+    Built by `VersionedSnapshots.snapshot()`. Rosters and schedules are listed in the order the
+    students enrolled. Once released, the snapshot can't be read anymore.
+
+    Attributes
+    ----------
+    version : int
+        The number of changes applied to the system's copy when the snapshot was taken.
+    num_students / num_instructors / num_courses / num_enrollments : int
+        The number of records of each type in the snapshot.
+
+    Methods
+    -------
+    get_student(student_id: int) -> Student
+        Retrieves a student.
+    get_students_in_course(course_id: str) -> list[Student]
+        Retrieves the students enrolled in a course.
+    get_courses_of_student(student_id: int) -> list[Course]
+        Retrieves the courses a student is enrolled in.
+    get_grade(student_id: int, course_id: str) -> str | None
+        Retrieves the grade of a student in a course.
+    get_all_students / get_all_instructors / get_all_courses / get_all_enrollments -> list
+        Retrieves every record of a type.
+    iter_students() / iter_instructors() / iter_courses() / iter_enrollments() -> Iterator
+        Lazily iterates over every record of a type.
+    release() -> None
+        Gives the version up, so its memory can be reclaimed.
+    """
+
+    __slots__ = ("version", "num_enrollments", "_students", "_instructors", "_courses",
+                 "_rosters", "_schedules", "_release", "__weakref__")
+
+    def __init__(self, version: int, state: tuple, num_enrollments: int) -> None:
+        self.version = version
+        self.num_enrollments = num_enrollments
+        self._students, self._instructors, self._courses, self._rosters, self._schedules = state
+        self._release = None
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    def __repr__(self) -> str:
+        return f"Snapshot(version={self.version})"
+
+    def release(self) -> None:
+        """
+        Give the snapshot up. Objects already returned by queries stay valid; releasing twice does nothing.
+        """
+        self._students = self._instructors = self._courses = self._rosters = self._schedules = None
+        if self._release is not None:
+            self._release()
+
+    @property
+    def num_students(self) -> int:
+        return len(self._students)
+
+    @property
+    def num_instructors(self) -> int:
+        return len(self._instructors)
+
+    @property
+    def num_courses(self) -> int:
+        return len(self._courses)
+
+    def get_student(self, student_id: int) -> Student:
+        """
+        Retrieve a student.
+
+        Raises
+        ------
+        ValueError
+            If the student ID is not in the snapshot.
+        """
+        student = self._students.get(student_id)
+        if student is None:
+            raise ValueError(f"The Student with ID {student_id} doesn't exist!")
+        return student
+
+    def get_students_in_course(self, course_id: str) -> list[Student]:
+        """
+        Retrieve the students enrolled in a course, in the order they enrolled.
+
+        Parameters
+        ----------
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        List[Student]
+            The enrolled students.
+
+        Raises
+        ------
+        KeyError
+            If the course ID is not in the snapshot.
+        """
+        roster = self._rosters.get(course_id)
+        if roster is None:
+            raise KeyError(f"The Course with ID {course_id} doesn't exist!")
+        students = self._students
+        return [students[student_id] for student_id, _ in sorted(roster.items(), key=lambda item: item[1][0])]
+
+    def get_courses_of_student(self, student_id: int) -> list[Course]:
+        """
+        Retrieve the courses a student is enrolled in, in the order they enrolled.
+
+        Parameters
+        ----------
+        student_id : int
+            The ID of the student.
+
+        Returns
+        -------
+        List[Course]
+            The courses the student is enrolled in.
+
+        Raises
+        ------
+        ValueError
+            If the student ID is not in the snapshot.
+        """
+        schedule = self._schedules.get(student_id)
+        if schedule is None:
+            raise ValueError(f"The Student with ID {student_id} doesn't exist!")
+        courses = self._courses
+        return [courses[course_id] for course_id, _ in sorted(schedule.items(), key=lambda item: item[1][0])]
+
+    def get_grade(self, student_id: int, course_id: str):
+        """
+        Retrieve the grade of a student in a course.
+
+        Returns
+        -------
+        str or None
+            The grade, or None if no grade has been assigned.
+
+        Raises
+        ------
+        ValueError
+            If the student is not enrolled in the course.
+        """
+        entry = self._schedules.get(student_id, _EMPTY).get(course_id)
+        if entry is None:
+            raise ValueError(f"No enrollment found for student ID {student_id} in course ID {course_id}.")
+        return entry[1]
+
+    def iter_students(self):
+        """
+        Lazily iterate over the students in the snapshot.
+        """
+        return self._students.values()
+
+    def iter_instructors(self):
+        """
+        Lazily iterate over the instructors in the snapshot.
+        """
+        return self._instructors.values()
+
+    def iter_courses(self):
+        """
+        Lazily iterate over the courses in the snapshot.
+        """
+        return self._courses.values()
+
+    def iter_enrollments(self):
+        """
+        Lazily iterate over the enrollments in the snapshot, course by course.
+        """
+        students, courses = self._students, self._courses
+        for course_id, roster in self._rosters.items():
+            course = courses[course_id]
+            for student_id, (_, grade) in sorted(roster.items(), key=lambda item: item[1][0]):
+                yield Enrollment(students[student_id], course, grade)
+
+    def get_all_students(self) -> list[Student]:
+        return list(self.iter_students())
+
+    def get_all_instructors(self) -> list[Instructor]:
+        return list(self.iter_instructors())
+
+    def get_all_courses(self) -> list[Course]:
+        return list(self.iter_courses())
+
+    def get_all_enrollments(self) -> list[Enrollment]:
+        return list(self.iter_enrollments())
+
+
+class VersionedSnapshots(SystemObserver):
+    """
+    A class used to hand out O(1), immutable snapshots of a Student Management System.
+
+    Each roster maps student IDs, and each schedule course IDs, to an `(enrollment sequence, grade)`
+    pair; the sequence keeps the order students enrolled in, since persistent maps iterate in hash
+    order. Updates and `snapshot()` hold a lock, so the snapshots can follow a
+    `ConcurrentStudentManagementSystem` used from several threads; reading a snapshot takes no lock.
+
+    Attributes
+    ----------
+    sms : StudentManagementSystem
+        The observed system.
+    version : int
+        The number of changes applied so far.
+
+    Methods
+    -------
+    snapshot() -> Snapshot
+        The current version, frozen.
+    open_versions() -> dict[int, int]
+        The number of unreleased snapshots of each version.
+    detach() -> None
+        Stops following the system's changes.
+    """
+
+    def __init__(self, sms) -> None:
+        """
+        Parameters
+        ----------
+        sms : StudentManagementSystem
+            The system to follow. Its current contents are copied, then kept up to date with its changes.
+        """
+        self.sms = sms
+        self.version = 0
+        self._lock = threading.RLock()
+        self._readers = {}  # version -> number of unreleased snapshots
+        self._sequence = 0  # enrollments made so far, to order rosters and schedules
+        with self._lock:
+            self._students = PersistentMap((student.id_number, _copy_student(student)) for student in sms.iter_students())
+            self._instructors = PersistentMap((instructor.id_number, _copy_instructor(instructor))
+                                              for instructor in sms.iter_instructors())
+            self._courses = PersistentMap((course.course_id, _copy_course(course)) for course in sms.iter_courses())
+            rosters = {course_id: {} for course_id in self._courses}
+            schedules = {student_id: {} for student_id in self._students}
+            for enrollment in sms.iter_enrollments():
+                student_id, course_id = enrollment.student.id_number, enrollment.course.course_id
+                rosters[course_id][student_id] = schedules[student_id][course_id] = (self._sequence, enrollment.grade)
+                self._sequence += 1
+            self._rosters = PersistentMap((course_id, PersistentMap(roster)) for course_id, roster in rosters.items())
+            self._schedules = PersistentMap((student_id, PersistentMap(schedule)) for student_id, schedule in schedules.items())
+            self._enrollments = self._sequence
+        sms.add_observer(self)
+
+    def detach(self) -> None:
+        """
+        Stop following the system's changes; snapshots taken so far stay readable.
+        """
+        self.sms.remove_observer(self)
+
+    def snapshot(self) -> Snapshot:
+        """
+        Return the current version of the system, which no later change affects.
+
+        Release the snapshot (or use it as a context manager) once done, so the memory only it
+        holds can be reclaimed; a snapshot that is garbage collected is released too.
+
+        Returns
+        -------
+        Snapshot
+            A read-only view of the system as of now.
+        """
+        with self._lock:
+            state = (self._students, self._instructors, self._courses, self._rosters, self._schedules)
+            snapshot = Snapshot(self.version, state, self._enrollments)
+            self._readers[self.version] = self._readers.get(self.version, 0) + 1
+        snapshot._release = weakref.finalize(snapshot, self._released, snapshot.version)
+        return snapshot
+
+    def open_versions(self) -> dict:
+        """
+        Return the number of unreleased snapshots of each version, oldest first.
+        """
+        with self._lock:
+            return dict(sorted(self._readers.items()))
+
+    def _released(self, version: int) -> None:
+        with self._lock:
+            readers = self._readers[version] - 1
+            if readers:
+                self._readers[version] = readers
+            else:
+                del self._readers[version]
+
+    # updates
+
+    def _set_entry(self, student_id: int, course_id: str, entry) -> None:
+        # put (or, with entry None, remove) an enrollment in both its roster and its schedule
+        roster, schedule = self._rosters[course_id], self._schedules[student_id]
+        if entry is None:
+            roster, schedule = roster.delete(student_id), schedule.delete(course_id)
+        else:
+            roster, schedule = roster.set(student_id, entry), schedule.set(course_id, entry)
+        self._rosters = self._rosters.set(course_id, roster)
+        self._schedules = self._schedules.set(student_id, schedule)
+
+    def student_added(self, student) -> None:
+        with self._lock:
+            self._students = self._students.set(student.id_number, _copy_student(student))
+            self._schedules = self._schedules.set(student.id_number, _EMPTY)
+            self.version += 1
+
+    def student_updated(self, student, previous: dict) -> None:
+        with self._lock:
+            old_id = previous.get("id_number", student.id_number)
+            if old_id != student.id_number:
+                schedule = self._schedules[old_id]
+                self._students = self._students.delete(old_id)
+                self._schedules = self._schedules.delete(old_id).set(student.id_number, schedule)
+                for course_id, entry in schedule.items():
+                    roster = self._rosters[course_id].delete(old_id).set(student.id_number, entry)
+                    self._rosters = self._rosters.set(course_id, roster)
+            self._students = self._students.set(student.id_number, _copy_student(student))
+            self.version += 1
+
+    def student_removed(self, student) -> None:
+        # the removal's unenrollments have already been applied
+        with self._lock:
+            self._students = self._students.delete(student.id_number)
+            self._schedules = self._schedules.delete(student.id_number)
+            self.version += 1
+
+    def instructor_added(self, instructor) -> None:
+        with self._lock:
+            self._instructors = self._instructors.set(instructor.id_number, _copy_instructor(instructor))
+            self.version += 1
+
+    def instructor_updated(self, instructor, previous: dict) -> None:
+        with self._lock:
+            if "id_number" in previous:
+                self._instructors = self._instructors.delete(previous["id_number"])
+            self._instructors = self._instructors.set(instructor.id_number, _copy_instructor(instructor))
+            self.version += 1
+
+    def instructor_removed(self, instructor) -> None:
+        with self._lock:
+            self._instructors = self._instructors.delete(instructor.id_number)
+            self.version += 1
+
+    def course_added(self, course) -> None:
+        with self._lock:
+            self._courses = self._courses.set(course.course_id, _copy_course(course))
+            self._rosters = self._rosters.set(course.course_id, _EMPTY)
+            self.version += 1
+
+    def course_updated(self, course, previous: dict) -> None:
+        with self._lock:
+            if "course_id" in previous:
+                old_id = previous["course_id"]
+                roster = self._rosters[old_id]
+                self._courses = self._courses.delete(old_id)
+                self._rosters = self._rosters.delete(old_id).set(course.course_id, roster)
+                for student_id, entry in roster.items():
+                    schedule = self._schedules[student_id].delete(old_id).set(course.course_id, entry)
+                    self._schedules = self._schedules.set(student_id, schedule)
+            self._courses = self._courses.set(course.course_id, _copy_course(course))
+            self.version += 1
+
+    def course_removed(self, course) -> None:
+        # the removal's unenrollments have already been applied
+        with self._lock:
+            self._courses = self._courses.delete(course.course_id)
+            self._rosters = self._rosters.delete(course.course_id)
+            self.version += 1
+
+    def enrolled(self, enrollment) -> None:
+        with self._lock:
+            self._set_entry(enrollment.student.id_number, enrollment.course.course_id, (self._sequence, enrollment.grade))
+            self._sequence += 1
+            self._enrollments += 1
+            self.version += 1
+
+    def unenrolled(self, enrollment) -> None:
+        with self._lock:
+            self._set_entry(enrollment.student.id_number, enrollment.course.course_id, None)
+            self._enrollments -= 1
+            self.version += 1
+
+    def grade_assigned(self, enrollment, previous_grade) -> None:
+        with self._lock:
+            student_id, course_id = enrollment.student.id_number, enrollment.course.course_id
+            sequence, _ = self._schedules[student_id][course_id]
+            self._set_entry(student_id, course_id, (sequence, enrollment.grade))
+            self.version += 1
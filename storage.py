@@ -0,0 +1,429 @@
+"""
+Storage engines for the Student Management System.
+
+A storage engine owns the `students`, `instructors` and `courses` repositories (mappings from
+id to entity), and the `enrollments` and `assignments` stores used by `StudentManagementSystem`.
+Two engines are provided:
+
+- `InMemoryStorage` keeps everything in Python dictionaries, an `EnrollmentStore` and an
+  `AssignmentStore`. It is the default engine and the fastest one, but nothing survives a restart.
+- `SQLiteStorage` keeps everything in an SQLite database, so the system survives restarts and
+  can hold datasets larger than RAM. Every lookup is an indexed query.
+
+Example
+-------
+from storage import SQLiteStorage
+
+sms = StudentManagementSystem(storage=SQLiteStorage("registry.db"))
+"""
+
+import sqlite3
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+
+from person import Student, Instructor
+from course import Course, Enrollment, format_meetings, format_prerequisites, parse_meetings, parse_prerequisites
+from enrollment_store import EnrollmentStore
+from assignment_store import AssignmentStore
+
+
+class InMemoryStorage:
+    """
+    A class used to keep the Student Management System's data in memory.
+
+    Attributes
+    ----------
+    students : dict[int, Student]
+        The students in the system keyed by id number.
+    instructors : dict[int, Instructor]
+        The instructors in the system keyed by id number.
+    courses : dict[str, Course]
+        The courses in the system keyed by course id.
+    enrollments : EnrollmentStore
+        The enrollments in the system.
+    assignments : AssignmentStore
+        The courses each instructor teaches.
+
+    Methods
+    -------
+    save_student(student: Student) -> None
+        Persists changes made to a student's attributes.
+    save_instructor(instructor: Instructor) -> None
+        Persists changes made to an instructor's attributes.
+    save_course(course: Course) -> None
+        Persists changes made to a course's attributes.
+    transaction()
+        A context manager grouping writes into one atomic batch.
+    close() -> None
+        Releases the resources held by the engine.
+    """
+
+    def __init__(self) -> None:
+        self.students = {}
+        self.instructors = {}
+        self.courses = {}
+        self.enrollments = EnrollmentStore()
+        self.assignments = AssignmentStore()
+
+    # the repositories hold the objects themselves, so attribute changes are already persisted
+    def save_student(self, student: Student) -> None:
+        pass
+
+    def save_instructor(self, instructor: Instructor) -> None:
+        pass
+
+    def save_course(self, course: Course) -> None:
+        pass
+
+    @contextmanager
+    def transaction(self):
+        yield
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteTable(MutableMapping):
+    """
+    A class used to expose an SQLite table of entities as a mapping from id to entity.
+
+    Every access runs a query against the table's primary key, and the entities returned are
+    built fresh from the row, so changes to their attributes are only persisted by assigning
+    them back to the mapping.
+
+    Attributes
+    ----------
+    connection : sqlite3.Connection
+        The database connection.
+    table : str
+        The name of the table.
+    columns : tuple[str, ...]
+        The table's columns, starting with its primary key, in the order the factory takes them.
+    factory : Callable
+        Builds an entity from a row's column values.
+    encoders : dict[str, Callable]
+        Converts the attributes of the named columns to the values stored in them.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, table: str, columns: tuple[str, ...], factory, encoders=None) -> None:
+        self.connection = connection
+        self.table = table
+        self.columns = columns
+        self.factory = factory
+        self.encoders = encoders or {}
+        key, *fields = columns
+        # the sql is built once so the sqlite3 statement cache reuses the prepared statements
+        self._select = f"SELECT {', '.join(columns)} FROM {table} WHERE {key} = ?"
+        self._select_all = f"SELECT {', '.join(columns)} FROM {table} ORDER BY rowid"
+        self._select_keys = f"SELECT {key} FROM {table} ORDER BY rowid"
+        self._exists = f"SELECT 1 FROM {table} WHERE {key} = ?"
+        self._count = f"SELECT COUNT(*) FROM {table}"
+        self._upsert = (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                        f"ON CONFLICT({key}) DO UPDATE SET {', '.join(f'{field} = excluded.{field}' for field in fields)}")
+        self._delete = f"DELETE FROM {table} WHERE {key} = ?"
+
+    def __getitem__(self, key):
+        row = self.connection.execute(self._select, (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return self.factory(*row)
+
+    def __setitem__(self, key, entity) -> None:
+        values = [getattr(entity, column) for column in self.columns[1:]]
+        for position, column in enumerate(self.columns[1:]):
+            if column in self.encoders:
+                values[position] = self.encoders[column](values[position])
+        self.connection.execute(self._upsert, (key, *values))
+
+    def __delitem__(self, key) -> None:
+        if self.connection.execute(self._delete, (key,)).rowcount == 0:
+            raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        return self.connection.execute(self._exists, (key,)).fetchone() is not None
+
+    def __iter__(self):
+        return (key for key, in self.connection.execute(self._select_keys))
+
+    def __len__(self) -> int:
+        return self.connection.execute(self._count).fetchone()[0]
+
+    def values(self):
+        # one query streaming every row, rather than one query per key
+        return (self.factory(*row) for row in self.connection.execute(self._select_all))
+
+
+class SQLiteEnrollmentStore:
+    """
+    A class used to store enrollments in SQLite with the same interface as `EnrollmentStore`.
+
+    Enrollments are rows of the `enrollments` table, which has a unique index on the
+    `(student_id, course_id)` pair and indexes on each id, so every method runs as an indexed
+    query. The `Enrollment` objects returned are built from the rows and their students and courses.
+    """
+
+    # the enrollment row joined with its student and course, in enrollment order
+    _SELECT = ("SELECT s.id_number, s.name, s.major, c.course_id, c.course_name, c.capacity, c.meetings, c.prerequisites, e.grade "
+               "FROM enrollments e JOIN students s ON s.id_number = e.student_id "
+               "JOIN courses c ON c.course_id = e.course_id")
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+
+    @staticmethod
+    def _enrollment(student_id, name, major, course_id, course_name, capacity, meetings, prerequisites, grade) -> Enrollment:
+        course = Course(course_name, course_id, capacity, parse_meetings(meetings), parse_prerequisites(prerequisites))
+        return Enrollment(Student(name, student_id, major), course, grade)
+
+    def _query(self, where: str = "", parameters: tuple = ()) -> list[Enrollment]:
+        rows = self.connection.execute(f"{self._SELECT} {where} ORDER BY e.seq", parameters)
+        return [self._enrollment(*row) for row in rows]
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM enrollments").fetchone()[0]
+
+    def __iter__(self):
+        rows = self.connection.execute(f"{self._SELECT} ORDER BY e.seq")
+        return (self._enrollment(*row) for row in rows)
+
+    def __contains__(self, key: tuple[int, str]) -> bool:
+        return self.connection.execute(
+            "SELECT 1 FROM enrollments WHERE student_id = ? AND course_id = ?", key).fetchone() is not None
+
+    def add(self, enrollment: Enrollment) -> bool:
+        cursor = self.connection.execute(
+            "INSERT OR IGNORE INTO enrollments (student_id, course_id, grade) VALUES (?, ?, ?)",
+            (enrollment.student.id_number, enrollment.course.course_id, enrollment.grade))
+        return cursor.rowcount == 1
+
+    def insert(self, key: tuple[int, str], enrollment: Enrollment) -> None:
+        self.connection.execute("INSERT INTO enrollments (student_id, course_id, grade) VALUES (?, ?, ?)",
+                                (*key, enrollment.grade))
+
+    def get(self, student_id: int, course_id: str):
+        enrollments = self._query("WHERE e.student_id = ? AND e.course_id = ?", (student_id, course_id))
+        return enrollments[0] if enrollments else None
+
+    def remove(self, student_id: int, course_id: str):
+        enrollment = self.get(student_id, course_id)
+        if enrollment is not None:
+            self.connection.execute("DELETE FROM enrollments WHERE student_id = ? AND course_id = ?",
+                                    (student_id, course_id))
+        return enrollment
+
+    def set_grade(self, student_id: int, course_id: str, grade: str) -> bool:
+        cursor = self.connection.execute("UPDATE enrollments SET grade = ? WHERE student_id = ? AND course_id = ?",
+                                         (grade, student_id, course_id))
+        return cursor.rowcount == 1
+
+    def for_student(self, student_id: int) -> list[Enrollment]:
+        return self._query("WHERE e.student_id = ?", (student_id,))
+
+    def for_course(self, course_id: str) -> list[Enrollment]:
+        return self._query("WHERE e.course_id = ?", (course_id,))
+
+    def count_for_course(self, course_id: str) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM enrollments WHERE course_id = ?", (course_id,)).fetchone()[0]
+
+    def remove_student(self, student_id: int) -> list[Enrollment]:
+        removed = self.for_student(student_id)
+        self.connection.execute("DELETE FROM enrollments WHERE student_id = ?", (student_id,))
+        return removed
+
+    def remove_course(self, course_id: str) -> list[Enrollment]:
+        removed = self.for_course(course_id)
+        self.connection.execute("DELETE FROM enrollments WHERE course_id = ?", (course_id,))
+        return removed
+
+    def rekey_student(self, old_id: int, new_id: int) -> None:
+        self.connection.execute("UPDATE enrollments SET student_id = ? WHERE student_id = ?", (new_id, old_id))
+
+    def rekey_course(self, old_id: str, new_id: str) -> None:
+        self.connection.execute("UPDATE enrollments SET course_id = ? WHERE course_id = ?", (new_id, old_id))
+
+
+class SQLiteAssignmentStore:
+    """
+    A class used to store instructor assignments in SQLite with the same interface as `AssignmentStore`.
+
+    Assignments are rows of the `assignments` table, which has a unique index on the
+    `(instructor_id, course_id)` pair and an index on the course id.
+    """
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+
+    def _ids(self, sql: str, parameters: tuple) -> list:
+        return [row[0] for row in self.connection.execute(sql, parameters)]
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM assignments").fetchone()[0]
+
+    def __iter__(self):
+        return iter(self.connection.execute("SELECT instructor_id, course_id FROM assignments ORDER BY seq"))
+
+    def __contains__(self, key: tuple[int, str]) -> bool:
+        return self.connection.execute(
+            "SELECT 1 FROM assignments WHERE instructor_id = ? AND course_id = ?", key).fetchone() is not None
+
+    def add(self, instructor_id: int, course_id: str) -> bool:
+        cursor = self.connection.execute("INSERT OR IGNORE INTO assignments (instructor_id, course_id) VALUES (?, ?)",
+                                         (instructor_id, course_id))
+        return cursor.rowcount == 1
+
+    def remove(self, instructor_id: int, course_id: str) -> bool:
+        cursor = self.connection.execute("DELETE FROM assignments WHERE instructor_id = ? AND course_id = ?",
+                                         (instructor_id, course_id))
+        return cursor.rowcount == 1
+
+    def courses_of(self, instructor_id: int) -> list[str]:
+        return self._ids("SELECT course_id FROM assignments WHERE instructor_id = ? ORDER BY seq", (instructor_id,))
+
+    def instructors_of(self, course_id: str) -> list[int]:
+        return self._ids("SELECT instructor_id FROM assignments WHERE course_id = ? ORDER BY seq", (course_id,))
+
+    def remove_instructor(self, instructor_id: int) -> list[str]:
+        course_ids = self.courses_of(instructor_id)
+        self.connection.execute("DELETE FROM assignments WHERE instructor_id = ?", (instructor_id,))
+        return course_ids
+
+    def remove_course(self, course_id: str) -> list[int]:
+        instructor_ids = self.instructors_of(course_id)
+        self.connection.execute("DELETE FROM assignments WHERE course_id = ?", (course_id,))
+        return instructor_ids
+
+    def rekey_instructor(self, old_id: int, new_id: int) -> None:
+        self.connection.execute("UPDATE assignments SET instructor_id = ? WHERE instructor_id = ?", (new_id, old_id))
+
+    def rekey_course(self, old_id: str, new_id: str) -> None:
+        self.connection.execute("UPDATE assignments SET course_id = ? WHERE course_id = ?", (new_id, old_id))
+
+
+class SQLiteStorage:
+    """
+    A class used to keep the Student Management System's data in an SQLite database.
+
+    The database has one table per entity type, keyed by its id, an `enrollments` table
+    with a unique index on the `(student_id, course_id)` pair plus per-student and per-course
+    indexes, and an `assignments` table indexed the same way by instructor and course. A course's
+    meetings and prerequisites are stored in text columns in the `format_meetings` and
+    `format_prerequisites` forms. Each statement outside
+    `transaction()` commits on its own; wrap batches of writes in `transaction()` to commit them
+    atomically in one go.
+
+    Attributes
+    ----------
+    connection : sqlite3.Connection
+        The database connection.
+    students : SQLiteTable
+        The students in the system keyed by id number.
+    instructors : SQLiteTable
+        The instructors in the system keyed by id number.
+    courses : SQLiteTable
+        The courses in the system keyed by course id.
+    enrollments : SQLiteEnrollmentStore
+        The enrollments in the system.
+    assignments : SQLiteAssignmentStore
+        The courses each instructor teaches.
+
+    Methods
+    -------
+    save_student(student: Student) -> None
+        Persists changes made to a student's attributes.
+    save_instructor(instructor: Instructor) -> None
+        Persists changes made to an instructor's attributes.
+    save_course(course: Course) -> None
+        Persists changes made to a course's attributes.
+    transaction()
+        A context manager grouping writes into one atomic batch.
+    close() -> None
+        Closes the database connection.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS students (id_number INTEGER PRIMARY KEY, name TEXT NOT NULL, major TEXT);
+        CREATE TABLE IF NOT EXISTS instructors (id_number INTEGER PRIMARY KEY, name TEXT NOT NULL, department TEXT);
+        CREATE TABLE IF NOT EXISTS courses (
+            course_id TEXT PRIMARY KEY, course_name TEXT NOT NULL, capacity INTEGER, meetings TEXT NOT NULL DEFAULT '',
+            prerequisites TEXT NOT NULL DEFAULT ''
+        );
+        CREATE TABLE IF NOT EXISTS enrollments (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            student_id INTEGER NOT NULL,
+            course_id TEXT NOT NULL,
+            grade TEXT
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS enrollments_pair ON enrollments (student_id, course_id);
+        CREATE INDEX IF NOT EXISTS enrollments_course ON enrollments (course_id, seq);
+        CREATE TABLE IF NOT EXISTS assignments (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            instructor_id INTEGER NOT NULL,
+            course_id TEXT NOT NULL
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS assignments_pair ON assignments (instructor_id, course_id);
+        CREATE INDEX IF NOT EXISTS assignments_course ON assignments (course_id, seq);
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        # autocommit mode, transactions are opened explicitly by transaction()
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(self.SCHEMA)
+        # databases created before courses had meetings or prerequisites gain the columns, their courses having none
+        columns = {column for _, column, *_ in self.connection.execute("PRAGMA table_info(courses)")}
+        for column in ("meetings", "prerequisites"):
+            if column not in columns:
+                self.connection.execute(f"ALTER TABLE courses ADD COLUMN {column} TEXT NOT NULL DEFAULT ''")
+        self.students = SQLiteTable(self.connection, "students", ("id_number", "name", "major"),
+                                    lambda id_number, name, major: Student(name, id_number, major))
+        self.instructors = SQLiteTable(self.connection, "instructors", ("id_number", "name", "department"),
+                                       lambda id_number, name, department: Instructor(name, id_number, department))
+        self.courses = SQLiteTable(self.connection, "courses",
+                                   ("course_id", "course_name", "capacity", "meetings", "prerequisites"),
+                                   lambda course_id, course_name, capacity, meetings, prerequisites:
+                                       Course(course_name, course_id, capacity, parse_meetings(meetings),
+                                              parse_prerequisites(prerequisites)),
+                                   encoders={"meetings": format_meetings, "prerequisites": format_prerequisites})
+        self.enrollments = SQLiteEnrollmentStore(self.connection)
+        self.assignments = SQLiteAssignmentStore(self.connection)
+        self._transaction_depth = 0
+
+    def save_student(self, student: Student) -> None:
+        self.students[student.id_number] = student
+
+    def save_instructor(self, instructor: Instructor) -> None:
+        self.instructors[instructor.id_number] = instructor
+
+    def save_course(self, course: Course) -> None:
+        self.courses[course.course_id] = course
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group the writes made inside the block into one transaction.
+
+        The transaction is committed when the outermost block exits normally and rolled back
+        if it raises. Nested blocks join the enclosing transaction.
+        """
+        if self._transaction_depth:
+            self._transaction_depth += 1
+            try:
+                yield
+            finally:
+                self._transaction_depth -= 1
+            return
+        self.connection.execute("BEGIN")
+        self._transaction_depth = 1
+        try:
+            yield
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        else:
+            self.connection.execute("COMMIT")
+        finally:
+            self._transaction_depth = 0
+
+    def close(self) -> None:
+        self.connection.close()
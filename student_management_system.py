@@ -1,13 +1,59 @@
 from person import Student, Instructor
 from course import Course, Enrollment
+from storage import InMemoryStorage
+from registration import CourseFullError, WaitlistBook
+from timetable import ScheduleConflictError, Timetable
+from prerequisites import EligibilityCache, PrerequisiteError, PrerequisiteGraph
+
+class BulkLoadReport:
+    """
+    A class used to report the outcome of a `StudentManagementSystem.bulk_load` call.
+
+    Attributes
+    ----------
+    students_added : int
+        The number of students added to the system.
+    instructors_added : int
+        The number of instructors added to the system.
+    courses_added : int
+        The number of courses added to the system.
+    enrollments_added : int
+        The number of enrollments added to the system.
+    assignments_added : int
+        The number of instructor assignments added to the system.
+    errors : list[tuple[str, int, str]]
+        The rejected records as `(record_type, position, message)` tuples, where position is the
+        index of the record in the iterable it came from.
+    """
+
+    def __init__(self) -> None:
+        self.students_added = 0
+        self.instructors_added = 0
+        self.courses_added = 0
+        self.enrollments_added = 0
+        self.assignments_added = 0
+        self.errors = []
+
+    def __str__(self) -> str:
+        return (f"Students: {self.students_added}, Instructors: {self.instructors_added}, "
+                f"Courses: {self.courses_added}, Enrollments: {self.enrollments_added}, "
+                f"Assignments: {self.assignments_added}, Errors: {len(self.errors)}")
+
 
 class StudentManagementSystem:
     """
     A class to manage students, instructors, courses, and enrollments in a Student Management System.
 
     The `StudentManagementSystem` class provides functionality to add, update, and remove students, instructors, and courses.
-    It also allows for enrolling students in courses, assigning grades, and retrieving information about student-course relationships.
-    The class uses dictionaries and lists to maintain and manage data effectively.
+    It also allows for enrolling students in courses, assigning grades, assigning instructors to courses, and retrieving
+    information about student-course and instructor-course relationships.
+    The data itself lives in a pluggable storage engine: by default an `InMemoryStorage` of dictionaries, an
+    `EnrollmentStore` indexed by student and course and an `AssignmentStore` indexed by instructor and course,
+    or an `SQLiteStorage` database that survives restarts.
+    Courses may have weekly meetings; a `Timetable` of the meetings booked by each student and each room
+    is used to reject enrollments that would double-book a student and courses that would double-book a room.
+    Courses may also require other courses to be passed first; the requirements form a `PrerequisiteGraph`,
+    and an `EligibilityCache` memoizes which requirements each student is missing.
 
     Methods
     -------
@@ -17,6 +63,9 @@ class StudentManagementSystem:
     remove_student(id_number: int) -> None
         Removes a `Student` object from the system based on the student's ID number.
 
+    remove_students(id_numbers: Iterable[int]) -> None
+        Removes several `Student` objects from the system in one batch.
+
     update_student_details(current_id_number: int, new_name: str = None, new_major: str = None, new_id_number: int = None) -> None
         Updates the details of an existing student in the system.
 
@@ -35,7 +84,10 @@ class StudentManagementSystem:
     remove_course(course_id: str) -> None
         Removes a `Course` object from the system based on the course ID.
 
-    update_course_details(current_course_id: str, new_course_name: str = None, new_course_id: str = None) -> None
+    remove_courses(course_ids: Iterable[str]) -> None
+        Removes several `Course` objects from the system in one batch.
+
+    update_course_details(current_course_id: str, new_course_name: str = None, new_course_id: str = None, new_capacity: int = None, new_meetings=None, new_prerequisites=None) -> None
         Updates the details of an existing course in the system.
 
     unenroll_student(student_id: int, course_id: str) -> None
@@ -44,14 +96,47 @@ class StudentManagementSystem:
     enroll_student(student_id: int, course_id: str) -> None
         Enrolls a student in a course based on student and course IDs.
 
+    join_waitlist(student_id: int, course_id: str, priority=0) -> None
+        Adds a student to the waitlist of a full course.
+
+    leave_waitlist(student_id: int, course_id: str) -> None
+        Removes a student from the waitlist of a course.
+
+    get_waitlist(course_id: str) -> list[Student]
+        Retrieves the students waitlisted for a course in the order they will be promoted.
+
     assign_grade(student_id: int, course_id: str, grade: str) -> None
         Assigns a grade to a student for a specific course.
 
+    assign_instructor(instructor_id: int, course_id: str) -> None
+        Assigns an instructor to teach a course.
+
+    unassign_instructor(instructor_id: int, course_id: str) -> None
+        Removes an instructor from the courses they teach.
+
+    bulk_load(students=(), instructors=(), courses=(), enrollments=(), assignments=(), check_rules=True) -> BulkLoadReport
+        Adds students, instructors, courses, enrollments and instructor assignments to the system in one batched pass.
+
     get_students_in_course(course_id: str) -> list[Student]
         Retrieves a list of students enrolled in a specific course.
 
     get_courses_of_student(student_id: int) -> list[Course]
         Retrieves a list of courses in which a specific student is enrolled.
+
+    get_missing_prerequisites(student_id: int, course_id: str) -> list[tuple[str, str]]
+        Retrieves the prerequisites of a course a student hasn't passed.
+
+    is_eligible(student_id: int, course_id: str) -> bool
+        Checks whether a student has passed every prerequisite of a course.
+
+    get_courses_of_instructor(instructor_id: int) -> list[Course]
+        Retrieves the courses an instructor teaches.
+
+    get_instructors_of_course(course_id: str) -> list[Instructor]
+        Retrieves the instructors teaching a course.
+
+    get_students_of_instructor(instructor_id: int) -> list[Student]
+        Retrieves the students enrolled in any course an instructor teaches.
     get_all_students -> List[Student]
         Retrieve a list of all students in the system.
     get_all_instructors -> List[Instructor]
@@ -60,15 +145,70 @@ class StudentManagementSystem:
         Retrieve a list of all courses in the system.
     get_all_enrollments() -> list[Enrollement]
         Retrieve a list of all enrollments in the system.
+    iter_students() / iter_instructors() / iter_courses() / iter_enrollments() / iter_assignments() -> Iterator
+        Lazily iterate over the entities in the system without copying them into a list.
+    add_observer(observer: SystemObserver) / remove_observer(observer: SystemObserver) -> None
+        Registers or unregisters an observer notified of every change made to the system.
 
     """
 
-    def __init__(self) -> None:
-        
-        self.students =  {} 
-        self.instructors = {}
-        self.courses = {} 
-        self.enrollments = []
+    def __init__(self, storage=None) -> None:
+        """
+        Parameters
+        ----------
+        storage : InMemoryStorage | SQLiteStorage, optional
+            The storage engine holding the system's data (default is a new `InMemoryStorage`).
+        """
+        self.storage = storage if storage is not None else InMemoryStorage()
+        self.students = self.storage.students
+        self.instructors = self.storage.instructors
+        self.courses = self.storage.courses
+        self.enrollments = self.storage.enrollments
+        self.assignments = self.storage.assignments
+        self.waitlists = WaitlistBook() # waitlists are kept in memory whichever storage engine is used
+        self.timetable = Timetable() # as are the timetable and the prerequisites, rebuilt from the courses a storage engine already holds
+        self.prerequisites = PrerequisiteGraph()
+        self.eligibility = EligibilityCache(self.prerequisites, self.enrollments.for_student)
+        for course in self.courses.values():
+            if course.prerequisites:
+                self.prerequisites.set(course.course_id, course.prerequisites)
+            if course.meetings:
+                self.timetable.book_course(course)
+                for enrollment in self.enrollments.for_course(course.course_id):
+                    self.timetable.enroll(enrollment.student.id_number, course)
+        self.observers = []
+
+    def add_observer(self, observer) -> None:
+        """
+        Register an observer to be notified of every change made to the system from now on.
+
+        Parameters
+        ----------
+        observer : SystemObserver
+            The observer whose hooks are called after each change.
+        """
+        self.observers.append(observer)
+
+    def remove_observer(self, observer) -> None:
+        """
+        Stop notifying an observer registered with `add_observer`.
+
+        Parameters
+        ----------
+        observer : SystemObserver
+            The observer to unregister.
+
+        Raises
+        ------
+        ValueError
+            If the observer is not registered.
+        """
+        self.observers.remove(observer)
+
+    def _notify(self, event: str, *args) -> None:
+        # call the event's hook on every observer, see events.SystemObserver
+        for observer in self.observers:
+            getattr(observer, event)(*args)
 
     def add_student(self, student: Student):
         """
@@ -82,6 +222,7 @@ class StudentManagementSystem:
         if student.id_number in self.students:
             raise ValueError(f"Student with ID {student.id_number} already exists.")
         self.students[student.id_number] = student
+        self._notify("student_added", student)
 
     def remove_student(self, id_number:int):
         """
@@ -95,12 +236,48 @@ class StudentManagementSystem:
         if id_number not in self.students:
             raise ValueError(f"Student with ID {id_number} doesn't exist.")
         
-        # remove student object from course enrollment list
-        for course_id in self.courses:
-            if self.students[id_number] in self.courses[course_id].enrolled_students:
-                 self.unenroll_student(id_number, course_id)
-        # remove student object from students repo
-        del self.students[id_number]
+        self._remove_student(id_number)
+
+    def remove_students(self, id_numbers) -> None:
+        """
+        Removes several Student objects from the students dictionary in one batch.
+
+        Every ID is checked before anything is removed, so either all the students are removed or none are.
+        Each student's enrollments are found through the per-student enrollment index, so the
+        cascade only touches the enrollments of the removed students.
+
+        Parameters
+        ----------
+        id_numbers : Iterable[int]
+            The student ids of the Student objects to be removed from the system.
+
+        Raises
+        ------
+        ValueError
+            If any of the student IDs does not exist in the system.
+        """
+        id_numbers = list(dict.fromkeys(id_numbers)) # drop repeated ids, keeping their order
+        missing = [id_number for id_number in id_numbers if id_number not in self.students]
+        if missing:
+            raise ValueError(f"Students with IDs {missing} don't exist.")
+
+        with self.storage.transaction():
+            for id_number in id_numbers:
+                self._remove_student(id_number)
+
+    def _remove_student(self, id_number: int) -> None:
+        # cascade through the student's own enrollments only, then remove the student object from students repo
+        self.waitlists.remove_student(id_number)
+        self.timetable.remove_student(id_number)
+        self.eligibility.forget_student(id_number)
+        enrollments = self.enrollments.remove_student(id_number)
+        for enrollment in enrollments:
+            enrollment.course.unenroll_student(enrollment.student)
+            self._notify("unenrolled", enrollment)
+        self._notify("student_removed", self.students.pop(id_number))
+        # the seats the student held can go to waitlisted students
+        for enrollment in enrollments:
+            self._promote_waitlisted(enrollment.course.course_id)
     
     def update_student_details(self, current_id_number:int, new_name:str = None, new_major:str = None, new_id_number:int = None) -> None:
         """
@@ -119,20 +296,33 @@ class StudentManagementSystem:
         """
         if current_id_number not in self.students:
             raise ValueError(f"Student with ID {current_id_number} doesn't exist.")
+        if new_id_number and new_id_number in self.students:
+            raise ValueError(f"Student with ID {new_id_number} already exists.") # checked first so a failed update changes nothing
         
         student = self.students[current_id_number]
+        previous = {}
 
         if new_name:
+            previous["name"] = student.name
             student.name = new_name
 
         if new_major:
+            previous["major"] = student.major
             student.major = new_major
 
         if new_id_number:
-            if new_id_number in self.students:
-                raise ValueError(f"Student with ID {new_id_number} already exists.")
+            previous["id_number"] = current_id_number
             self.students[new_id_number] = self.students.pop(current_id_number)
             student.id_number = new_id_number # student still references the same memory as self.students[new_id_number]
+            for enrollment in self.enrollments.for_student(current_id_number):
+                enrollment.course.rekey_student(current_id_number, new_id_number)
+            self.enrollments.rekey_student(current_id_number, new_id_number)
+            self.waitlists.rekey_student(current_id_number, new_id_number)
+            self.timetable.rekey_student(current_id_number, new_id_number)
+            self.eligibility.forget_student(current_id_number)
+
+        self.storage.save_student(student)
+        self._notify("student_updated", student, previous)
 
     
     def add_instructor(self, instructor: Instructor):
@@ -147,10 +337,11 @@ class StudentManagementSystem:
         if instructor.id_number in self.instructors:
             raise ValueError(f"Instructor with ID {instructor.id_number} already exists.")
         self.instructors[instructor.id_number] = instructor
+        self._notify("instructor_added", instructor)
 
     def remove_instructor(self, id_number:int):
         """
-        Removes an Instructor object from the instructors dictionary.
+        Removes an Instructor object from the instructors dictionary, together with their course assignments.
 
         Parameters
         ----------
@@ -160,7 +351,10 @@ class StudentManagementSystem:
         if id_number not in self.instructors:
             raise ValueError(f"Instructor with ID {id_number} doesn't exist.")
         
-        del self.instructors[id_number]
+        instructor = self.instructors.pop(id_number)
+        for course_id in self.assignments.remove_instructor(id_number):
+            self._notify("instructor_unassigned", instructor, self.courses[course_id])
+        self._notify("instructor_removed", instructor)
     
     def update_instructor_details(self, current_id_number:int, new_name:str = None, new_department:str = None, new_id_number:int = None) -> None:
         """
@@ -179,20 +373,28 @@ class StudentManagementSystem:
         """
         if current_id_number not in self.instructors:
             raise ValueError(f"Instructor with ID {current_id_number} doesn't exist.")
+        if new_id_number and new_id_number in self.instructors:
+            raise ValueError(f"Instructor with ID {new_id_number} already exists.") # checked first so a failed update changes nothing
         
         instructor = self.instructors[current_id_number]
+        previous = {}
 
         if new_name:
+            previous["name"] = instructor.name
             instructor.name = new_name
 
         if new_department:
+            previous["department"] = instructor.department
             instructor.department = new_department
 
         if new_id_number:
-            if new_id_number in self.instructors:
-                raise ValueError(f"Instructor with ID {new_id_number} already exists.")
+            previous["id_number"] = current_id_number
             self.instructors[new_id_number] = self.instructors.pop(current_id_number)
             instructor.id_number = new_id_number # instructor still references the same memory as self.instructors[new_id_number]
+            self.assignments.rekey_instructor(current_id_number, new_id_number)
+
+        self.storage.save_instructor(instructor)
+        self._notify("instructor_updated", instructor, previous)
              
     def add_course(self, course: Course):
         """
@@ -202,10 +404,35 @@ class StudentManagementSystem:
         ----------
         course : Course
             The Course object to be added to the system.
+
+        Raises
+        ------
+        ValueError
+            If the course ID already exists in the system.
+        ScheduleConflictError
+            If the course's meetings overlap each other or a room is already booked during one of them.
+        PrerequisiteCycleError
+            If the course's prerequisites would make it a prerequisite of itself.
         """
         if course.course_id in self.courses:
             raise ValueError(f"Course with ID {course.course_id} already exists.")
+        self._check_course(course)
+        self._schedule_course(course)
         self.courses[course.course_id] = course
+        self._notify("course_added", course)
+
+    def _check_course(self, course: Course) -> None:
+        # raise if a new course's meetings clash, or its prerequisites are invalid or circular
+        conflict = self.timetable.course_conflict(course) if course.meetings else None
+        if conflict is not None:
+            raise ScheduleConflictError(conflict)
+        self.prerequisites.validate(course.course_id, course.prerequisites)
+
+    def _schedule_course(self, course: Course) -> None:
+        # record a checked new course's room bookings and prerequisites
+        self.timetable.book_course(course)
+        if course.prerequisites:
+            self.eligibility.requirements_changed(self.prerequisites.set(course.course_id, course.prerequisites))
 
     def remove_course(self, course_id: str):
         """
@@ -219,16 +446,62 @@ class StudentManagementSystem:
         if course_id not in self.courses:
             raise ValueError(f"Course with ID {course_id} doesn't exist.")
         
-        # remove course object from course enrollment list
-        for enrollment in self.enrollments[:]:
-            if enrollment.course.course_id == course_id:
-                 self.enrollments.remove(enrollment)
+        self._remove_course(course_id)
+
+    def remove_courses(self, course_ids) -> None:
+        """
+        Removes several Course objects from the courses dictionary in one batch.
 
-        # remove course object from courses repo
+        Every ID is checked before anything is removed, so either all the courses are removed or none are.
+        Each course's enrollments are found through the per-course enrollment index, so the
+        cascade only touches the enrollments of the removed courses.
+
+        Parameters
+        ----------
+        course_ids : Iterable[str]
+            The course ids of the Course objects to be removed from the system.
+
+        Raises
+        ------
+        ValueError
+            If any of the course IDs does not exist in the system.
+        """
+        course_ids = list(dict.fromkeys(course_ids)) # drop repeated ids, keeping their order
+        missing = [course_id for course_id in course_ids if course_id not in self.courses]
+        if missing:
+            raise ValueError(f"Courses with IDs {missing} don't exist.")
+
+        with self.storage.transaction():
+            for course_id in course_ids:
+                self._remove_course(course_id)
+
+    def _remove_course(self, course_id: str) -> None:
+        # cascade through the course's own enrollments only, emptying its roster so a caller still
+        # holding the Course object doesn't see stale students, then remove it from courses repo
+        course = self.courses[course_id]
+        for enrollment in self.enrollments.remove_course(course_id):
+            enrollment.course.unenroll_student(enrollment.student)
+            self.timetable.unenroll(enrollment.student.id_number, course)
+            if enrollment.grade is not None:
+                self.eligibility.grade_changed(enrollment.student.id_number, course_id, None)
+            self._notify("unenrolled", enrollment)
+        self.timetable.release_course(course)
+        # the courses requiring the removed course no longer do
+        self.eligibility.requirements_changed(set(self.prerequisites.dependents(course_id)))
+        for dependent_id in self.prerequisites.remove_course(course_id):
+            dependent = self.courses[dependent_id]
+            previous = {"prerequisites": dict(dependent.prerequisites)}
+            del dependent.prerequisites[course_id]
+            self.storage.save_course(dependent)
+            self._notify("course_updated", dependent, previous)
+        for instructor_id in self.assignments.remove_course(course_id):
+            self._notify("instructor_unassigned", self.instructors[instructor_id], course)
+        self.waitlists.remove_course(course_id)
         del self.courses[course_id]
+        self._notify("course_removed", course)
 
     
-    def update_course_details(self, current_course_id: str, new_course_name: str = None, new_course_id: str = None) -> None:
+    def update_course_details(self, current_course_id: str, new_course_name: str = None, new_course_id: str = None, new_capacity: int = None, new_meetings=None, new_prerequisites=None) -> None:
         """
         Updates the Course object attributes from the courses dictionary.
 
@@ -240,26 +513,89 @@ class StudentManagementSystem:
             The new course name to be changed into.
         new_course_id : str
             The existing course id of the Course object to be updated in the system.
+        new_capacity : int
+            The new maximum number of students in the course. Raising the capacity promotes waitlisted students
+            into the new seats; lowering it below the current enrollment only stops new enrollments.
+        new_meetings : Iterable[MeetingSlot]
+            The new weekly meetings of the course; an empty iterable removes them.
+        new_prerequisites : dict[str, str | None]
+            The new prerequisites of the course, the minimum grade required in each keyed by course id;
+            an empty dictionary removes them. Renaming the course renames it in the prerequisites of other courses.
 
         Raises
         ------
         ValueError
             If the course ID does not exist in the system.
             If the course ID already exist in the system.
+        ScheduleConflictError
+            If the new meetings clash with each other, with a room's bookings or with the timetable of an enrolled student.
+        PrerequisiteCycleError
+            If the new prerequisites would make the course a prerequisite of itself.
         """
         if current_course_id not in self.courses:
             raise ValueError(f"Course with ID {current_course_id} doesn't exist.")
+        if new_course_id and new_course_id in self.courses:
+            raise ValueError(f"Course with ID {new_course_id} already exists.") # checked first so a failed update changes nothing
         
         course = self.courses[current_course_id]
+        previous = {}
+        student_ids = ()
+
+        if new_meetings is not None or new_course_id:
+            student_ids = [enrollment.student.id_number for enrollment in self.enrollments.for_course(current_course_id)]
+        if new_meetings is not None:
+            new_meetings = tuple(new_meetings)
+            conflict = self.timetable.course_conflict(course, new_meetings)
+            if conflict is not None:
+                raise ScheduleConflictError(conflict)
+            for student_id in student_ids:
+                booked = self.timetable.student_conflict(student_id, course, new_meetings)
+                if booked is not None:
+                    raise ScheduleConflictError(
+                        f"The new meetings of course ID {current_course_id} clash with course ID {booked} for student ID {student_id}.")
+        if new_prerequisites is not None:
+            new_prerequisites = dict(new_prerequisites)
+            self.prerequisites.validate(current_course_id, new_prerequisites)
 
         if new_course_name:
+            previous["course_name"] = course.course_name
             course.course_name = new_course_name    
         
         if new_course_id:
-            if new_course_id in self.courses:
-                raise ValueError(f"Course with ID {new_course_id} already exists.")
+            previous["course_id"] = current_course_id
             self.courses[new_course_id] = self.courses.pop(current_course_id)
             course.course_id = new_course_id # course still references the same memory as self.courses[new_course_id]
+            self.enrollments.rekey_course(current_course_id, new_course_id)
+            self.assignments.rekey_course(current_course_id, new_course_id)
+            self.waitlists.rekey_course(current_course_id, new_course_id)
+            self.prerequisites.rename(current_course_id, new_course_id)
+            self.eligibility.clear() # the students' grades are keyed by course id
+            for dependent_id in self.prerequisites.required_by.get(new_course_id, ()):
+                dependent = self.courses[dependent_id]
+                dependent.prerequisites = dict(self.prerequisites.requires[dependent_id])
+                self.storage.save_course(dependent)
+
+        if new_capacity is not None:
+            previous["capacity"] = course.capacity
+            course.capacity = new_capacity
+
+        if new_meetings is not None:
+            previous["meetings"] = course.meetings
+            course.meetings = new_meetings
+
+        if new_prerequisites is not None:
+            previous["prerequisites"] = course.prerequisites
+            course.prerequisites = new_prerequisites
+            self.eligibility.requirements_changed(self.prerequisites.set(course.course_id, new_prerequisites))
+
+        if new_meetings is not None or new_course_id:
+            self.timetable.move_course(course, current_course_id, previous.get("meetings", course.meetings), student_ids)
+
+        self.storage.save_course(course)
+        self._notify("course_updated", course, previous)
+
+        if new_capacity is not None:
+            self._promote_waitlisted(course.course_id)
     
     def unenroll_student(self, student_id: int, course_id:str):
         """
@@ -291,11 +627,14 @@ class StudentManagementSystem:
         student = self.students[student_id]
 
         course.unenroll_student(student) # unenroll_student() in Course class has a condition to ignore if it already exists
-        # remove from Enrollment
-        for enrollment in self.enrollments[:]:
-            if (enrollment.course.course_id == course_id) and (enrollment.student.id_number == student_id):
-                self.enrollments.remove(enrollment)
-                break
+        # remove from Enrollment, handing the freed seat to the waitlist
+        enrollment = self.enrollments.remove(student_id, course_id)
+        if enrollment is not None:
+            self.timetable.unenroll(student_id, course)
+            if enrollment.grade is not None:
+                self.eligibility.grade_changed(student_id, course_id, None)
+            self._notify("unenrolled", enrollment)
+            self._promote_waitlisted(course_id)
 
 
     def enroll_student(self, student_id: int, course_id:str):
@@ -317,18 +656,152 @@ class StudentManagementSystem:
         ValueError
             If the student ID does not exist in the system.
             If the course ID does not exist in the system.
+        PrerequisiteError
+            If the student hasn't passed every prerequisite of the course.
+        ScheduleConflictError
+            If one of the course's meetings clashes with a course the student is already enrolled in.
+        CourseFullError
+            If the course has reached its capacity. The student can join its waitlist instead.
 
         """
         if student_id not in self.students:
             raise ValueError(f"The Student with ID {student_id} doesn't exist!")
         if course_id not in self.courses:
             raise ValueError(f"The Course with ID {course_id} doesn't exist!")
-        student = self.students[student_id]
+        if (student_id, course_id) in self.enrollments:
+            return # enrolling twice is a no-op
         course = self.courses[course_id]
+        self._check_requirements(student_id, course)
+        if not self._has_free_seat(course):
+            raise CourseFullError(f"The Course with ID {course_id} is full ({course.capacity} seats).")
+        self._enroll(self.students[student_id], course)
+
+    def _enroll(self, student: Student, course: Course) -> None:
+        # record a new enrollment, it takes the student off the course's waitlist if they were on it
+        course.enroll_student(student)
         enrollment = Enrollment(student, course)
-        course.enroll_student(student) # enroll_student has a condition to ignore if it already exists
-        if enrollment not in self.enrollments:
-            self.enrollments.append(enrollment)
+        self.enrollments.add(enrollment)
+        self.timetable.enroll(student.id_number, course)
+        self.waitlists.leave(student.id_number, course.course_id)
+        self._notify("enrolled", enrollment)
+
+    def _check_requirements(self, student_id: int, course: Course) -> None:
+        # raise if the student may not take the course: a prerequisite isn't passed or the meetings clash
+        missing = self.eligibility.missing(student_id, course.course_id)
+        if missing:
+            raise PrerequisiteError(self._missing_message(student_id, course.course_id, missing))
+        booked = self.timetable.student_conflict(student_id, course) if course.meetings else None
+        if booked is not None:
+            raise ScheduleConflictError(
+                f"The Course with ID {course.course_id} clashes with course ID {booked} for student ID {student_id}.")
+
+    @staticmethod
+    def _missing_message(student_id: int, course_id: str, missing) -> str:
+        return (f"Student ID {student_id} hasn't passed the prerequisites of course ID {course_id}: "
+                + ", ".join(required if minimum is None else f"{required} with {minimum} or better"
+                            for required, minimum in missing) + ".")
+
+    def _has_free_seat(self, course: Course) -> bool:
+        return course.capacity is None or self.enrollments.count_for_course(course.course_id) < course.capacity
+
+    def _promote_waitlisted(self, course_id: str) -> None:
+        # fill the course's free seats from the head of its waitlist
+        if not self.waitlists.waiting(course_id):
+            return
+        course = self.courses[course_id]
+        while self._has_free_seat(course):
+            student_id = self.waitlists.pop(course_id)
+            if student_id is None:
+                break
+            try:
+                self._check_requirements(student_id, course)
+            except (PrerequisiteError, ScheduleConflictError):
+                # e.g. the student has since enrolled in a clashing course, so they give up their place
+                self._notify("waitlist_left", student_id, course_id)
+                continue
+            self._enroll(self.students[student_id], course)
+
+    def join_waitlist(self, student_id: int, course_id: str, priority=0) -> None:
+        """
+        Add a student to the waitlist of a full course.
+
+        The student is enrolled automatically when a seat frees up and they are at the head of the
+        waitlist. Students with a lower priority value are promoted first, and students with equal
+        priority are promoted in the order they joined. Joining again moves the student to the new priority.
+
+        Parameters
+        ----------
+        student_id : int
+            The ID of the student to be waitlisted.
+        course_id : str
+            The ID of the course whose waitlist the student joins.
+        priority : int, optional
+            The student's priority on the waitlist; lower values are promoted first (default is 0).
+
+        Raises
+        ------
+        ValueError
+            If the student ID or the course ID does not exist in the system.
+            If the student is already enrolled in the course, or the course has a free seat.
+        PrerequisiteError
+            If the student hasn't passed every prerequisite of the course.
+        ScheduleConflictError
+            If one of the course's meetings clashes with a course the student is already enrolled in.
+        """
+        if student_id not in self.students:
+            raise ValueError(f"The Student with ID {student_id} doesn't exist!")
+        if course_id not in self.courses:
+            raise ValueError(f"The Course with ID {course_id} doesn't exist!")
+        if (student_id, course_id) in self.enrollments:
+            raise ValueError(f"Student ID {student_id} is already enrolled in course ID {course_id}.")
+        if self._has_free_seat(self.courses[course_id]):
+            raise ValueError(f"The Course with ID {course_id} has free seats, enroll the student instead.")
+        self._check_requirements(student_id, self.courses[course_id])
+        self.waitlists.join(student_id, course_id, priority)
+        self._notify("waitlist_joined", student_id, course_id, priority)
+
+    def leave_waitlist(self, student_id: int, course_id: str) -> None:
+        """
+        Remove a student from the waitlist of a course.
+
+        Parameters
+        ----------
+        student_id : int
+            The ID of the waitlisted student.
+        course_id : str
+            The ID of the course whose waitlist the student leaves.
+
+        Raises
+        ------
+        ValueError
+            If the student is not on the course's waitlist.
+        """
+        if not self.waitlists.leave(student_id, course_id):
+            raise ValueError(f"Student ID {student_id} is not on the waitlist of course ID {course_id}.")
+        self._notify("waitlist_left", student_id, course_id)
+
+    def get_waitlist(self, course_id: str):
+        """
+        Retrieve the students waitlisted for a course, in the order they will be promoted.
+
+        Parameters
+        ----------
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        List[Student]
+            The waitlisted `Student` objects, head of the waitlist first.
+
+        Raises
+        ------
+        KeyError
+            If the course ID does not exist in the system's course collection.
+        """
+        if course_id not in self.courses:
+            raise KeyError(f"The Course with ID {course_id} doesn't exist!")
+        return [self.students[student_id] for student_id in self.waitlists.student_ids(course_id)]
     
     def assign_grade(self, student_id: int, course_id: str, grade: str):
         """
@@ -349,14 +822,208 @@ class StudentManagementSystem:
         ValueError
             If no matching enrollment is found for the given student ID and course ID.
         """
-        
-        for enrollment in self.enrollments:
-            if enrollment.student.id_number == student_id and enrollment.course.course_id == course_id:
-                enrollment.set_grade(grade)
-                return  # exit to avoid unnecessary iteration after the grade is assigned
+        enrollment = self.enrollments.get(student_id, course_id)
+        if enrollment is None:
+            raise ValueError(f"No enrollment found for student ID {student_id} in course ID {course_id}.")
+        previous_grade = enrollment.grade
+        self.enrollments.set_grade(student_id, course_id, grade)
+        enrollment.grade = grade # the store may hand out copies, so keep the notified object current
+        self.eligibility.grade_changed(student_id, course_id, grade)
+        self._notify("grade_assigned", enrollment, previous_grade)
+
+    def assign_instructor(self, instructor_id: int, course_id: str) -> None:
+        """
+        Assign an instructor to teach a course. A course may have several instructors, and
+        assigning an instructor who already teaches the course does nothing.
 
-        raise ValueError(f"No enrollment found for student ID {student_id} in course ID {course_id}.")
+        Parameters
+        ----------
+        instructor_id : int
+            The ID of the instructor.
+        course_id : str
+            The ID of the course.
+
+        Raises
+        ------
+        ValueError
+            If the instructor ID or the course ID does not exist in the system.
+        """
+        if instructor_id not in self.instructors:
+            raise ValueError(f"The Instructor with ID {instructor_id} doesn't exist!")
+        if course_id not in self.courses:
+            raise ValueError(f"The Course with ID {course_id} doesn't exist!")
+        if self.assignments.add(instructor_id, course_id):
+            self._notify("instructor_assigned", self.instructors[instructor_id], self.courses[course_id])
+
+    def unassign_instructor(self, instructor_id: int, course_id: str) -> None:
+        """
+        Remove an instructor from a course they teach. Unassigning an instructor who doesn't teach the course does nothing.
+
+        Parameters
+        ----------
+        instructor_id : int
+            The ID of the instructor.
+        course_id : str
+            The ID of the course.
+
+        Raises
+        ------
+        ValueError
+            If the instructor ID or the course ID does not exist in the system.
+        """
+        if instructor_id not in self.instructors:
+            raise ValueError(f"The Instructor with ID {instructor_id} doesn't exist!")
+        if course_id not in self.courses:
+            raise ValueError(f"The Course with ID {course_id} doesn't exist!")
+        if self.assignments.remove(instructor_id, course_id):
+            self._notify("instructor_unassigned", self.instructors[instructor_id], self.courses[course_id])
         
+    def bulk_load(self, students=(), instructors=(), courses=(), enrollments=(), assignments=(),
+                  check_rules: bool = True) -> BulkLoadReport:
+        """
+        Add students, instructors, courses, enrollments and instructor assignments to the system in one batched pass.
+
+        Each iterable is consumed once, so generators can be passed in directly. Every record is
+        validated as it is read and invalid records are reported in the returned `BulkLoadReport`
+        instead of aborting the whole batch. Entities are loaded before enrollments and assignments,
+        so those may refer to students, instructors and courses in the same batch. Enrollments are
+        checked against prerequisites like `enroll_student`, and a grade loaded in the batch counts
+        for the enrollments after it.
+
+        Parameters
+        ----------
+        students : Iterable[Student]
+            The Student objects to be added to the system.
+        instructors : Iterable[Instructor]
+            The Instructor objects to be added to the system.
+        courses : Iterable[Course]
+            The Course objects to be added to the system.
+        enrollments : Iterable[tuple]
+            The enrollments to be added, as `(student_id, course_id)` or `(student_id, course_id, grade)` tuples.
+        assignments : Iterable[tuple]
+            The instructor assignments to be added, as `(instructor_id, course_id)` tuples.
+        check_rules : bool, optional
+            Whether enrollments are checked against prerequisites, course capacity and timetable clashes, default True.
+            Pass False to restore state that was already accepted, such as a snapshot, exactly as it was.
+
+        Returns
+        -------
+        BulkLoadReport
+            The number of records added of each type and the rejected records.
+
+        Example
+        -------
+        report = sms.bulk_load(students=[student1, student2], courses=[course1],
+                               enrollments=[(1, "CS101"), (2, "CS101", "A")])
+        print(report)
+        """
+        with self.storage.transaction():
+            return self._bulk_load(students, instructors, courses, enrollments, assignments, check_rules)
+
+    def _bulk_load(self, students, instructors, courses, enrollments, assignments, check_rules=True) -> BulkLoadReport:
+        # bulk_load's body, run inside a single storage transaction
+        report = BulkLoadReport()
+        errors = report.errors
+        notify = self._notify if self.observers else None
+
+        for record_type, records, repo, key in (("student", students, self.students, "id_number"),
+                                                ("instructor", instructors, self.instructors, "id_number"),
+                                                ("course", courses, self.courses, "course_id")):
+            added = 0
+            for position, entity in enumerate(records):
+                entity_id = getattr(entity, key, None)
+                if entity_id is None:
+                    errors.append((record_type, position, f"Record {entity!r} has no {key}."))
+                elif entity_id in repo:
+                    errors.append((record_type, position, f"{record_type.capitalize()} with ID {entity_id} already exists."))
+                else:
+                    if record_type == "course":
+                        try:
+                            self._check_course(entity)
+                        except ValueError as error:
+                            errors.append((record_type, position, str(error)))
+                            continue
+                        self._schedule_course(entity)
+                    repo[entity_id] = entity
+                    added += 1
+                    if notify:
+                        notify(f"{record_type}_added", entity)
+            setattr(report, f"{record_type}s_added", added)
+
+        # bind the lookups used per record to locals, this loop is the hot path for large loads
+        student_repo = self.students
+        course_repo = self.courses
+        is_enrolled = self.enrollments.__contains__
+        insert_enrollment = self.enrollments.insert
+        timetable = self.timetable
+        eligibility = self.eligibility
+        free_seats = {} # course id -> seats left in the course, tracked locally for capacity-limited courses
+        added = 0
+        for position, record in enumerate(enrollments):
+            try:
+                student_id, course_id, *grade = record
+                grade = grade[0] if grade else None
+            except (TypeError, ValueError):
+                errors.append(("enrollment", position, f"Malformed enrollment record {record!r}."))
+                continue
+            student = student_repo.get(student_id)
+            course = course_repo.get(course_id)
+            if student is None:
+                errors.append(("enrollment", position, f"The Student with ID {student_id} doesn't exist!"))
+            elif course is None:
+                errors.append(("enrollment", position, f"The Course with ID {course_id} doesn't exist!"))
+            elif is_enrolled((student_id, course_id)):
+                errors.append(("enrollment", position, f"Student ID {student_id} is already enrolled in course ID {course_id}."))
+            elif check_rules and course.prerequisites and eligibility.missing(student_id, course_id):
+                errors.append(("enrollment", position,
+                               self._missing_message(student_id, course_id, eligibility.missing(student_id, course_id))))
+            elif check_rules and course.capacity is not None and self._free_seats(free_seats, course) <= 0:
+                errors.append(("enrollment", position, f"The Course with ID {course_id} is full ({course.capacity} seats)."))
+            elif check_rules and course.meetings and timetable.student_conflict(student_id, course) is not None:
+                errors.append(("enrollment", position, f"The Course with ID {course_id} clashes with course ID "
+                                                       f"{timetable.student_conflict(student_id, course)} for student ID {student_id}."))
+            else:
+                if check_rules and course.capacity is not None:
+                    free_seats[course_id] -= 1
+                if course.meetings:
+                    timetable.enroll(student_id, course)
+                course.roster[student_id] = student
+                enrollment = Enrollment(student, course, grade)
+                insert_enrollment((student_id, course_id), enrollment)
+                if grade is not None:
+                    eligibility.grade_changed(student_id, course_id, grade)
+                added += 1
+                if notify:
+                    notify("enrolled", enrollment)
+        report.enrollments_added = added
+
+        added = 0
+        for position, record in enumerate(assignments):
+            try:
+                instructor_id, course_id = record
+            except (TypeError, ValueError):
+                errors.append(("assignment", position, f"Malformed assignment record {record!r}."))
+                continue
+            if instructor_id not in self.instructors:
+                errors.append(("assignment", position, f"The Instructor with ID {instructor_id} doesn't exist!"))
+            elif course_id not in course_repo:
+                errors.append(("assignment", position, f"The Course with ID {course_id} doesn't exist!"))
+            elif not self.assignments.add(instructor_id, course_id):
+                errors.append(("assignment", position, f"Instructor ID {instructor_id} already teaches course ID {course_id}."))
+            else:
+                added += 1
+                if notify:
+                    notify("instructor_assigned", self.instructors[instructor_id], course_repo[course_id])
+        report.assignments_added = added
+        return report
+
+    def _free_seats(self, free_seats: dict, course: Course) -> int:
+        # the seats left in a capacity-limited course, counted once per bulk load and then tracked in free_seats
+        seats = free_seats.get(course.course_id)
+        if seats is None:
+            seats = free_seats[course.course_id] = course.capacity - self.enrollments.count_for_course(course.course_id)
+        return seats
+
     def get_students_in_course(self, course_id: str):
         """
         Retrieve a list of students enrolled in a specific course.
@@ -384,8 +1051,7 @@ class StudentManagementSystem:
         """
         if course_id not in self.courses:
             raise KeyError(f"The Course with ID {course_id} doesn't exist!")
-        course = self.courses[course_id]
-        return course.enrolled_students
+        return [enrollment.student for enrollment in self.enrollments.for_course(course_id)]
 
     def get_courses_of_student(self, student_id: str):
         """
@@ -409,7 +1075,141 @@ class StudentManagementSystem:
         """
         if student_id not in self.students:
             raise ValueError(f"The Student with ID {student_id} doesn't exist!")
-        return [enrollment.course for enrollment in self.enrollments if enrollment.student.id_number == student_id]
+        return [enrollment.course for enrollment in self.enrollments.for_student(student_id)]
+
+    def get_missing_prerequisites(self, student_id: int, course_id: str):
+        """
+        Retrieve the prerequisites of a course a student hasn't passed, direct or transitive.
+
+        Parameters
+        ----------
+        student_id : int
+            The ID of the student.
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        List[tuple[str, str | None]]
+            One `(course_id, minimum_grade)` tuple per requirement not met, the minimum grade being None
+            when any passing grade will do; empty if the student may enroll.
+
+        Raises
+        ------
+        ValueError
+            If the student ID or the course ID does not exist in the system.
+
+        Example
+        -------
+        for required, minimum in sms.get_missing_prerequisites(1, "CS201"):
+            print(f"Pass {required} with {minimum or 'any passing grade'} first")
+        """
+        if student_id not in self.students:
+            raise ValueError(f"The Student with ID {student_id} doesn't exist!")
+        if course_id not in self.courses:
+            raise ValueError(f"The Course with ID {course_id} doesn't exist!")
+        return list(self.eligibility.missing(student_id, course_id))
+
+    def is_eligible(self, student_id: int, course_id: str) -> bool:
+        """
+        Check whether a student has passed every prerequisite of a course.
+
+        Parameters
+        ----------
+        student_id : int
+            The ID of the student.
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        bool
+            True if the student's grades meet every requirement of the course.
+
+        Raises
+        ------
+        ValueError
+            If the student ID or the course ID does not exist in the system.
+        """
+        return not self.get_missing_prerequisites(student_id, course_id)
+
+    def get_courses_of_instructor(self, instructor_id: int):
+        """
+        Retrieve the courses an instructor teaches, in the order they were assigned.
+
+        Parameters
+        ----------
+        instructor_id : int
+            The ID of the instructor.
+
+        Returns
+        -------
+        List[Course]
+            The `Course` objects the instructor is assigned to.
+
+        Raises
+        ------
+        ValueError
+            If the instructor ID does not exist in the system.
+        """
+        if instructor_id not in self.instructors:
+            raise ValueError(f"The Instructor with ID {instructor_id} doesn't exist!")
+        return [self.courses[course_id] for course_id in self.assignments.courses_of(instructor_id)]
+
+    def get_instructors_of_course(self, course_id: str):
+        """
+        Retrieve the instructors teaching a course, in the order they were assigned.
+
+        Parameters
+        ----------
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        List[Instructor]
+            The `Instructor` objects assigned to the course.
+
+        Raises
+        ------
+        KeyError
+            If the course ID does not exist in the system's course collection.
+        """
+        if course_id not in self.courses:
+            raise KeyError(f"The Course with ID {course_id} doesn't exist!")
+        return [self.instructors[instructor_id] for instructor_id in self.assignments.instructors_of(course_id)]
+
+    def get_students_of_instructor(self, instructor_id: int):
+        """
+        Retrieve the students enrolled in any course an instructor teaches, each listed once.
+
+        Parameters
+        ----------
+        instructor_id : int
+            The ID of the instructor.
+
+        Returns
+        -------
+        List[Student]
+            The `Student` objects taught by the instructor, in course then enrollment order.
+
+        Raises
+        ------
+        ValueError
+            If the instructor ID does not exist in the system.
+
+        Example
+        -------
+        for student in sms.get_students_of_instructor(instructor_id=7):
+            print(student)
+        """
+        if instructor_id not in self.instructors:
+            raise ValueError(f"The Instructor with ID {instructor_id} doesn't exist!")
+        students = {}
+        for course_id in self.assignments.courses_of(instructor_id):
+            for enrollment in self.enrollments.for_course(course_id):
+                students.setdefault(enrollment.student.id_number, enrollment.student)
+        return list(students.values())
 
     def get_all_students(self):
         """
@@ -477,4 +1277,74 @@ class StudentManagementSystem:
         for enrollment in all_enrollments:
             print(enrollment)
         """
-        return self.enrollments.copy() # .copy() to ensure original enrollments list is not modified when the returned list is manipulated.
\ No newline at end of file
+        return list(self.enrollments) # a new list to ensure the enrollment store is not modified when the returned list is manipulated.
+
+    def iter_students(self):
+        """
+        Lazily iterate over all students in the system without building a list.
+
+        The system must not be modified while the iterator is being consumed.
+
+        Returns
+        -------
+        Iterator[Student]
+            An iterator over the `Student` objects in the system.
+        """
+        return iter(self.students.values())
+
+    def iter_instructors(self):
+        """
+        Lazily iterate over all instructors in the system without building a list.
+
+        The system must not be modified while the iterator is being consumed.
+
+        Returns
+        -------
+        Iterator[Instructor]
+            An iterator over the `Instructor` objects in the system.
+        """
+        return iter(self.instructors.values())
+
+    def iter_courses(self):
+        """
+        Lazily iterate over all courses in the system without building a list.
+
+        The system must not be modified while the iterator is being consumed.
+
+        Returns
+        -------
+        Iterator[Course]
+            An iterator over the `Course` objects in the system.
+        """
+        return iter(self.courses.values())
+
+    def iter_enrollments(self):
+        """
+        Lazily iterate over all enrollments in the system without copying them into a list.
+
+        The system must not be modified while the iterator is being consumed.
+
+        Returns
+        -------
+        Iterator[Enrollment]
+            An iterator over the `Enrollment` objects in the system.
+
+        Example
+        -------
+        for enrollment in sms.iter_enrollments():
+            print(enrollment)
+        """
+        return iter(self.enrollments)
+
+    def iter_assignments(self):
+        """
+        Lazily iterate over the instructor assignments in the system.
+
+        The system must not be modified while the iterator is being consumed.
+
+        Returns
+        -------
+        Iterator[tuple[int, str]]
+            An iterator over `(instructor_id, course_id)` pairs.
+        """
+        return iter(self.assignments)
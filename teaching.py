@@ -0,0 +1,275 @@
+"""
+Teaching-load aggregates for the Student Management System.
+
+`TeachingLoad` keeps, for every instructor and every department, the number of sections
+(course assignments) taught and the number of students enrolled across them. The totals are
+computed once from the system's current contents, then adjusted as an observer (see
+`events.SystemObserver`): an enrollment adds one student to each instructor of its course and
+to their departments, an assignment adds one section and the course's current roster. Reading
+a load is a dictionary lookup, whatever the size of the system.
+
+A student enrolled in two courses of the same instructor counts twice, since the load measures
+seats taught; `StudentManagementSystem.get_students_of_instructor` lists the distinct students.
+A department's load is the sum of its instructors' loads.
+
+Example
+-------
+load = TeachingLoad(sms)
+sms.assign_instructor(7, "CS101")
+print(load.instructor_load(7), load.department_load("Computer Science"))
+"""
+
+import threading
+
+from events import SystemObserver
+
+
+class Load:
+    """
+    A class used to hold a teaching load.
+
+    Attributes
+    ----------
+    sections : int
+        The number of course sections taught.
+    students : int
+        The number of student enrollments across those sections.
+    """
+
+    __slots__ = ("sections", "students")
+
+    def __init__(self, sections: int = 0, students: int = 0) -> None:
+        self.sections = sections
+        self.students = students
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Load):
+            return NotImplemented
+        return (self.sections, self.students) == (other.sections, other.students)
+
+    def __repr__(self) -> str:
+        return f"Load(sections={self.sections}, students={self.students})"
+
+    def _add(self, sections: int, students: int) -> None:
+        self.sections += sections
+        self.students += students
+
+
+class TeachingLoad(SystemObserver):
+    """
+    A class used to keep per-instructor and per-department teaching loads of a Student Management System up to date.
+
+    The aggregates keep their own copy of each course's roster size, each course's instructors and
+    each instructor's department, so every change is applied in time proportional to the number of
+    instructors of the course involved. Updates and reads hold a lock, so the aggregates can observe a
+    `ConcurrentStudentManagementSystem` used from several threads.
+
+    Attributes
+    ----------
+    sms : StudentManagementSystem
+        The observed system.
+
+    Methods
+    -------
+    instructor_load(instructor_id: int) -> Load
+        The load of an instructor.
+    department_load(department: str) -> Load
+        The load of a department.
+    instructor_loads() / department_loads() -> dict[Any, Load]
+        The loads of every instructor, or every department with instructors.
+    detach() -> None
+        Stops following the system's changes.
+    """
+
+    def __init__(self, sms) -> None:
+        """
+        Parameters
+        ----------
+        sms : StudentManagementSystem
+            The system to follow. Its current loads are computed, then kept up to date with its changes.
+        """
+        self.sms = sms
+        self._lock = threading.RLock()
+        self._instructors = {}  # instructor id -> Load
+        self._departments = {}  # department -> Load
+        self._members = {}      # department -> number of instructors in it
+        self._department_of = {}  # instructor id -> department
+        self._roster_sizes = {}   # course id -> number of enrolled students
+        self._teachers = {}       # course id -> {instructor id: None}
+        with self._lock:
+            for instructor in sms.iter_instructors():
+                self.instructor_added(instructor)
+            for course in sms.iter_courses():
+                self._roster_sizes[course.course_id] = 0
+            for enrollment in sms.iter_enrollments():
+                self._roster_sizes[enrollment.course.course_id] += 1
+            for instructor_id, course_id in sms.iter_assignments():
+                self._assign(instructor_id, course_id, 1)
+        sms.add_observer(self)
+
+    def detach(self) -> None:
+        """
+        Stop following the system's changes; the loads keep their current values.
+        """
+        self.sms.remove_observer(self)
+
+    # reads
+
+    def instructor_load(self, instructor_id: int) -> Load:
+        """
+        Return the load of an instructor.
+
+        Parameters
+        ----------
+        instructor_id : int
+            The ID of the instructor.
+
+        Returns
+        -------
+        Load
+            A copy of the instructor's load.
+
+        Raises
+        ------
+        ValueError
+            If the instructor ID does not exist in the system.
+        """
+        with self._lock:
+            load = self._instructors.get(instructor_id)
+            if load is None:
+                raise ValueError(f"The Instructor with ID {instructor_id} doesn't exist!")
+            return Load(load.sections, load.students)
+
+    def department_load(self, department: str) -> Load:
+        """
+        Return the load of a department, the sum of its instructors' loads.
+
+        Parameters
+        ----------
+        department : str
+            The name of the department.
+
+        Returns
+        -------
+        Load
+            A copy of the department's load, empty if no instructor belongs to it.
+        """
+        with self._lock:
+            load = self._departments.get(department)
+            return Load(load.sections, load.students) if load is not None else Load()
+
+    def instructor_loads(self) -> dict:
+        """
+        Return the loads of every instructor.
+
+        Returns
+        -------
+        dict[int, Load]
+            Copies of the loads keyed by instructor id.
+        """
+        with self._lock:
+            return {key: Load(load.sections, load.students) for key, load in self._instructors.items()}
+
+    def department_loads(self) -> dict:
+        """
+        Return the loads of every department with at least one instructor.
+
+        Returns
+        -------
+        dict[str, Load]
+            Copies of the loads keyed by department.
+        """
+        with self._lock:
+            return {key: Load(load.sections, load.students) for key, load in self._departments.items()}
+
+    # updates
+
+    def _assign(self, instructor_id: int, course_id: str, sign: int) -> None:
+        # add (sign 1) or withdraw (sign -1) one section and its roster from an instructor and their department
+        if sign > 0:
+            self._teachers.setdefault(course_id, {})[instructor_id] = None
+        else:
+            teachers = self._teachers[course_id]
+            del teachers[instructor_id]
+            if not teachers:
+                del self._teachers[course_id]
+        students = sign * self._roster_sizes[course_id]
+        self._instructors[instructor_id]._add(sign, students)
+        self._departments[self._department_of[instructor_id]]._add(sign, students)
+
+    def _roster_changed(self, course_id: str, delta: int) -> None:
+        self._roster_sizes[course_id] += delta
+        for instructor_id in self._teachers.get(course_id, ()):
+            self._instructors[instructor_id].students += delta
+            self._departments[self._department_of[instructor_id]].students += delta
+
+    def _join_department(self, instructor_id: int, department: str, load: Load) -> None:
+        self._department_of[instructor_id] = department
+        self._members[department] = self._members.get(department, 0) + 1
+        self._departments.setdefault(department, Load())._add(load.sections, load.students)
+
+    def _leave_department(self, instructor_id: int, load: Load) -> None:
+        department = self._department_of.pop(instructor_id)
+        self._members[department] -= 1
+        if self._members[department]:
+            self._departments[department]._add(-load.sections, -load.students)
+        else:
+            del self._members[department]
+            del self._departments[department]
+
+    def instructor_added(self, instructor) -> None:
+        with self._lock:
+            load = self._instructors[instructor.id_number] = Load()
+            self._join_department(instructor.id_number, instructor.department, load)
+
+    def instructor_updated(self, instructor, previous: dict) -> None:
+        with self._lock:
+            old_id = previous.get("id_number", instructor.id_number)
+            if "id_number" in previous:
+                load = self._instructors[instructor.id_number] = self._instructors.pop(old_id)
+                # the system has already moved the assignments to the new id
+                for course_id in self.sms.assignments.courses_of(instructor.id_number):
+                    teachers = self._teachers[course_id]
+                    del teachers[old_id]
+                    teachers[instructor.id_number] = None
+            else:
+                load = self._instructors[old_id]
+            self._leave_department(old_id, load)
+            self._join_department(instructor.id_number, instructor.department, load)
+
+    def instructor_removed(self, instructor) -> None:
+        # the removal's unassignments have already been announced, so the load is empty
+        with self._lock:
+            self._leave_department(instructor.id_number, self._instructors.pop(instructor.id_number))
+
+    def course_added(self, course) -> None:
+        with self._lock:
+            self._roster_sizes[course.course_id] = 0
+
+    def course_updated(self, course, previous: dict) -> None:
+        if "course_id" in previous:
+            with self._lock:
+                old_id = previous["course_id"]
+                self._roster_sizes[course.course_id] = self._roster_sizes.pop(old_id)
+                if old_id in self._teachers:
+                    self._teachers[course.course_id] = self._teachers.pop(old_id)
+
+    def course_removed(self, course) -> None:
+        with self._lock:
+            self._roster_sizes.pop(course.course_id, None)
+
+    def enrolled(self, enrollment) -> None:
+        with self._lock:
+            self._roster_changed(enrollment.course.course_id, 1)
+
+    def unenrolled(self, enrollment) -> None:
+        with self._lock:
+            self._roster_changed(enrollment.course.course_id, -1)
+
+    def instructor_assigned(self, instructor, course) -> None:
+        with self._lock:
+            self._assign(instructor.id_number, course.course_id, 1)
+
+    def instructor_unassigned(self, instructor, course) -> None:
+        with self._lock:
+            self._assign(instructor.id_number, course.course_id, -1)
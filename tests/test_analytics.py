@@ -0,0 +1,29 @@
+import pytest
+
+from analytics import GradeAnalytics
+from benchmarks.analytics import METHODS, build, same
+from columnar import ColumnarEnrollments
+
+
+def test_pure_python_results():
+    table = ColumnarEnrollments()
+    for student_id, course_id, grade in ((1, "CS101", "A"), (1, "CS102", "C"), (2, "CS101", "B"),
+                                         (2, "CS102", None), (3, "CS101", "P"), (3, "CS102", "B")):
+        table.append(student_id, course_id, grade)
+    analytics = GradeAnalytics(table, majors={1: "Mathematics", 2: "Mathematics", 3: "History"}, use_numpy=False)
+
+    assert analytics.student_gpa() == {1: 3.0, 2: 3.0, 3: 3.0}
+    assert analytics.course_statistics() == {"CS101": {"count": 2, "mean": 3.5, "median": 3.5},
+                                             "CS102": {"count": 2, "mean": 2.5, "median": 2.5}}
+    assert analytics.grade_distribution() == {"CS101": {"A": 1, "B": 1, "P": 1}, "CS102": {"C": 1, "B": 1}}
+    assert analytics.major_statistics() == {"Mathematics": {"students": 2, "mean_gpa": 3.0},
+                                            "History": {"students": 1, "mean_gpa": 3.0}}
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_numpy_matches_pure_python(method):
+    pytest.importorskip("numpy")
+    table, majors = build(num_enrollments=50_000, num_students=4_000, num_courses=300, seed=1)
+    expected = getattr(GradeAnalytics(table, majors=majors, use_numpy=False), method)()
+    actual = getattr(GradeAnalytics(table, majors=majors, use_numpy=True), method)()
+    assert same(actual, expected)
@@ -0,0 +1,120 @@
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+
+from async_sms import AsyncStudentManagementSystem
+from course import Course
+from person import Student
+from storage import InMemoryStorage
+from student_management_system import StudentManagementSystem
+
+
+def _system(storage=None):
+    sms = StudentManagementSystem(storage)
+    sms.bulk_load(students=[Student(f"Student {i}", i, "Computer Science") for i in range(100)],
+                  courses=[Course("Programming I", "CS101"), Course("Seminar", "CS490", 1)])
+    return sms
+
+
+class _CountingStorage(InMemoryStorage):
+    # counts the transactions, and fails the commit of the next one when asked to
+    def __init__(self) -> None:
+        super().__init__()
+        self.transactions = 0
+        self.fail_next_commit = False
+
+    @contextmanager
+    def transaction(self):
+        self.transactions += 1
+        yield
+        if self.fail_next_commit:
+            self.fail_next_commit = False
+            raise OSError("disk full")
+
+
+def test_concurrent_writes_are_applied_in_batches():
+    storage = _CountingStorage()
+    sms = _system(storage)
+    storage.transactions = 0
+
+    async def main():
+        async with AsyncStudentManagementSystem(sms, max_batch=32) as async_sms:
+            await asyncio.gather(*(async_sms.enroll_student(i, "CS101") for i in range(100)))
+            return async_sms.batches, storage.transactions
+
+    batches, transactions = asyncio.run(main())
+    assert len(sms.get_students_in_course("CS101")) == 100
+    assert batches == transactions == 4 # 100 mutations queued at once, 32 to a batch
+
+
+def test_writes_apply_in_order_and_reads_see_returned_writes():
+    sms = _system()
+
+    async def main():
+        async with AsyncStudentManagementSystem(sms) as async_sms:
+            enroll = asyncio.ensure_future(async_sms.enroll_student(1, "CS101"))
+            await asyncio.sleep(0) # queued, not yet applied: reads don't wait for it
+            assert await async_sms.get_students_in_course("CS101") == []
+            await enroll
+            assert [c.course_id for c in await async_sms.get_courses_of_student(1)] == ["CS101"]
+            # queued one after the other, so the grade and the unenrollment see the enrollment
+            await asyncio.gather(async_sms.enroll_student(2, "CS101"), async_sms.assign_grade(2, "CS101", "A"),
+                                 async_sms.unenroll_student(1, "CS101"))
+            return await async_sms.get_students_in_course("CS101")
+
+    assert [s.id_number for s in asyncio.run(main())] == [2]
+    assert sms.enrollments.get(2, "CS101").grade == "A"
+
+
+def test_errors_reach_only_their_caller():
+    sms = _system()
+
+    async def main():
+        async with AsyncStudentManagementSystem(sms) as async_sms:
+            return await asyncio.gather(async_sms.enroll_student(1, "CS490"), async_sms.enroll_student(2, "CS490"),
+                                        async_sms.enroll_student(999, "CS101"), async_sms.enroll_student(3, "CS101"),
+                                        return_exceptions=True)
+
+    first, full, missing, last = asyncio.run(main())
+    assert first is None and last is None
+    assert isinstance(full, ValueError) and "is full" in str(full)
+    assert isinstance(missing, ValueError) and "999" in str(missing)
+    assert sorted(e.student.id_number for e in sms.get_all_enrollments()) == [1, 3]
+
+
+def test_a_failed_commit_fails_the_whole_batch():
+    storage = _CountingStorage()
+    sms = _system(storage)
+
+    async def main():
+        async with AsyncStudentManagementSystem(sms) as async_sms:
+            storage.fail_next_commit = True
+            results = await asyncio.gather(async_sms.enroll_student(1, "CS101"), async_sms.enroll_student(2, "CS101"),
+                                           return_exceptions=True)
+            await async_sms.enroll_student(3, "CS101") # the writer keeps going
+            return results
+
+    assert [type(result) for result in asyncio.run(main())] == [OSError, OSError]
+
+
+def test_close_applies_queued_writes_then_stops():
+    sms = _system()
+
+    async def main():
+        async_sms = AsyncStudentManagementSystem(sms)
+        with pytest.raises(RuntimeError, match="not running"):
+            await async_sms.enroll_student(1, "CS101")
+        await async_sms.start()
+        with pytest.raises(RuntimeError, match="already running"):
+            await async_sms.start()
+        pending = [asyncio.ensure_future(async_sms.enroll_student(i, "CS101")) for i in range(10)]
+        await asyncio.sleep(0) # every write is queued
+        await async_sms.close()
+        assert all(future.done() and future.exception() is None for future in pending)
+        with pytest.raises(RuntimeError, match="not running"):
+            await async_sms.enroll_student(10, "CS101")
+        await async_sms.close() # closing twice is harmless
+
+    asyncio.run(main())
+    assert len(sms.get_students_in_course("CS101")) == 10
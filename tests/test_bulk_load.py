@@ -0,0 +1,30 @@
+import itertools
+import time
+
+from benchmarks.bulk_load import records
+from course import Course
+from person import Student
+from student_management_system import StudentManagementSystem
+
+
+def test_bulk_load_counts_errors_and_throughput():
+    students, courses, enrollments = records(num_students=5_000, num_courses=200, num_enrollments=20_000)
+    students = itertools.chain(students, [Student("Duplicate", 0, "Undeclared")])
+    courses = itertools.chain(courses, [Course("Small", "SMALL", 1)])
+    enrollments = itertools.chain(enrollments, [(0, "C0", "A"),     # already enrolled
+                                                (99_999, "C1"),     # no such student
+                                                (1, "NOPE"),        # no such course
+                                                (1, "SMALL"), (2, "SMALL"),  # the second one is over capacity
+                                                ("not a record",)])
+    sms = StudentManagementSystem()
+    start = time.perf_counter()
+    report = sms.bulk_load(students=students, courses=courses, enrollments=enrollments)
+    elapsed = time.perf_counter() - start
+    print(f"\n{report} in {elapsed:.3f}s, {report.enrollments_added / elapsed:,.0f} enrollments/s")
+
+    assert (report.students_added, report.courses_added, report.enrollments_added) == (5_000, 201, 20_001)
+    assert len(sms.enrollments) == 20_001
+    assert [(record_type, position) for record_type, position, _ in report.errors] == [
+        ("student", 5_000), ("enrollment", 20_000), ("enrollment", 20_001), ("enrollment", 20_002),
+        ("enrollment", 20_004), ("enrollment", 20_005)]
+    assert report.errors[4][2] == "The Course with ID SMALL is full (1 seats)."
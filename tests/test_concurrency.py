@@ -0,0 +1,110 @@
+import random
+import sys
+import threading
+
+import pytest
+
+from concurrency import ConcurrentStudentManagementSystem
+from course import Course
+from person import Student
+
+STUDENTS = 200
+COURSES = 12
+CAPACITY = 8
+
+
+def _registrar(sms, seed: int, operations: int, start: threading.Barrier) -> None:
+    # enroll (joining the waitlist of a full course), unenroll (promoting the head of the waitlist) and grade
+    generator = random.Random(seed)
+    start.wait()
+    for _ in range(operations):
+        # renamed students and courses move between the two id ranges, so some ids are missing at any time
+        student_id = generator.randrange(2 * STUDENTS)
+        course_id = f"{generator.choice('CR')}{generator.randrange(COURSES)}"
+        action = generator.random()
+        try:
+            if action < 0.5:
+                try:
+                    sms.enroll_student(student_id, course_id)
+                except ValueError as error:
+                    if "is full" not in str(error):
+                        raise
+                    sms.join_waitlist(student_id, course_id, priority=generator.randrange(3))
+            elif action < 0.8:
+                sms.unenroll_student(student_id, course_id)
+            elif action < 0.9:
+                sms.assign_grade(student_id, course_id, "B")
+            else:
+                sms.leave_waitlist(student_id, course_id)
+        except ValueError: # an id that is renamed away, or a seat taken or freed by another thread in between
+            pass
+
+
+def _renamer(sms, seed: int, operations: int, start: threading.Barrier) -> None:
+    # move students between ids i and i + STUDENTS, and courses between Ci and Ri
+    generator = random.Random(seed)
+    start.wait()
+    for _ in range(operations):
+        if generator.random() < 0.5:
+            student_id = generator.randrange(STUDENTS)
+            old_id, new_id = (student_id, student_id + STUDENTS) if student_id in sms.students else (student_id + STUDENTS, student_id)
+            sms.update_student_details(old_id, new_name=f"Student {new_id}", new_id_number=new_id)
+        else:
+            number = generator.randrange(COURSES)
+            old_id, new_id = (f"C{number}", f"R{number}") if f"C{number}" in sms.courses else (f"R{number}", f"C{number}")
+            sms.update_course_details(old_id, new_course_id=new_id)
+
+
+def check_consistency(sms) -> None:
+    store = sms.enrollments
+    pairs = set(store.by_pair)
+    assert pairs == {(s, c) for s, courses in store.by_student_id.items() for c in courses}, "student index diverged"
+    assert pairs == {(s, c) for c, students in store.by_course_id.items() for s in students}, "course index diverged"
+    assert pairs == {(s, c.course_id) for c in sms.courses.values() for s in c.roster}, "course rosters diverged"
+    assert all((e.student.id_number, e.course.course_id) == pair and sms.students[pair[0]] is e.student
+               and sms.courses[pair[1]] is e.course for pair, e in store.by_pair.items()), "enrollments hold stale ids"
+    assert all(s.id_number == student_id for student_id, s in sms.students.items()), "student keys diverged"
+    assert all(c.course_id == course_id for course_id, c in sms.courses.items()), "course keys diverged"
+    waitlisted = {(s, c) for c in sms.courses for s in sms.waitlists.student_ids(c)}
+    assert waitlisted == {(s, c) for s, courses in sms.waitlists.by_student_id.items() for c in courses}, "waitlist index diverged"
+    assert not waitlisted & pairs, "a student is both enrolled in and waitlisted for a course"
+    assert set(sms.waitlists.by_course_id) <= set(sms.courses), "a waitlist outlived its course"
+    for course_id, course in sms.courses.items():
+        count = store.count_for_course(course_id)
+        assert count == len(course.roster) <= CAPACITY, f"course {course_id} is over capacity"
+        assert count == CAPACITY or not sms.waitlists.waiting(course_id), f"course {course_id} has free seats and a waitlist"
+
+
+@pytest.fixture
+def fast_switching():
+    # switch threads every few bytecodes so the operations interleave as much as possible
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_threads_keep_indexes_consistent(seed, fast_switching):
+    sms = ConcurrentStudentManagementSystem(stripes=8)
+    sms.bulk_load(students=(Student(f"Student {i}", i, "Undeclared") for i in range(STUDENTS)),
+                  courses=(Course(f"Course {i}", f"C{i}", CAPACITY) for i in range(COURSES)))
+    threads = 6
+    start = threading.Barrier(threads + 1)
+    errors = []
+
+    def guarded(target, *args):
+        try:
+            target(*args)
+        except BaseException as error: # surfaced in the test's thread below
+            errors.append(error)
+
+    workers = [threading.Thread(target=guarded, args=(_registrar, sms, seed * 100 + i, 3_000, start)) for i in range(threads)]
+    workers.append(threading.Thread(target=guarded, args=(_renamer, sms, seed, 300, start)))
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert not errors, errors[0]
+    check_consistency(sms)
+    assert len(sms.enrollments) > 0 and sms.waitlists.by_course_id
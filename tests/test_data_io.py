@@ -0,0 +1,56 @@
+import io
+
+import pytest
+
+from course import Course
+from data_io import MalformedRecord, export_system, import_system, read_courses, read_enrollments, read_students
+from person import Student
+from student_management_system import StudentManagementSystem
+
+
+def test_malformed_rows_are_reported_and_the_rest_loads():
+    students = io.StringIO("id_number,name,major\n1,Ada Lovelace,Mathematics\nx,Alan Turing,Mathematics\n"
+                           "3,Grace Hopper,Computer Science\n")
+    courses = io.StringIO('{"course_id": "CS101", "course_name": "Programming I", "capacity": "many"}\n'
+                          '{"course_id": "CS102", "course_name": "Programming II"}\n'
+                          'not json\n')
+    enrollments = io.StringIO("student_id,course_id,grade\n1,CS102,A\n3\n3,CS102,\n")
+    report = StudentManagementSystem().bulk_load(students=read_students(students, "csv"),
+                                                 courses=read_courses(courses, "jsonl"),
+                                                 enrollments=read_enrollments(enrollments, "csv"))
+
+    assert (report.students_added, report.courses_added, report.enrollments_added) == (2, 1, 2)
+    assert [(record_type, position) for record_type, position, _ in report.errors] == [
+        ("student", 1), ("course", 0), ("course", 2), ("enrollment", 1)]
+    assert "invalid literal for int()" in report.errors[0][2]
+    assert "invalid JSON" in report.errors[2][2]
+
+
+def test_missing_field():
+    record, = read_enrollments(io.StringIO('{"course_id": "CS101"}\n'), "jsonl")
+    assert isinstance(record, MalformedRecord)
+    assert record.reason == "missing field 'student_id'"
+
+
+def _enrollments(sms):
+    return sorted((e.student.id_number, e.course.course_id, e.grade) for e in sms.get_all_enrollments())
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_export_import_round_trip_keeps_accepted_enrollments(tmp_path, fmt):
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=[Student(f"Student {i}", i, "Computer Science") for i in (1, 2, 3)],
+                  courses=[Course("Programming I", "CS101", 3), Course("Programming II", "CS102", prerequisites={"CS101": "C"})],
+                  enrollments=[(1, "CS101", "A"), (2, "CS101", "B"), (3, "CS101"), (1, "CS102")])
+    sms.update_course_details("CS101", new_capacity=2) # the roster stays above the new capacity
+    sms.assign_grade(1, "CS101", "F") # student 1 no longer passes CS102's prerequisite
+    export_system(sms, str(tmp_path), fmt)
+
+    restored = StudentManagementSystem()
+    report = import_system(restored, str(tmp_path), fmt)
+    assert report.errors == []
+    assert _enrollments(restored) == _enrollments(sms)
+    assert restored.courses["CS101"].capacity == 2
+
+    report = import_system(StudentManagementSystem(), str(tmp_path), fmt, check_rules=True)
+    assert [(record_type, position) for record_type, position, _ in report.errors] == [("enrollment", 2), ("enrollment", 3)]
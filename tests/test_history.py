@@ -0,0 +1,95 @@
+import itertools
+import random
+
+import pytest
+
+from course import Course
+from history import ChangeJournal
+from person import Student
+from student_management_system import StudentManagementSystem
+
+
+def _state(sms):
+    # the live system, in the shape of `ChangeJournal.state_as_of`
+    state = {("student", s.id_number): {"id_number": s.id_number, "name": s.name, "major": s.major} for s in sms.iter_students()}
+    state.update((("course", c.course_id), {"course_id": c.course_id, "course_name": c.course_name, "capacity": c.capacity})
+                 for c in sms.iter_courses())
+    state.update((("enrollment", (e.student.id_number, e.course.course_id)),
+                  {"student_id": e.student.id_number, "course_id": e.course.course_id, "grade": e.grade})
+                 for e in sms.iter_enrollments())
+    return state
+
+
+def _journaled(checkpoint_interval=1024):
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=[Student(f"Student {i}", i, "Undeclared") for i in range(1, 4)],
+                  courses=[Course("Programming I", "CS101", 30)], enrollments=[(1, "CS101")])
+    return sms, ChangeJournal(sms, clock=itertools.count(100).__next__, checkpoint_interval=checkpoint_interval)
+
+
+def test_history_and_grade_changes_follow_renames():
+    sms, journal = _journaled()
+    sms.assign_grade(1, "CS101", "B")                          # 101
+    sms.update_student_details(1, new_id_number=10)            # 102, 103
+    sms.assign_grade(10, "CS101", "A")                         # 104
+    sms.update_course_details("CS101", new_course_id="CS100")  # 105, 106
+    sms.enroll_student(2, "CS100")                             # 107
+
+    assert len(journal) == 7
+    history = journal.history("enrollment", (10, "CS100"))
+    assert [(change.timestamp, change.fields) for change in history] == [
+        (101, {"grade": (None, "B")}), (103, {"student_id": (1, 10)}), (104, {"grade": ("B", "A")}),
+        (106, {"course_id": ("CS101", "CS100")})]
+    assert history[1].renamed_from == (1, "CS101") and journal.history("enrollment", (1, "CS101")) == []
+    assert [change.fields["grade"] for change in journal.grade_changes("CS100")] == [(None, "B"), ("B", "A")]
+    assert [change.sequence for change in journal.changes(start=102, end=104)] == [1, 2, 3]
+    assert journal.entity_as_of("enrollment", (1, "CS101"), 102) == {"student_id": 1, "course_id": "CS101", "grade": "B"}
+    assert journal.entity_as_of("enrollment", (10, "CS100"), 102) is None
+    with pytest.raises(ValueError, match="Unknown kind"):
+        journal.history("teacher", 1)
+    with pytest.raises(ValueError, match="journal started"):
+        journal.state_as_of(99)
+
+
+@pytest.mark.parametrize("checkpoint_interval", [1, 7, 1024])
+def test_state_as_of_matches_the_live_state_across_checkpoints(checkpoint_interval):
+    sms, journal = _journaled(checkpoint_interval)
+    states = {100: _state(sms)}
+    generator = random.Random(2)
+    for _ in range(400):
+        student_id, course_id = generator.randrange(1, 12), f"C{generator.randrange(4)}"
+        action = generator.random()
+        try:
+            if action < 0.35:
+                sms.enroll_student(student_id, course_id)
+            elif action < 0.5:
+                sms.unenroll_student(student_id, course_id)
+            elif action < 0.7:
+                sms.assign_grade(student_id, course_id, generator.choice("ABCDF"))
+            elif action < 0.8:
+                new_id = generator.randrange(1, 12)
+                sms.update_student_details(student_id, new_major="Physics", new_id_number=new_id if new_id not in sms.students else None)
+            elif action < 0.87:
+                sms.update_course_details(course_id, new_course_name=f"Course {generator.randrange(100)}")
+            elif action < 0.93:
+                sms.add_student(Student(f"Student {student_id}", student_id, "Undeclared"))
+            elif action < 0.97:
+                sms.add_course(Course(f"Course {course_id}", course_id, 5))
+            else:
+                sms.remove_student(student_id)
+        except (KeyError, ValueError): # missing ids, full courses, repeated enrollments and ids in use
+            continue
+        if len(journal):
+            states[journal.changes()[-1].timestamp] = _state(sms)
+    assert len(journal) > 100 and len(states) > 100
+    for timestamp, state in states.items():
+        assert dict(journal.state_as_of(timestamp).items()) == state
+
+
+def test_updates_that_change_nothing_are_not_journaled():
+    sms, journal = _journaled()
+    sms.update_student_details(1, new_name="Student 1")
+    sms.update_course_details("CS101", new_capacity=30)
+    assert len(journal) == 0
+    sms.update_student_details(1, new_name="Student 1", new_major="Physics")
+    assert [change.fields for change in journal.changes()] == [{"major": ("Undeclared", "Physics")}]
@@ -0,0 +1,95 @@
+import pytest
+
+from course import Course
+from indexes import Query, SecondaryIndexes
+from person import Instructor, Student
+from student_management_system import StudentManagementSystem
+
+
+def _ids(query):
+    return [getattr(entity, "course_id", None) or entity.id_number for entity in query]
+
+
+def _indexed():
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=[Student("John Smith", 3, "Mathematics"), Student("Joan Smithers", 1, "History"),
+                            Student("Jonathan Smyth", 2, "Mathematics"), Student("Ada Lovelace", 4, "Mathematics")],
+                  instructors=[Instructor("Barbara Liskov", 10, "Computer Science"), Instructor("Edsger Dijkstra", 11, "Mathematics")],
+                  courses=[Course("Programming I", "CS101"), Course("Programming II", "CS102"), Course("Calculus", "MATH100")])
+    return sms, SecondaryIndexes(sms)
+
+
+def test_lookups_by_attribute_and_name_prefix():
+    sms, indexes = _indexed()
+    assert _ids(indexes.find_students(major="Mathematics")) == [2, 3, 4]
+    assert _ids(indexes.find_students(name_prefix="JO")) == [1, 2, 3]
+    assert _ids(indexes.find_students(name_prefix="john s")) == [3] # longer than the bucket depth, checked in full
+    assert _ids(indexes.find_students(major="Mathematics", name_prefix="jo")) == [2, 3]
+    assert _ids(indexes.find_students(major="Physics")) == []
+    assert _ids(indexes.find_students()) == [1, 2, 3, 4]
+    assert _ids(indexes.find_instructors(department="Mathematics")) == [11]
+    assert _ids(indexes.find_instructors(name_prefix="bar")) == [10]
+    assert _ids(indexes.find_courses(name_prefix="programming")) == ["CS101", "CS102"]
+    assert _ids(indexes.find_courses(course_name="Calculus")) == ["MATH100"]
+
+
+def test_name_prefixes_match_any_word():
+    sms, indexes = _indexed()
+    assert _ids(indexes.find_students(name_prefix="smi")) == [1, 3]
+    assert _ids(indexes.find_students(name_prefix="smithe")) == [1]
+    assert _ids(indexes.find_students(name_prefix="love")) == [4]
+    assert _ids(indexes.find_students(name_prefix="smith j")) == []
+    assert _ids(indexes.find_students(name_prefix="ohn")) == [] # only the starts of words match
+    assert _ids(indexes.find_courses(name_prefix="ii")) == ["CS102"]
+    sms.update_student_details(4, new_name="Augusta Ada King")
+    assert _ids(indexes.find_students(name_prefix="kin")) == [4]
+    assert _ids(indexes.find_students(name_prefix="lov")) == []
+    assert "lov" not in indexes.student_names.buckets
+
+
+def test_queries_filter_combine_and_paginate():
+    sms, indexes = _indexed()
+    maths = indexes.find_students(major="Mathematics")
+    jo = indexes.find_students(name_prefix="jo")
+    assert _ids(maths & jo) == [2, 3]
+    assert _ids(maths | jo) == [1, 2, 3, 4]
+    assert _ids(maths - jo) == [4]
+    assert _ids(maths.where(lambda student: student.id_number > 2)) == [3, 4]
+    assert (maths.count(), len(maths), 3 in maths, 1 in maths) == (3, 3, True, False)
+    assert maths.first().id_number == 2 and indexes.find_students(major="Physics").first() is None
+    assert [_ids(maths.page(number, size=2)) for number in (1, 2, 3)] == [[2, 3], [4], []]
+    with pytest.raises(ValueError):
+        maths.page(0)
+    with pytest.raises(ValueError, match="Cannot combine"):
+        maths & indexes.find_courses()
+    # a query holds its own copy of the results
+    sms.remove_student(2)
+    assert _ids(maths) == [2, 3, 4] and _ids(indexes.find_students(major="Mathematics")) == [3, 4]
+
+
+def test_indexes_follow_renames_and_removals():
+    sms, indexes = _indexed()
+    sms.update_student_details(3, new_name="Jack Smith", new_major="Physics", new_id_number=30)
+    sms.add_student(Student("Joe Bloggs", 5, "Physics"))
+    sms.update_instructor_details(11, new_department="Computer Science", new_id_number=12)
+    sms.update_course_details("CS102", new_course_name="Data Structures", new_course_id="CS201")
+    sms.remove_course("CS101")
+
+    assert _ids(indexes.find_students(name_prefix="jo")) == [1, 2, 5]
+    assert _ids(indexes.find_students(major="Physics")) == [5, 30]
+    assert _ids(indexes.find_students(major="Mathematics")) == [2, 4]
+    assert _ids(indexes.find_instructors(department="Computer Science")) == [10, 12]
+    assert _ids(indexes.find_courses(name_prefix="prog")) == []
+    assert _ids(indexes.find_courses(name_prefix="data")) == ["CS201"]
+    assert indexes.course_names.get("Programming I") == {}
+
+    indexes.detach()
+    sms.add_student(Student("Joy Adamson", 6, "Biology"))
+    assert _ids(indexes.find_students(major="Biology")) == []
+
+
+def test_query_is_a_plain_result_set():
+    students = {2: Student("B", 2, None), 1: Student("A", 1, None)}
+    query = Query("student", students)
+    assert [student.id_number for student in query.all()] == [1, 2]
+    assert Query("student", {}).page(1) == []
@@ -0,0 +1,88 @@
+import re
+
+from course import Course
+from instrumentation import LATENCY_BUCKETS, Instrumentation, profile
+from person import Student
+from student_management_system import StudentManagementSystem
+
+
+def _instrumented():
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=[Student(f"Student {i}", i, "Undeclared") for i in range(1, 4)],
+                  courses=[Course("Programming I", "CS101")])
+    return sms, Instrumentation(sms)
+
+
+def test_prometheus_bucket_labels_are_exact_decimals():
+    sms, instrumentation = _instrumented()
+    sms.enroll_student(1, "CS101")
+    labels = re.findall(r'sms_call_duration_seconds_bucket\{method="enroll_student",le="([^"]+)"\}', instrumentation.prometheus())
+    assert labels == ["1e-06", "2.5e-06", "5e-06", "1e-05", "2.5e-05", "5e-05", "0.0001", "0.00025", "0.0005",
+                      "0.001", "0.0025", "0.005", "0.01", "0.025", "0.05", "0.1", "0.25", "0.5",
+                      "1.0", "2.5", "5.0", "10.0", "+Inf"]
+    assert [float(label) for label in labels[:-1]] == list(LATENCY_BUCKETS)
+
+
+def test_calls_errors_and_sizes_are_recorded():
+    sms, instrumentation = _instrumented()
+    sms.enroll_student(1, "CS101")
+    sms.enroll_student(2, "CS101")
+    sms.enroll_student(course_id="CS101", student_id=3) # keyword calls are probed too
+    try:
+        sms.enroll_student(1, "CS999")
+    except ValueError:
+        pass
+    sms.get_students_in_course("CS101")
+
+    snapshot = instrumentation.snapshot()
+    assert set(snapshot) == {"enroll_student", "get_students_in_course"} # methods never called are left out
+    enroll = snapshot["enroll_student"]
+    assert (enroll["calls"], enroll["errors"], enroll["scanned"]) == (4, 1, 3) # rosters of 0, 1, 2 and the empty CS999
+    assert enroll["sizes"][:3] == [(1, 3), (2, 4), (5, 4)] and enroll["sizes"][-1] == (float("inf"), 4)
+    assert enroll["latency"][-1] == (float("inf"), 4) and enroll["seconds"] > 0
+    assert snapshot["get_students_in_course"]["scanned"] == 3
+
+    instrumentation.reset()
+    assert instrumentation.snapshot() == {}
+    instrumentation.detach()
+    assert "enroll_student" not in sms.__dict__
+    sms.unenroll_student(1, "CS101")
+    assert instrumentation.snapshot() == {}
+
+
+def test_prometheus_exposition_format():
+    sms, instrumentation = _instrumented()
+    sms.enroll_student(1, "CS101")
+    try:
+        sms.enroll_student(9, "CS101")
+    except ValueError:
+        pass
+    text = instrumentation.prometheus(prefix="registry")
+    lines = text.splitlines()
+    assert text.endswith("\n")
+    assert lines[:3] == ["# HELP registry_calls_total Calls of each Student Management System method.",
+                         "# TYPE registry_calls_total counter", 'registry_calls_total{method="enroll_student"} 2']
+    assert 'registry_errors_total{method="enroll_student"} 1' in lines
+    assert "# TYPE registry_call_duration_seconds histogram" in lines
+    assert "# TYPE registry_scanned_items histogram" in lines
+    # every sample is `name{labels} value`, and bucket counts are cumulative up to the total count
+    sample = re.compile(r'^registry_[a-z_]+\{method="[a-z_]+"(,le="[^"]+")?\} [0-9.e+-]+$')
+    assert all(line.startswith("# ") or sample.match(line) for line in lines)
+    buckets = [int(line.rsplit(" ", 1)[1]) for line in lines if line.startswith("registry_call_duration_seconds_bucket")]
+    assert buckets == sorted(buckets) and buckets[-1] == 2
+    assert 'registry_call_duration_seconds_count{method="enroll_student"} 2' in lines
+    assert 'registry_scanned_items_bucket{method="enroll_student",le="1.0"} 2' in lines
+    assert 'registry_scanned_items_sum{method="enroll_student"} 1' in lines
+
+
+def test_profile_fills_in_a_report():
+    sms = StudentManagementSystem()
+    with profile(limit=5) as report:
+        sms.bulk_load(students=[Student(f"Student {i}", i, "Undeclared") for i in range(2_000)])
+    assert report.seconds > 0 and len(report.functions) == 5
+    assert report.memory_peak > 0 and report.allocations
+    assert "function" in str(report) and "allocated at" in str(report)
+
+    with profile(sort="tottime", memory=False) as report:
+        sms.get_all_students()
+    assert report.memory_peak is None and report.allocations == []
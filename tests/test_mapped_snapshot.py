@@ -0,0 +1,70 @@
+import pytest
+
+from course import Course, MeetingSlot
+from mapped_snapshot import MappedStudentManagementSystem, write_mapped_snapshot
+from person import Instructor, Student
+from student_management_system import StudentManagementSystem
+
+
+def _system():
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=[Student("Ada Lovelace", 3, "Mathematics"), Student("Alan Turing", 1, "Mathematics"),
+                            Student("Grace Hopper", 2, None)],
+                  instructors=[Instructor("Edsger Dijkstra", 20, "Computer Science"), Instructor("Barbara Liskov", 10, "Computer Science")],
+                  courses=[Course("Programming II", "CS102", 2, (MeetingSlot(0, 540, 630, "R101"), MeetingSlot(2, 540, 630)),
+                                  {"CS101": "C", "MATH100": None}),
+                           Course("Programming I", "CS101"), Course("Calculus", "MATH100", 40)],
+                  enrollments=[(1, "CS101", "A"), (1, "MATH100", "B"), (3, "CS101", "B"), (1, "CS102"), (3, "MATH100", "A-")],
+                  assignments=[(20, "CS102"), (10, "CS101"), (10, "CS102")])
+    return sms
+
+
+def _courses(courses):
+    return [(c.course_id, c.course_name, c.capacity, c.meetings, c.prerequisites) for c in courses]
+
+
+def test_snapshot_answers_queries_like_the_system(tmp_path):
+    sms = _system()
+    path = str(tmp_path / "registry.smap")
+    write_mapped_snapshot(sms, path)
+    with MappedStudentManagementSystem(path) as view:
+        assert (view.num_students, view.num_instructors, view.num_courses, view.num_enrollments) == (3, 2, 3, 5)
+        assert [(s.id_number, s.name, s.major) for s in view.get_all_students()] == [
+            (1, "Alan Turing", "Mathematics"), (2, "Grace Hopper", None), (3, "Ada Lovelace", "Mathematics")]
+        assert [(i.id_number, i.department) for i in view.get_all_instructors()] == [(10, "Computer Science"), (20, "Computer Science")]
+        assert _courses(view.get_all_courses()) == _courses(sorted(sms.get_all_courses(), key=lambda c: c.course_id))
+        assert [s.id_number for s in view.get_students_in_course("CS101")] == [1, 3]
+        assert [c.course_id for c in view.get_courses_of_student(1)] == ["CS101", "MATH100", "CS102"]
+        assert view.get_grade(3, "MATH100") == "A-" and view.get_grade(1, "CS102") is None
+        assert sorted((e.student.id_number, e.course.course_id, e.grade) for e in view.iter_enrollments()) == \
+            sorted((e.student.id_number, e.course.course_id, e.grade) for e in sms.iter_enrollments())
+        assert [c.course_id for c in view.get_courses_of_instructor(10)] == ["CS101", "CS102"]
+        assert [i.id_number for i in view.get_instructors_of_course("CS102")] == [20, 10]
+        assert sorted(view.iter_assignments()) == sorted(sms.iter_assignments())
+        assert [(s.id_number, [(c.course_id, grade) for c, grade in courses]) for s, courses in view.iter_schedules(1, 3)] == [
+            (2, []), (3, [("CS101", "B"), ("MATH100", "A-")])]
+        # objects are built once and reused
+        assert view.get_courses_of_student(1)[2] is view.get_courses_of_instructor(20)[0]
+
+
+def test_missing_records_raise(tmp_path):
+    path = str(tmp_path / "registry.smap")
+    write_mapped_snapshot(_system(), path)
+    with MappedStudentManagementSystem(path) as view:
+        with pytest.raises(KeyError):
+            view.get_students_in_course("CS999")
+        with pytest.raises(KeyError):
+            view.get_instructors_of_course("CS999")
+        with pytest.raises(ValueError):
+            view.get_courses_of_student(4)
+        with pytest.raises(ValueError):
+            view.get_courses_of_instructor(30)
+        with pytest.raises(ValueError):
+            view.get_grade(2, "CS101")
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "registry.smap"
+    path.write_bytes(b"not a snapshot" * 20)
+    with pytest.raises(ValueError, match="not a mapped snapshot"):
+        MappedStudentManagementSystem(str(path))
@@ -0,0 +1,39 @@
+from name_search import NameSearch
+from person import Instructor, Student
+from student_management_system import StudentManagementSystem
+
+
+def _index():
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=[Student("John Smith", 1, "Mathematics"), Student("Joan Smithers", 2, "History"),
+                            Student("Jon Smyth", 3, "Physics"), Student("Christopher Smith", 4, "Physics")],
+                  instructors=[Instructor("John Smith", 5, "Mathematics")])
+    return sms, NameSearch(sms)
+
+
+def _found(results):
+    return [(result.kind, result.person.id_number, round(result.score, 2)) for result in results]
+
+
+def test_exact_prefix_and_misspelled_words():
+    sms, index = _index()
+    assert _found(index.search("john smith", k=2)) == [("student", 1, 1.0), ("instructor", 5, 1.0)]
+    assert _found(index.search("jhon smiht", kind="student")) == [("student", 1, 0.78)]
+    assert _found(index.search("smith", k=3)) == [("student", 1, 1.0), ("student", 4, 1.0), ("instructor", 5, 1.0)]
+    assert _found(index.search("joan smith"))[:2] == [("student", 2, 0.95), ("student", 1, 0.88)]
+    assert index.search("zzzz") == []
+
+
+def test_words_far_from_the_vocabulary_fall_back_to_trigrams():
+    sms, index = _index()
+    assert _found(index.search("kristofer", threshold=0.3)) == [("student", 4, 0.36)]
+    assert index.search("kristofer") == []
+
+
+def test_index_follows_renames():
+    sms, index = _index()
+    sms.update_student_details(3, new_name="Jonathan Smyth", new_id_number=30)
+    assert _found(index.search("jonathan")) == [("student", 30, 1.0)]
+    assert _found(index.search("jon smyth")) == [("student", 30, 0.95), ("student", 1, 0.78), ("instructor", 5, 0.78)]
+    sms.remove_student(1)
+    assert _found(index.search("john smith")) == [("instructor", 5, 1.0), ("student", 2, 0.82)]
@@ -0,0 +1,24 @@
+from course import Course
+from person import Student
+from student_management_system import StudentManagementSystem
+
+
+def test_bulk_load_checks_prerequisites():
+    sms = StudentManagementSystem()
+    report = sms.bulk_load(students=[Student(f"Student {i}", i, "Computer Science") for i in (1, 2, 3)],
+                           courses=[Course("Programming I", "CS101"), Course("Programming II", "CS102", prerequisites={"CS101": "C"})],
+                           enrollments=[(1, "CS101", "A"), (1, "CS102"),  # passed earlier in the batch
+                                        (2, "CS101", "D"), (2, "CS102"),  # below the minimum grade
+                                        (3, "CS102")])                    # never took CS101
+    assert report.enrollments_added == 3
+    assert [(record_type, position) for record_type, position, _ in report.errors] == [("enrollment", 3), ("enrollment", 4)]
+    assert report.errors[0][2] == "Student ID 2 hasn't passed the prerequisites of course ID CS102: CS101 with C or better."
+    assert sms.get_missing_prerequisites(1, "CS102") == []
+
+
+def test_bulk_load_without_rules_keeps_state_as_is():
+    sms = StudentManagementSystem()
+    report = sms.bulk_load(students=[Student("Student 1", 1, "Computer Science")],
+                           courses=[Course("Programming II", "CS102", 0, prerequisites={"CS101": "C"})],
+                           enrollments=[(1, "CS102")], check_rules=False)
+    assert (report.enrollments_added, report.errors) == (1, [])
@@ -0,0 +1,125 @@
+import pytest
+
+from course import Course, MeetingSlot
+from person import Student
+from registration import CourseFullError, Waitlist, WaitlistBook, allocate_seats
+from student_management_system import StudentManagementSystem
+
+
+def _ids(students):
+    return [student.id_number for student in students]
+
+
+def _system(capacity=2):
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=[Student(f"Student {i}", i, "Computer Science") for i in range(1, 8)],
+                  courses=[Course("Programming I", "CS101", capacity, (MeetingSlot(0, 540, 600),)),
+                           Course("Programming II", "CS102", capacity, prerequisites={"CS101": "C"}),
+                           Course("Algorithms", "CS201", capacity, (MeetingSlot(0, 570, 630),))])
+    return sms
+
+
+def test_waitlist_serves_by_priority_then_in_order():
+    waitlist = Waitlist()
+    for student_id, priority in ((1, 0), (2, 1), (3, 0), (4, 0)):
+        waitlist.push(student_id, priority)
+    assert waitlist.student_ids() == [1, 3, 4, 2]
+    waitlist.push(3, priority=2) # joining again moves the student to the back of the new priority
+    assert waitlist.student_ids() == [1, 4, 2, 3]
+    assert (len(waitlist), 3 in waitlist) == (4, True)
+    waitlist.rekey_student(4, 40)
+    assert [waitlist.pop(), waitlist.pop(), waitlist.pop(), waitlist.pop(), waitlist.pop()] == [1, 40, 2, 3, None]
+
+
+def test_waitlist_removal_is_lazy():
+    waitlist = Waitlist()
+    for student_id in (1, 2, 3):
+        waitlist.push(student_id)
+    assert waitlist.remove(1) and not waitlist.remove(1)
+    assert len(waitlist) == 2 and len(waitlist._heap) == 3 # the stale entry stays in the heap
+    assert waitlist.pop() == 2 and len(waitlist._heap) == 1 # and is skipped when it reaches the top
+    assert waitlist.student_ids() == [3]
+
+
+def test_waitlist_book_keeps_both_indexes():
+    book = WaitlistBook()
+    book.join(1, "CS101")
+    book.join(1, "CS102")
+    book.join(2, "CS101", priority=-1)
+    assert book.student_ids("CS101") == [2, 1] and book.by_student_id == {1: {"CS101", "CS102"}, 2: {"CS101"}}
+    assert book.leave(1, "CS102") and not book.leave(1, "CS102")
+    assert "CS102" not in book.by_course_id # empty waitlists are dropped
+    book.rekey_course("CS101", "CS100")
+    book.rekey_student(2, 20)
+    assert book.by_student_id == {1: {"CS100"}, 20: {"CS100"}}
+    assert book.pop("CS100") == 20 and book.waiting("CS100") == 1
+    book.remove_course("CS100")
+    assert book.by_course_id == {} and book.by_student_id == {}
+    assert book.pop("CS100") is None and book.student_ids("CS100") == []
+
+
+def test_capacity_is_enforced_and_full_courses_can_be_waitlisted():
+    sms = _system()
+    with pytest.raises(ValueError, match="has free seats"):
+        sms.join_waitlist(3, "CS101")
+    sms.enroll_student(1, "CS101")
+    sms.enroll_student(2, "CS101")
+    with pytest.raises(CourseFullError, match="is full"):
+        sms.enroll_student(3, "CS101")
+    sms.join_waitlist(3, "CS101")
+    sms.join_waitlist(4, "CS101", priority=-1)
+    sms.join_waitlist(5, "CS101")
+    assert _ids(sms.get_waitlist("CS101")) == [4, 3, 5]
+    sms.leave_waitlist(5, "CS101")
+    with pytest.raises(ValueError, match="not on the waitlist"):
+        sms.leave_waitlist(5, "CS101")
+
+
+def test_freed_seats_are_promoted_from_the_waitlist():
+    sms = _system()
+    for student_id in (1, 2):
+        sms.enroll_student(student_id, "CS101")
+    for student_id in (3, 4, 5, 6):
+        sms.join_waitlist(student_id, "CS101")
+
+    sms.unenroll_student(1, "CS101")
+    assert _ids(sms.get_students_in_course("CS101")) == [2, 3]
+    sms.remove_student(2)
+    assert _ids(sms.get_students_in_course("CS101")) == [3, 4]
+    sms.update_course_details("CS101", new_capacity=3)
+    assert _ids(sms.get_students_in_course("CS101")) == [3, 4, 5]
+    assert _ids(sms.get_waitlist("CS101")) == [6]
+
+
+def test_a_student_who_can_no_longer_take_the_seat_is_skipped():
+    sms = _system(capacity=1)
+    sms.enroll_student(1, "CS101")
+    sms.join_waitlist(2, "CS101")
+    sms.join_waitlist(3, "CS101")
+    sms.enroll_student(2, "CS201") # clashes with CS101
+    sms.unenroll_student(1, "CS101")
+    assert _ids(sms.get_students_in_course("CS101")) == [3]
+    assert sms.get_waitlist("CS101") == []
+
+
+def test_allocate_seats():
+    sms = _system()
+    sms.enroll_student(7, "CS101")
+    sms.assign_grade(7, "CS101", "A")
+    preferences = [(1, ["CS101", "CS201", "CS102"]),  # CS201 clashes with CS101, CS102 needs CS101 passed
+                   (2, ["CS101", "NOPE"]),             # CS101 is full by now
+                   (3, ["CS102", "CS101"]),
+                   (99, ["CS101"]),
+                   (4, ["CS201", "CS101"]),
+                   (5, ["CS101"]),
+                   (7, ["CS102", "CS201"])]            # already enrolled in CS101, so CS102 is the second course
+    result = allocate_seats(sms, preferences, max_courses=2)
+
+    assert result.assigned == {1: ["CS101"], 4: ["CS201"], 7: ["CS102"]}
+    assert result.waitlisted == {2: ["CS101"], 3: ["CS101"], 5: ["CS101"]}
+    assert [(student_id, course_id) for student_id, course_id, _ in result.errors] == [
+        (1, "CS201"), (1, "CS102"), (2, "NOPE"), (3, "CS102"), (99, None), (4, "CS101")]
+    # waitlist priority is the preference rank, then the student's position
+    assert _ids(sms.get_waitlist("CS101")) == [2, 5, 3]
+    assert _ids(sms.get_students_in_course("CS101")) == [7, 1]
+    assert str(result) == "Seats assigned: 3, Waitlist places: 3, Errors: 6"
@@ -0,0 +1,97 @@
+import time
+
+import pytest
+
+from benchmarks.bulk_load import records
+from course import Course, MeetingSlot
+from person import Instructor, Student
+from student_management_system import StudentManagementSystem
+
+
+def check_cascade(sms) -> None:
+    # every index, roster, booking and waitlist only refers to students and courses still in the system
+    store = sms.enrollments
+    pairs = set(store.by_pair)
+    assert pairs == {(s, c) for s, courses in store.by_student_id.items() for c in courses}, "student index diverged"
+    assert pairs == {(s, c) for c, students in store.by_course_id.items() for s in students}, "course index diverged"
+    assert pairs == {(s, c.course_id) for c in sms.courses.values() for s in c.roster}, "course rosters diverged"
+    assert all(s in sms.students and c in sms.courses for s, c in pairs), "an enrollment outlived its student or course"
+    assert set(store.by_student_id) <= set(sms.students) and set(store.by_course_id) <= set(sms.courses)
+
+    booked = {(s, meeting.week_start, meeting.week_end, c) for s, c in pairs for meeting in sms.courses[c].meetings}
+    assert booked == {(s, *booking) for s, bookings in sms.timetable.students.by_key.items() for booking in bookings}, \
+        "student timetable diverged"
+    rooms = {(meeting.room, meeting.week_start, meeting.week_end, c.course_id)
+             for c in sms.courses.values() for meeting in c.meetings if meeting.room is not None}
+    assert rooms == {(room, *booking) for room, bookings in sms.timetable.rooms.by_key.items() for booking in bookings}, \
+        "room bookings diverged"
+
+    waitlisted = {(s, c) for c in sms.waitlists.by_course_id for s in sms.waitlists.student_ids(c)}
+    assert waitlisted == {(s, c) for s, courses in sms.waitlists.by_student_id.items() for c in courses}, "waitlist index diverged"
+    assert all(s in sms.students and c in sms.courses for s, c in waitlisted), "a waitlist entry outlived its student or course"
+
+    assert all(i in sms.instructors and c in sms.courses for i, c in sms.assignments), "an assignment outlived its course"
+    assert all(set(c.prerequisites) <= set(sms.courses) for c in sms.courses.values()), "a prerequisite outlived its course"
+
+
+def _term():
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=[Student(f"Student {i}", i, "Computer Science") for i in range(1, 7)],
+                  instructors=[Instructor("Barbara Liskov", 10, "Computer Science")],
+                  courses=[Course("Programming I", "CS101", 3, (MeetingSlot(0, 540, 600, "R101"),)),
+                           Course("Programming II", "CS102", None, (MeetingSlot(1, 540, 600, "R101"),), {"CS101": "C"}),
+                           Course("Databases", "CS220", 2, (MeetingSlot(2, 540, 600, "R102"),))],
+                  enrollments=[(1, "CS101", "A"), (2, "CS101", "B"), (3, "CS101"), (1, "CS102"), (2, "CS102"),
+                               (1, "CS220"), (4, "CS220")],
+                  assignments=[(10, "CS101"), (10, "CS220")])
+    sms.join_waitlist(5, "CS101")
+    sms.join_waitlist(5, "CS220")
+    sms.join_waitlist(6, "CS220")
+    return sms
+
+
+def test_remove_course_cascades():
+    sms = _term()
+    course = sms.courses["CS101"]
+    sms.remove_course("CS101")
+    check_cascade(sms)
+    assert "CS101" not in sms.courses and course.roster == {}
+    assert [c.course_id for c in sms.get_courses_of_student(1)] == ["CS102", "CS220"]
+    assert sms.courses["CS102"].prerequisites == {}
+    assert [c.course_id for c in sms.get_courses_of_instructor(10)] == ["CS220"]
+    assert list(sms.waitlists.by_student_id[5]) == ["CS220"]
+    assert sms.timetable.rooms.conflict("R101", 0, 10_080) is not None # CS102 still holds its room
+
+
+def test_remove_courses_is_all_or_nothing():
+    sms = _term()
+    with pytest.raises(ValueError, match="CS999"):
+        sms.remove_courses(["CS101", "CS999"])
+    assert len(sms.courses) == 3 and len(sms.enrollments) == 7
+    sms.remove_courses(["CS220", "CS101", "CS220"])
+    check_cascade(sms)
+    assert list(sms.courses) == ["CS102"]
+    assert sorted(sms.enrollments.by_pair) == [(1, "CS102"), (2, "CS102")]
+    assert not sms.waitlists.by_course_id and not sms.waitlists.by_student_id
+    assert len(sms.assignments) == 0
+
+
+def test_remove_courses_at_10k_courses_and_1m_enrollments():
+    students, courses, enrollments = records(num_students=200_000, num_courses=10_000, num_enrollments=1_000_000)
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=students, courses=courses, enrollments=enrollments)
+    retired = [f"C{i}" for i in range(0, 10_000, 10)]
+    cascaded = sum(sms.enrollments.count_for_course(course_id) for course_id in retired)
+
+    start = time.perf_counter()
+    sms.remove_course(retired[0])
+    single = time.perf_counter() - start
+    start = time.perf_counter()
+    sms.remove_courses(retired[1:])
+    batch = time.perf_counter() - start
+    print(f"\nremove_course x1: {single * 1000:.2f}ms, remove_courses x{len(retired) - 1:,}: {batch:.3f}s, "
+          f"{cascaded:,} enrollments cascaded, {cascaded / (single + batch):,.0f} enrollments/s")
+
+    assert len(sms.courses) == 9_000
+    assert len(sms.enrollments) == 1_000_000 - cascaded
+    check_cascade(sms)
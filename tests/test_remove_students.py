@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+from benchmarks.bulk_load import records
+from student_management_system import StudentManagementSystem
+from tests.test_remove_courses import _term, check_cascade
+
+
+def test_remove_student_cascades_and_promotes_the_waitlist():
+    sms = _term()
+    student = sms.students[1]
+    sms.remove_student(1)
+    check_cascade(sms)
+    assert 1 not in sms.students
+    assert all(student not in course.roster.values() for course in sms.courses.values())
+    assert 1 not in sms.timetable.students.by_key
+    # the seats freed in the full CS101 and CS220 go to the heads of their waitlists
+    assert [s.id_number for s in sms.get_students_in_course("CS101")] == [2, 3, 5]
+    assert [s.id_number for s in sms.get_students_in_course("CS220")] == [4, 5]
+    assert [s.id_number for s in sms.get_waitlist("CS220")] == [6]
+
+
+def test_remove_students_is_all_or_nothing():
+    sms = _term()
+    with pytest.raises(ValueError, match="99"):
+        sms.remove_students([5, 99])
+    assert len(sms.students) == 6 and [s.id_number for s in sms.get_waitlist("CS220")] == [5, 6]
+    sms.remove_students([5, 1, 5, 2])
+    check_cascade(sms)
+    assert sorted(sms.students) == [3, 4, 6]
+    assert sorted(sms.enrollments.by_pair) == [(3, "CS101"), (4, "CS220"), (6, "CS220")]
+    assert not sms.waitlists.by_course_id and not sms.waitlists.by_student_id
+
+
+def test_remove_students_of_a_graduating_class_from_1m_enrollments():
+    students, courses, enrollments = records(num_students=200_000, num_courses=10_000, num_enrollments=1_000_000)
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=students, courses=courses, enrollments=enrollments)
+    graduating = range(0, 200_000, 10)
+    cascaded = sum(len(sms.enrollments.by_student_id.get(student_id, ())) for student_id in graduating)
+
+    start = time.perf_counter()
+    sms.remove_student(graduating[0])
+    single = time.perf_counter() - start
+    start = time.perf_counter()
+    sms.remove_students(graduating[1:])
+    batch = time.perf_counter() - start
+    print(f"\nremove_student x1: {single * 1000:.2f}ms, remove_students x{len(graduating) - 1:,}: {batch:.3f}s, "
+          f"{cascaded:,} enrollments cascaded, {cascaded / (single + batch):,.0f} enrollments/s")
+
+    assert len(sms.students) == 180_000
+    assert len(sms.enrollments) == 1_000_000 - cascaded
+    check_cascade(sms)
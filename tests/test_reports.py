@@ -0,0 +1,67 @@
+import pytest
+
+from benchmarks.bulk_load import records
+from course import Course
+from mapped_snapshot import write_mapped_snapshot
+from person import Student
+from reports import format_roster, format_transcript, write_reports
+from student_management_system import StudentManagementSystem
+
+
+def _system():
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=[Student("Ada Lovelace", 2, "Mathematics"), Student("Alan Turing", 1, None)],
+                  courses=[Course("Programming I", "CS101", 30), Course("Calculus", "MATH100")],
+                  enrollments=[(2, "MATH100", "A"), (2, "CS101", "B+"), (1, "CS101")])
+    return sms
+
+
+def test_formats():
+    sms = _system()
+    student, course = sms.students[2], sms.courses["CS101"]
+    assert format_transcript(student, [(sms.courses["MATH100"], "A"), (course, "B+"), (course, "P")]) == (
+        "Transcript: Ada Lovelace (ID 2), Mathematics\n"
+        f"  MATH100    {'Calculus':<40} A\n"
+        f"  CS101      {'Programming I':<40} B+\n"
+        f"  CS101      {'Programming I':<40} P\n"
+        "  GPA: 3.65 over 2 graded courses\n\n")
+    assert format_transcript(sms.students[1], [(course, None)]).endswith("  GPA: n/a\n\n")
+    assert format_roster(course, [(student, "B+"), (sms.students[1], None)]) == (
+        "Roster: CS101 Programming I, 2 of 30 enrolled\n"
+        f"  2          {'Ada Lovelace':<30} {'Mathematics':<25} B+\n"
+        f"  1          {'Alan Turing':<30} {'':<25} -\n\n")
+
+
+def test_write_reports_in_id_order(tmp_path):
+    sms = _system()
+    path = tmp_path / "transcripts.txt"
+    assert write_reports(sms, "transcripts", str(path), processes=1) == 2
+    assert path.read_text(encoding="utf-8") == (
+        format_transcript(sms.students[1], [(sms.courses["CS101"], None)])
+        + format_transcript(sms.students[2], [(sms.courses["MATH100"], "A"), (sms.courses["CS101"], "B+")]))
+    assert write_reports(sms, "rosters", str(path), processes=1) == 2
+    assert path.read_text(encoding="utf-8").startswith("Roster: CS101 Programming I, 2 of 30 enrolled\n")
+    assert list(tmp_path.iterdir()) == [path] # the shards and the temporary snapshot are cleaned up
+
+
+@pytest.mark.parametrize("kind", ["transcripts", "rosters"])
+def test_output_is_the_same_whatever_the_number_of_processes(tmp_path, kind):
+    students, courses, enrollments = records(num_students=500, num_courses=40, num_enrollments=2_000)
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=students, courses=courses, enrollments=enrollments)
+    snapshot = str(tmp_path / "registry.smap")
+    write_mapped_snapshot(sms, snapshot)
+
+    single, parallel = tmp_path / "single.txt", tmp_path / "parallel.txt"
+    count = write_reports(sms, kind, str(single), processes=1)
+    assert count == (500 if kind == "transcripts" else 40)
+    assert write_reports(snapshot, kind, str(parallel), processes=2, shards=7) == count
+    assert parallel.read_bytes() == single.read_bytes()
+
+
+def test_write_reports_edge_cases(tmp_path):
+    path = tmp_path / "reports.txt"
+    assert write_reports(StudentManagementSystem(), "rosters", str(path), processes=1) == 0
+    assert path.read_text() == ""
+    with pytest.raises(ValueError, match="Unknown report kind"):
+        write_reports(_system(), "grades", str(path))
@@ -0,0 +1,117 @@
+import gc
+import random
+
+import pytest
+
+from course import Course
+from person import Instructor, Student
+from snapshots import VersionedSnapshots
+from student_management_system import StudentManagementSystem
+
+
+def _state(view):
+    # what a snapshot and the live system are compared on
+    return ({student.id_number: (student.name, student.major) for student in view.iter_students()},
+            {instructor.id_number: instructor.department for instructor in view.iter_instructors()},
+            {course.course_id: (course.course_name, course.capacity) for course in view.iter_courses()},
+            sorted((e.student.id_number, e.course.course_id, e.grade) for e in view.iter_enrollments()))
+
+
+def _system():
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=[Student(f"Student {i}", i, "Undeclared") for i in range(1, 6)],
+                  instructors=[Instructor("Barbara Liskov", 10, "Computer Science")],
+                  courses=[Course("Programming I", "CS101", 4), Course("Calculus", "MATH100")],
+                  enrollments=[(3, "CS101", "A"), (1, "CS101"), (2, "MATH100"), (1, "MATH100", "B")])
+    return sms
+
+
+def test_snapshots_are_frozen_across_renames():
+    sms = _system()
+    snapshots = VersionedSnapshots(sms)
+    before = snapshots.snapshot()
+    frozen = _state(sms)
+    assert _state(before) == frozen and before.version == 0 and before.num_enrollments == 4
+    assert [student.id_number for student in before.get_students_in_course("CS101")] == [3, 1] # enrollment order
+
+    sms.update_student_details(1, new_name="Ada Lovelace", new_id_number=11)
+    sms.update_course_details("CS101", new_course_name="Programming", new_course_id="CS100", new_capacity=5)
+    sms.update_instructor_details(10, new_department="Mathematics", new_id_number=12)
+    sms.assign_grade(11, "CS100", "C")
+    sms.enroll_student(4, "CS100")
+    sms.remove_student(2) # its unenrollment is a version of its own
+    after = snapshots.snapshot()
+
+    assert _state(before) == frozen
+    assert before.get_student(1).name == "Student 1" and before.get_grade(1, "CS101") is None
+    assert [course.course_id for course in before.get_courses_of_student(1)] == ["CS101", "MATH100"]
+    with pytest.raises(ValueError):
+        before.get_student(11)
+
+    assert _state(after) == _state(sms)
+    assert after.version == 7 and (after.num_students, after.num_courses, after.num_enrollments) == (4, 2, 4)
+    assert [student.id_number for student in after.get_students_in_course("CS100")] == [3, 11, 4]
+    assert [course.course_id for course in after.get_courses_of_student(11)] == ["CS100", "MATH100"]
+    assert after.get_grade(11, "CS100") == "C"
+    with pytest.raises(KeyError):
+        after.get_students_in_course("CS101")
+    with pytest.raises(ValueError):
+        after.get_grade(2, "MATH100")
+
+
+def test_snapshots_match_live_state_after_random_changes():
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=[Student(f"Student {i}", i, "Undeclared") for i in range(40)],
+                  courses=[Course(f"Course {i}", f"C{i}", 8) for i in range(6)])
+    snapshots = VersionedSnapshots(sms)
+    generator = random.Random(1)
+    taken = []
+    for step in range(1_500):
+        student_id, course_id = generator.randrange(50), f"C{generator.randrange(8)}"
+        action = generator.random()
+        try:
+            if action < 0.5:
+                sms.enroll_student(student_id, course_id)
+            elif action < 0.65:
+                sms.unenroll_student(student_id, course_id)
+            elif action < 0.8:
+                sms.assign_grade(student_id, course_id, generator.choice("ABCDF"))
+            elif action < 0.88:
+                new_id = generator.randrange(50)
+                sms.update_student_details(student_id, new_name=f"Renamed {step}",
+                                           new_id_number=new_id if new_id not in sms.students else None)
+            elif action < 0.94:
+                new_id = f"C{generator.randrange(8)}"
+                sms.update_course_details(course_id, new_course_id=new_id if new_id not in sms.courses else None)
+            elif action < 0.97:
+                sms.remove_student(student_id)
+            else:
+                sms.add_student(Student(f"Student {student_id}", student_id, "Undeclared"))
+        except (KeyError, ValueError): # missing ids, full courses, repeated enrollments and ids in use
+            pass
+        if step % 100 == 0:
+            taken.append((snapshots.snapshot(), _state(sms)))
+    for snapshot, state in taken:
+        assert _state(snapshot) == state
+    assert _state(snapshots.snapshot()) == _state(sms)
+
+
+def test_versions_are_released():
+    sms = _system()
+    snapshots = VersionedSnapshots(sms)
+    first, second = snapshots.snapshot(), snapshots.snapshot()
+    sms.enroll_student(5, "CS101")
+    with snapshots.snapshot() as third:
+        assert snapshots.open_versions() == {0: 2, 1: 1}
+    first.release()
+    first.release() # releasing twice does nothing
+    assert snapshots.open_versions() == {0: 1}
+    del second
+    gc.collect()
+    assert snapshots.open_versions() == {} and third.version == 1
+    with pytest.raises(AttributeError): # a released snapshot can't be read
+        third.get_student(1)
+
+    snapshots.detach()
+    sms.enroll_student(5, "MATH100")
+    assert snapshots.version == 1
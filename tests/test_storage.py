@@ -0,0 +1,131 @@
+import sqlite3
+
+import pytest
+
+from course import Course, MeetingSlot
+from person import Instructor, Student
+from prerequisites import PrerequisiteError
+from storage import InMemoryStorage, SQLiteStorage
+from student_management_system import StudentManagementSystem
+from timetable import ScheduleConflictError
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def storage(request, tmp_path):
+    storage = InMemoryStorage() if request.param == "memory" else SQLiteStorage(str(tmp_path / "registry.db"))
+    yield storage
+    storage.close()
+
+
+def _enrollments(sms):
+    return sorted((e.student.id_number, e.course.course_id, e.grade) for e in sms.get_all_enrollments())
+
+
+def _term(sms):
+    sms.add_student(Student("Ada Lovelace", 1, "Mathematics"))
+    sms.add_student(Student("Alan Turing", 2, "Mathematics"))
+    sms.add_instructor(Instructor("Barbara Liskov", 10, "Computer Science"))
+    sms.add_course(Course("Programming I", "CS101", 2, (MeetingSlot(0, 540, 600, "R101"),)))
+    sms.add_course(Course("Programming II", "CS102", None, (MeetingSlot(0, 570, 630),), {"CS101": "C"}))
+    sms.add_course(Course("Calculus", "MATH100", 40))
+
+
+def test_enroll_grade_and_query(storage):
+    sms = StudentManagementSystem(storage)
+    _term(sms)
+    sms.enroll_student(1, "CS101")
+    sms.enroll_student(2, "CS101")
+    sms.enroll_student(1, "MATH100")
+    sms.assign_grade(1, "CS101", "A")
+    sms.assign_instructor(10, "CS101")
+
+    assert [s.id_number for s in sms.get_students_in_course("CS101")] == [1, 2]
+    assert [c.course_id for c in sms.get_courses_of_student(1)] == ["CS101", "MATH100"]
+    assert _enrollments(sms) == [(1, "CS101", "A"), (1, "MATH100", None), (2, "CS101", None)]
+    assert [i.id_number for i in sms.get_instructors_of_course("CS101")] == [10]
+    sms.add_student(Student("Grace Hopper", 3, None))
+    with pytest.raises(ValueError, match="full"):
+        sms.enroll_student(3, "CS101")
+    with pytest.raises(PrerequisiteError):
+        sms.enroll_student(2, "CS102")
+    with pytest.raises(ScheduleConflictError):
+        sms.enroll_student(1, "CS102") # meets while CS101 does
+    sms.unenroll_student(1, "MATH100")
+    assert (1, "MATH100") not in sms.enrollments and len(sms.enrollments) == 2
+
+
+def test_updates_are_saved_and_ids_rekeyed(storage):
+    sms = StudentManagementSystem(storage)
+    _term(sms)
+    sms.enroll_student(1, "CS101")
+    sms.assign_grade(1, "CS101", "B")
+    sms.assign_instructor(10, "CS101")
+
+    sms.update_student_details(1, new_name="Augusta Ada King", new_id_number=11)
+    sms.update_course_details("CS101", new_course_name="Programming Fundamentals", new_course_id="CS100", new_capacity=3)
+    sms.update_instructor_details(10, new_department="Engineering", new_id_number=20)
+
+    assert 1 not in sms.students and "CS101" not in sms.courses and 10 not in sms.instructors
+    assert (sms.students[11].name, sms.courses["CS100"].course_name, sms.courses["CS100"].capacity) == \
+        ("Augusta Ada King", "Programming Fundamentals", 3)
+    assert sms.instructors[20].department == "Engineering"
+    assert _enrollments(sms) == [(11, "CS100", "B")]
+    assert [(i.id_number, c.course_id) for i in sms.get_all_instructors() for c in sms.get_courses_of_instructor(i.id_number)] == [(20, "CS100")]
+    # the prerequisite on the renamed course follows it
+    assert sms.courses["CS102"].prerequisites == {"CS100": "C"}
+
+
+def test_bulk_load_is_one_transaction(storage):
+    sms = StudentManagementSystem(storage)
+    sms.add_course(Course("Programming I", "CS101"))
+
+    def students():
+        yield Student("Ada Lovelace", 1, "Mathematics")
+        yield Student("Alan Turing", 2, "Mathematics")
+        raise RuntimeError("the source failed")
+
+    with pytest.raises(RuntimeError):
+        sms.bulk_load(students=students(), enrollments=[(1, "CS101")])
+    if isinstance(storage, SQLiteStorage): # only the SQLite engine rolls the batch back
+        assert len(sms.students) == 0 and len(sms.enrollments) == 0
+        assert list(sms.courses) == ["CS101"]
+    report = sms.bulk_load(students=[Student("Grace Hopper", 3, None)], enrollments=[(3, "CS101", "A")])
+    assert (report.students_added, report.enrollments_added) == (1, 1)
+    assert (3, "CS101", "A") in _enrollments(sms)
+
+
+def test_sqlite_schema_is_created_and_reopened(tmp_path):
+    path = str(tmp_path / "registry.db")
+    storage = SQLiteStorage(path)
+    tables = {name for name, in storage.connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {"students", "instructors", "courses", "enrollments", "assignments"} <= tables
+    sms = StudentManagementSystem(storage)
+    _term(sms)
+    sms.enroll_student(1, "CS101")
+    sms.assign_grade(1, "CS101", "A")
+    storage.close()
+
+    storage = SQLiteStorage(path)
+    sms = StudentManagementSystem(storage)
+    assert _enrollments(sms) == [(1, "CS101", "A")]
+    course = sms.courses["CS102"]
+    assert (course.meetings, course.prerequisites) == ((MeetingSlot(0, 570, 630),), {"CS101": "C"})
+    # the timetable and prerequisites are rebuilt from the stored courses
+    with pytest.raises(ScheduleConflictError):
+        sms.enroll_student(1, "CS102")
+    assert sms.get_missing_prerequisites(2, "CS102") == [("CS101", "C")]
+    storage.close()
+
+
+def test_sqlite_adds_columns_to_an_older_schema(tmp_path):
+    path = str(tmp_path / "registry.db")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE courses (course_id TEXT PRIMARY KEY, course_name TEXT NOT NULL, capacity INTEGER)")
+    connection.execute("INSERT INTO courses VALUES ('CS101', 'Programming I', 30)")
+    connection.commit()
+    connection.close()
+
+    storage = SQLiteStorage(path)
+    course = StudentManagementSystem(storage).courses["CS101"]
+    assert (course.course_name, course.capacity, course.meetings, course.prerequisites) == ("Programming I", 30, (), {})
+    storage.close()
@@ -0,0 +1,63 @@
+import pytest
+
+from course import Course
+from person import Instructor, Student
+from student_management_system import StudentManagementSystem
+from teaching import Load, TeachingLoad
+
+
+def _system():
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=[Student(f"Student {i}", i, "Computer Science") for i in range(1, 7)],
+                  instructors=[Instructor("Barbara Liskov", 10, "Computer Science"), Instructor("Edsger Dijkstra", 11, "Computer Science"),
+                               Instructor("Emmy Noether", 12, "Mathematics")],
+                  courses=[Course("Programming I", "CS101"), Course("Programming II", "CS102"), Course("Algebra", "MATH200")],
+                  enrollments=[(1, "CS101"), (2, "CS101"), (3, "CS101"), (1, "CS102"), (4, "MATH200")],
+                  assignments=[(10, "CS101"), (11, "CS101"), (10, "CS102"), (12, "MATH200")])
+    return sms
+
+
+def test_loads_of_the_initial_system():
+    load = TeachingLoad(_system())
+    assert load.instructor_loads() == {10: Load(2, 4), 11: Load(1, 3), 12: Load(1, 1)}
+    assert load.department_loads() == {"Computer Science": Load(3, 7), "Mathematics": Load(1, 1)}
+    assert load.department_load("History") == Load()
+    with pytest.raises(ValueError, match="99"):
+        load.instructor_load(99)
+
+
+def test_loads_follow_changes_and_match_a_recount():
+    sms = _system()
+    load = TeachingLoad(sms)
+    sms.enroll_student(5, "CS102")
+    sms.assign_instructor(11, "CS102")
+    sms.update_instructor_details(11, new_department="Mathematics", new_id_number=21)
+    sms.update_course_details("CS101", new_course_id="CS100")
+    sms.enroll_student(6, "CS100")
+    sms.unenroll_student(2, "CS100")
+    sms.remove_student(1)
+    sms.update_student_details(3, new_id_number=30)
+
+    assert load.instructor_loads() == {10: Load(2, 3), 21: Load(2, 3), 12: Load(1, 1)}
+    assert load.department_loads() == {"Computer Science": Load(2, 3), "Mathematics": Load(3, 4)}
+    assert load.instructor_loads() == TeachingLoad(sms).instructor_loads()
+
+    sms.remove_course("CS102")
+    sms.remove_instructor(12)
+    sms.add_instructor(Instructor("Ada Lovelace", 13, "History"))
+    sms.assign_instructor(13, "CS100")
+    assert load.instructor_loads() == {10: Load(1, 2), 21: Load(1, 2), 13: Load(1, 2)}
+    assert load.department_loads() == {"Computer Science": Load(1, 2), "Mathematics": Load(1, 2), "History": Load(1, 2)}
+    fresh = TeachingLoad(sms)
+    assert (load.instructor_loads(), load.department_loads()) == (fresh.instructor_loads(), fresh.department_loads())
+
+    load.detach()
+    sms.enroll_student(4, "CS100")
+    assert load.instructor_load(10) == Load(1, 2)
+
+
+def test_returned_loads_are_copies():
+    load = TeachingLoad(_system())
+    copy = load.instructor_load(10)
+    copy.students = 100
+    assert load.instructor_load(10) == Load(2, 4) and repr(copy) == "Load(sections=2, students=100)"
@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from course import Course, MeetingSlot
+from person import Student
+from student_management_system import StudentManagementSystem
+from timetable import IntervalIndex, ScheduleConflictError, find_conflicts
+
+
+def _course(course_id, *meetings):
+    return Course(course_id, course_id, meetings=[MeetingSlot.parse(meeting) for meeting in meetings])
+
+
+def test_meeting_slots():
+    slot = MeetingSlot.parse("mon 09:00-10:30 R101")
+    assert (slot.day, slot.start, slot.end, slot.room, str(slot)) == (0, 540, 630, "R101", "Mon 09:00-10:30 R101")
+    assert (slot.week_start, MeetingSlot.parse("Tue 09:00-10:00").week_start) == (540, 1980)
+    assert slot.overlaps(MeetingSlot.parse("Mon 10:00-11:00")) and not slot.overlaps(MeetingSlot.parse("Mon 10:30-11:00"))
+    assert not slot.overlaps(MeetingSlot.parse("Tue 09:00-10:30 R101"))
+    with pytest.raises(ValueError, match="Invalid meeting"):
+        MeetingSlot.parse("Mon 10:00")
+    with pytest.raises(ValueError, match="Invalid meeting time"):
+        MeetingSlot(0, 600, 600)
+
+
+def test_courses_without_meetings():
+    assert Course("Independent Study", "CS499", meetings=None).meetings == ()
+    assert Course("Independent Study", "CS499").meetings == ()
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=[Student("Ada Lovelace", 1, None)],
+                  courses=[Course("Independent Study", "CS499", meetings=None), _course("CS101", "Mon 09:00-10:00 R1")],
+                  enrollments=[(1, "CS499"), (1, "CS101")])
+    assert find_conflicts(sms.iter_courses(), [(1, "CS499"), (1, "CS101")]) == []
+
+
+def test_interval_index():
+    index = IntervalIndex()
+    index.add("R1", 600, 660, "CS102")
+    index.add("R1", 540, 600, "CS101")
+    index.add("R1", 720, 780, "CS103")
+    assert index.by_key["R1"] == [(540, 600, "CS101"), (600, 660, "CS102"), (720, 780, "CS103")]
+    assert index.conflict("R1", 650, 730) == "CS102"
+    assert index.conflict("R1", 650, 730, ignore="CS102") == "CS103"
+    assert index.conflict("R1", 660, 720) is None # back to back with both neighbours
+    assert index.conflict("R1", 500, 1000) == "CS101" and index.conflict("R2", 0, 10_000) is None
+    index.remove("R1", 600, 660, "CS102")
+    index.remove("R1", 600, 660, "CS999") # freeing a range that isn't booked does nothing
+    assert index.conflict("R1", 650, 700) is None
+    index.rekey("R1", "R9")
+    assert "R1" not in index.by_key and index.conflict("R9", 550, 560) == "CS101"
+    index.remove("R9", 540, 600, "CS101")
+    index.remove("R9", 720, 780, "CS103")
+    assert index.by_key == {}
+    index.add("R3", 0, 10, "CS101")
+    index.remove_key("R3")
+    assert index.by_key == {}
+
+
+def test_interval_index_matches_brute_force():
+    generator = random.Random(3)
+    index, booked = IntervalIndex(), []
+    for number in range(300):
+        start = generator.randrange(0, 7 * 24 * 60 - 120)
+        end = start + generator.randrange(1, 120)
+        clashing = [course_id for booked_start, booked_end, course_id in booked if booked_start < end and start < booked_end]
+        assert (index.conflict("key", start, end) is None) == (not clashing)
+        if clashing:
+            assert index.conflict("key", start, end) in clashing
+        else:
+            index.add("key", start, end, f"C{number}")
+            booked.append((start, end, f"C{number}"))
+
+
+def test_find_conflicts():
+    courses = [_course("CS101", "Mon 09:00-10:30 R1", "Wed 09:00-10:30 R1"), _course("CS102", "Mon 10:00-11:00 R2", "Wed 10:00-10:15 R2"),
+               _course("MATH100", "Mon 10:30-12:00 R1", "Wed 10:00-11:00 R3"), _course("PHYS100", "Fri 09:00-10:00")]
+    enrollments = [(1, "CS101"), (1, "CS102"), (1, "MATH100", "A"), (2, "CS101"), (2, "PHYS100"), (3, "CS999")]
+    assert sorted(find_conflicts(courses, enrollments)) == [("student", 1, "CS101", "CS102"), ("student", 1, "CS101", "MATH100"),
+                                                             ("student", 1, "CS102", "MATH100")]
+    # CS101 and CS102 clash on both Monday and Wednesday, but the pair is reported once
+    courses.append(_course("CS220", "Wed 10:00-11:00 R1"))
+    assert find_conflicts(courses, []) == [("room", "R1", "CS101", "CS220")]
+
+
+def test_enrollments_and_rooms_are_checked_against_the_timetable():
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=[Student("Ada Lovelace", 1, None)],
+                  courses=[_course("CS101", "Mon 09:00-10:30 R1"), _course("CS102", "Mon 10:00-11:00 R2")])
+    sms.enroll_student(1, "CS101")
+    with pytest.raises(ScheduleConflictError):
+        sms.enroll_student(1, "CS102")
+    with pytest.raises(ScheduleConflictError):
+        sms.add_course(_course("MATH100", "Mon 10:00-11:00 R1"))
+    sms.update_course_details("CS102", new_meetings=[MeetingSlot.parse("Mon 10:30-11:00 R2")])
+    sms.enroll_student(1, "CS102")
+    assert [course.course_id for course in sms.get_courses_of_student(1)] == ["CS101", "CS102"]
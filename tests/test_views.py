@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+from course import Course
+from person import Student
+from student_management_system import StudentManagementSystem
+from views import AggregateViews
+
+MAJORS = ("Mathematics", "History", "Physics")
+
+
+def _system():
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=[Student(f"Student {i}", i, MAJORS[i % 3]) for i in range(1, 7)],
+                  courses=[Course("Programming I", "CS101"), Course("Calculus", "MATH100")],
+                  enrollments=[(1, "CS101", "A"), (2, "CS101"), (3, "CS101", "B"), (1, "MATH100", "A"), (4, "MATH100")])
+    return sms
+
+
+def test_counters_of_the_initial_system():
+    views = AggregateViews(_system())
+    assert views.enrollment_count() == 5
+    assert (views.roster_size("CS101"), views.roster_size("MATH100")) == (3, 2)
+    assert views.enrollments_by_major() == {"History": 3, "Physics": 1, "Mathematics": 1}
+    assert views.major_enrollments("Biology") == 0
+    assert views.grade_counts("CS101") == {"A": 1, "B": 1}
+    assert (views.ungraded_count(), views.ungraded_count("MATH100")) == (2, 1)
+    with pytest.raises(KeyError):
+        views.roster_size("CS999")
+    with pytest.raises(KeyError):
+        views.grade_counts("CS999")
+    assert views.check() == []
+
+
+def test_counters_follow_changes():
+    sms = _system()
+    views = AggregateViews(sms)
+    sms.assign_grade(2, "CS101", "C")
+    sms.assign_grade(1, "CS101", "B")
+    sms.update_student_details(1, new_major="Physics", new_id_number=10)
+    sms.update_course_details("CS101", new_course_id="CS100")
+    sms.unenroll_student(3, "CS100")
+    sms.remove_student(4)
+    sms.add_course(Course("Databases", "CS220"))
+    sms.enroll_student(5, "CS220")
+
+    assert views.enrollment_count() == 4
+    assert views.grade_counts("CS100") == {"B": 1, "C": 1}
+    assert views.enrollments_by_major() == {"Physics": 4}
+    assert (views.ungraded_count(), views.roster_size("CS220")) == (1, 1)
+    sms.remove_course("CS100")
+    assert views.enrollments_by_major() == {"Physics": 2}
+    with pytest.raises(KeyError):
+        views.roster_size("CS100")
+    assert views.check() == []
+
+
+def test_check_after_random_mixed_operations():
+    sms = StudentManagementSystem()
+    sms.bulk_load(students=[Student(f"Student {i}", i, MAJORS[i % 3]) for i in range(60)],
+                  courses=[Course(f"Course {i}", f"C{i}", 10) for i in range(8)])
+    views = AggregateViews(sms)
+    generator = random.Random(0)
+    for _ in range(2_000):
+        student_id, course_id = generator.randrange(80), f"C{generator.randrange(10)}"
+        action = generator.random()
+        try:
+            if action < 0.5:
+                sms.enroll_student(student_id, course_id)
+            elif action < 0.7:
+                sms.unenroll_student(student_id, course_id)
+            elif action < 0.85:
+                sms.assign_grade(student_id, course_id, generator.choice("ABCDF"))
+            elif action < 0.9:
+                sms.update_student_details(student_id, new_major=generator.choice(MAJORS))
+            elif action < 0.95:
+                sms.remove_student(student_id)
+                sms.add_student(Student(f"Student {student_id}", student_id, generator.choice(MAJORS)))
+            else:
+                new_id = f"C{generator.randrange(10)}"
+                sms.update_course_details(course_id, new_course_id=new_id if new_id not in sms.courses else None)
+        except (KeyError, ValueError): # missing ids, full courses and repeated enrollments
+            pass
+    assert views.enrollment_count() == len(sms.enrollments) > 0
+    assert views.check() == []
+
+
+def test_check_reports_drift_and_detach_stops_updates():
+    sms = _system()
+    views = AggregateViews(sms)
+    views.detach()
+    sms.enroll_student(5, "CS101")
+    assert views.enrollment_count() == 5
+    assert sorted(views.check()) == ["enrollment count is 5, recomputed 6", "grade counts of 'CS101' is {'A': 1, None: 1, 'B': 1}, "
+                                     "recomputed {'A': 1, None: 2, 'B': 1}", "major enrollments of 'Physics' is 1, recomputed 2",
+                                     "roster size of 'CS101' is 3, recomputed 4", "schedule size of 5 is 0, recomputed 1",
+                                     "ungraded count is 2, recomputed 3"]
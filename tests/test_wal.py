@@ -0,0 +1,112 @@
+import time
+
+import pytest
+
+from concurrency import ConcurrentStudentManagementSystem
+from course import Course, MeetingSlot
+from person import Student
+from wal import WriteAheadLog
+
+
+def _state(sms):
+    return (sorted((s.id_number, s.name, s.major) for s in sms.get_all_students()),
+            sorted((c.course_id, c.course_name, c.capacity) for c in sms.get_all_courses()),
+            sorted((e.student.id_number, e.course.course_id, e.grade) for e in sms.enrollments.by_pair.values()),
+            sorted((course_id, [student.id_number for student in sms.get_waitlist(course_id)]) for course_id in sms.courses))
+
+
+def test_snapshot_keeps_enrollments_above_a_lowered_capacity(tmp_path):
+    log = WriteAheadLog(str(tmp_path))
+    sms = log.recover()
+    sms.add_course(Course("Algorithms", "CS301", 3))
+    for student_id in (1, 2, 3, 4):
+        sms.add_student(Student(f"Student {student_id}", student_id, "Computer Science"))
+    for student_id in (1, 2, 3):
+        sms.enroll_student(student_id, "CS301")
+    sms.join_waitlist(4, "CS301")
+    sms.update_course_details("CS301", new_capacity=2)
+    log.checkpoint(wait=True)
+    log.close()
+
+    recovered_log = WriteAheadLog(str(tmp_path))
+    recovered = recovered_log.recover()
+    assert [student.id_number for student in recovered.get_students_in_course("CS301")] == [1, 2, 3]
+    assert _state(recovered) == _state(sms)
+    recovered_log.close()
+
+
+def test_log_tail_renames_after_the_snapshot_are_replayed(tmp_path):
+    log = WriteAheadLog(str(tmp_path))
+    sms = log.recover()
+    sms.add_course(Course("Databases", "CS220", 10))
+    sms.add_student(Student("Ada Lovelace", 1, "Mathematics"))
+    sms.enroll_student(1, "CS220")
+    log.checkpoint(wait=True)
+    sms.update_student_details(1, new_id_number=7)
+    sms.update_course_details("CS220", new_course_id="CS221")
+    sms.assign_grade(7, "CS221", "A")
+    log.flush()
+    sms.remove_observer(log) # crash: the log is dropped without close()
+
+    recovered_log = WriteAheadLog(str(tmp_path))
+    recovered = recovered_log.recover()
+    assert _state(recovered) == _state(sms)
+    assert (recovered_log.replayed, recovered_log.skipped) == (3, 0)
+    recovered_log.close()
+
+
+def test_failed_promotions_are_replayed_from_their_own_records(tmp_path):
+    log = WriteAheadLog(str(tmp_path))
+    sms = log.recover()
+    monday_nine = (MeetingSlot(0, 540, 600),)
+    sms.add_course(Course("Algebra", "A", 1, monday_nine))
+    sms.add_course(Course("Biology", "B", None, monday_nine))
+    sms.add_student(Student("Student 1", 1, "Mathematics"))
+    sms.add_student(Student("Student 2", 2, "Biology"))
+    sms.enroll_student(1, "A")
+    sms.join_waitlist(2, "A")
+    sms.enroll_student(2, "B")
+    sms.unenroll_student(1, "A") # student 2 clashes with B, so they leave A's waitlist instead of taking the seat
+    log.close()
+    assert sms.get_students_in_course("A") == [] and sms.get_waitlist("A") == []
+
+    recovered_log = WriteAheadLog(str(tmp_path))
+    recovered = recovered_log.recover()
+    assert _state(recovered) == _state(sms)
+    assert recovered_log.skipped == 0
+    recovered_log.close()
+
+
+def test_a_record_that_does_not_apply_raises(tmp_path):
+    log = WriteAheadLog(str(tmp_path))
+    sms = log.recover()
+    sms.add_student(Student("Ada Lovelace", 1, "Mathematics"))
+    log.close()
+    # a diverged log: the student's record is logged a second time
+    log = WriteAheadLog(str(tmp_path))
+    sms = log.recover()
+    log._append("student_added", 1, "Ada Lovelace", "Mathematics")
+    log.close()
+
+    with pytest.raises(ValueError, match="Log record 2"):
+        WriteAheadLog(str(tmp_path)).recover()
+
+
+def test_automatic_checkpoints_of_a_concurrent_system(tmp_path):
+    log = WriteAheadLog(str(tmp_path), checkpoint_every=10)
+    sms = log.recover(ConcurrentStudentManagementSystem)
+    sms.add_course(Course("Compilers", "CS410", 10))
+    for student_id in range(30):
+        sms.add_student(Student(f"Student {student_id}", student_id, "Computer Science"))
+        if student_id < 8:
+            sms.enroll_student(student_id, "CS410")
+    deadline = time.monotonic() + 5
+    while log.snapshot_lsn == 0 and time.monotonic() < deadline: # the flusher starts the snapshot on its next pass
+        time.sleep(0.01)
+    log.close()
+    assert log.snapshot_lsn > 0
+
+    recovered_log = WriteAheadLog(str(tmp_path))
+    recovered = recovered_log.recover(ConcurrentStudentManagementSystem)
+    assert _state(recovered) == _state(sms)
+    recovered_log.close()
@@ -0,0 +1,311 @@
+"""
+Timetable clash detection for the Student Management System.
+
+Courses meet in weekly `MeetingSlot`s (see `course.py`). `Timetable` keeps the booked meetings
+of every student and every room in an `IntervalIndex`, sorted by start time on a Monday-to-Sunday
+axis. A timetable never holds two overlapping bookings, so a new meeting can only clash with
+the bookings next to its start in that order, which a binary search finds in O(log n).
+`StudentManagementSystem` uses it to reject double-booked enrollments and rooms.
+
+`find_conflicts` checks a whole term's courses and enrollments in one sweep per student and
+per room instead of comparing every pair of courses, e.g. to validate a timetable before
+it is loaded.
+
+Example
+-------
+sms.add_course(Course("Calculus", "MATH101", meetings=[MeetingSlot.parse("Mon 09:00-10:30 R101")]))
+sms.add_course(Course("Physics", "PHYS101", meetings=[MeetingSlot.parse("Mon 10:00-11:00 R102")]))
+sms.enroll_student(1, "MATH101")
+sms.enroll_student(1, "PHYS101")   # raises ScheduleConflictError
+"""
+
+import heapq
+from bisect import bisect_left
+
+
+class ScheduleConflictError(ValueError):
+    """
+    Raised when a student or a room would be booked for two meetings at the same time.
+    """
+
+
+class IntervalIndex:
+    """
+    A class used to index non-overlapping weekly bookings per key, such as a student or a room.
+
+    Each key's bookings are a list of `(week_start, week_end, course_id)` tuples sorted by start.
+
+    Attributes
+    ----------
+    by_key : dict[Any, list[tuple[int, int, str]]]
+        The bookings of each key, sorted by start.
+
+    Methods
+    -------
+    conflict(key, start: int, end: int, ignore: str = None) -> str | None
+        The course booked for the key during a time range.
+    add(key, start: int, end: int, course_id: str) / remove(key, start: int, end: int, course_id: str) -> None
+        Books or frees a time range.
+    remove_key(key) -> None
+        Frees every booking of a key.
+    rekey(old_key, new_key) -> None
+        Moves a key's bookings to a new key.
+    """
+
+    def __init__(self) -> None:
+        self.by_key = {}
+
+    def conflict(self, key, start: int, end: int, ignore: str = None):
+        """
+        Find a booking of a key overlapping a time range.
+
+        Parameters
+        ----------
+        key : Any
+            The student id or room.
+        start, end : int
+            The time range in minutes since Monday 00:00, end excluded.
+        ignore : str, optional
+            A course whose bookings don't count, e.g. the course being rescheduled.
+
+        Returns
+        -------
+        str | None
+            The ID of the clashing course, or None if the range is free.
+        """
+        bookings = self.by_key.get(key)
+        if not bookings:
+            return None
+        # bookings don't overlap, so only the one starting just before `start` can reach past it,
+        # and the ones after it clash while they start before `end`
+        position = max(bisect_left(bookings, (start,)) - 1, 0)
+        while position < len(bookings) and bookings[position][0] < end:
+            booked_start, booked_end, course_id = bookings[position]
+            if booked_end > start and course_id != ignore:
+                return course_id
+            position += 1
+        return None
+
+    def add(self, key, start: int, end: int, course_id: str) -> None:
+        bookings = self.by_key.setdefault(key, [])
+        booking = (start, end, course_id)
+        bookings.insert(bisect_left(bookings, booking), booking)
+
+    def remove(self, key, start: int, end: int, course_id: str) -> None:
+        bookings = self.by_key.get(key)
+        if bookings:
+            booking = (start, end, course_id)
+            position = bisect_left(bookings, booking)
+            if position < len(bookings) and bookings[position] == booking:
+                del bookings[position]
+            if not bookings:
+                del self.by_key[key]
+
+    def remove_key(self, key) -> None:
+        self.by_key.pop(key, None)
+
+    def rekey(self, old_key, new_key) -> None:
+        bookings = self.by_key.pop(old_key, None)
+        if bookings is not None:
+            self.by_key[new_key] = bookings
+
+
+class Timetable:
+    """
+    A class used to keep the meetings booked by every student and every room of a Student Management System.
+
+    A student is booked for every meeting of the courses they are enrolled in, and a room for
+    every meeting held in it. The conflict methods only read; the system checks a change with them
+    before making it, then records it with the booking methods.
+
+    Attributes
+    ----------
+    students : IntervalIndex
+        The meetings each student attends, keyed by student id.
+    rooms : IntervalIndex
+        The meetings held in each room, keyed by room.
+
+    Methods
+    -------
+    course_conflict(course: Course, meetings=None) -> str | None
+        Describes why a course's meetings can't be held.
+    student_conflict(student_id: int, course: Course, meetings=None) -> str | None
+        The course a student attends at the same time as a course's meetings.
+    book_course(course: Course) / release_course(course: Course) -> None
+        Books or frees a course's rooms.
+    enroll(student_id: int, course: Course) / unenroll(student_id: int, course: Course) -> None
+        Books or frees a student's seat in a course's meetings.
+    remove_student(student_id: int) -> None
+        Frees every booking of a student.
+    rekey_student(old_id: int, new_id: int) -> None
+        Moves a student's bookings to a new student id.
+    move_course(course: Course, old_id: str, old_meetings, student_ids) -> None
+        Rebooks a course whose ID or meetings changed.
+    """
+
+    def __init__(self) -> None:
+        self.students = IntervalIndex()
+        self.rooms = IntervalIndex()
+
+    # checks
+
+    def course_conflict(self, course, meetings=None):
+        """
+        Check whether a course's meetings can be held: they must not overlap each other, and their rooms must be free.
+
+        Parameters
+        ----------
+        course : Course
+            The course, whose own room bookings are ignored.
+        meetings : Iterable[MeetingSlot], optional
+            The meetings to check (default is the course's meetings).
+
+        Returns
+        -------
+        str | None
+            A description of the clash, or None if the meetings can be held.
+        """
+        meetings = course.meetings if meetings is None else tuple(meetings)
+        for position, meeting in enumerate(meetings):
+            for other in meetings[position + 1:]:
+                if meeting.overlaps(other):
+                    return f"The meetings {meeting} and {other} of course ID {course.course_id} overlap."
+            if meeting.room is not None:
+                booked = self.rooms.conflict(meeting.room, meeting.week_start, meeting.week_end, ignore=course.course_id)
+                if booked is not None:
+                    return f"Room {meeting.room} is booked by course ID {booked} during {meeting}."
+        return None
+
+    def student_conflict(self, student_id: int, course, meetings=None):
+        """
+        Find a course a student attends at the same time as one of a course's meetings.
+
+        Parameters
+        ----------
+        student_id : int
+            The ID of the student.
+        course : Course
+            The course, whose own bookings are ignored.
+        meetings : Iterable[MeetingSlot], optional
+            The meetings to check (default is the course's meetings).
+
+        Returns
+        -------
+        str | None
+            The ID of the clashing course, or None if the student is free.
+        """
+        for meeting in (course.meetings if meetings is None else meetings):
+            booked = self.students.conflict(student_id, meeting.week_start, meeting.week_end, ignore=course.course_id)
+            if booked is not None:
+                return booked
+        return None
+
+    # bookings
+
+    def book_course(self, course) -> None:
+        for meeting in course.meetings:
+            if meeting.room is not None:
+                self.rooms.add(meeting.room, meeting.week_start, meeting.week_end, course.course_id)
+
+    def release_course(self, course) -> None:
+        for meeting in course.meetings:
+            if meeting.room is not None:
+                self.rooms.remove(meeting.room, meeting.week_start, meeting.week_end, course.course_id)
+
+    def enroll(self, student_id: int, course) -> None:
+        for meeting in course.meetings:
+            self.students.add(student_id, meeting.week_start, meeting.week_end, course.course_id)
+
+    def unenroll(self, student_id: int, course) -> None:
+        for meeting in course.meetings:
+            self.students.remove(student_id, meeting.week_start, meeting.week_end, course.course_id)
+
+    def remove_student(self, student_id: int) -> None:
+        self.students.remove_key(student_id)
+
+    def rekey_student(self, old_id: int, new_id: int) -> None:
+        self.students.rekey(old_id, new_id)
+
+    def move_course(self, course, old_id: str, old_meetings, student_ids) -> None:
+        """
+        Rebook a course whose ID or meetings changed, for its rooms and its enrolled students.
+
+        Parameters
+        ----------
+        course : Course
+            The course, already holding its new ID and meetings.
+        old_id : str
+            The course's previous ID.
+        old_meetings : Iterable[MeetingSlot]
+            The course's previous meetings.
+        student_ids : Iterable[int]
+            The IDs of the students enrolled in the course.
+        """
+        old_meetings = tuple(old_meetings)
+        for meeting in old_meetings:
+            if meeting.room is not None:
+                self.rooms.remove(meeting.room, meeting.week_start, meeting.week_end, old_id)
+        self.book_course(course)
+        for student_id in student_ids:
+            for meeting in old_meetings:
+                self.students.remove(student_id, meeting.week_start, meeting.week_end, old_id)
+            self.enroll(student_id, course)
+
+
+def find_conflicts(courses, enrollments) -> list[tuple]:
+    """
+    Find every timetable clash in a term in one sweep per student and per room.
+
+    Each student's and each room's meetings are sorted by start and swept once, keeping the
+    meetings still running in a heap ordered by end, so every clash is found in
+    O(m log m + c) for m meetings and c clashes rather than by comparing every pair of courses.
+
+    Parameters
+    ----------
+    courses : Iterable[Course]
+        The courses of the term with their meetings, e.g. `sms.iter_courses()`.
+    enrollments : Iterable[tuple]
+        The enrollments of the term as `(student_id, course_id, ...)` records, the format accepted by `bulk_load`.
+        Records for courses not in `courses` are ignored.
+
+    Returns
+    -------
+    list[tuple[str, Any, str, str]]
+        One `("student", student_id, course_id, other_course_id)` or `("room", room, course_id, other_course_id)`
+        tuple per pair of courses that clash, each pair reported once per student or room.
+
+    Example
+    -------
+    for kind, key, course_id, other_course_id in find_conflicts(courses, planned_enrollments):
+        print(f"{kind} {key}: {course_id} clashes with {other_course_id}")
+    """
+    meetings = {}
+    rooms = {}
+    for course in courses:
+        if course.meetings:
+            meetings[course.course_id] = [(meeting.week_start, meeting.week_end) for meeting in course.meetings]
+            for meeting in course.meetings:
+                if meeting.room is not None:
+                    rooms.setdefault(meeting.room, []).append((meeting.week_start, meeting.week_end, course.course_id))
+
+    students = {}
+    for student_id, course_id, *_ in enrollments:
+        for start, end in meetings.get(course_id, ()):
+            students.setdefault(student_id, []).append((start, end, course_id))
+
+    conflicts = []
+    for kind, bookings in (("student", students), ("room", rooms)):
+        for key, intervals in bookings.items():
+            intervals.sort()
+            running = [] # (end, course_id) heap of the meetings still running at the current start
+            seen = set()
+            for start, end, course_id in intervals:
+                while running and running[0][0] <= start:
+                    heapq.heappop(running)
+                for _, other_id in running:
+                    pair = (other_id, course_id)
+                    if other_id != course_id and pair not in seen and pair[::-1] not in seen:
+                        seen.add(pair)
+                        conflicts.append((kind, key, other_id, course_id))
+                heapq.heappush(running, (end, course_id))
+    return conflicts
@@ -0,0 +1,316 @@
+"""
+Materialized aggregate views for the Student Management System.
+
+`AggregateViews` keeps the counters dashboards poll: roster sizes, enrollments per major,
+grade counts per course and the number of enrollments without a grade. The counters are
+computed once from the system's current contents, then adjusted by a constant amount as an
+observer (see `events.SystemObserver`) on every enrollment, unenrollment, grade and removal,
+so reading them never walks the enrollments.
+
+`check()` recomputes every counter from the system and reports where the views disagree,
+which should never happen while the views are attached.
+
+Example
+-------
+views = AggregateViews(sms)
+sms.enroll_student(1, "CS101")
+print(views.roster_size("CS101"), views.major_enrollments("Computer Science"), views.ungraded_count())
+assert not views.check()
+"""
+
+import threading
+
+from events import SystemObserver
+
+
+def _adjust(counts: dict, key, delta: int) -> None:
+    # add delta to counts[key], dropping keys whose count falls to zero
+    count = counts.get(key, 0) + delta
+    if count:
+        counts[key] = count
+    else:
+        del counts[key]
+
+
+class AggregateViews(SystemObserver):
+    """
+    A class used to keep aggregate counters over a Student Management System up to date.
+
+    Every update and read holds a lock, so the views can observe a `ConcurrentStudentManagementSystem`
+    used from several threads.
+
+    Attributes
+    ----------
+    sms : StudentManagementSystem
+        The observed system.
+
+    Methods
+    -------
+    enrollment_count() -> int
+        The number of enrollments in the system.
+    roster_size(course_id: str) -> int
+        The number of students enrolled in a course.
+    major_enrollments(major: str) -> int
+        The number of enrollments held by students of a major.
+    enrollments_by_major() -> dict[str, int]
+        The number of enrollments per major.
+    grade_counts(course_id: str) -> dict[str, int]
+        The number of students per grade in a course.
+    ungraded_count(course_id: str = None) -> int
+        The number of enrollments without a grade, in a course or in the whole system.
+    check() -> list[str]
+        Compares the views with a full recomputation.
+    detach() -> None
+        Stops following the system's changes.
+    """
+
+    def __init__(self, sms) -> None:
+        """
+        Parameters
+        ----------
+        sms : StudentManagementSystem
+            The system to follow. Its counters are computed, then kept up to date with its changes.
+        """
+        self.sms = sms
+        self._lock = threading.RLock()
+        with self._lock:
+            (self._rosters, self._schedules, self._major_of, self._majors,
+             self._grades, self._enrollments, self._ungraded) = self._compute(sms)
+        sms.add_observer(self)
+
+    def detach(self) -> None:
+        """
+        Stop following the system's changes; the views keep their current values.
+        """
+        self.sms.remove_observer(self)
+
+    @staticmethod
+    def _compute(sms) -> tuple:
+        # every counter, recomputed with one pass over the students, courses and enrollments
+        rosters = {course.course_id: 0 for course in sms.iter_courses()}
+        schedules = {}
+        major_of = {}
+        for student in sms.iter_students():
+            schedules[student.id_number] = 0
+            major_of[student.id_number] = student.major
+        majors = {}
+        grades = {course_id: {} for course_id in rosters}
+        enrollments = ungraded = 0
+        for enrollment in sms.iter_enrollments():
+            student_id, course_id = enrollment.student.id_number, enrollment.course.course_id
+            rosters[course_id] += 1
+            schedules[student_id] += 1
+            _adjust(majors, major_of[student_id], 1)
+            _adjust(grades[course_id], enrollment.grade, 1)
+            enrollments += 1
+            ungraded += enrollment.grade is None
+        return rosters, schedules, major_of, majors, grades, enrollments, ungraded
+
+    # reads
+
+    def enrollment_count(self) -> int:
+        """
+        Return the number of enrollments in the system.
+        """
+        with self._lock:
+            return self._enrollments
+
+    def roster_size(self, course_id: str) -> int:
+        """
+        Return the number of students enrolled in a course.
+
+        Parameters
+        ----------
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        int
+            The size of the course's roster.
+
+        Raises
+        ------
+        KeyError
+            If the course ID does not exist in the system's course collection.
+        """
+        with self._lock:
+            if course_id not in self._rosters:
+                raise KeyError(f"The Course with ID {course_id} doesn't exist!")
+            return self._rosters[course_id]
+
+    def major_enrollments(self, major: str) -> int:
+        """
+        Return the number of enrollments held by students of a major.
+
+        Parameters
+        ----------
+        major : str
+            The major.
+
+        Returns
+        -------
+        int
+            The number of enrollments, 0 if no student of the major is enrolled anywhere.
+        """
+        with self._lock:
+            return self._majors.get(major, 0)
+
+    def enrollments_by_major(self) -> dict:
+        """
+        Return the number of enrollments per major, for every major with at least one enrollment.
+
+        Returns
+        -------
+        dict[str, int]
+            A copy of the counts keyed by major.
+        """
+        with self._lock:
+            return dict(self._majors)
+
+    def grade_counts(self, course_id: str) -> dict:
+        """
+        Return the number of students per grade in a course; ungraded students are left out.
+
+        Parameters
+        ----------
+        course_id : str
+            The ID of the course.
+
+        Returns
+        -------
+        dict[str, int]
+            A copy of the counts keyed by grade.
+
+        Raises
+        ------
+        KeyError
+            If the course ID does not exist in the system's course collection.
+        """
+        with self._lock:
+            if course_id not in self._grades:
+                raise KeyError(f"The Course with ID {course_id} doesn't exist!")
+            return {grade: count for grade, count in self._grades[course_id].items() if grade is not None}
+
+    def ungraded_count(self, course_id: str = None) -> int:
+        """
+        Return the number of enrollments without a grade.
+
+        Parameters
+        ----------
+        course_id : str, optional
+            The ID of a course to count in (default is every course).
+
+        Returns
+        -------
+        int
+            The number of ungraded enrollments.
+
+        Raises
+        ------
+        KeyError
+            If the course ID does not exist in the system's course collection.
+        """
+        with self._lock:
+            if course_id is None:
+                return self._ungraded
+            if course_id not in self._grades:
+                raise KeyError(f"The Course with ID {course_id} doesn't exist!")
+            return self._grades[course_id].get(None, 0)
+
+    # consistency
+
+    def check(self) -> list:
+        """
+        Recompute every counter from the system and compare it with the views.
+
+        The system must not be modified while the check runs.
+
+        Returns
+        -------
+        list[str]
+            One message per counter that differs from its recomputed value; empty if the views are consistent.
+        """
+        with self._lock:
+            expected = self._compute(self.sms)
+            actual = (self._rosters, self._schedules, self._major_of, self._majors,
+                      self._grades, self._enrollments, self._ungraded)
+            names = ("roster size", "schedule size", "major", "major enrollments",
+                     "grade counts", "enrollment count", "ungraded count")
+            problems = []
+            for name, kept, computed in zip(names, actual, expected):
+                if not isinstance(computed, dict):
+                    if kept != computed:
+                        problems.append(f"{name} is {kept}, recomputed {computed}")
+                    continue
+                for key in kept.keys() | computed.keys():
+                    if kept.get(key) != computed.get(key):
+                        problems.append(f"{name} of {key!r} is {kept.get(key)!r}, recomputed {computed.get(key)!r}")
+            return problems
+
+    # updates
+
+    def _count(self, enrollment, delta: int) -> None:
+        student_id, course_id = enrollment.student.id_number, enrollment.course.course_id
+        self._rosters[course_id] += delta
+        self._schedules[student_id] += delta
+        _adjust(self._majors, self._major_of[student_id], delta)
+        _adjust(self._grades[course_id], enrollment.grade, delta)
+        self._enrollments += delta
+        if enrollment.grade is None:
+            self._ungraded += delta
+
+    def student_added(self, student) -> None:
+        with self._lock:
+            self._schedules[student.id_number] = 0
+            self._major_of[student.id_number] = student.major
+
+    def student_updated(self, student, previous: dict) -> None:
+        with self._lock:
+            old_id = previous.get("id_number", student.id_number)
+            enrollments = self._schedules.pop(old_id)
+            self._schedules[student.id_number] = enrollments
+            old_major = self._major_of.pop(old_id)
+            self._major_of[student.id_number] = student.major
+            if old_major != student.major and enrollments:
+                # the student's enrollments move to the new major's count
+                _adjust(self._majors, old_major, -enrollments)
+                _adjust(self._majors, student.major, enrollments)
+
+    def student_removed(self, student) -> None:
+        # the removal's unenrollments have already been counted
+        with self._lock:
+            del self._schedules[student.id_number]
+            del self._major_of[student.id_number]
+
+    def course_added(self, course) -> None:
+        with self._lock:
+            self._rosters[course.course_id] = 0
+            self._grades[course.course_id] = {}
+
+    def course_updated(self, course, previous: dict) -> None:
+        if "course_id" in previous:
+            with self._lock:
+                old_id = previous["course_id"]
+                self._rosters[course.course_id] = self._rosters.pop(old_id)
+                self._grades[course.course_id] = self._grades.pop(old_id)
+
+    def course_removed(self, course) -> None:
+        with self._lock:
+            del self._rosters[course.course_id]
+            del self._grades[course.course_id]
+
+    def enrolled(self, enrollment) -> None:
+        with self._lock:
+            self._count(enrollment, 1)
+
+    def unenrolled(self, enrollment) -> None:
+        with self._lock:
+            self._count(enrollment, -1)
+
+    def grade_assigned(self, enrollment, previous_grade) -> None:
+        with self._lock:
+            grades = self._grades[enrollment.course.course_id]
+            _adjust(grades, previous_grade, -1)
+            _adjust(grades, enrollment.grade, 1)
+            self._ungraded += (enrollment.grade is None) - (previous_grade is None)
@@ -0,0 +1,623 @@
+"""
+Write-ahead logging, snapshots and crash recovery for the Student Management System.
+
+`WriteAheadLog` observes a system (see `events.SystemObserver`) and appends every change to an
+append-only binary log in a directory. A background thread writes the appended records out and
+fsyncs them in groups, so one fsync covers every change made during a `sync_interval` and
+writers never wait on the disk. `flush()` waits until everything logged so far is durable.
+
+The log is cut into segments. `checkpoint()` starts a new segment and writes a compact snapshot
+of the whole state from a background thread; once the snapshot is durable, the segments it
+covers are deleted. The snapshot's records are copied while writers are held back (every lock
+stripe of a `ConcurrentStudentManagementSystem` is held), so a snapshot is exactly the state
+after its last log record; only writing it to disk runs alongside the writers.
+
+`recover()` rebuilds the system from the latest snapshot plus the log records after it, then
+attaches the log to it. The snapshot is restored as it was, without checking capacities or
+clashes again, and every log record must apply to the recovered state: a record that doesn't
+raises instead of being dropped. A torn record at the end of the log, left by a crash
+mid-write, ends the replay.
+
+Log record : <payload length: uint32> <crc32 of payload: uint32> <payload: marshal of (lsn, event, *values)>
+Snapshot   : frames of <length: uint32> <marshal of a list of tuples>, starting with a (magic, lsn) header frame,
+             then the students, instructors, courses, enrollments, waitlists and instructor assignments, each section
+             ended by an empty frame (version 1 snapshots, without assignments, are still read)
+
+Example
+-------
+log = WriteAheadLog("registry-log")
+sms = log.recover()          # an empty system on the first run
+sms.add_student(Student("Jane Smith", 2, "Mathematics"))
+log.checkpoint()
+log.close()
+"""
+
+import contextlib
+import gc
+import marshal
+import os
+import struct
+import threading
+import zlib
+
+from course import Course, format_meetings, format_prerequisites, parse_meetings, parse_prerequisites
+from events import SystemObserver
+from person import Student, Instructor
+from storage import InMemoryStorage
+from student_management_system import StudentManagementSystem
+
+_HEADER = struct.Struct("<II")
+_FRAME = struct.Struct("<I")
+_SNAPSHOT_MAGIC = "sms-snapshot-2"
+_SNAPSHOT_SECTIONS = {"sms-snapshot-1": 5, _SNAPSHOT_MAGIC: 6} # sections stored by each snapshot version
+_CHUNK = 65536 # records per marshalled snapshot chunk
+
+
+def _segment_name(first_lsn: int) -> str:
+    return f"wal-{first_lsn:020d}.log"
+
+
+def _snapshot_name(lsn: int) -> str:
+    return f"snapshot-{lsn:020d}.bin"
+
+
+def _numbered(directory: str, prefix: str, suffix: str) -> list[tuple[int, str]]:
+    # the (number, path) of each file named prefix-<number>suffix, in number order
+    files = []
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name.endswith(suffix):
+            number = name[len(prefix):-len(suffix)]
+            if number.isdigit():
+                files.append((int(number), os.path.join(directory, name)))
+    return sorted(files)
+
+
+def _fsync_directory(directory: str) -> None:
+    # make file creations, renames and deletions in the directory durable
+    if hasattr(os, "O_DIRECTORY"):
+        descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+
+def read_log(path: str):
+    """
+    Read the records of a log segment, stopping at the first torn or corrupt record.
+
+    Parameters
+    ----------
+    path : str
+        The path of the segment file.
+
+    Yields
+    ------
+    tuple
+        The `(lsn, event, *values)` records in the order they were logged.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    position = 0
+    while position + _HEADER.size <= len(data):
+        length, checksum = _HEADER.unpack_from(data, position)
+        start = position + _HEADER.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            return
+        yield marshal.loads(payload)
+        position = start + length
+
+
+def write_snapshot(path: str, lsn: int, students, instructors, courses, enrollments, waitlists, assignments=()) -> None:
+    """
+    Write a snapshot file atomically: it is written to a temporary file, fsynced, then renamed.
+
+    Parameters
+    ----------
+    path : str
+        The path of the snapshot file.
+    lsn : int
+        The number of the last log record the snapshot covers.
+    students, instructors, courses, enrollments, waitlists : Iterable[tuple]
+        The `(id_number, name, major)`, `(id_number, name, department)`, `(course_id, course_name, capacity, meetings, prerequisites)`,
+        `(student_id, course_id, grade)` and `(course_id, student_id, priority)` records, waitlists in serving order.
+    assignments : Iterable[tuple]
+        The `(instructor_id, course_id)` records of the instructor assignments (default is none).
+    """
+    def write_frame(value) -> None:
+        data = marshal.dumps(value) if value is not None else b""
+        file.write(_FRAME.pack(len(data)))
+        file.write(data)
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        write_frame((_SNAPSHOT_MAGIC, lsn))
+        for records in (students, instructors, courses, enrollments, waitlists, assignments):
+            chunk = []
+            for record in records:
+                chunk.append(record)
+                if len(chunk) == _CHUNK:
+                    write_frame(chunk)
+                    chunk = []
+            if chunk:
+                write_frame(chunk)
+            write_frame(None)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def read_snapshot(path: str):
+    """
+    Read a snapshot file written by `write_snapshot`.
+
+    Parameters
+    ----------
+    path : str
+        The path of the snapshot file.
+
+    Returns
+    -------
+    tuple[int, list[list[tuple]]]
+        The LSN the snapshot covers and its six sections of records; the assignments section
+        of a version 1 snapshot is empty.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a complete snapshot.
+    """
+    # the file is read whole and unmarshalled from memory, which is several times faster than marshal.load on a file
+    with open(path, "rb") as file:
+        data = memoryview(file.read())
+    position = 0
+
+    def read_frame():
+        nonlocal position
+        (length,) = _FRAME.unpack_from(data, position)
+        position += _FRAME.size + length
+        if position > len(data):
+            raise EOFError("truncated frame")
+        return marshal.loads(data[position - length:position]) if length else None
+
+    try:
+        header = read_frame()
+        if not isinstance(header, tuple) or header[0] not in _SNAPSHOT_SECTIONS:
+            raise ValueError(f"{path} is not a snapshot file.")
+        sections = [[] for _ in range(6)]
+        for section in range(_SNAPSHOT_SECTIONS[header[0]]):
+            records = []
+            for chunk in iter(read_frame, None):
+                records.extend(chunk)
+            sections[section] = records
+    except (EOFError, TypeError, struct.error) as error:
+        raise ValueError(f"{path} is not a complete snapshot: {error}") from None
+    return header[1], sections
+
+
+def _course_from_record(course_id: str, name: str, capacity, meetings: str = "", prerequisites: str = "") -> Course:
+    # snapshot course records written before courses had meetings or prerequisites lack the last fields
+    return Course(name, course_id, capacity, parse_meetings(meetings), parse_prerequisites(prerequisites))
+
+
+def _replay_enrolled(sms, student_id: int, course_id: str, grade):
+    # the enrollment was accepted when it was logged, so capacity, clashes and prerequisites aren't checked again
+    if (student_id, course_id) in sms.enrollments:
+        return False
+    if student_id not in sms.students:
+        raise ValueError(f"The Student with ID {student_id} doesn't exist!")
+    if course_id not in sms.courses:
+        raise ValueError(f"The Course with ID {course_id} doesn't exist!")
+    sms._enroll(sms.students[student_id], sms.courses[course_id])
+    if grade is not None:
+        sms.assign_grade(student_id, course_id, grade)
+
+
+def _replay_unenrolled(sms, student_id: int, course_id: str):
+    if (student_id, course_id) not in sms.enrollments:
+        return False
+    sms.unenroll_student(student_id, course_id)
+
+
+def _replay_assigned(sms, instructor_id: int, course_id: str):
+    if (instructor_id, course_id) in sms.assignments:
+        return False
+    sms.assign_instructor(instructor_id, course_id)
+
+
+def _replay_unassigned(sms, instructor_id: int, course_id: str):
+    if (instructor_id, course_id) not in sms.assignments:
+        return False
+    sms.unassign_instructor(instructor_id, course_id)
+
+
+# how each log record is applied when the system is recovered, by event name
+_REPLAYERS = {
+    "student_added": lambda sms, id_number, name, major: sms.add_student(Student(name, id_number, major)),
+    "student_updated": lambda sms, old_id, id_number, name, major:
+        sms.update_student_details(old_id, name, major, id_number if id_number != old_id else None),
+    "student_removed": lambda sms, id_number: sms.remove_student(id_number),
+    "instructor_added": lambda sms, id_number, name, department: sms.add_instructor(Instructor(name, id_number, department)),
+    "instructor_updated": lambda sms, old_id, id_number, name, department:
+        sms.update_instructor_details(old_id, name, department, id_number if id_number != old_id else None),
+    "instructor_removed": lambda sms, id_number: sms.remove_instructor(id_number),
+    # course records logged before courses had meetings or prerequisites lack the last fields
+    "course_added": lambda sms, course_id, name, capacity, meetings="", prerequisites="":
+        sms.add_course(Course(name, course_id, capacity, parse_meetings(meetings), parse_prerequisites(prerequisites))),
+    "course_updated": lambda sms, old_id, course_id, name, capacity, meetings=None, prerequisites=None:
+        sms.update_course_details(old_id, name, course_id if course_id != old_id else None, capacity,
+                                  parse_meetings(meetings) if meetings is not None else None,
+                                  parse_prerequisites(prerequisites) if prerequisites is not None else None),
+    "course_removed": lambda sms, course_id: sms.remove_course(course_id),
+    "enrolled": _replay_enrolled,
+    "unenrolled": _replay_unenrolled,
+    "grade_assigned": lambda sms, student_id, course_id, grade: sms.assign_grade(student_id, course_id, grade),
+    "waitlist_joined": lambda sms, student_id, course_id, priority: sms.join_waitlist(student_id, course_id, priority),
+    "waitlist_left": lambda sms, student_id, course_id: sms.leave_waitlist(student_id, course_id),
+    "instructor_assigned": _replay_assigned,
+    "instructor_unassigned": _replay_unassigned,
+}
+
+
+class WriteAheadLog(SystemObserver):
+    """
+    A class used to make a Student Management System durable with a write-ahead log and snapshots.
+
+    The log works with systems using the default `InMemoryStorage`; `SQLiteStorage` is already durable.
+
+    Attributes
+    ----------
+    directory : str
+        The directory holding the log segments and snapshots.
+    sync_interval : float
+        The most seconds a logged change waits before it is written and fsynced.
+    checkpoint_every : int | None
+        The number of logged records after which a snapshot is started automatically (None to only snapshot on request).
+    lsn : int
+        The number of the last record logged.
+    durable_lsn : int
+        The number of the last record known to be on disk.
+    snapshot_lsn : int
+        The number of the last record covered by the latest durable snapshot.
+    replayed : int
+        The number of log records applied by the last `recover()`.
+    skipped : int
+        The number of log records `recover()` found already applied, e.g. an unenrollment that a student's removal already made.
+
+    Methods
+    -------
+    recover(system_factory=StudentManagementSystem) -> StudentManagementSystem
+        Rebuilds the system from the latest snapshot and the log, then starts logging its changes.
+    flush() -> None
+        Waits until every change logged so far is durable.
+    checkpoint(wait=False) -> int
+        Starts a snapshot of the current state in the background.
+    close() -> None
+        Makes every logged change durable and stops logging.
+    """
+
+    def __init__(self, directory: str, sync_interval: float = 0.01, checkpoint_every: int = None) -> None:
+        """
+        Parameters
+        ----------
+        directory : str
+            The directory holding the log segments and snapshots; it is created if needed.
+        sync_interval : float
+            The most seconds a logged change waits before it is written and fsynced (default is 0.01).
+        checkpoint_every : int, optional
+            Start a snapshot automatically after this many records are logged (default is only on request).
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.sync_interval = sync_interval
+        self.checkpoint_every = checkpoint_every
+        self.lsn = 0
+        self.durable_lsn = 0
+        self.snapshot_lsn = 0
+        self.replayed = 0
+        self.skipped = 0
+        self.sms = None
+        self._lock = threading.Lock() # guards lsn and the pending records
+        self._durable = threading.Condition()
+        self._wakeup = threading.Event()
+        self._pending = [] # [segment path, bytearray] pairs waiting to be written, in log order
+        self._file = None
+        self._file_path = None
+        self._flusher = None
+        self._snapshotter = None
+        self._checkpoint_due = False # set by writers of a lock-striped system, the flusher then starts the snapshot
+        self._closing = False
+
+    # recovery
+
+    def recover(self, system_factory=StudentManagementSystem):
+        """
+        Rebuild the system from the latest snapshot and the log records after it, then log its changes.
+
+        Parameters
+        ----------
+        system_factory : Callable[[], StudentManagementSystem]
+            Creates the empty system to recover into, e.g. `ConcurrentStudentManagementSystem`
+            (default is `StudentManagementSystem`).
+
+        Returns
+        -------
+        StudentManagementSystem
+            The recovered system, with this log attached as an observer.
+
+        Raises
+        ------
+        ValueError
+            If the log is already attached to a system, or the new system doesn't use `InMemoryStorage`.
+            If the snapshot can't be restored, or a log record doesn't apply to the recovered state.
+        """
+        if self.sms is not None:
+            raise ValueError("The log is already attached to a system.")
+        sms = system_factory()
+        if not isinstance(sms.storage, InMemoryStorage):
+            raise ValueError("The write-ahead log only works with systems using InMemoryStorage.")
+
+        # recovery allocates millions of long-lived objects, collecting them for cycles along the way is wasted work
+        collecting = gc.isenabled()
+        gc.disable()
+        # promotions are logged as records of their own, so replayed unenrollments, removals and
+        # capacity changes mustn't promote waitlisted students a second time
+        sms._promote_waitlisted = lambda course_id: None
+        try:
+            snapshots = _numbered(self.directory, "snapshot-", ".bin")
+            for _, path in reversed(snapshots):
+                try:
+                    self.snapshot_lsn, sections = read_snapshot(path)
+                except ValueError:
+                    continue # fall back to the previous snapshot
+                self._restore(sms, *sections)
+                break
+
+            self.lsn = self.snapshot_lsn
+            self.replayed = self.skipped = 0
+            for _, path in _numbered(self.directory, "wal-", ".log"):
+                for lsn, event, *values in read_log(path):
+                    if lsn <= self.lsn:
+                        continue # covered by the snapshot
+                    self.lsn = lsn
+                    if self._replay(sms, lsn, event, values):
+                        self.replayed += 1
+                    else:
+                        self.skipped += 1
+        finally:
+            del sms._promote_waitlisted
+            if collecting:
+                gc.enable()
+        self.durable_lsn = self.lsn
+
+        # new records go to a fresh segment, so a torn tail in an old one is never followed by live records
+        self._pending = [[os.path.join(self.directory, _segment_name(self.lsn + 1)), bytearray()]]
+        self.sms = sms
+        self._closing = False
+        self._flusher = threading.Thread(target=self._flush_loop, name="wal-flusher", daemon=True)
+        self._flusher.start()
+        sms.add_observer(self)
+        return sms
+
+    @staticmethod
+    def _restore(sms, students, instructors, courses, enrollments, waitlists, assignments) -> None:
+        # load a snapshot into an empty system as it was: its enrollments were accepted when they were made,
+        # even where a course's capacity was lowered since, and waitlists are kept although their courses are full
+        report = sms.bulk_load(students=(Student(name, id_number, major) for id_number, name, major in students),
+                               instructors=(Instructor(name, id_number, department) for id_number, name, department in instructors),
+                               courses=(_course_from_record(*record) for record in courses),
+                               enrollments=enrollments, assignments=assignments, check_rules=False)
+        if report.errors:
+            record_type, position, message = report.errors[0]
+            raise ValueError(f"The snapshot holds {len(report.errors)} records that can't be restored, "
+                             f"the first is {record_type} record {position}: {message}")
+        for course_id, student_id, priority in waitlists:
+            sms.waitlists.join(student_id, course_id, priority)
+
+    @staticmethod
+    def _replay(sms, lsn: int, event: str, values: list) -> bool:
+        # apply one log record, returning False if the state already reflected it
+        apply = _REPLAYERS.get(event)
+        if apply is None:
+            raise ValueError(f"Unknown log record type {event!r}.")
+        try:
+            return apply(sms, *values) is not False
+        except (KeyError, ValueError) as error:
+            raise ValueError(f"Log record {lsn} ({event}) doesn't apply to the recovered state: {error}") from error
+
+    # logging
+
+    def _append(self, event: str, *values) -> None:
+        with self._lock:
+            if self.sms is None:
+                raise ValueError("The write-ahead log is closed.")
+            self.lsn += 1
+            payload = marshal.dumps((self.lsn, event) + values)
+            buffer = self._pending[-1][1]
+            buffer += _HEADER.pack(len(payload), zlib.crc32(payload))
+            buffer += payload
+            start_snapshot = self.checkpoint_every is not None and self.lsn - self.snapshot_lsn >= self.checkpoint_every
+        if start_snapshot and self._snapshotter is None:
+            if getattr(self.sms, "locks", None) is None:
+                self.checkpoint()
+            else:
+                # this writer may hold some of the system's lock stripes, so the flusher takes the snapshot instead
+                self._checkpoint_due = True
+                self._wakeup.set()
+
+    def _flush_loop(self) -> None:
+        # the group commit: every record appended since the last pass is written with one fsync per segment
+        while True:
+            self._wakeup.wait(self.sync_interval)
+            self._wakeup.clear()
+            with self._lock:
+                pending, lsn = self._pending, self.lsn
+                self._pending = [[pending[-1][0], bytearray()]]
+                closing = self._closing
+            for path, buffer in pending:
+                if path != self._file_path:
+                    if self._file is not None:
+                        self._file.close()
+                    self._file = open(path, "ab")
+                    self._file_path = path
+                    _fsync_directory(self.directory)
+                if buffer:
+                    self._file.write(buffer)
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+            with self._durable:
+                self.durable_lsn = lsn
+                self._durable.notify_all()
+            if closing:
+                self._file.close()
+                self._file = self._file_path = None
+                return
+            if self._checkpoint_due:
+                self._checkpoint_due = False
+                self.checkpoint()
+
+    def flush(self) -> None:
+        """
+        Wait until every change logged so far has been written and fsynced.
+        """
+        target = self.lsn
+        self._wakeup.set()
+        with self._durable:
+            self._durable.wait_for(lambda: self.durable_lsn >= target or self._flusher is None)
+
+    # snapshots
+
+    def checkpoint(self, wait: bool = False) -> int:
+        """
+        Start writing a snapshot of the current state from a background thread.
+
+        The log moves on to a new segment first and the state is copied while writers are held
+        back; once the snapshot is durable, the older segments and snapshots are deleted. Only
+        one snapshot is written at a time.
+
+        Parameters
+        ----------
+        wait : bool
+            Whether to return only once the snapshot is durable (default is False).
+
+        Returns
+        -------
+        int
+            The number of the last log record the snapshot covers, or the running snapshot's if one is already being written.
+        """
+        if self.sms is None:
+            raise ValueError("The write-ahead log is not attached to a system, use recover() first.")
+        sms = self.sms
+        locks = getattr(sms, "locks", None)
+        # a lock-striped system's writers change the state before logging it, so they are held back while it is copied
+        with locks.hold_all() if locks is not None else contextlib.nullcontext(), self._lock:
+            snapshotter = self._snapshotter
+            if snapshotter is None:
+                lsn = self.lsn
+                self._pending.append([os.path.join(self.directory, _segment_name(lsn + 1)), bytearray()])
+                # the records are copied out of the live objects now, so the snapshot is the state as of lsn
+                state = ([(s.id_number, s.name, s.major) for s in sms.students.values()],
+                         [(i.id_number, i.name, i.department) for i in sms.instructors.values()],
+                         [(c.course_id, c.course_name, c.capacity, format_meetings(c.meetings), format_prerequisites(c.prerequisites))
+                          for c in sms.courses.values()],
+                         [(e.student.id_number, e.course.course_id, e.grade) for e in sms.enrollments.by_pair.values()],
+                         [(course_id, student_id, priority)
+                          for course_id, waitlist in sms.waitlists.by_course_id.items()
+                          for priority, _, student_id in sorted(tuple(entry) for entry in waitlist.entries.values() if entry[-1] is not None)],
+                         list(sms.assignments))
+                snapshotter = self._snapshotter = threading.Thread(target=self._write_snapshot, args=(lsn, state),
+                                                                   name="wal-snapshot", daemon=True)
+                snapshotter.lsn = lsn
+                snapshotter.start()
+        if wait:
+            snapshotter.join()
+        return snapshotter.lsn
+
+    def _write_snapshot(self, lsn: int, state) -> None:
+        try:
+            write_snapshot(os.path.join(self.directory, _snapshot_name(lsn)), lsn, *state)
+            _fsync_directory(self.directory)
+            # the records the snapshot covers must be durable before the segments holding them go
+            self.flush()
+            self.snapshot_lsn = lsn
+            for first_lsn, path in _numbered(self.directory, "wal-", ".log"):
+                if first_lsn <= lsn:
+                    os.remove(path)
+            for snapshot_lsn, path in _numbered(self.directory, "snapshot-", ".bin"):
+                if snapshot_lsn < lsn:
+                    os.remove(path)
+            _fsync_directory(self.directory)
+        finally:
+            self._snapshotter = None
+
+    def close(self) -> None:
+        """
+        Wait for a running snapshot, make every logged change durable and stop logging.
+        """
+        if self.sms is None:
+            return
+        snapshotter = self._snapshotter
+        if snapshotter is not None:
+            snapshotter.join()
+        self.sms.remove_observer(self)
+        with self._lock:
+            self._closing = True
+        self._wakeup.set()
+        self._flusher.join()
+        self._flusher = None
+        self.sms = None
+
+    # hooks, each logs the resulting state of the entity it is given
+
+    def student_added(self, student) -> None:
+        self._append("student_added", student.id_number, student.name, student.major)
+
+    def student_updated(self, student, previous: dict) -> None:
+        self._append("student_updated", previous.get("id_number", student.id_number), student.id_number, student.name, student.major)
+
+    def student_removed(self, student) -> None:
+        self._append("student_removed", student.id_number)
+
+    def instructor_added(self, instructor) -> None:
+        self._append("instructor_added", instructor.id_number, instructor.name, instructor.department)
+
+    def instructor_updated(self, instructor, previous: dict) -> None:
+        self._append("instructor_updated", previous.get("id_number", instructor.id_number), instructor.id_number,
+                     instructor.name, instructor.department)
+
+    def instructor_removed(self, instructor) -> None:
+        self._append("instructor_removed", instructor.id_number)
+
+    def course_added(self, course) -> None:
+        self._append("course_added", course.course_id, course.course_name, course.capacity,
+                     format_meetings(course.meetings), format_prerequisites(course.prerequisites))
+
+    def course_updated(self, course, previous: dict) -> None:
+        self._append("course_updated", previous.get("course_id", course.course_id), course.course_id,
+                     course.course_name, course.capacity, format_meetings(course.meetings),
+                     format_prerequisites(course.prerequisites))
+
+    def course_removed(self, course) -> None:
+        self._append("course_removed", course.course_id)
+
+    def enrolled(self, enrollment) -> None:
+        self._append("enrolled", enrollment.student.id_number, enrollment.course.course_id, enrollment.grade)
+
+    def unenrolled(self, enrollment) -> None:
+        self._append("unenrolled", enrollment.student.id_number, enrollment.course.course_id)
+
+    def grade_assigned(self, enrollment, previous_grade) -> None:
+        self._append("grade_assigned", enrollment.student.id_number, enrollment.course.course_id, enrollment.grade)
+
+    def instructor_assigned(self, instructor, course) -> None:
+        self._append("instructor_assigned", instructor.id_number, course.course_id)
+
+    def instructor_unassigned(self, instructor, course) -> None:
+        self._append("instructor_unassigned", instructor.id_number, course.course_id)
+
+    def waitlist_joined(self, student_id: int, course_id: str, priority) -> None:
+        self._append("waitlist_joined", student_id, course_id, priority)
+
+    def waitlist_left(self, student_id: int, course_id: str) -> None:
+        self._append("waitlist_left", student_id, course_id)